@@ -3,15 +3,39 @@ PreEII - Pre-enrollment review support software for Industrial Engineering
 Main entry point of the application.
 
 Python minimum version: 3.8
+
+Without arguments the interactive menu is shown; with arguments the
+non-interactive command line is used (run `python main.py --help`).
+`python main.py --perfilar` shows the menu profiling each operation; the
+PREEII_PERFILAR=1 environment variable does the same for the menu and the CLI.
+PREEII_MEMORIA=1 adds the memory of each stage to the run metrics.
 """
-from src.presentation.console.menu_controller import MenuController
+import os
+import sys
+
+from src.shared.config.settings import app_config
 
 
 def main() -> None:
     """
     Función principal de la aplicación.
-    Inicializa y ejecuta el controlador del menú principal.
+    Con argumentos ejecuta la línea de comandos; sin ellos, el menú principal.
     """
+    if os.environ.get('PREEII_PERFILAR', '') not in ('', '0'):
+        app_config.perfilar = True
+    if os.environ.get('PREEII_MEMORIA', '') not in ('', '0'):
+        app_config.medir_memoria = True
+    app_config.directorio_perfiles = os.environ.get('PREEII_DIRECTORIO_PERFILES', app_config.directorio_perfiles)
+    if sys.argv[1:] == ['--perfilar']:
+        app_config.perfilar = True
+        del sys.argv[1]
+
+    if len(sys.argv) > 1:
+        from src.presentation.console.cli_controller import CliController
+        sys.exit(CliController().ejecutar(sys.argv[1:]))
+
+    from src.presentation.console.menu_controller import MenuController
+
     try:
         menu_controller = MenuController()
         menu_controller.mostrar_menu_principal()
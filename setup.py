@@ -19,6 +19,9 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/mauricio-zamora-ucr/preeii2",
     packages=find_packages(),
+    package_data={
+        "src.shared.config": ["*.json"],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Education",
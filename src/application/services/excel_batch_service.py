@@ -0,0 +1,422 @@
+"""
+Servicio para la generación de archivos Excel en lote usando varios procesos
+"""
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...shared.instrumentacion import metricas
+
+
+# Orden de las columnas con que se envía el historial a los procesos trabajadores
+COLUMNAS_HISTORIAL = ('SIGLA', 'CURSO', 'CREDITOS', 'GRUPO', 'SEM', 'AÑO', 'ESTADO', 'NOTA')
+
+
+@dataclass(frozen=True)
+class TareaExcel:
+    """
+    Datos compactos necesarios para generar el Excel de un estudiante.
+    El historial viaja como tuplas en el orden de COLUMNAS_HISTORIAL.
+    """
+    carne: str
+    nombre: str
+    filas: Tuple[Tuple[str, ...], ...]
+    ruta_salida: str
+
+    @classmethod
+    def desde_historial(
+        cls, carne: str, nombre: str, historial: List[Dict[str, str]], ruta_salida: str
+    ) -> 'TareaExcel':
+        """
+        Crea una tarea a partir del historial leído del repositorio.
+
+        Args:
+            carne: Carné del estudiante
+            nombre: Nombre del estudiante
+            historial: Lista de diccionarios con el historial académico
+            ruta_salida: Ruta del archivo Excel a generar
+
+        Returns:
+            Tarea lista para enviarse a un proceso trabajador
+        """
+        filas = tuple(
+            tuple(fila.get(columna, '') for columna in COLUMNAS_HISTORIAL)
+            for fila in historial
+        )
+        return cls(carne=carne, nombre=nombre, filas=filas, ruta_salida=ruta_salida)
+
+    def historial(self) -> List[Dict[str, str]]:
+        """Reconstruye el historial como lista de diccionarios."""
+        return [dict(zip(COLUMNAS_HISTORIAL, fila)) for fila in self.filas]
+
+
+@dataclass
+class ResultadoExcel:
+    """Resultado de la generación del Excel de un estudiante."""
+    carne: str
+    nombre: str
+    ruta_salida: str
+    exitoso: bool
+    error: str = ''
+    duracion: float = 0.0
+    tiempo_agotado: bool = False
+    metricas: Dict[str, Any] = field(default_factory=dict)  # Métricas del proceso trabajador
+
+
+@dataclass
+class ResumenLote:
+    """Resumen de la generación de un lote de archivos Excel."""
+    exitosos: List[ResultadoExcel] = field(default_factory=list)
+    fallidos: List[ResultadoExcel] = field(default_factory=list)
+    duracion: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Cantidad de tareas procesadas."""
+        return len(self.exitosos) + len(self.fallidos)
+
+    @property
+    def por_segundo(self) -> float:
+        """Archivos procesados por segundo."""
+        return self.total / self.duracion if self.duracion > 0 else 0.0
+
+    @property
+    def tiempos_agotados(self) -> int:
+        """Cantidad de tareas canceladas por exceder el tiempo límite."""
+        return sum(1 for resultado in self.fallidos if resultado.tiempo_agotado)
+
+
+def _generar_excel_trabajador(tarea: TareaExcel, opciones_excel: Dict[str, object]) -> ResultadoExcel:
+    """
+    Genera el Excel de un estudiante. Se ejecuta dentro de un proceso trabajador
+    y las opciones se pasan como argumentos con nombre a ExcelWriter.
+
+    Los errores se capturan y se devuelven como resultado para que un estudiante
+    con datos defectuosos no detenga el lote. En un proceso trabajador, las métricas
+    de la tarea viajan en el resultado para sumarlas en el proceso principal.
+    """
+    from .expediente_service import ExpedienteService
+    from ...infrastructure.adapters.excel_writer import ExcelWriter
+
+    if _EN_TRABAJADOR:
+        metricas.reiniciar()
+
+    inicio = time.perf_counter()
+    try:
+        expediente = ExpedienteService.procesar_expediente_estudiante(
+            tarea.carne, tarea.nombre, tarea.historial()
+        )
+        ExcelWriter(**opciones_excel).generar_expediente(expediente, tarea.ruta_salida)
+        resultado = ResultadoExcel(
+            tarea.carne, tarea.nombre, tarea.ruta_salida, True,
+            duracion=time.perf_counter() - inicio
+        )
+    except Exception as e:
+        resultado = ResultadoExcel(
+            tarea.carne, tarea.nombre, tarea.ruta_salida, False, str(e),
+            time.perf_counter() - inicio
+        )
+
+    if _EN_TRABAJADOR:
+        resultado.metricas = metricas.como_dict()
+    return resultado
+
+
+# Indica si el proceso actual es un trabajador del pool
+_EN_TRABAJADOR = False
+
+
+def _inicializar_trabajador(medir_memoria: bool = False) -> None:
+    """
+    Precarga en cada proceso trabajador los módulos pesados de generación.
+
+    Args:
+        medir_memoria: Si es True, el trabajador registra también la memoria de cada etapa
+    """
+    global _EN_TRABAJADOR
+    _EN_TRABAJADOR = True
+    if medir_memoria:
+        metricas.activar_memoria()
+
+    from .expediente_service import ExpedienteService  # noqa: F401
+    from ...infrastructure.adapters import excel_writer  # noqa: F401
+
+
+def _calentar_trabajador(opciones_excel: Dict[str, object]) -> float:
+    """
+    Deja listo un proceso trabajador que se mantiene abierto: compila el índice del
+    plan de estudios y genera un libro de prueba para recorrer una vez el código de
+    todas las hojas del perfil.
+
+    Returns:
+        Segundos que tomó el calentamiento
+    """
+    import tempfile
+    from ...shared.config.indice_curricular import obtener_indice_curricular
+
+    inicio = time.perf_counter()
+    obtener_indice_curricular()
+    with tempfile.TemporaryDirectory() as directorio:
+        tarea = TareaExcel(
+            '000000', 'CALENTAMIENTO', (('MA1001', 'CÁLCULO I', '3', '1', 'I', '2020', 'APROBADO', '8.0'),),
+            os.path.join(directorio, 'calentamiento.xlsx')
+        )
+        _generar_excel_trabajador(tarea, opciones_excel)
+    metricas.reiniciar()
+    return time.perf_counter() - inicio
+
+
+def _atender_tareas(conexion, opciones_excel: Dict[str, object], medir_memoria: bool) -> None:
+    """
+    Ciclo de un proceso trabajador propio del lote: avisa que está listo y genera
+    las tareas que recibe por la conexión, de una en una, hasta recibir None.
+    """
+    _inicializar_trabajador(medir_memoria)
+    conexion.send(None)
+    while True:
+        tarea = conexion.recv()
+        if tarea is None:
+            break
+        conexion.send(_generar_excel_trabajador(tarea, opciones_excel))
+
+
+class _TrabajadorLote:
+    """
+    Proceso trabajador que genera un Excel a la vez. Como solo recibe una tarea
+    cuando está desocupado, el tiempo de cada tarea se cuenta desde que empieza, y
+    si se excede el límite el proceso se reinicia sin afectar a los demás.
+    """
+
+    def __init__(self, opciones_excel: Dict[str, object]):
+        self.opciones_excel = opciones_excel
+        self._iniciar()
+
+    def _iniciar(self) -> None:
+        """Inicia el proceso; queda listo cuando termina de cargar los módulos de generación."""
+        self.conexion, extremo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(
+            target=_atender_tareas, args=(extremo, self.opciones_excel, metricas.memoria is not None),
+            daemon=True
+        )
+        self.proceso.start()
+        extremo.close()
+        self.listo = False
+        self.tarea: Optional[TareaExcel] = None
+        self.inicio = 0.0
+
+    def asignar(self, tarea: TareaExcel) -> None:
+        """Entrega una tarea al trabajador desocupado y empieza a contar su tiempo."""
+        self.conexion.send(tarea)
+        self.tarea = tarea
+        self.inicio = time.perf_counter()
+
+    def recibir(self) -> Optional[ResultadoExcel]:
+        """
+        Recibe el siguiente mensaje del proceso: el aviso de que está listo (None) o
+        el resultado de su tarea. Si el proceso murió, reinicia el trabajador y
+        retorna la tarea como fallida.
+
+        Raises:
+            RuntimeError: Si el proceso murió antes de quedar listo
+        """
+        try:
+            mensaje = self.conexion.recv()
+        except EOFError:
+            tarea, duracion = self.tarea, time.perf_counter() - self.inicio
+            if tarea is None:
+                raise RuntimeError('No se pudo iniciar un proceso trabajador')
+            self.reiniciar()
+            return ResultadoExcel(
+                tarea.carne, tarea.nombre, tarea.ruta_salida, False,
+                'El proceso trabajador terminó inesperadamente', duracion
+            )
+        if mensaje is None:
+            self.listo = True
+        else:
+            self.tarea = None
+        return mensaje
+
+    def generar(self, tarea: TareaExcel, tiempo_limite: Optional[float] = None) -> ResultadoExcel:
+        """
+        Genera una tarea y espera su resultado.
+
+        Args:
+            tarea: Tarea a generar
+            tiempo_limite: Segundos máximos desde que empieza la tarea (None para no limitar)
+
+        Returns:
+            Resultado de la tarea; si excede el límite, el trabajador se reinicia y la
+            tarea se retorna como fallida por tiempo
+        """
+        while not self.listo:
+            self.recibir()
+        self.asignar(tarea)
+        if not self.conexion.poll(tiempo_limite):
+            return self.cancelar_por_tiempo(tiempo_limite)
+        return self.recibir()
+
+    def cancelar_por_tiempo(self, tiempo_limite: float) -> ResultadoExcel:
+        """Reinicia el trabajador ocupado y retorna su tarea como fallida por tiempo."""
+        tarea, duracion = self.tarea, time.perf_counter() - self.inicio
+        self.reiniciar()
+        return ResultadoExcel(
+            tarea.carne, tarea.nombre, tarea.ruta_salida, False,
+            f'Se excedió el tiempo límite de {tiempo_limite:g} s', duracion, tiempo_agotado=True
+        )
+
+    def reiniciar(self) -> None:
+        """Detiene el proceso aunque esté ocupado e inicia otro en su lugar."""
+        self.proceso.terminate()
+        self.proceso.join()
+        self.conexion.close()
+        self._iniciar()
+
+    def cerrar(self) -> None:
+        """Pide al proceso que termine y lo detiene si no lo hace."""
+        try:
+            self.conexion.send(None)
+        except OSError:
+            pass
+        self.proceso.join(timeout=5)
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+            self.proceso.join()
+        self.conexion.close()
+
+
+class ExcelBatchService:
+    """
+    Servicio que distribuye la generación de archivos Excel entre varios procesos.
+    """
+
+    def __init__(self, procesos: Optional[int] = None, tiempo_limite: Optional[float] = None,
+                 **opciones_excel):
+        """
+        Inicializa el servicio de generación en lote.
+
+        Args:
+            procesos: Cantidad de procesos trabajadores. Si es None o 0 se usan
+                      todos los núcleos disponibles; con 1 se genera en el proceso actual.
+            tiempo_limite: Segundos máximos por archivo, contados desde que un trabajador
+                           empieza la tarea. Solo se aplica al generar en procesos
+                           trabajadores (procesos mayor que 1); None o 0 para no limitar.
+            **opciones_excel: Opciones para ExcelWriter (por ejemplo modo_streaming)
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tiempo_limite = tiempo_limite or None
+        self.opciones_excel = opciones_excel
+
+    def generar_lote(
+        self,
+        tareas: List[TareaExcel],
+        al_completar: Optional[Callable[[int, int, ResultadoExcel], None]] = None
+    ) -> ResumenLote:
+        """
+        Genera los archivos Excel de todas las tareas.
+
+        Args:
+            tareas: Tareas a procesar
+            al_completar: Función llamada conforme termina cada tarea con
+                          (número completado, total, resultado)
+
+        Returns:
+            Resumen con los resultados exitosos y fallidos
+        """
+        resumen = ResumenLote()
+        inicio = time.perf_counter()
+        total = len(tareas)
+
+        def registrar(resultado: ResultadoExcel) -> None:
+            if resultado.metricas:
+                metricas.combinar(resultado.metricas)
+            if resultado.exitoso:
+                resumen.exitosos.append(resultado)
+            else:
+                resumen.fallidos.append(resultado)
+            if al_completar:
+                al_completar(resumen.total, total, resultado)
+
+        if self.procesos > 1 and self.tiempo_limite and total:
+            self._generar_con_limite(tareas, registrar)
+        elif self.procesos > 1 and total > 1:
+            self._generar_en_paralelo(tareas, registrar)
+        else:
+            for tarea in tareas:
+                registrar(_generar_excel_trabajador(tarea, self.opciones_excel))
+
+        resumen.duracion = time.perf_counter() - inicio
+        return resumen
+
+    def _generar_en_paralelo(
+        self,
+        tareas: List[TareaExcel],
+        registrar: Callable[[ResultadoExcel], None]
+    ) -> None:
+        """Distribuye las tareas en un grupo de procesos y registra cada resultado conforme termina."""
+        with ProcessPoolExecutor(
+            max_workers=min(self.procesos, len(tareas)), initializer=_inicializar_trabajador,
+            initargs=(metricas.memoria is not None,)
+        ) as pool:
+            futuros = {
+                pool.submit(_generar_excel_trabajador, tarea, self.opciones_excel): tarea
+                for tarea in tareas
+            }
+            for futuro in as_completed(futuros):
+                registrar(self._obtener_resultado(futuro, futuros[futuro]))
+
+    def _generar_con_limite(
+        self,
+        tareas: List[TareaExcel],
+        registrar: Callable[[ResultadoExcel], None]
+    ) -> None:
+        """
+        Distribuye las tareas entre trabajadores propios que reciben una tarea a la vez.
+
+        Una tarea que excede el tiempo límite se registra como fallida y solo se
+        termina y reemplaza su proceso, ya que un proceso ocupado no se puede
+        interrumpir. El tiempo cuenta desde que el trabajador recibe la tarea, de
+        modo que ni la espera en la cola ni la carga de los módulos se incluyen.
+        """
+        pendientes = list(reversed(tareas))
+        trabajadores = [_TrabajadorLote(self.opciones_excel) for _ in range(min(self.procesos, len(tareas)))]
+        intervalo = min(1.0, self.tiempo_limite / 4)
+
+        try:
+            while pendientes or any(trabajador.tarea for trabajador in trabajadores):
+                for trabajador in trabajadores:
+                    if trabajador.listo and trabajador.tarea is None and pendientes:
+                        trabajador.asignar(pendientes.pop())
+
+                listos = multiprocessing.connection.wait(
+                    [trabajador.conexion for trabajador in trabajadores], timeout=intervalo
+                )
+                for trabajador in trabajadores:
+                    if trabajador.conexion in listos:
+                        resultado = trabajador.recibir()
+                        if resultado is not None:
+                            registrar(resultado)
+                    elif trabajador.tarea and time.perf_counter() - trabajador.inicio > self.tiempo_limite:
+                        registrar(trabajador.cancelar_por_tiempo(self.tiempo_limite))
+        finally:
+            for trabajador in trabajadores:
+                trabajador.cerrar()
+
+    @staticmethod
+    def _obtener_resultado(futuro: Future, tarea: TareaExcel) -> ResultadoExcel:
+        """Obtiene el resultado de una tarea terminada, convirtiendo las excepciones en fallos."""
+        try:
+            return futuro.result()
+        except BrokenProcessPool as e:
+            return ResultadoExcel(
+                tarea.carne, tarea.nombre, tarea.ruta_salida, False,
+                f'El proceso trabajador terminó inesperadamente: {str(e)}'
+            )
+        except Exception as e:
+            return ResultadoExcel(
+                tarea.carne, tarea.nombre, tarea.ruta_salida, False, str(e)
+            )
@@ -10,6 +10,7 @@ from ...domain.entities.expediente import Expediente
 from ...domain.entities.semestre import Semestre
 from ...domain.entities.curso_carrera import CursoCarrera
 from ...shared.config.settings import DETALLE_CURSOS
+from ...shared.instrumentacion import medido
 
 
 class ExpedienteService:
@@ -76,6 +77,7 @@ class ExpedienteService:
         return sigla_cursos, semestre_cursos, expediente
 
     @staticmethod
+    @medido('expediente.construir')
     def procesar_expediente_estudiante(
         carne: str, 
         nombre: str, 
@@ -0,0 +1,180 @@
+"""
+Servicio para generar los archivos Excel de los expedientes descargados
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .excel_batch_service import ExcelBatchService, ResultadoExcel, ResumenLote, TareaExcel
+
+
+@dataclass
+class PlanGeneracion:
+    """
+    Archivos por generar de un lote, con los que se omiten por estar actualizados
+    y los expedientes que no se pudieron leer.
+    """
+    perfil: str
+    total: int
+    tareas: List[TareaExcel] = field(default_factory=list)
+    omitidos: List[Tuple[int, str, str]] = field(default_factory=list)  # (posición, carné, nombre)
+    errores: List[Tuple[int, str, str]] = field(default_factory=list)  # (posición, archivo, error)
+    huellas: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # ruta -> (archivo, huella)
+
+
+class GeneracionExcelService:
+    """
+    Servicio que genera en paralelo los archivos Excel de los expedientes descargados,
+    usando la caché de construcción para omitir los que ya están actualizados.
+    """
+
+    ENCABEZADO_FALLOS = ['CARNE', 'NOMBRE', 'ARCHIVO', 'ERROR', 'DURACION']
+
+    def __init__(self, file_repository, procesos: Optional[int] = None,
+                 tiempo_limite: Optional[float] = None, modo_streaming: bool = False):
+        """
+        Inicializa el servicio de generación.
+
+        Args:
+            file_repository: Repositorio con los expedientes descargados
+            procesos: Cantidad de procesos trabajadores (None o 0 para todos los núcleos)
+            tiempo_limite: Segundos máximos por archivo (None o 0 para no limitar)
+            modo_streaming: Si es True, los libros se escriben con memoria constante
+        """
+        self.file_repository = file_repository
+        self.procesos = procesos
+        self.tiempo_limite = tiempo_limite
+        self.modo_streaming = modo_streaming
+
+    @staticmethod
+    def nombre_archivo_excel(carne: str, nombre: str) -> str:
+        """
+        Obtiene el nombre del archivo Excel de un estudiante.
+
+        Args:
+            carne: Carné del estudiante
+            nombre: Nombre del estudiante
+
+        Returns:
+            Nombre del archivo dentro del directorio de salida
+        """
+        return f'{carne}-{nombre.upper()}.xlsx'
+
+    def preparar(self, archivos_expedientes: List[str], perfil: str, forzar: bool = False) -> PlanGeneracion:
+        """
+        Lee los expedientes y decide cuáles archivos se deben generar.
+
+        Args:
+            archivos_expedientes: Nombres de los archivos .edf a procesar
+            perfil: Perfil de hojas de ExcelWriter a generar
+            forzar: Si es True, se generan también los archivos actualizados
+
+        Returns:
+            Plan con las tareas a generar, los archivos omitidos y los errores de lectura
+        """
+        from ...infrastructure.adapters.excel_writer import ExcelWriter
+        from ...infrastructure.repositories.build_cache_repository import BuildCacheRepository, huella_plan
+
+        excel_writer = ExcelWriter(perfil=perfil)
+        plan = PlanGeneracion(excel_writer.perfil, len(archivos_expedientes))
+        cache = BuildCacheRepository(self.file_repository.directorio_salida)
+        huella_del_plan = huella_plan(excel_writer.hojas_seleccionadas)
+
+        for i, archivo in enumerate(archivos_expedientes, 1):
+            try:
+                carne = archivo.replace('.edf', '')
+                _, nombre = self.file_repository.leer_informacion_estudiante(carne)
+                historial = self.file_repository.leer_historial(carne)
+
+                # Omitir si el archivo ya fue generado con las mismas entradas
+                nombre_archivo = self.nombre_archivo_excel(carne, nombre)
+                huella = cache.calcular_huella(
+                    carne, nombre, historial, excel_writer.VERSION, excel_writer.hojas_seleccionadas,
+                    huella_del_plan
+                )
+                if not forzar and cache.esta_actualizado(nombre_archivo, huella):
+                    plan.omitidos.append((i, carne, nombre))
+                    continue
+
+                ruta_salida = str(self.file_repository.obtener_ruta_salida(nombre_archivo))
+                plan.tareas.append(TareaExcel.desde_historial(carne, nombre, historial, ruta_salida))
+                plan.huellas[ruta_salida] = (nombre_archivo, huella)
+
+            except Exception as e:
+                plan.errores.append((i, archivo, str(e)))
+
+        return plan
+
+    def generar(
+        self,
+        plan: PlanGeneracion,
+        al_completar: Optional[Callable[[int, int, ResultadoExcel], None]] = None
+    ) -> ResumenLote:
+        """
+        Genera los archivos del plan y registra los exitosos en la caché de construcción.
+
+        Args:
+            plan: Plan obtenido con preparar
+            al_completar: Función llamada con (completados, total, resultado) por cada archivo
+
+        Returns:
+            Resumen del lote generado
+        """
+        from ...infrastructure.repositories.build_cache_repository import BuildCacheRepository
+
+        cache = BuildCacheRepository(self.file_repository.directorio_salida)
+        batch_service = ExcelBatchService(
+            self.procesos, self.tiempo_limite, modo_streaming=self.modo_streaming, perfil=plan.perfil
+        )
+
+        def registrar(completados, total, resultado):
+            if resultado.exitoso:
+                cache.registrar(*plan.huellas[resultado.ruta_salida])
+            if al_completar:
+                al_completar(completados, total, resultado)
+
+        try:
+            return batch_service.generar_lote(plan.tareas, registrar)
+        finally:
+            cache.guardar()
+
+    def escribir_reporte_fallos(self, resumen: ResumenLote) -> Optional[Path]:
+        """
+        Guarda el detalle de los archivos que fallaron en el directorio de reportes.
+
+        Args:
+            resumen: Resumen del lote generado
+
+        Returns:
+            Ruta del reporte, o None si no hubo fallos
+        """
+        if not resumen.fallidos:
+            return None
+
+        filas = [
+            {
+                'CARNE': resultado.carne,
+                'NOMBRE': resultado.nombre,
+                'ARCHIVO': resultado.ruta_salida,
+                'ERROR': resultado.error,
+                'DURACION': f'{resultado.duracion:.2f}'
+            }
+            for resultado in resumen.fallidos
+        ]
+        return self.file_repository.escribir_reporte(
+            f'fallos-{datetime.now():%Y%m%d-%H%M%S}.tsv', self.ENCABEZADO_FALLOS, filas
+        )
+
+    def escribir_reporte_metricas(self) -> Path:
+        """
+        Guarda los tiempos y contadores de la corrida en el directorio de reportes.
+
+        Returns:
+            Ruta del archivo JSON escrito
+        """
+        from ...shared.instrumentacion import metricas
+
+        return metricas.exportar(
+            self.file_repository.directorio_reportes / f'metricas-{datetime.now():%Y%m%d-%H%M%S}.json'
+        )
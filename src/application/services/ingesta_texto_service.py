@@ -0,0 +1,175 @@
+"""
+Servicio para ingerir textos copiados o exportados con los datos de muchos estudiantes
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .excel_batch_service import COLUMNAS_HISTORIAL
+from ...infrastructure.adapters.texto_memoria_parser import (
+    TextoMemoria, analizar_texto_memoria, dividir_registros
+)
+from ...shared.instrumentacion import metricas
+
+
+COLUMNAS_SOLICITUD = ('SIGLA', 'CURSO', 'CREDITOS', 'AUTORIZACION', 'DEC')
+TAMANO_LOTE = 250  # Registros por tarea de análisis y por escritura en el repositorio
+
+
+def _analizar_lote(registros: List[str]) -> List[Optional[TextoMemoria]]:
+    """Analiza un lote de registros; se ejecuta en un proceso trabajador."""
+    return [analizar_texto_memoria(registro) for registro in registros]
+
+
+@dataclass
+class ResumenIngesta:
+    """Estudiantes guardados en una ingesta."""
+    expedientes: List[Tuple[str, str]] = field(default_factory=list)  # (carné, nombre)
+    prematriculas: List[Tuple[str, str]] = field(default_factory=list)  # (carné, nombre)
+    sin_datos: int = 0  # Registros sin carné
+    duracion: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Cantidad de registros guardados."""
+        return len(self.expedientes) + len(self.prematriculas)
+
+    @property
+    def por_segundo(self) -> float:
+        """Registros guardados por segundo."""
+        return self.total / self.duracion if self.duracion > 0 else 0.0
+
+
+class IngestaTextoService:
+    """
+    Servicio que guarda todos los expedientes y prematrículas de textos con muchos
+    estudiantes, como una página completa copiada o una carpeta de volcados de texto.
+
+    Los textos se dividen en registros en una sola pasada, los registros se analizan en
+    lotes en varios procesos y cada lote analizado se escribe de una vez en el
+    repositorio mientras se analizan los siguientes. Si un estudiante aparece varias
+    veces, queda guardado su último registro.
+    """
+
+    def __init__(self, file_repository, procesos: Optional[int] = None, tamano_lote: int = TAMANO_LOTE):
+        """
+        Inicializa el servicio de ingesta.
+
+        Args:
+            file_repository: Repositorio donde se guardan los estudiantes
+            procesos: Procesos para analizar los registros (None o 0 para todos los
+                      núcleos; con 1, o con un solo lote, se analiza en el proceso actual)
+            tamano_lote: Registros por lote
+        """
+        self.file_repository = file_repository
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tamano_lote = max(1, tamano_lote)
+
+    @staticmethod
+    def leer_textos(rutas: Iterable[Union[str, Path]]) -> Iterator[str]:
+        """
+        Lee los volcados de texto de archivos y de directorios (sus archivos .txt).
+
+        Los saltos de línea se conservan; los archivos que no son UTF-8 se leen como latin-1.
+
+        Args:
+            rutas: Archivos o directorios
+
+        Yields:
+            El contenido de cada archivo
+        """
+        for ruta in map(Path, rutas):
+            archivos = sorted(ruta.glob('*.txt')) if ruta.is_dir() else [ruta]
+            for archivo in archivos:
+                contenido = archivo.read_bytes()
+                try:
+                    yield contenido.decode('utf-8')
+                except UnicodeDecodeError:
+                    yield contenido.decode('latin-1')
+
+    def ingerir(
+        self,
+        textos: Iterable[str],
+        al_guardar: Optional[Callable[[int, ResumenIngesta], None]] = None
+    ) -> ResumenIngesta:
+        """
+        Divide, analiza y guarda los registros de los textos.
+
+        Args:
+            textos: Textos con cero o más registros cada uno
+            al_guardar: Función llamada con (registros analizados, resumen) después de
+                        escribir cada lote
+
+        Returns:
+            Resumen con los estudiantes guardados
+        """
+        inicio = time.perf_counter()
+        with metricas.medir('ingesta.division'):
+            registros = [registro for texto in textos for registro in dividir_registros(texto)]
+        resumen = self.ingerir_registros(registros, al_guardar)
+        resumen.duracion = time.perf_counter() - inicio
+        return resumen
+
+    def ingerir_registros(
+        self,
+        registros: List[str],
+        al_guardar: Optional[Callable[[int, ResumenIngesta], None]] = None
+    ) -> ResumenIngesta:
+        """
+        Analiza y guarda registros ya divididos con dividir_registros, un estudiante por registro.
+
+        Args:
+            registros: Texto de cada registro
+            al_guardar: Función llamada con (registros analizados, resumen) después de
+                        escribir cada lote
+
+        Returns:
+            Resumen con los estudiantes guardados
+        """
+        resumen = ResumenIngesta()
+        inicio = time.perf_counter()
+        lotes = [registros[i:i + self.tamano_lote] for i in range(0, len(registros), self.tamano_lote)]
+
+        analizados = 0
+        if self.procesos <= 1 or len(lotes) <= 1:
+            for lote in lotes:
+                with metricas.medir('ingesta.analisis'):
+                    datos = _analizar_lote(lote)
+                analizados += len(datos)
+                self._guardar(datos, resumen)
+                if al_guardar:
+                    al_guardar(analizados, resumen)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.procesos, len(lotes))) as executor:
+                for datos in executor.map(_analizar_lote, lotes):
+                    analizados += len(datos)
+                    self._guardar(datos, resumen)
+                    if al_guardar:
+                        al_guardar(analizados, resumen)
+
+        resumen.duracion = time.perf_counter() - inicio
+        metricas.contar('ingesta.registros', len(registros))
+        return resumen
+
+    def _guardar(self, lote: List[Optional[TextoMemoria]], resumen: ResumenIngesta) -> None:
+        """Escribe en el repositorio los expedientes y las prematrículas de un lote analizado."""
+        expedientes = []
+        solicitudes = []
+        for datos in lote:
+            if datos is None or not datos.carne:
+                resumen.sin_datos += 1
+            elif datos.tipo == 'exp':
+                expedientes.append((datos.carne, datos.nombre, datos.cursos))
+                resumen.expedientes.append((datos.carne, datos.nombre))
+            else:
+                solicitudes.append((datos.carne, datos.cursos, datos.comentario_estudiante, datos.comentario_profesor))
+                resumen.prematriculas.append((datos.carne, datos.nombre))
+
+        with metricas.medir('ingesta.escritura'):
+            if expedientes:
+                self.file_repository.escribir_expedientes(list(COLUMNAS_HISTORIAL), expedientes)
+            if solicitudes:
+                self.file_repository.escribir_solicitudes(list(COLUMNAS_SOLICITUD), solicitudes)
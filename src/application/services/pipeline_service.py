@@ -0,0 +1,317 @@
+"""
+Servicio para descargar y generar los expedientes en etapas simultáneas
+"""
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .excel_batch_service import ResultadoExcel, ResumenLote, TareaExcel, _TrabajadorLote
+from .generacion_excel_service import GeneracionExcelService
+from ...shared.instrumentacion import metricas
+
+
+# Marca de fin de los elementos de una cola
+_FIN = object()
+
+
+@dataclass
+class FalloEtapa:
+    """Elemento que no pudo pasar por una etapa del pipeline."""
+    etapa: str
+    elemento: Any
+    error: str
+
+
+class Pipeline:
+    """
+    Etapas conectadas por colas acotadas; cada etapa corre en sus propios hilos.
+
+    Cuando una cola se llena, la etapa anterior espera, de modo que la memoria no
+    crece aunque una etapa sea más lenta que las demás. Un error en un elemento se
+    registra en fallos y el elemento no continúa a las etapas siguientes.
+    """
+
+    def __init__(self, capacidad: int = 8):
+        """
+        Inicializa el pipeline sin etapas.
+
+        Args:
+            capacidad: Cantidad máxima de elementos en espera entre dos etapas
+        """
+        self.capacidad = capacidad
+        self.fallos: List[FalloEtapa] = []
+        self.tiempos: Dict[str, float] = {}  # Tiempo ocupado acumulado de cada etapa
+        self._etapas: List[Tuple[str, Callable[[Any], Any], int]] = []
+        self._candado = threading.Lock()
+
+    def etapa(self, nombre: str, funcion: Callable[[Any], Any], hilos: int = 1) -> 'Pipeline':
+        """
+        Agrega una etapa al final del pipeline.
+
+        Args:
+            nombre: Nombre de la etapa para los tiempos y los fallos
+            funcion: Función que transforma cada elemento
+            hilos: Cantidad de hilos que procesan la etapa
+
+        Returns:
+            El mismo pipeline, para encadenar etapas
+        """
+        self._etapas.append((nombre, funcion, max(1, hilos)))
+        self.tiempos[nombre] = 0.0
+        return self
+
+    def ejecutar(self, entradas: Iterable[Any]) -> Iterator[Any]:
+        """
+        Procesa las entradas por todas las etapas.
+
+        Args:
+            entradas: Elementos para la primera etapa
+
+        Yields:
+            Resultados de la última etapa conforme terminan, sin un orden garantizado
+        """
+        colas = [queue.Queue(maxsize=self.capacidad) for _ in range(len(self._etapas) + 1)]
+        hilos = [threading.Thread(
+            target=self._alimentar, args=(entradas, colas[0], self._etapas[0][2]),
+            name='pipeline-entrada', daemon=True
+        )]
+
+        for indice, (nombre, funcion, cantidad) in enumerate(self._etapas):
+            siguientes = self._etapas[indice + 1][2] if indice + 1 < len(self._etapas) else 1
+            activos = [cantidad]
+            for numero in range(cantidad):
+                hilos.append(threading.Thread(
+                    target=self._trabajar,
+                    args=(nombre, funcion, colas[indice], colas[indice + 1], activos, siguientes),
+                    name=f'pipeline-{nombre}-{numero}', daemon=True
+                ))
+
+        for hilo in hilos:
+            hilo.start()
+
+        salida = colas[-1]
+        while True:
+            elemento = salida.get()
+            if elemento is _FIN:
+                break
+            yield elemento
+
+        for hilo in hilos:
+            hilo.join()
+
+    @staticmethod
+    def _alimentar(entradas: Iterable[Any], cola: queue.Queue, consumidores: int) -> None:
+        """Coloca las entradas en la primera cola y luego una marca de fin por consumidor."""
+        for elemento in entradas:
+            cola.put(elemento)
+        for _ in range(consumidores):
+            cola.put(_FIN)
+
+    def _trabajar(
+        self,
+        nombre: str,
+        funcion: Callable[[Any], Any],
+        entrada: queue.Queue,
+        salida: queue.Queue,
+        activos: List[int],
+        siguientes: int
+    ) -> None:
+        """
+        Procesa los elementos de una cola hasta recibir la marca de fin.
+        El último hilo de la etapa en terminar avisa el fin a la etapa siguiente.
+        """
+        while True:
+            elemento = entrada.get()
+            if elemento is _FIN:
+                break
+
+            inicio = time.perf_counter()
+            try:
+                resultado = funcion(elemento)
+            except Exception as e:
+                with self._candado:
+                    self.fallos.append(FalloEtapa(nombre, elemento, str(e)))
+                continue
+            finally:
+                with self._candado:
+                    self.tiempos[nombre] += time.perf_counter() - inicio
+            salida.put(resultado)
+
+        with self._candado:
+            activos[0] -= 1
+            ultimo = activos[0] == 0
+        if ultimo:
+            for _ in range(siguientes):
+                salida.put(_FIN)
+
+
+@dataclass
+class EstudianteEnProceso:
+    """Datos de un estudiante conforme avanza por las etapas de la descarga."""
+    clave: str
+    carne: str
+    nombre: str
+    contenido_html: str = ''
+    historial: List[Dict[str, str]] = field(default_factory=list)
+    tarea: Optional[TareaExcel] = None
+    huella: Tuple[str, str] = ('', '')  # (archivo, huella) para la caché de construcción
+    omitido: bool = False
+    resultado: Optional[ResultadoExcel] = None
+
+
+@dataclass
+class ResumenPipeline:
+    """Resumen de una descarga con generación simultánea."""
+    estudiantes: int = 0
+    omitidos: List[EstudianteEnProceso] = field(default_factory=list)
+    lote: ResumenLote = field(default_factory=ResumenLote)
+    tiempos: Dict[str, float] = field(default_factory=dict)
+
+
+class PipelineDescargaService:
+    """
+    Servicio que descarga los expedientes y genera sus archivos Excel al mismo tiempo.
+
+    Las etapas son descarga (red), análisis del HTML, guardado de los archivos del
+    expediente y generación del Excel. La generación construye el expediente y el
+    libro en procesos trabajadores, por lo que el libro de un estudiante queda listo
+    mientras se descargan los siguientes. Un libro que excede el tiempo límite se
+    registra como fallido y su proceso se reinicia sin detener la descarga.
+    """
+
+    def __init__(self, web_scraping_service, file_repository, procesos: Optional[int] = None,
+                 descargas: int = 1, tiempo_limite: Optional[float] = None, **opciones_excel):
+        """
+        Inicializa el servicio.
+
+        Args:
+            web_scraping_service: Servicio con la sesión autenticada del sistema de matrícula
+            file_repository: Repositorio donde se guardan los expedientes
+            procesos: Procesos trabajadores para generar los Excel (None o 0 para todos los núcleos)
+            descargas: Cantidad de expedientes que se descargan a la vez
+            tiempo_limite: Segundos máximos por archivo Excel (None o 0 para no limitar)
+            **opciones_excel: Opciones para ExcelWriter (perfil, modo_streaming)
+        """
+        self.web_scraping_service = web_scraping_service
+        self.file_repository = file_repository
+        self.procesos = procesos or os.cpu_count() or 1
+        self.descargas = max(1, descargas)
+        self.tiempo_limite = tiempo_limite or None
+        self.opciones_excel = opciones_excel
+
+    def ejecutar(
+        self,
+        estudiantes: List[Tuple[str, ...]],
+        forzar: bool = True,
+        al_completar: Optional[Callable[[int, int, EstudianteEnProceso], None]] = None
+    ) -> ResumenPipeline:
+        """
+        Descarga, guarda y genera el Excel de cada estudiante del listado.
+
+        Args:
+            estudiantes: Listado de estudiantes (clave, carné, nombre, ...)
+            forzar: Si es False, no se genera el Excel de los expedientes sin cambios
+            al_completar: Función llamada con (completados, total, estudiante) cuando un
+                          estudiante termina todas las etapas
+
+        Returns:
+            Resumen con los resultados, los fallos y el tiempo ocupado por etapa
+        """
+        from ...infrastructure.adapters.excel_writer import ExcelWriter
+        from ...infrastructure.repositories.build_cache_repository import BuildCacheRepository, huella_plan
+
+        inicio = time.perf_counter()
+        excel_writer = ExcelWriter(**self.opciones_excel)
+        cache = BuildCacheRepository(self.file_repository.directorio_salida)
+        huella_del_plan = huella_plan(excel_writer.hojas_seleccionadas)
+        resumen = ResumenPipeline()
+        entradas = [EstudianteEnProceso(e[0], e[1], e[2]) for e in estudiantes if len(e) >= 3]
+        total = len(entradas)
+
+        def descargar(estudiante: EstudianteEnProceso) -> EstudianteEnProceso:
+            estudiante.contenido_html = self.web_scraping_service.descargar_expediente_estudiante(
+                estudiante.clave
+            )
+            return estudiante
+
+        def analizar(estudiante: EstudianteEnProceso) -> EstudianteEnProceso:
+            estudiante.historial = self.web_scraping_service.procesar_expediente_estudiante(
+                estudiante.contenido_html
+            )
+            estudiante.contenido_html = ''
+            return estudiante
+
+        def guardar(estudiante: EstudianteEnProceso) -> EstudianteEnProceso:
+            self.web_scraping_service.guardar_expediente_estudiante(
+                estudiante.carne, estudiante.nombre, estudiante.historial, self.file_repository
+            )
+            nombre_archivo = GeneracionExcelService.nombre_archivo_excel(estudiante.carne, estudiante.nombre)
+            huella = cache.calcular_huella(
+                estudiante.carne, estudiante.nombre, estudiante.historial,
+                excel_writer.VERSION, excel_writer.hojas_seleccionadas, huella_del_plan
+            )
+            if not forzar and cache.esta_actualizado(nombre_archivo, huella):
+                estudiante.omitido = True
+                return estudiante
+
+            ruta_salida = str(self.file_repository.obtener_ruta_salida(nombre_archivo))
+            estudiante.tarea = TareaExcel.desde_historial(
+                estudiante.carne, estudiante.nombre, estudiante.historial, ruta_salida
+            )
+            estudiante.huella = (nombre_archivo, huella)
+            return estudiante
+
+        # Un trabajador por hilo de generación; cada hilo toma uno libre para cada libro
+        trabajadores: queue.Queue = queue.Queue()
+        for _ in range(self.procesos):
+            trabajadores.put(_TrabajadorLote(self.opciones_excel))
+
+        def generar(estudiante: EstudianteEnProceso) -> EstudianteEnProceso:
+            if not estudiante.omitido:
+                trabajador = trabajadores.get()
+                try:
+                    estudiante.resultado = trabajador.generar(estudiante.tarea, self.tiempo_limite)
+                finally:
+                    trabajadores.put(trabajador)
+            return estudiante
+
+        pipeline = (
+            Pipeline(capacidad=2 * self.procesos)
+            .etapa('descarga', descargar, self.descargas)
+            .etapa('analisis', analizar)
+            .etapa('guardado', guardar)
+            .etapa('generacion', generar, self.procesos)
+        )
+
+        try:
+            for estudiante in pipeline.ejecutar(entradas):
+                resumen.estudiantes += 1
+                if estudiante.resultado and estudiante.resultado.metricas:
+                    metricas.combinar(estudiante.resultado.metricas)
+                if estudiante.omitido:
+                    resumen.omitidos.append(estudiante)
+                elif estudiante.resultado.exitoso:
+                    cache.registrar(*estudiante.huella)
+                    resumen.lote.exitosos.append(estudiante.resultado)
+                else:
+                    resumen.lote.fallidos.append(estudiante.resultado)
+                if al_completar:
+                    al_completar(resumen.estudiantes, total, estudiante)
+        finally:
+            cache.guardar()
+            while not trabajadores.empty():
+                trabajadores.get().cerrar()
+
+        # Los estudiantes que fallaron antes de generar su Excel se reportan como fallidos
+        for fallo in pipeline.fallos:
+            estudiante = fallo.elemento
+            resumen.lote.fallidos.append(ResultadoExcel(
+                estudiante.carne, estudiante.nombre, '', False, f'Error en {fallo.etapa}: {fallo.error}'
+            ))
+
+        resumen.tiempos = dict(pipeline.tiempos)
+        resumen.lote.duracion = time.perf_counter() - inicio
+        return resumen
@@ -0,0 +1,278 @@
+"""
+Servicio para vigilar el portapapeles y generar al instante el Excel de cada estudiante copiado
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Set
+
+from .excel_batch_service import (
+    ResultadoExcel, _calentar_trabajador, _generar_excel_trabajador, _inicializar_trabajador
+)
+from .generacion_excel_service import GeneracionExcelService
+from .memory_reader_service import MemoryReaderService
+from ...shared.instrumentacion import metricas
+
+
+INTERVALO_MINIMO = 0.1  # Segundos entre lecturas justo después de un cambio
+INTERVALO_MAXIMO = 0.5  # Segundos entre lecturas cuando el portapapeles no cambia
+
+
+class VigilantePortapapeles:
+    """
+    Lee el portapapeles periódicamente y entrega cada texto distinto una sola vez.
+
+    El intervalo entre lecturas crece mientras el portapapeles no cambia y vuelve al
+    mínimo con cada texto nuevo, de modo que los pegados seguidos se atienden rápido
+    sin leer el portapapeles sin pausa. Los textos se reconocen por su huella SHA-1,
+    así que volver a copiar un estudiante ya procesado no lo procesa otra vez.
+    """
+
+    def __init__(self, leer: Callable[[], str], intervalo: float = INTERVALO_MINIMO,
+                 intervalo_maximo: float = INTERVALO_MAXIMO):
+        """
+        Inicializa el vigilante.
+
+        Args:
+            leer: Función que retorna el texto del portapapeles (por ejemplo pyperclip.paste)
+            intervalo: Segundos entre lecturas después de un cambio
+            intervalo_maximo: Segundos máximos entre lecturas
+        """
+        self.leer = leer
+        self.intervalo = intervalo
+        self.intervalo_maximo = intervalo_maximo
+        self._ultimo = ''
+        self._vistos: Set[bytes] = set()
+
+    def revisar(self) -> Optional[str]:
+        """
+        Lee el portapapeles una vez.
+
+        Returns:
+            El texto si no se había visto antes, o None
+        """
+        texto = self.leer() or ''
+        if texto == self._ultimo:
+            return None
+        self._ultimo = texto
+
+        huella = hashlib.sha1(texto.encode('utf-8', 'surrogatepass')).digest()
+        if not texto.strip() or huella in self._vistos:
+            return None
+        self._vistos.add(huella)
+        return texto
+
+    def textos(self, detener: Optional[threading.Event] = None,
+               al_esperar: Optional[Callable[[], None]] = None) -> Iterator[str]:
+        """
+        Entrega los textos nuevos conforme aparecen, hasta que se active detener.
+
+        Args:
+            detener: Evento para terminar la vigilancia (None para vigilar sin fin)
+            al_esperar: Función llamada en cada lectura sin texto nuevo, por ejemplo
+                        para mostrar los Excel que terminaron mientras tanto
+        """
+        detener = detener or threading.Event()
+        espera = self.intervalo
+        while not detener.is_set():
+            texto = self.revisar()
+            if texto is not None:
+                espera = self.intervalo
+                yield texto
+                continue
+            if al_esperar:
+                al_esperar()
+            detener.wait(espera)
+            espera = min(espera * 1.5, self.intervalo_maximo)
+
+
+@dataclass
+class Pegado:
+    """Estudiante copiado al portapapeles y el Excel que se generó con él."""
+    tipo: str  # 'exp' para expediente, 'pre' para prematrícula
+    carne: str
+    nombre: str
+    enviado: bool = False  # El Excel se envió al trabajador (ver PortapapelesService.terminados)
+    actualizado: bool = False  # El Excel ya existía con las mismas entradas
+    resultado: Optional[ResultadoExcel] = None  # None si no se generó un Excel
+    error: str = ''
+    duracion: float = 0.0  # Segundos desde que se leyó el texto hasta tener el Excel
+
+
+class GeneradorEnCaliente:
+    """
+    Genera el Excel de un estudiante a la vez en un proceso trabajador que se mantiene
+    abierto y calentado, con los módulos cargados y el índice del plan compilado.
+
+    Los libros se generan en el orden en que se envían; mientras el trabajador escribe
+    uno, el proceso principal sigue leyendo el portapapeles. Se usa como administrador
+    de contexto para cerrar el trabajador al terminar.
+    """
+
+    def __init__(self, file_repository, perfil: str = 'completo', modo_streaming: bool = False):
+        """
+        Inicializa el generador sin iniciar el trabajador.
+
+        Args:
+            file_repository: Repositorio donde se guardan los estudiantes copiados
+            perfil: Perfil de hojas de ExcelWriter a generar
+            modo_streaming: Si es True, los libros se escriben con memoria constante
+        """
+        self.servicio = GeneracionExcelService(file_repository, 1, modo_streaming=modo_streaming)
+        self.perfil = perfil
+        self.opciones_excel = {'modo_streaming': modo_streaming, 'perfil': perfil}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._calentamiento: Optional[Future] = None
+
+    def iniciar(self) -> 'GeneradorEnCaliente':
+        """Inicia y calienta el trabajador sin esperar a que termine de calentarse."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=1, initializer=_inicializar_trabajador, initargs=(metricas.memoria is not None,)
+        )
+        self._calentamiento = self._pool.submit(_calentar_trabajador, self.opciones_excel)
+        return self
+
+    def esperar_calentamiento(self) -> float:
+        """Espera a que el trabajador esté listo y retorna los segundos que tomó."""
+        return self._calentamiento.result()
+
+    def cerrar(self) -> None:
+        """Cierra el trabajador, cancelando los libros pendientes."""
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> 'GeneradorEnCaliente':
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    def enviar(self, pegado: Pegado, forzar: bool = False) -> Optional[Future]:
+        """
+        Envía al trabajador el Excel de un estudiante ya guardado en el repositorio.
+        El tiempo de preparación y generación se suma a pegado.duracion.
+
+        Args:
+            pegado: Estudiante copiado
+            forzar: Si es True, se genera aunque el Excel esté actualizado
+
+        Returns:
+            Future con el mismo pegado, completado con su resultado; None si el Excel
+            está actualizado o no se pudo leer el expediente (ver pegado.actualizado y
+            pegado.error)
+        """
+        inicio = time.perf_counter()
+        plan = self.servicio.preparar([f'{pegado.carne}.edf'], self.perfil, forzar)
+        if plan.errores:
+            pegado.error = plan.errores[0][2]
+            return None
+        if plan.omitidos:
+            pegado.actualizado = True
+            return None
+
+        tarea = plan.tareas[0]
+        archivo, huella = plan.huellas[tarea.ruta_salida]
+        try:
+            futuro_excel = self._pool.submit(_generar_excel_trabajador, tarea, self.opciones_excel)
+        except BrokenProcessPool:
+            self.cerrar()
+            self.iniciar()
+            futuro_excel = self._pool.submit(_generar_excel_trabajador, tarea, self.opciones_excel)
+
+        pegado.enviado = True
+        futuro: Future = Future()
+
+        def completar(terminado: Future) -> None:
+            try:
+                pegado.resultado = terminado.result()
+                if pegado.resultado.exitoso:
+                    self._registrar(archivo, huella)
+                else:
+                    pegado.error = pegado.resultado.error
+            except Exception as e:  # El trabajador murió, se canceló la tarea o falló la caché
+                pegado.error = str(e) or type(e).__name__
+            finally:
+                pegado.duracion += time.perf_counter() - inicio
+                futuro.set_result(pegado)
+
+        futuro_excel.add_done_callback(completar)
+        return futuro
+
+    def _registrar(self, archivo: str, huella: str) -> None:
+        """Registra el libro generado en la caché de construcción."""
+        from ...infrastructure.repositories.build_cache_repository import BuildCacheRepository
+
+        cache = BuildCacheRepository(self.servicio.file_repository.directorio_salida)
+        cache.registrar(archivo, huella)
+        cache.guardar()
+
+
+class PortapapelesService:
+    """
+    Servicio que guarda cada expediente o prematrícula copiado al portapapeles y genera
+    de inmediato el Excel del estudiante en un GeneradorEnCaliente.
+    """
+
+    def __init__(self, memory_reader: MemoryReaderService, generador: GeneradorEnCaliente):
+        """
+        Inicializa el servicio.
+
+        Args:
+            memory_reader: Servicio que interpreta y guarda los textos copiados
+            generador: Generador iniciado donde se producen los Excel
+        """
+        self.memory_reader = memory_reader
+        self.generador = generador
+        self._pendientes: List[Future] = []
+
+    def procesar(self, texto: str) -> Optional[Pegado]:
+        """
+        Guarda un texto copiado y envía su Excel al trabajador.
+
+        El Excel se omite si ya está actualizado; para una prematrícula, también si el
+        estudiante no tiene un expediente guardado.
+
+        Args:
+            texto: Texto copiado
+
+        Returns:
+            El pegado, o None si el texto no es un expediente ni una prematrícula
+        """
+        inicio = time.perf_counter()
+        with metricas.medir('portapapeles.guardar'):
+            procesado = self.memory_reader.procesar_contenido(texto)
+        if procesado is None:
+            return None
+
+        pegado = Pegado(*procesado)
+        pegado.duracion = time.perf_counter() - inicio
+        if pegado.tipo == 'pre' and not self._tiene_expediente(pegado.carne):
+            return pegado
+
+        futuro = self.generador.enviar(pegado)
+        if futuro is not None:
+            self._pendientes.append(futuro)
+        return pegado
+
+    def terminados(self, esperar: bool = False) -> List[Pegado]:
+        """
+        Retira los pegados cuyo Excel ya se generó, en el orden en que se enviaron.
+
+        Args:
+            esperar: Si es True, espera a que terminen todos los pendientes
+        """
+        listos: List[Pegado] = []
+        while self._pendientes and (esperar or self._pendientes[0].done()):
+            pegado = self._pendientes.pop(0).result()
+            if pegado.resultado and pegado.resultado.metricas:
+                metricas.combinar(pegado.resultado.metricas)
+            listos.append(pegado)
+        return listos
+
+    def _tiene_expediente(self, carne: str) -> bool:
+        """Indica si el estudiante ya tiene un expediente guardado."""
+        return (self.memory_reader.file_repo.directorio_expedientes / f'{carne}.edf').exists()
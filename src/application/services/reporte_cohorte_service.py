@@ -0,0 +1,74 @@
+"""
+Servicio para generar el resumen de una cohorte en un solo libro de Excel
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .expediente_service import ExpedienteService
+from ...domain.entities.analisis_expediente import AnalisisExpediente
+from ...domain.entities.cohorte import EstadisticasCohorte, FilaCohorte
+
+
+@dataclass
+class ResumenCohorte:
+    """Resultado de la generación del reporte de una cohorte."""
+    ruta_salida: str
+    estudiantes: int = 0
+    errores: List[Tuple[str, str]] = field(default_factory=list)
+    duracion: float = 0.0
+
+
+class ReporteCohorteService:
+    """
+    Servicio que recorre una sola vez a los estudiantes de una cohorte y escribe
+    un libro con una fila por estudiante y las estadísticas por curso.
+    """
+
+    def generar(
+        self,
+        estudiantes: Iterable[Tuple[str, str, List[Dict[str, str]]]],
+        ruta_salida: str,
+        al_procesar: Optional[Callable[[int, FilaCohorte], None]] = None
+    ) -> ResumenCohorte:
+        """
+        Genera el reporte de la cohorte.
+
+        Los estudiantes se consumen uno a uno, por lo que puede recibir un generador
+        (por ejemplo FileRepository.iterar_expedientes) sin cargar toda la cohorte.
+
+        Args:
+            estudiantes: Tuplas (carné, nombre, historial) de cada estudiante
+            ruta_salida: Ruta del archivo Excel a generar
+            al_procesar: Función llamada con (número procesado, fila) por cada estudiante
+
+        Returns:
+            Resumen con la cantidad de estudiantes y los errores encontrados
+        """
+        from ...infrastructure.adapters.cohorte_excel_writer import CohorteExcelWriter
+
+        inicio = time.perf_counter()
+        resumen = ResumenCohorte(ruta_salida)
+        estadisticas = EstadisticasCohorte()
+        writer = CohorteExcelWriter(ruta_salida)
+
+        try:
+            for carne, nombre, historial in estudiantes:
+                try:
+                    expediente = ExpedienteService.procesar_expediente_estudiante(carne, nombre, historial)
+                    analisis = AnalisisExpediente(expediente)
+                    fila = FilaCohorte.desde_analisis(analisis)
+                except Exception as e:
+                    resumen.errores.append((carne, str(e)))
+                    continue
+
+                writer.agregar_estudiante(fila)
+                estadisticas.agregar(analisis)
+                resumen.estudiantes += 1
+                if al_procesar:
+                    al_procesar(resumen.estudiantes, fila)
+        finally:
+            writer.cerrar(estadisticas.cursos())
+
+        resumen.duracion = time.perf_counter() - inicio
+        return resumen
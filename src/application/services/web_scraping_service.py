@@ -2,28 +2,36 @@
 Servicio para el web scraping del sistema de matrícula
 """
 import re
-import requests
-from typing import List, Optional, Tuple, Dict
+from typing import TYPE_CHECKING, List, Optional, Tuple, Dict
 from termcolor import cprint
 
 from ...shared.config.settings import app_config
-from ...infrastructure.adapters.http_adapter import HttpAdapter
+from ...shared.instrumentacion import medido, metricas
 from ...infrastructure.adapters.html_parser import StudentParser, MainListingParser
 
+if TYPE_CHECKING:
+    from ...infrastructure.adapters.http_adapter import HttpAdapter
+
 
 class WebScrapingService:
     """
     Servicio que maneja el web scraping del sistema de matrícula de la UCR.
     """
 
-    def __init__(self, http_adapter: Optional[HttpAdapter] = None):
+    ENCABEZADOS_HISTORIAL = ['SIGLA', 'CURSO', 'CREDITOS', 'GRUPO', 'SEM', 'AÑO', 'ESTADO', 'NOTA']
+
+    def __init__(self, http_adapter: Optional['HttpAdapter'] = None):
         """
         Inicializa el servicio de web scraping.
         
         Args:
             http_adapter: Adaptador HTTP personalizado
         """
-        self.http_adapter = http_adapter or HttpAdapter()
+        if http_adapter is None:
+            # requests y ssl tardan en cargarse; solo se importan al crear el servicio
+            from ...infrastructure.adapters.http_adapter import HttpAdapter
+            http_adapter = HttpAdapter()
+        self.http_adapter = http_adapter
         self.urls = app_config.urls
 
     def autenticar_usuario(self, usuario: str, clave: str) -> bool:
@@ -52,9 +60,10 @@ class WebScrapingService:
         if not self._validar_acceso_listado(response):
             raise ValueError("No se pudo acceder al listado de estudiantes")
 
-        parser = MainListingParser()
-        parser.feed(response)
-        return parser.get_lista()
+        with metricas.medir('parseo.listado'):
+            parser = MainListingParser()
+            parser.feed(response)
+            return parser.get_lista()
 
     def descargar_expediente_estudiante(self, clave_estudiante: str) -> str:
         """
@@ -69,6 +78,7 @@ class WebScrapingService:
         url_expediente = self.urls.notas.format(clave_estudiante)
         return self.http_adapter.obtener_contenido(url_expediente)
 
+    @medido('parseo.expediente')
     def procesar_expediente_estudiante(self, contenido_html: str) -> List[Dict[str, str]]:
         """
         Procesa el contenido HTML del expediente y extrae la información.
@@ -95,16 +105,8 @@ class WebScrapingService:
             True si el proceso fue exitoso, False en caso contrario
         """
         try:
-            # Autenticar usuario
-            if not self.autenticar_usuario(usuario, clave):
-                self._mostrar_error_credenciales()
-                return False
-
-            # Obtener listado de estudiantes
-            estudiantes = self.obtener_listado_estudiantes()
-            
-            if not estudiantes:
-                cprint('No se encontraron estudiantes asignados.', 'yellow', 'on_red')
+            estudiantes = self.obtener_estudiantes_asignados(usuario, clave)
+            if estudiantes is None:
                 return False
 
             # Procesar cada estudiante
@@ -122,6 +124,46 @@ class WebScrapingService:
             cprint(f'Error durante el proceso de descarga: {str(e)}', 'white', 'on_red', attrs=['bold'])
             return False
 
+    def obtener_estudiantes_asignados(self, usuario: str, clave: str) -> Optional[List[Tuple[str, ...]]]:
+        """
+        Autentica al usuario y obtiene el listado de estudiantes asignados.
+        
+        Args:
+            usuario: Nombre de usuario
+            clave: Contraseña del usuario
+        
+        Returns:
+            Listado de estudiantes, o None si no se pudo autenticar o no hay estudiantes
+        """
+        if not self.autenticar_usuario(usuario, clave):
+            self._mostrar_error_credenciales()
+            return None
+
+        estudiantes = self.obtener_listado_estudiantes()
+        
+        if not estudiantes:
+            cprint('No se encontraron estudiantes asignados.', 'yellow', 'on_red')
+            return None
+
+        return estudiantes
+
+    def guardar_expediente_estudiante(self, carne: str, nombre: str, datos_cursos: List[Dict[str, str]],
+                                      file_repo=None) -> None:
+        """
+        Guarda el historial y la información de un estudiante en el repositorio de archivos.
+        
+        Args:
+            carne: Carné del estudiante
+            nombre: Nombre del estudiante
+            datos_cursos: Historial académico extraído del expediente
+            file_repo: Repositorio donde se guarda (None para el del directorio actual)
+        """
+        from ...infrastructure.repositories.file_repository import FileRepository
+        
+        file_repo = file_repo or FileRepository()
+        file_repo.escribir_historial(carne, self.ENCABEZADOS_HISTORIAL, datos_cursos)
+        file_repo.escribir_informacion_estudiante(carne, carne, nombre)
+
     def _procesar_estudiante_individual(self, estudiante_data: List[str]) -> None:
         """
         Procesa un estudiante individual descargando y guardando su expediente.
@@ -149,12 +191,7 @@ class WebScrapingService:
         datos_cursos = self.procesar_expediente_estudiante(contenido_expediente)
         
         # Guardar datos usando el repositorio
-        from ...infrastructure.repositories.file_repository import FileRepository
-        
-        file_repo = FileRepository()
-        encabezados = ['SIGLA', 'CURSO', 'CREDITOS', 'GRUPO', 'SEM', 'AÑO', 'ESTADO', 'NOTA']
-        file_repo.escribir_historial(carne, encabezados, datos_cursos)
-        file_repo.escribir_informacion_estudiante(carne, carne, nombre)
+        self.guardar_expediente_estudiante(carne, nombre, datos_cursos)
 
     def _validar_acceso_listado(self, contenido: str) -> bool:
         """
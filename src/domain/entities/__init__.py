@@ -7,6 +7,8 @@ from .expediente import Expediente
 from .historial import Historial
 from .semestre import Semestre
 from .enums import EstadoCurso, EstadoRequisito
+from .analisis_expediente import AnalisisExpediente
+from .cohorte import EstadisticaCurso, EstadisticasCohorte, FilaCohorte
 
 __all__ = [
     'Curso',
@@ -15,5 +17,9 @@ __all__ = [
     'Historial',
     'Semestre',
     'EstadoCurso',
-    'EstadoRequisito'
+    'EstadoRequisito',
+    'AnalisisExpediente',
+    'EstadisticaCurso',
+    'EstadisticasCohorte',
+    'FilaCohorte'
 ]
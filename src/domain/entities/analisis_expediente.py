@@ -0,0 +1,237 @@
+"""
+Datos derivados de un expediente, calculados solo cuando se necesitan
+"""
+from functools import cached_property
+from typing import Any, Dict, List, Set, Tuple
+
+from .curso_carrera import CursoCarrera
+from .enums import EstadoCurso
+from .expediente import Expediente
+from .historial import Historial
+
+
+class AnalisisExpediente:
+    """
+    Agrupa los datos derivados de un expediente que usan los reportes.
+
+    Cada dato se calcula la primera vez que se consulta y se reutiliza después,
+    de modo que un reporte que no lo necesita no paga su costo.
+    """
+
+    def __init__(self, expediente: Expediente):
+        """
+        Inicializa el análisis del expediente.
+
+        Args:
+            expediente: Expediente del estudiante
+        """
+        self.expediente = expediente
+
+    @cached_property
+    def creditos_plan(self) -> int:
+        """Total de créditos de los cursos del plan."""
+        return sum(
+            curso.creditos for semestre in self.expediente.semestres.values()
+            for curso in semestre.cursos
+        )
+
+    @cached_property
+    def creditos_aprobados(self) -> int:
+        """Créditos de los cursos del plan que están aprobados."""
+        return sum(
+            curso.creditos for semestre in self.expediente.semestres.values()
+            for curso in semestre.cursos if curso.esta_aprobado()
+        )
+
+    @cached_property
+    def semestres_completos(self) -> List[int]:
+        """Números de los semestres del plan con todos sus cursos aprobados."""
+        return [
+            numero for numero in sorted(self.expediente.semestres.keys())
+            if all(curso.esta_aprobado() for curso in self.expediente.semestres[numero].cursos)
+        ]
+
+    @cached_property
+    def siglas_aprobadas(self) -> Set[str]:
+        """Siglas de los cursos del plan que están aprobados."""
+        return {
+            curso.sigla
+            for semestre in self.expediente.semestres.values()
+            for curso in semestre.cursos
+            if curso.esta_aprobado()
+        }
+
+    @cached_property
+    def siglas_matriculadas(self) -> Set[str]:
+        """Siglas de los cursos del plan que no están aprobados y tienen matrícula."""
+        return {
+            curso.sigla
+            for semestre in self.expediente.semestres.values()
+            for curso in semestre.cursos
+            if not curso.esta_aprobado() and any(h.estado == 'MATRICULADO' for h in curso.historial)
+        }
+
+    @cached_property
+    def siglas_en_matricula(self) -> Set[str]:
+        """Siglas de los cursos del plan con algún registro matriculado."""
+        return {
+            curso.sigla
+            for semestre in self.expediente.semestres.values()
+            for curso in semestre.cursos
+            if any(h.estado == 'MATRICULADO' for h in curso.historial)
+        }
+
+    @cached_property
+    def cursos_pendientes(self) -> List[Tuple[int, CursoCarrera]]:
+        """
+        Cursos del plan sin aprobar y sin matrícula, con su número de semestre,
+        en el orden del plan.
+        """
+        return [
+            (numero_semestre, curso)
+            for numero_semestre in sorted(self.expediente.semestres.keys())
+            for curso in self.expediente.semestres[numero_semestre].cursos
+            if not curso.esta_aprobado() and not any(h.estado == 'MATRICULADO' for h in curso.historial)
+        ]
+
+    @cached_property
+    def siglas_elegibles(self) -> Set[str]:
+        """
+        Siglas de los cursos pendientes que el estudiante puede matricular: todos
+        sus requisitos están aprobados y cada correquisito está aprobado o matriculado.
+        """
+        return {
+            curso.sigla
+            for _, curso in self.cursos_pendientes
+            if all(req in self.siglas_aprobadas for req in curso.requisitos)
+            and all(
+                correq in self.siglas_aprobadas or correq in self.siglas_en_matricula
+                for correq in curso.correquisitos
+            )
+        }
+
+    @cached_property
+    def reprobaciones_por_sigla(self) -> Dict[str, int]:
+        """Cantidad de registros reprobados de cada curso del plan que tiene alguno."""
+        reprobaciones = {}
+        for semestre in self.expediente.semestres.values():
+            for curso in semestre.cursos:
+                cantidad = sum(1 for h in curso.historial if h.estado == 'REPROBADO')
+                if cantidad:
+                    reprobaciones[curso.sigla] = cantidad
+        return reprobaciones
+
+    @cached_property
+    def historial_completo(self) -> List[Dict[str, Any]]:
+        """
+        Todos los registros del historial en orden cronológico. Los cursos sin
+        historial aparecen una vez con los datos del curso.
+        """
+        todo_historial = []
+
+        for numero_semestre in sorted(self.expediente.semestres.keys()):
+            semestre = self.expediente.semestres[numero_semestre]
+            for curso in semestre.cursos:
+                if curso.historial:
+                    for registro in curso.historial:
+                        todo_historial.append({
+                            'sigla': registro.sigla,
+                            'nombre': registro.nombre,
+                            'creditos': curso.creditos,
+                            'grupo': registro.grupo,
+                            'periodo': registro.periodo,
+                            'anno': registro.anno,
+                            'estado': registro.estado,
+                            'nota': registro.nota or '',
+                            'semestre_plan': numero_semestre
+                        })
+                else:
+                    todo_historial.append({
+                        'sigla': curso.sigla,
+                        'nombre': curso.nombre,
+                        'creditos': curso.creditos,
+                        'grupo': '',
+                        'periodo': '',
+                        'anno': '',
+                        'estado': curso.get_estado_actual(),
+                        'nota': curso.get_nota_actual(),
+                        'semestre_plan': numero_semestre
+                    })
+
+        # Ordenar por año, período, sigla
+        todo_historial.sort(key=lambda x: (x['anno'] or 0, x['periodo'] or 0, x['sigla']))
+        return todo_historial
+
+    @cached_property
+    def periodos(self) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Totales de cursos y créditos por período lectivo ('AÑO-PERÍODO'),
+        ordenados cronológicamente.
+        """
+        periodos_cronologicos = {}
+
+        for semestre in self.expediente.semestres.values():
+            for curso in semestre.cursos:
+                for registro in curso.historial:
+                    if not (registro.anno and registro.periodo):
+                        continue
+
+                    periodo_key = f"{registro.anno}-{registro.periodo}"
+                    if periodo_key not in periodos_cronologicos:
+                        periodos_cronologicos[periodo_key] = {
+                            'año': registro.anno,
+                            'periodo': registro.periodo,
+                            'cursos_matriculados': 0,
+                            'cursos_aprobados': 0,
+                            'cursos_reprobados': 0,
+                            'cursos_en_matricula': 0,
+                            'cursos_retiro': 0,
+                            'creditos_matriculados': 0,
+                            'creditos_aprobados': 0,
+                            'creditos_reprobados': 0,
+                            'creditos_en_matricula': 0,
+                            'creditos_retiro': 0
+                        }
+
+                    periodo = periodos_cronologicos[periodo_key]
+                    periodo['cursos_matriculados'] += 1
+                    periodo['creditos_matriculados'] += curso.creditos
+
+                    if EstadoCurso.es_aprobado(registro.estado):
+                        periodo['cursos_aprobados'] += 1
+                        periodo['creditos_aprobados'] += curso.creditos
+                    elif registro.estado == 'REPROBADO':
+                        periodo['cursos_reprobados'] += 1
+                        periodo['creditos_reprobados'] += curso.creditos
+                    elif registro.estado == 'MATRICULADO':
+                        periodo['cursos_en_matricula'] += 1
+                        periodo['creditos_en_matricula'] += curso.creditos
+                    elif 'RETIRO' in registro.estado:
+                        periodo['cursos_retiro'] += 1
+                        periodo['creditos_retiro'] += curso.creditos
+
+        return sorted(periodos_cronologicos.items(), key=lambda x: (x[1]['año'], x[1]['periodo']))
+
+    @cached_property
+    def cursos_problema(self) -> Dict[str, Dict[str, Any]]:
+        """Cursos con registros reprobados o retirados, por sigla, con esos registros."""
+        cursos_problema = {}
+
+        for semestre in self.expediente.semestres.values():
+            for curso in semestre.cursos:
+                registros_problema: List[Historial] = [
+                    h for h in curso.historial
+                    if h.estado in ['REPROBADO', 'RETIRO', 'RETIRO DE MATRÍCULA']
+                ]
+                if not registros_problema:
+                    continue
+
+                if curso.sigla not in cursos_problema:
+                    cursos_problema[curso.sigla] = {
+                        'nombre': curso.nombre,
+                        'creditos': curso.creditos,
+                        'registros': []
+                    }
+                cursos_problema[curso.sigla]['registros'].extend(registros_problema)
+
+        return cursos_problema
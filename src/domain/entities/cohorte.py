@@ -0,0 +1,126 @@
+"""
+Resumen de una cohorte de estudiantes
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .analisis_expediente import AnalisisExpediente
+
+
+@dataclass
+class FilaCohorte:
+    """
+    Indicadores de un estudiante dentro del resumen de la cohorte.
+    """
+    carne: str
+    nombre: str
+    creditos_aprobados: int
+    creditos_plan: int
+    semestres_completos: int
+    semestre_actual: int  # Primer semestre del plan con cursos sin aprobar (0 si completó el plan)
+    cursos_elegibles: int
+    cursos_reprobados_3_mas: int
+    cursos_matriculados: int
+
+    @property
+    def avance(self) -> float:
+        """Porcentaje de créditos del plan aprobados."""
+        return (self.creditos_aprobados / self.creditos_plan * 100) if self.creditos_plan > 0 else 0
+
+    @classmethod
+    def desde_analisis(cls, analisis: AnalisisExpediente) -> 'FilaCohorte':
+        """
+        Crea la fila de un estudiante a partir del análisis de su expediente.
+
+        Args:
+            analisis: Análisis del expediente del estudiante
+
+        Returns:
+            Fila con los indicadores del estudiante
+        """
+        expediente = analisis.expediente
+        completos = set(analisis.semestres_completos)
+        semestre_actual = next(
+            (numero for numero in sorted(expediente.semestres.keys()) if numero not in completos), 0
+        )
+        return cls(
+            carne=expediente.carne,
+            nombre=expediente.nombre,
+            creditos_aprobados=analisis.creditos_aprobados,
+            creditos_plan=analisis.creditos_plan,
+            semestres_completos=len(completos),
+            semestre_actual=semestre_actual,
+            cursos_elegibles=len(analisis.siglas_elegibles),
+            cursos_reprobados_3_mas=sum(
+                1 for cantidad in analisis.reprobaciones_por_sigla.values() if cantidad >= 3
+            ),
+            cursos_matriculados=len(analisis.siglas_matriculadas)
+        )
+
+
+@dataclass
+class EstadisticaCurso:
+    """
+    Totales de la cohorte para un curso del plan.
+    """
+    sigla: str
+    nombre: str
+    semestre: int
+    aprobados: int = 0
+    matriculados: int = 0
+    pendientes: int = 0
+    estudiantes_reprobados: int = 0
+    reprobaciones: int = 0
+    estudiantes_3_mas: int = 0
+
+    @property
+    def porcentaje_aprobacion(self) -> float:
+        """Porcentaje de estudiantes de la cohorte que aprobaron el curso."""
+        total = self.aprobados + self.matriculados + self.pendientes
+        return (self.aprobados / total * 100) if total > 0 else 0
+
+
+class EstadisticasCohorte:
+    """
+    Acumula las estadísticas por curso conforme se agregan estudiantes.
+    """
+
+    def __init__(self):
+        """Inicializa las estadísticas sin estudiantes."""
+        self.estudiantes = 0
+        self._cursos: Dict[str, EstadisticaCurso] = {}
+
+    def agregar(self, analisis: AnalisisExpediente) -> None:
+        """
+        Suma a las estadísticas los cursos del expediente de un estudiante.
+
+        Args:
+            analisis: Análisis del expediente del estudiante
+        """
+        self.estudiantes += 1
+        reprobaciones = analisis.reprobaciones_por_sigla
+
+        for numero_semestre, semestre in analisis.expediente.semestres.items():
+            for curso in semestre.cursos:
+                estadistica = self._cursos.get(curso.sigla)
+                if estadistica is None:
+                    estadistica = EstadisticaCurso(curso.sigla, curso.nombre, numero_semestre)
+                    self._cursos[curso.sigla] = estadistica
+
+                if curso.sigla in analisis.siglas_aprobadas:
+                    estadistica.aprobados += 1
+                elif curso.sigla in analisis.siglas_matriculadas:
+                    estadistica.matriculados += 1
+                else:
+                    estadistica.pendientes += 1
+
+                cantidad = reprobaciones.get(curso.sigla, 0)
+                if cantidad:
+                    estadistica.estudiantes_reprobados += 1
+                    estadistica.reprobaciones += cantidad
+                    if cantidad >= 3:
+                        estadistica.estudiantes_3_mas += 1
+
+    def cursos(self) -> List[EstadisticaCurso]:
+        """Estadísticas de cada curso, ordenadas por semestre del plan y sigla."""
+        return sorted(self._cursos.values(), key=lambda c: (c.semestre, c.sigla))
@@ -26,6 +26,29 @@ class EstadoCurso(Enum):
         """Verifica si un estado en string corresponde a un curso aprobado."""
         return estado in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']
 
+    @classmethod
+    def codigo(cls, estado: str) -> int:
+        """
+        Convierte un estado en string a su código entero.
+
+        Los estados desconocidos o que no son texto se consideran SIN_DATOS y
+        cualquier variante de retiro (por ejemplo 'RETIRO DE MATRÍCULA') se
+        considera RETIRADO.
+        """
+        codigo = _CODIGOS_ESTADO.get(estado) if isinstance(estado, str) else cls.SIN_DATOS.value
+        if codigo is None:
+            codigo = cls.RETIRADO.value if 'RETIRO' in estado else cls.SIN_DATOS.value
+        return codigo
+
+
+# Códigos de los estados que escribe el sistema de matrícula
+_CODIGOS_ESTADO = {estado.name: estado.value for estado in EstadoCurso}
+_CODIGOS_ESTADO.update({
+    '': EstadoCurso.SIN_DATOS.value,
+    'RETIRO': EstadoCurso.RETIRADO.value,
+    'RETIRO DE MATRÍCULA': EstadoCurso.RETIRADO.value,
+})
+
 
 class EstadoRequisito(Enum):
     """
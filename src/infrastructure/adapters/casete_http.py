@@ -0,0 +1,197 @@
+"""
+Grabación y reproducción de las sesiones HTTP con el sistema de matrícula
+"""
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .http_adapter import HttpAdapter
+from ...shared.instrumentacion import medido, metricas
+
+
+VERSION_CASETE = 1
+VALOR_OCULTO = '***'
+
+
+@dataclass
+class Interaccion:
+    """Una solicitud grabada con su respuesta."""
+    metodo: str  # 'login' o 'get'
+    url: str
+    exitoso: bool
+    contenido: str = ''  # Texto de la respuesta, o el mensaje de error si no fue exitosa
+    duracion: float = 0.0  # Segundos que tardó la respuesta original
+    inicio: float = 0.0  # Segundos desde el inicio de la grabación
+    datos: Optional[Dict[str, str]] = None  # Campos del login, con los valores ocultos
+
+
+def _ruta_solicitud(url: str) -> str:
+    """Ruta y consulta de una URL; el casete no depende del servidor donde se grabó."""
+    partes = urlsplit(url)
+    return f'{partes.path}?{partes.query}' if partes.query else partes.path
+
+
+class Casete:
+    """
+    Archivo comprimido con las interacciones de una sesión, en el orden en que terminaron.
+    """
+
+    def __init__(self, interacciones: Optional[List[Interaccion]] = None):
+        """
+        Inicializa el casete.
+
+        Args:
+            interacciones: Interacciones ya grabadas
+        """
+        self.interacciones: List[Interaccion] = interacciones or []
+
+    @classmethod
+    def cargar(cls, ruta: Union[str, Path]) -> 'Casete':
+        """
+        Lee un casete guardado con guardar.
+
+        Raises:
+            ValueError: Si el archivo no es un casete de una versión compatible
+        """
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        if datos.get('version') != VERSION_CASETE:
+            raise ValueError(f'Versión de casete no compatible: {datos.get("version")}')
+        return cls([Interaccion(**interaccion) for interaccion in datos['interacciones']])
+
+    def guardar(self, ruta: Union[str, Path]) -> Path:
+        """Guarda el casete comprimido y retorna su ruta."""
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(ruta, 'wt', encoding='utf-8') as archivo:
+            json.dump({
+                'version': VERSION_CASETE,
+                'creado': datetime.now().isoformat(timespec='seconds'),
+                'interacciones': [asdict(interaccion) for interaccion in self.interacciones],
+            }, archivo, ensure_ascii=False)
+        return ruta
+
+    @property
+    def tiempo_red(self) -> float:
+        """Suma de los segundos de espera de todas las respuestas grabadas."""
+        return sum(interaccion.duracion for interaccion in self.interacciones)
+
+    @property
+    def bytes(self) -> int:
+        """Tamaño total de las respuestas grabadas."""
+        return sum(len(interaccion.contenido.encode('utf-8')) for interaccion in self.interacciones)
+
+
+class HttpAdapterGrabador(HttpAdapter):
+    """
+    Adaptador que usa el sistema de matrícula y graba cada solicitud en un casete.
+
+    Los valores enviados al login se reemplazan por VALOR_OCULTO y no se graban las
+    cookies de la sesión.
+    """
+
+    def __init__(self):
+        """Inicializa el adaptador con un casete vacío."""
+        super().__init__()
+        self.casete = Casete()
+        self._inicio = time.perf_counter()
+        self._candado = threading.Lock()
+
+    def autenticar(self, url_login: str, datos_login: Dict[str, str]) -> bool:
+        """Autentica al usuario y graba el resultado sin los valores enviados."""
+        inicio = time.perf_counter()
+        exitoso = super().autenticar(url_login, datos_login)
+        self._grabar(Interaccion(
+            'login', url_login, exitoso, duracion=time.perf_counter() - inicio,
+            inicio=inicio - self._inicio, datos={campo: VALOR_OCULTO for campo in datos_login}
+        ))
+        return exitoso
+
+    def obtener_contenido(self, url: str) -> str:
+        """Obtiene el contenido de una URL y graba la respuesta o el error."""
+        inicio = time.perf_counter()
+        try:
+            contenido = super().obtener_contenido(url)
+        except ValueError as e:
+            self._grabar(Interaccion('get', url, False, str(e), time.perf_counter() - inicio, inicio - self._inicio))
+            raise
+        self._grabar(Interaccion('get', url, True, contenido, time.perf_counter() - inicio, inicio - self._inicio))
+        return contenido
+
+    def _grabar(self, interaccion: Interaccion) -> None:
+        """Agrega una interacción al casete; las descargas simultáneas graban desde varios hilos."""
+        with self._candado:
+            self.casete.interacciones.append(interaccion)
+
+
+class HttpAdapterReproductor(HttpAdapter):
+    """
+    Adaptador que responde con las interacciones de un casete sin usar la red.
+
+    Cada solicitud recibe la siguiente respuesta grabada para el mismo método y URL.
+    Con tiempos_originales, cada respuesta espera lo que tardó la original; si no, se
+    responde de inmediato, de modo que la corrida mide solo el tiempo de procesamiento.
+    """
+
+    def __init__(self, casete: Casete, tiempos_originales: bool = True):
+        """
+        Inicializa el adaptador.
+
+        Args:
+            casete: Casete a reproducir
+            tiempos_originales: Si es True, se respeta la duración de cada respuesta grabada
+        """
+        super().__init__()
+        self.tiempos_originales = tiempos_originales
+        self._pendientes: Dict[Tuple[str, str], Deque[Interaccion]] = {}
+        for interaccion in casete.interacciones:
+            clave = (interaccion.metodo, _ruta_solicitud(interaccion.url))
+            self._pendientes.setdefault(clave, deque()).append(interaccion)
+        self._candado = threading.Lock()
+        self._autenticado = False
+
+    @medido('http.autenticar')
+    def autenticar(self, url_login: str, datos_login: Dict[str, str]) -> bool:
+        """Responde con el resultado del login grabado, sin revisar las credenciales."""
+        self._autenticado = self._reproducir('login', url_login).exitoso
+        return self._autenticado
+
+    @medido('http.obtener')
+    def obtener_contenido(self, url: str) -> str:
+        """Responde con el contenido grabado de la URL, o con su error."""
+        if not self._autenticado:
+            raise ValueError("No hay una sesión activa. Debe autenticarse primero.")
+
+        interaccion = self._reproducir('get', url)
+        if not interaccion.exitoso:
+            raise ValueError(interaccion.contenido)
+        metricas.contar('http.bytes', len(interaccion.contenido.encode('utf-8')))
+        return interaccion.contenido
+
+    def cerrar_sesion(self) -> None:
+        """Cierra la sesión simulada."""
+        self._autenticado = False
+
+    def _reproducir(self, metodo: str, url: str) -> Interaccion:
+        """
+        Toma la siguiente interacción grabada de una solicitud y espera su duración.
+
+        Raises:
+            ValueError: Si el casete no tiene más respuestas para la solicitud
+        """
+        with self._candado:
+            pendientes = self._pendientes.get((metodo, _ruta_solicitud(url)))
+            if not pendientes:
+                raise ValueError(f'La solicitud {metodo} {url} no está en el casete')
+            interaccion = pendientes.popleft()
+
+        if self.tiempos_originales and interaccion.duracion > 0:
+            time.sleep(interaccion.duracion)
+        return interaccion
@@ -0,0 +1,114 @@
+"""
+Adaptador para generar el libro de Excel con el resumen de una cohorte
+"""
+from typing import Iterable
+
+from .excel_writer import LibroStreaming, registrar_formatos
+from ...domain.entities.cohorte import EstadisticaCurso, FilaCohorte
+
+
+class CohorteExcelWriter:
+    """
+    Escribe el resumen de una cohorte en un solo libro con memoria constante.
+
+    La hoja de estudiantes se escribe fila por fila conforme llegan los
+    estudiantes; las hojas por curso se escriben al cerrar el libro.
+    """
+
+    HOJA_ESTUDIANTES = 'Estudiantes'
+    HOJA_APROBACION = 'Aprobación por Curso'
+    HOJA_REPROBACION = 'Reprobación por Curso'
+
+    ENCABEZADOS_ESTUDIANTES = [
+        'Carné', 'Nombre', 'Créditos Aprobados', 'Créditos Plan', 'Avance %',
+        'Semestres Completos', 'Semestre Actual', 'Cursos Elegibles',
+        'Cursos 3+ Reprobaciones', 'Cursos Matriculados'
+    ]
+    ENCABEZADOS_APROBACION = [
+        'Sigla', 'Curso', 'Semestre', 'Aprobados', 'Matriculados', 'Pendientes', 'Aprobación %'
+    ]
+    ENCABEZADOS_REPROBACION = [
+        'Sigla', 'Curso', 'Semestre', 'Estudiantes con Reprobación', 'Total Reprobaciones',
+        'Estudiantes con 3+'
+    ]
+
+    def __init__(self, ruta_archivo: str):
+        """
+        Crea el libro y escribe los encabezados de la hoja de estudiantes.
+
+        Args:
+            ruta_archivo: Ruta donde guardar el archivo Excel
+        """
+        self.workbook = LibroStreaming(ruta_archivo)
+        self.formatos = registrar_formatos(self.workbook)
+        self.hoja_estudiantes = self._crear_hoja(
+            self.HOJA_ESTUDIANTES, self.ENCABEZADOS_ESTUDIANTES, [10, 40] + [14] * 8
+        )
+        self.fila = 1
+
+    def _crear_hoja(self, nombre: str, encabezados: list, anchos: list):
+        """Agrega una hoja con su fila de encabezados y el ancho de sus columnas."""
+        worksheet = self.workbook.add_worksheet(nombre)
+        for columna, ancho in enumerate(anchos):
+            worksheet.set_column(columna, columna, ancho)
+        for columna, encabezado in enumerate(encabezados):
+            worksheet.write(0, columna, encabezado, self.formatos['encabezado'])
+        worksheet.freeze_panes(1, 0)
+        return worksheet
+
+    def agregar_estudiante(self, fila: FilaCohorte) -> None:
+        """
+        Escribe la fila de un estudiante en la hoja de estudiantes.
+
+        Args:
+            fila: Datos del estudiante
+        """
+        formato_numero = self.formatos['numero']
+        valores = [
+            fila.creditos_aprobados, fila.creditos_plan, fila.avance / 100,
+            fila.semestres_completos, fila.semestre_actual, fila.cursos_elegibles,
+            fila.cursos_reprobados_3_mas, fila.cursos_matriculados
+        ]
+
+        worksheet = self.hoja_estudiantes
+        worksheet.write(self.fila, 0, fila.carne, self.formatos['texto_centrado'])
+        worksheet.write(self.fila, 1, fila.nombre)
+        for columna, valor in enumerate(valores, 2):
+            formato = self.formatos['porcentaje'] if columna == 4 else formato_numero
+            worksheet.write(self.fila, columna, valor, formato)
+        self.fila += 1
+
+    def cerrar(self, estadisticas: Iterable[EstadisticaCurso]) -> None:
+        """
+        Escribe las hojas por curso y cierra el libro.
+
+        Args:
+            estadisticas: Estadísticas de cada curso del plan, en orden del plan
+        """
+        estadisticas = list(estadisticas)
+        formato = self.formatos['numero']
+
+        aprobacion = self._crear_hoja(
+            self.HOJA_APROBACION, self.ENCABEZADOS_APROBACION, [10, 45, 10, 12, 12, 12, 14]
+        )
+        for fila, curso in enumerate(estadisticas, 1):
+            aprobacion.write(fila, 0, curso.sigla, self.formatos['texto_centrado'])
+            aprobacion.write(fila, 1, curso.nombre)
+            for columna, valor in enumerate([curso.semestre, curso.aprobados, curso.matriculados,
+                                             curso.pendientes], 2):
+                aprobacion.write(fila, columna, valor, formato)
+            aprobacion.write(fila, 6, curso.porcentaje_aprobacion / 100, self.formatos['porcentaje'])
+
+        reprobacion = self._crear_hoja(
+            self.HOJA_REPROBACION, self.ENCABEZADOS_REPROBACION, [10, 45, 10, 16, 16, 16]
+        )
+        for fila, curso in enumerate(
+            sorted(estadisticas, key=lambda c: (-c.reprobaciones, c.semestre, c.sigla)), 1
+        ):
+            reprobacion.write(fila, 0, curso.sigla, self.formatos['texto_centrado'])
+            reprobacion.write(fila, 1, curso.nombre)
+            for columna, valor in enumerate([curso.semestre, curso.estudiantes_reprobados,
+                                             curso.reprobaciones, curso.estudiantes_3_mas], 2):
+                reprobacion.write(fila, columna, valor, formato)
+
+        self.workbook.close()
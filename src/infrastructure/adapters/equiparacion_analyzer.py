@@ -1,17 +1,85 @@
 """
 Analizador de equiparación para el nuevo plan de estudios.
-Analiza expedientes existentes y agrega hoja de equiparación con análisis específico.
+Calcula la equiparación de cada curso a partir del expediente y la escribe en la
+hoja de equiparación, ya sea al generar el libro o sobre un archivo existente.
 """
 
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-import xlsxwriter
+from typing import Dict, List, Set, Tuple, Optional, Any
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from dataclasses import dataclass
+from xlsxwriter.workbook import Workbook
 
+from ...domain.entities.enums import EstadoCurso
 from ...domain.entities.expediente import Expediente
 from ...domain.entities.curso import Curso
+from ...shared.config.tabla_equivalencias import RUTA_EQUIVALENCIAS, obtener_tabla_equivalencias
+from ...shared.instrumentacion import medido, metricas
+
+
+HOJA_EQUIPARACION = 'Equiparación'
+
+# Categorías de color de las celdas de la hoja de equiparación
+APROBADO = 'aprobado'
+PENDIENTE = 'pendiente'
+SIN_EQUIVALENCIA = 'sin_equivalencia'
+EQUIPARADO = 'equiparado'
+
+# Color de relleno de cada categoría
+COLORES_CATEGORIA = {
+    APROBADO: 'C6EFCE',
+    PENDIENTE: 'FFC7CE',
+    SIN_EQUIVALENCIA: 'FFEB9C',
+    EQUIPARADO: 'CCE5FF',  # Azul claro para cursos equiparados
+}
+
+LEYENDA = [
+    ('• Verde claro: Curso aprobado', APROBADO),
+    ('• Verde oscuro: Curso equiparado', EQUIPARADO),
+    ('• Rojo: Curso pendiente o con nota insuficiente', PENDIENTE),
+    ('• Amarillo: Sin equivalencia en el nuevo plan', SIN_EQUIVALENCIA),
+]
+
+ANCHOS_COLUMNAS = [12, 45, 10, 15, 12, 45, 10, 15]
+
+# Cursos extraídos de archivos ya leídos, por huella del contenido del archivo
+MAX_CURSOS_EN_CACHE = 128
+_CURSOS_POR_HUELLA: 'OrderedDict[str, Dict[str, Dict[str, Any]]]' = OrderedDict()
+# Archivos que ya tienen su hoja de equiparación, por (huella del archivo, huella de la tabla)
+_HUELLAS_ANALIZADAS: 'OrderedDict[Tuple[str, str], None]' = OrderedDict()
+
+
+def _huella_archivo(ruta_archivo: str) -> str:
+    """Calcula la huella SHA-256 del contenido de un archivo."""
+    huella = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 16), b''):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+
+def _copiar_cursos(cursos: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Copia el diccionario de cursos para que la caché no se modifique desde afuera."""
+    return {sigla: dict(curso) for sigla, curso in cursos.items()}
+
+
+@dataclass
+class FilaEquiparacion:
+    """Fila de la hoja de equiparación: un curso del plan vigente y su par en el plan nuevo."""
+    sigla_vieja: str
+    curso_viejo: str
+    creditos_viejo: Any
+    estado_viejo: str
+    categoria_viejo: Optional[str]
+    sigla_nueva: str
+    curso_nuevo: str
+    creditos_nuevo: Any
+    estado_nuevo: str
+    categoria_nuevo: Optional[str]
 
 
 @dataclass
@@ -33,84 +101,145 @@ class AnalisisEquiparacion:
 class EquiparacionAnalyzer:
     """Analizador de equiparación para transición al nuevo plan de estudios."""
     
-    def __init__(self):
-        # Tabla completa de equivalencias basada en el archivo Equiparacion.xlsx
-        self.tabla_equivalencias = [
-            # [Sigla_Vieja, Curso_Viejo, Creditos_Viejo, Sigla_Nueva, Curso_Nuevo, Creditos_Nuevo]
-            ['EF-D', 'ACTIVIDAD DEPORTIVA', '0', 'EF-D', 'ACTIVIDAD DEPORTIVA', '0'],
-            ['EG-CA', 'CURSO DE ARTE', '2', 'EG-CA', 'CURSO DE ARTE', '2'],
-            ['EG-I', 'CURSO INTEGRADO DE HUMANIDADES I', '6', 'EG-I', 'CURSO INTEGRADO DE HUMANIDADES I', '6'],
-            ['MA0001', 'PRECÁLCULO', '0', 'MA0001', 'PRECÁLCULO', '0'],
-            ['MA1001', 'CÁLCULO I', '3', 'MA1001', 'CÁLCULO I', '3'],
-            ['QU0100', 'QUÍMICA GENERAL I', '3', 'QU0114', 'QUIMICA GENERAL INTENSIVA', '4'],
-            ['QU0101', 'LABORATORIO DE QUÍMICA GENERAL I', '1', 'QU0115', 'LABORATORIO QUIMICA GENERAL INTENSIVA', '1'],
-            ['RP-1', 'REPERTORIO', '3', 'RP-1', 'REPERTORIO', '3'],
-            ['EG-II', 'CURSO INTEGRADO DE HUMANIDADES II', '6', 'EG-II', 'CURSO INTEGRADO DE HUMANIDADES II', '6'],
-            ['FS0210', 'FÍSICA GENERAL I', '3', 'FS0210', 'FÍSICA GENERAL I', '3'],
-            ['FS0211', 'LABORATORIO DE FÍSICA GENERAL I', '1', 'FS0211', 'LABORATORIO DE FÍSICA GENERAL I', '1'],
-            ['II0201', 'INTRODUCCIÓN A LA INGENIERÍA INDUSTRIAL', '2', 'II-1118', 'INTRODUCCIÓN A LA INGENIERÍA INDUSTRIAL', '2'],
-            ['MA1002', 'CÁLCULO II', '4', 'MA1002', 'CÁLCULO II', '4'],
-            ['QU0102', 'QUÍMICA GENERAL II', '3', 'QU-0114', 'QUIMICA GENERAL INTENSIVA', ''],
-            ['QU0103', 'LABORATORIO DE QUÍMICA GENERAL II', '1', 'QU-0115', 'LABORATORIO QUIMICA GENERAL INTENSIVA', ''],
-            ['CI0202', 'PRINCIPIOS DE INFORMÁTICA', '4', 'II-1119', 'FUNDAMENTOS PARA TECNOLOGÍAS DIGITALES', '4'],
-            ['FS0310', 'FÍSICA GENERAL II', '3', 'FS0310', 'FÍSICA GENERAL II', '3'],
-            ['FS0311', 'LABORATORIO DE FÍSICA GENERAL II', '1', 'FS0311', 'LABORATORIO DE FÍSICA GENERAL II', '1'],
-            ['II0306', 'PROBABILIDAD Y ESTADÍSTICA', '3', 'II-1120', 'ESTADISTICA I PARA INGENIERIA INDUSTRIAL', '3'],
-            ['MA1003', 'CÁLCULO III', '4', 'MA1003', 'CÁLCULO III', '4'],
-            ['MA1004', 'ÁLGEBRA LINEAL', '3', 'MA-1004', 'ALGEBRA LINEAL', '3'],
-            ['FS0410', 'FÍSICA GENERAL III', '3', '', 'No tiene equivalencia en el nuevo plan de estudios', ''],
-            ['FS0411', 'LABORATORIO DE FÍSICA GENERAL III', '1', '', 'No tiene equivalencia en el nuevo plan de estudios', ''],
-            ['II0401', 'INVESTIGACIÓN DE OPERACIONES', '3', 'II-1122', 'MODELOS DE OPTIMIZACIÓN INDUSTRIAL', '3'],
-            ['II0402', 'INGENIERÍA DE CALIDAD I', '2', 'II-1123', 'ESTADISTICA II PARA INGENIERIA INDUSTRIAL', '4'],
-            ['II0501', 'TECNOLOGÍAS DE INFORMACIÓN', '2', 'II-1129', 'INGENIERIA DE LA INFORMACION', '3'],
-            ['IM0202', 'DIBUJO I', '3', 'IM0101', 'GRÁFICA', '3'],
-            ['MA1005', 'ECUACIONES DIFERENCIALES', '4', 'MA1005', 'ECUACIONES DIFERENCIALES ', '4'],
-            ['IE0303', 'ELECTROTECNIA I', '3', 'II-1137', 'FUNDAMENTOS PARA MANUFACTURA', '4'],
-            ['II0302', 'DISEÑO DEL TRABAJO E INGENIERÍA DE FACTORES HUMANOS', '3', 'II-1132', 'DISEÑO Y MEDICION DEL TRABAJO', '3'],
-            ['II0502', 'INGENIERÍA DE CALIDAD II', '4', 'II-1145', 'INGENIERIA DE CALIDAD Y MEJORA CONTINUA', '4'],
-            ['II0503', 'SIMULACIÓN', '3', 'II-1128', 'SIMULACION Y SISTEMAS DINAMICOS', '3'],
-            ['II0504', 'ADMINISTRACIÓN FINANCIERA Y CONTABLE I', '2', 'II-1124', 'INGENIERIA ECONOMICA INDUSTRIAL I', '3'],
-            ['IM0207', 'MECÁNICA I', '3', 'IM0207', 'MECÁNICA', '3'],
-            ['II0601', 'GESTIÓN DE CALIDAD', '4', 'II-1148', 'GERENCIA Y SISTEMAS DE GESTION INTEGRADOS', '3'],
-            ['II0603', 'SISTEMAS AUTOMATIZADOS DE MANUFACTURA', '3', 'II-1144', 'SISTEMAS DE MANUFACTURA', '4'],
-            ['II0604', 'ADMINISTRACIÓN FINANCIERA Y CONTABLE II', '2', '', 'No tiene equivalencia en el nuevo plan de estudios', ''],
-            ['II0605', 'LOGÍSTICA DE LA CADENA DEL VALOR I', '3', 'II-1136', 'INGENIERIA CADENA DE SUMINISTRO I', '3'],
-            ['II0606', 'TERMOFLUIDOS', '3', 'II-1137', 'FUNDAMENTOS PARA MANUFACTURA', ''],
-            ['II0701', 'DISEÑO DE SISTEMAS DE INFORMACIÓN', '3', 'II-1135', 'ANALITICA INDUSTRIAL', '3'],
-            ['II0602', 'DISEÑO DE EXPERIMENTOS', '3', 'II-1125', 'ESTADISTICA III PARA INGENIERIA INDUSTRIAL', '3'],
-            ['II0702', 'COMPORTAMIENTO ORGANIZACIONAL', '2', 'II-1121', 'GESTION DE LA INGENIERIA', '2'],
-            ['II0703', 'INGENIERÍA DE OPERACIONES', '4', 'II-1143', 'INGENIERIA DE OPERACIONES', '4'],
-            ['II0704', 'INGENIERÍA ECONÓMICA Y FINANCIERA', '3', 'II-1127', 'INGENIERIA ECONOMICA INDUSTRIAL II', '3'],
-            ['II0705', 'LOGÍSTICA DE LA CADENA DEL VALOR II', '4', 'II-1142', 'INGENIERIA CADENA DE SUMINISTRO II', '3'],
-            ['SR-I', 'SEMINARIO DE REALIDAD NACIONAL I', '2', 'SR-I', 'SEMINARIO DE REALIDAD NACIONAL I', '2'],
-            ['II0802', 'INGENIERÍA DE PROCESOS DE NEGOCIO', '4', 'II-1149', 'GESTION DE LA ESTRATEGIA INDUSTRIAL', '3'],
-            ['II0803', 'DISEÑO DE PRODUCTO', '3', 'II4045', 'DISEÑO DE PRODUCTO Y SERVICIOS', '3'],
-            ['II0804', 'GESTIÓN DE PROYECTOS', '3', 'II-1133', 'GESTIÓN DE PROYECTOS', '3'],
-            ['II0805', 'DISTRIBUCIÓN Y LOCALIZACIÓN DE INSTALACIONES', '4', 'II-1147', 'INGENIERIA DE INSTALACIONES Y DE ENERGÍA', '5'],
-            ['II0806', 'METROLOGÍA Y NORMALIZACIÓN', '3', 'II-1134', 'METROLOGIA INDUSTRIAL', '3'],
-            ['SR-II', 'SEMINARIO DE REALIDAD NACIONAL II', '2', 'SR-II', 'SEMINARIO DE REALIDAD NACIONAL II', '2'],
-            ['II0801', 'INGENIERÍA DE SERVICIOS', '3', 'II-1138', 'INGENIERIA DE SERVICIOS', '3'],
-            ['II0902', 'PROYECTO INDUSTRIAL', '3', 'II-1150', 'TALLER DE INVESTIGACIÓN EN INGENIERIA', '2'],
-            ['II0904', 'INGENIERÍA AMBIENTAL', '3', 'II-1130', 'INGENIERIA DE SOSTENIBILIDAD I', '2']
-        ]
+    def __init__(self, ruta_equivalencias: Optional[str] = None):
+        """
+        Inicializa el analizador con la tabla de equivalencias compilada.
 
-        # Casos especiales de química que requieren combinación
-        self.casos_especiales_quimica = {
-            'QU0100_QU0102': {
-                'cursos_requeridos': ['QU0100', 'QU0102'],
-                'equivale_a': 'QU0114',
-                'nombre_nuevo': 'QUIMICA GENERAL INTENSIVA'
-            },
-            'QU0101_QU0103': {
-                'cursos_requeridos': ['QU0101', 'QU0103'],
-                'equivale_a': 'QU0115',
-                'nombre_nuevo': 'LABORATORIO QUIMICA GENERAL INTENSIVA'
-            }
+        Args:
+            ruta_equivalencias: Archivo JSON con la tabla; por omisión, el del plan nuevo
+        """
+        self.tabla = obtener_tabla_equivalencias(ruta_equivalencias or RUTA_EQUIVALENCIAS)
+
+    def escribir_hoja(self, workbook: Workbook, expediente: Expediente) -> None:
+        """
+        Agrega la hoja de equiparación a un libro que se está generando con xlsxwriter,
+        calculando la equiparación directamente del expediente.
+        
+        Args:
+            workbook: Libro de Excel en construcción
+            expediente: Expediente del estudiante
+        """
+        filas = self.calcular_filas(self.cursos_desde_expediente(expediente))
+        
+        formatos = {
+            'titulo': workbook.add_format({'font_name': 'Arial', 'font_size': 12, 'bold': True}),
+            'fecha': workbook.add_format({'font_name': 'Arial', 'font_size': 11, 'italic': True}),
+            'encabezado': workbook.add_format({
+                'font_name': 'Arial', 'font_size': 12, 'bold': True, 'font_color': '#FFFFFF',
+                'bg_color': '#4472C4', 'align': 'center', 'valign': 'vcenter'
+            }),
+            'subencabezado': workbook.add_format({
+                'font_name': 'Arial', 'font_size': 10, 'bold': True,
+                'bg_color': '#4472C4', 'align': 'center', 'valign': 'vcenter'
+            }),
+            'leyenda_titulo': workbook.add_format({'font_name': 'Arial', 'font_size': 10, 'bold': True}),
+            None: workbook.add_format({'font_name': 'Arial', 'font_size': 10}),
         }
+        for categoria, color in COLORES_CATEGORIA.items():
+            formatos[categoria] = workbook.add_format(
+                {'font_name': 'Arial', 'font_size': 10, 'bg_color': f'#{color}'}
+            )
+            formatos[('leyenda', categoria)] = workbook.add_format(
+                {'font_name': 'Arial', 'font_size': 9, 'bg_color': f'#{color}'}
+            )
+        
+        sheet = workbook.add_worksheet(HOJA_EQUIPARACION)
+        
+        # Información del estudiante y fecha (filas 1-3)
+        sheet.write(0, 1, f'Estudiante: {expediente.nombre}', formatos['titulo'])
+        sheet.write(1, 1, f'Carné: {expediente.carne}', formatos['titulo'])
+        sheet.write(2, 1, f'Estudio realizado: {datetime.now().strftime("%d/%m/%Y")}', formatos['fecha'])
+        
+        # Encabezados principales y de columnas (filas 5 y 6)
+        sheet.merge_range(4, 0, 4, 3, 'PLAN DE ESTUDIOS VIGENTE', formatos['encabezado'])
+        sheet.merge_range(4, 4, 4, 7, 'PLAN DE ESTUDIOS NUEVO', formatos['encabezado'])
+        encabezados = ['Sigla', 'Curso', 'Créditos', 'Estado', 'Sigla', 'Curso', 'Créditos', 'Estado']
+        for col, encabezado in enumerate(encabezados):
+            sheet.write(5, col, encabezado, formatos['subencabezado'])
+        
+        row = 6
+        for fila in filas:
+            formato_viejo = formatos[fila.categoria_viejo]
+            formato_nuevo = formatos[fila.categoria_nuevo]
+            valores = [
+                (fila.sigla_vieja, formato_viejo), (fila.curso_viejo, formato_viejo),
+                (fila.creditos_viejo, formato_viejo), (fila.estado_viejo, formato_viejo),
+                (fila.sigla_nueva, formato_nuevo), (fila.curso_nuevo, formato_nuevo),
+                (fila.creditos_nuevo, formato_nuevo), (fila.estado_nuevo, formato_nuevo),
+            ]
+            for col, (valor, formato) in enumerate(valores):
+                sheet.write(row, col, valor, formato)
+            row += 1
+        
+        for col, ancho in enumerate(ANCHOS_COLUMNAS):
+            sheet.set_column(col, col, ancho)
+        
+        # Leyenda explicativa
+        row += 2
+        sheet.write(row, 0, 'LEYENDA:', formatos['leyenda_titulo'])
+        for texto, categoria in LEYENDA:
+            row += 1
+            sheet.write(row, 0, texto, formatos[('leyenda', categoria)])
+
+    def cursos_desde_expediente(self, expediente: Expediente) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene la información de todos los cursos del plan con su estado actual,
+        en el mismo formato que se extrae de la hoja 'Expediente Detallado'.
+        
+        Args:
+            expediente: Expediente del estudiante
+            
+        Returns:
+            Diccionario con información de todos los cursos por sigla
+        """
+        todos_los_cursos = {}
+        
+        for numero_semestre in sorted(expediente.semestres.keys()):
+            for curso in expediente.semestres[numero_semestre].cursos:
+                estado = curso.get_estado_actual()
+                try:
+                    nota = float(curso.get_nota_actual())
+                except (ValueError, TypeError):
+                    nota = 0.0
+                
+                todos_los_cursos[curso.sigla] = {
+                    'sigla': curso.sigla,
+                    'nombre': curso.nombre,
+                    'estado': estado,
+                    'nota': nota,
+                    'creditos': curso.creditos,
+                    'aprobado': EstadoCurso.es_aprobado(estado.upper())
+                }
+        
+        return todos_los_cursos
+
+    @medido('equiparacion.extraer_cursos')
+    def extraer_cursos(self, ruta_archivo_excel: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Lee la tabla de cursos de un expediente ya generado sin cargar el libro completo.
+        
+        El libro se abre en modo de solo lectura y solo se recorre la hoja del expediente.
+        Si el mismo contenido ya se leyó antes en el proceso, se usa la caché sin volver
+        a leer el libro.
         
+        Args:
+            ruta_archivo_excel: Ruta al archivo Excel del expediente
+            
+        Returns:
+            Diccionario con información de todos los cursos por sigla
+        """
+        cursos, _ = self._leer_solo_lectura(ruta_archivo_excel, _huella_archivo(ruta_archivo_excel))
+        return _copiar_cursos(cursos)
+
+    @medido('equiparacion.analizar')
     def analizar_expediente(self, ruta_archivo_excel: str) -> bool:
         """
-        Analiza un expediente existente y agrega hoja de equiparación.
+        Analiza un archivo de expediente ya generado y le agrega la hoja de equiparación.
+        
+        Los cursos se leen primero en modo de solo lectura, como en extraer_cursos. El
+        libro completo solo se carga y se vuelve a guardar si la hoja de equiparación
+        falta o difiere de la calculada, lo que es más lento que generarla junto con
+        el libro (escribir_hoja).
         
         Args:
             ruta_archivo_excel: Ruta al archivo Excel del expediente
@@ -119,33 +248,44 @@ class EquiparacionAnalyzer:
             True si el análisis fue exitoso, False en caso contrario
         """
         try:
-            # Abrir archivo Excel existente
-            workbook = openpyxl.load_workbook(ruta_archivo_excel)
+            huella = _huella_archivo(ruta_archivo_excel)
+            clave = (huella, self.tabla.huella)
+            if clave in _HUELLAS_ANALIZADAS:
+                _HUELLAS_ANALIZADAS.move_to_end(clave)
+                metricas.contar('equiparacion.cache_aciertos')
+                return True
             
             # Extraer información del estudiante del nombre del archivo
-            from pathlib import Path
             nombre_archivo = Path(ruta_archivo_excel).stem
             partes = nombre_archivo.split('-', 1)
             carne_estudiante = partes[0] if len(partes) > 0 else "N/A"
             nombre_estudiante = partes[1] if len(partes) > 1 else "N/A"
             
-            # Verificar si ya existe la hoja de equiparación
-            if 'Equiparación' in workbook.sheetnames:
-                # Eliminar hoja existente para regenerar
-                workbook.remove(workbook['Equiparación'])
-            
-            # Leer datos del historial académico
-            todos_los_cursos = self._extraer_cursos_aprobados(workbook)
-            
-            # Realizar análisis de equiparación
-            analisis = self._realizar_analisis_equiparacion(todos_los_cursos)
+            # Leer los cursos y la hoja actual sin cargar el libro completo
+            todos_los_cursos, hoja_actual = self._leer_solo_lectura(
+                ruta_archivo_excel, huella, con_hoja_equiparacion=True
+            )
+            filas = self.calcular_filas(todos_los_cursos)
             
-            # Crear nueva hoja de equiparación
-            self._crear_hoja_equiparacion(workbook, analisis, todos_los_cursos, carne_estudiante, nombre_estudiante)
+            if hoja_actual != self._valores_hoja(filas, carne_estudiante, nombre_estudiante):
+                workbook = openpyxl.load_workbook(ruta_archivo_excel)
+                
+                # Eliminar la hoja existente para regenerarla
+                if HOJA_EQUIPARACION in workbook.sheetnames:
+                    workbook.remove(workbook[HOJA_EQUIPARACION])
+                
+                self._crear_hoja_equiparacion(workbook, filas, carne_estudiante, nombre_estudiante)
+                workbook.save(ruta_archivo_excel)
+                workbook.close()
+                
+                # La tabla de cursos no cambia al agregar la hoja, así que el archivo
+                # guardado queda en caché con los mismos cursos
+                huella = _huella_archivo(ruta_archivo_excel)
+                self._guardar_en_cache(huella, todos_los_cursos)
             
-            # Guardar archivo
-            workbook.save(ruta_archivo_excel)
-            workbook.close()
+            _HUELLAS_ANALIZADAS[(huella, self.tabla.huella)] = None
+            while len(_HUELLAS_ANALIZADAS) > MAX_CURSOS_EN_CACHE:
+                _HUELLAS_ANALIZADAS.popitem(last=False)
             
             return True
             
@@ -153,12 +293,88 @@ class EquiparacionAnalyzer:
             print(f"Error analizando expediente {ruta_archivo_excel}: {str(e)}")
             return False
     
+    def _leer_solo_lectura(
+        self, ruta_archivo_excel: str, huella: str, con_hoja_equiparacion: bool = False
+    ) -> Tuple[Dict[str, Dict[str, Any]], Optional[List[Tuple[str, ...]]]]:
+        """
+        Lee un libro en modo de solo lectura: los cursos, de la caché si el contenido ya
+        se leyó, y opcionalmente los valores de su hoja de equiparación.
+        
+        Args:
+            ruta_archivo_excel: Ruta al archivo Excel del expediente
+            huella: Huella del contenido del archivo
+            con_hoja_equiparacion: Si es True, también se leen los valores de la hoja
+            
+        Returns:
+            Tupla con los cursos por sigla y los valores de la hoja (None si no existe o
+            no se pidió)
+        """
+        cursos = self._cursos_en_cache(huella)
+        if cursos is not None:
+            metricas.contar('equiparacion.cache_aciertos')
+            if not con_hoja_equiparacion:
+                return cursos, None
+        
+        hoja = None
+        workbook = openpyxl.load_workbook(ruta_archivo_excel, read_only=True)
+        try:
+            if cursos is None:
+                cursos = self._extraer_cursos_aprobados(workbook)
+                self._guardar_en_cache(huella, cursos)
+            if con_hoja_equiparacion and HOJA_EQUIPARACION in workbook.sheetnames:
+                hoja = self._leer_valores_hoja(workbook[HOJA_EQUIPARACION])
+        finally:
+            workbook.close()
+        return cursos, hoja
+    
+    @staticmethod
+    def _leer_valores_hoja(sheet) -> List[Tuple[str, ...]]:
+        """Lee el estudiante (filas 1-2) y las filas de cursos de una hoja de equiparación."""
+        valores = []
+        for row_idx, row in enumerate(sheet.iter_rows(max_col=8, values_only=True), 1):
+            if row_idx in (1, 2):
+                valores.append((str(row[1] or '') if len(row) > 1 else '',))
+            elif row_idx >= 7:
+                fila = tuple('' if valor is None else str(valor) for valor in row)
+                if not any(fila):
+                    break
+                valores.append(fila + ('',) * (8 - len(fila)))
+        return valores
+    
+    @staticmethod
+    def _valores_hoja(filas: List[FilaEquiparacion], carne_estudiante: str,
+                      nombre_estudiante: str) -> List[Tuple[str, ...]]:
+        """Valores que debe tener la hoja de equiparación, en el formato de _leer_valores_hoja."""
+        valores = [(f'Estudiante: {nombre_estudiante}',), (f'Carné: {carne_estudiante}',)]
+        for fila in filas:
+            valores.append(tuple('' if valor is None else str(valor) for valor in (
+                fila.sigla_vieja, fila.curso_viejo, fila.creditos_viejo, fila.estado_viejo,
+                fila.sigla_nueva, fila.curso_nuevo, fila.creditos_nuevo, fila.estado_nuevo
+            )))
+        return valores
+    
+    @staticmethod
+    def _cursos_en_cache(huella: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Obtiene los cursos extraídos de un archivo con la huella indicada, si existen."""
+        cursos = _CURSOS_POR_HUELLA.get(huella)
+        if cursos is not None:
+            _CURSOS_POR_HUELLA.move_to_end(huella)
+        return cursos
+    
+    @staticmethod
+    def _guardar_en_cache(huella: str, cursos: Dict[str, Dict[str, Any]]) -> None:
+        """Guarda los cursos extraídos de un archivo, descartando los más antiguos."""
+        _CURSOS_POR_HUELLA[huella] = _copiar_cursos(cursos)
+        _CURSOS_POR_HUELLA.move_to_end(huella)
+        while len(_CURSOS_POR_HUELLA) > MAX_CURSOS_EN_CACHE:
+            _CURSOS_POR_HUELLA.popitem(last=False)
+    
     def _extraer_cursos_aprobados(self, workbook: openpyxl.Workbook) -> Dict[str, Dict[str, Any]]:
         """
         Extrae información de TODOS los cursos del archivo Excel (no solo aprobados).
         
         Args:
-            workbook: Libro de Excel abierto
+            workbook: Libro de Excel abierto, completo o en modo de solo lectura
             
         Returns:
             Diccionario con información de todos los cursos
@@ -178,6 +394,7 @@ class EquiparacionAnalyzer:
             
             # Buscar encabezados en el expediente detallado
             headers = {}
+            fila_encabezado = 0
             for row_idx, row in enumerate(sheet.iter_rows(min_row=1, max_row=10, values_only=True), 1):
                 for col_idx, cell_value in enumerate(row, 1):
                     if cell_value:
@@ -192,15 +409,17 @@ class EquiparacionAnalyzer:
                             headers['nota'] = col_idx
                         elif 'créditos' in cell_str or 'creditos' in cell_str:
                             headers['creditos'] = col_idx
+                        else:
+                            continue
+                        fila_encabezado = row_idx
                 if len(headers) >= 3:  # Al menos sigla, nombre y estado
                     break
             
             if not headers.get('sigla') or not headers.get('estado'):
                 return todos_los_cursos
             
-            # Leer datos de cursos del expediente detallado
-            start_row = 8  # Comenzar después de la información del estudiante
-            for row in sheet.iter_rows(min_row=start_row, values_only=True):
+            # Leer datos de cursos del expediente detallado a partir de los encabezados
+            for row in sheet.iter_rows(min_row=fila_encabezado + 1, values_only=True):
                 if not row or not row[headers['sigla'] - 1]:
                     continue
                 
@@ -261,15 +480,9 @@ class EquiparacionAnalyzer:
         """
         analisis = AnalisisEquiparacion()
         
-        # Verificar química general completa (QU0100 + QU0102)
-        if (('QU0100' in cursos_aprobados and cursos_aprobados['QU0100']['aprobado']) and 
-            ('QU0102' in cursos_aprobados and cursos_aprobados['QU0102']['aprobado'])):
-            analisis.quimica_general_completa = True
-        
-        # Verificar química general II completa (QU0101 + QU0103)
-        if (('QU0101' in cursos_aprobados and cursos_aprobados['QU0101']['aprobado']) and 
-            ('QU0103' in cursos_aprobados and cursos_aprobados['QU0103']['aprobado'])):
-            analisis.quimica_intensiva_completa = True
+        aprobadas = self._siglas_aprobadas(cursos_aprobados)
+        analisis.quimica_general_completa = self.tabla.reglas['QU0100_QU0102'].cumplida(aprobadas)
+        analisis.quimica_intensiva_completa = self.tabla.reglas['QU0101_QU0103'].cumplida(aprobadas)
         
         # Verificar precálculo (MA0001 en lugar de MA0125 según la tabla)
         if 'MA0001' in cursos_aprobados and cursos_aprobados['MA0001']['aprobado']:
@@ -277,36 +490,135 @@ class EquiparacionAnalyzer:
         
         return analisis
     
-    def _crear_hoja_equiparacion(self, workbook: openpyxl.Workbook, 
-                                analisis: AnalisisEquiparacion,
-                                todos_los_cursos: Dict[str, Dict[str, Any]],
+    @medido('equiparacion.calcular_filas')
+    def calcular_filas(self, todos_los_cursos: Dict[str, Dict[str, Any]]) -> List[FilaEquiparacion]:
+        """
+        Calcula las filas de la hoja de equiparación.
+        
+        Args:
+            todos_los_cursos: Diccionario de todos los cursos del expediente por sigla
+            
+        Returns:
+            Filas con cada curso del plan vigente, su equivalencia y su estado en el plan nuevo
+        """
+        cursos_procesados = []
+        aprobadas = self._siglas_aprobadas(todos_los_cursos)
+        
+        # Para cada curso del expediente detallado
+        for sigla_vieja, curso_info in todos_los_cursos.items():
+            equivalencia = self.tabla.por_sigla_vieja(sigla_vieja)
+            
+            if equivalencia:
+                curso_viejo = equivalencia.curso_viejo
+                creditos_viejo = equivalencia.creditos_viejo
+                sigla_nueva = equivalencia.sigla_nueva
+                curso_nuevo = equivalencia.curso_nuevo
+                creditos_nuevo = equivalencia.creditos_nuevo
+            else:
+                # Curso no tiene equivalencia conocida
+                sigla_vieja = curso_info['sigla']
+                curso_viejo = curso_info['nombre']
+                creditos_viejo = curso_info['creditos']
+                sigla_nueva = ''
+                curso_nuevo = ''
+                creditos_nuevo = 0
+            
+            # Estado en plan vigente (exactamente como está en el expediente)
+            estado_viejo = curso_info['estado']
+            categoria_viejo = None
+            
+            if estado_viejo.upper() in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
+                categoria_viejo = APROBADO
+            elif estado_viejo.upper() == 'REPROBADO':
+                categoria_viejo = PENDIENTE
+            elif estado_viejo.upper() == 'MATRICULADO':
+                categoria_viejo = SIN_EQUIVALENCIA
+            
+            # Estado en plan nuevo (aplicar lógica de equiparación)
+            estado_nuevo = ''
+            categoria_nuevo = None
+            
+            if not sigla_nueva:  # No tiene equivalencia
+                estado_nuevo = 'Sin equivalencia'
+                categoria_nuevo = SIN_EQUIVALENCIA
+            elif sigla_vieja == sigla_nueva:  # Mismo curso en ambos planes
+                estado_nuevo = estado_viejo  # Copiar exactamente el mismo estado
+                categoria_nuevo = categoria_viejo
+            elif estado_viejo.upper() in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
+                # Curso diferente pero aprobado en plan vigente
+                
+                # Equivalencias que requieren aprobar varios cursos (química)
+                regla = self.tabla.regla_combinada(sigla_vieja, sigla_nueva)
+                faltantes = regla.faltantes(aprobadas) if regla else ()
+                if faltantes:
+                    estado_nuevo = f"Requiere {', '.join(faltantes)}"
+                    categoria_nuevo = PENDIENTE
+                else:
+                    estado_nuevo = 'EQUIPARADO'
+                    categoria_nuevo = EQUIPARADO
+            else:  # No aprobado en plan vigente
+                estado_nuevo = 'Pendiente'
+                categoria_nuevo = PENDIENTE
+            
+            cursos_procesados.append(FilaEquiparacion(
+                sigla_vieja=sigla_vieja,
+                curso_viejo=curso_viejo,
+                creditos_viejo=creditos_viejo,
+                estado_viejo=estado_viejo,
+                categoria_viejo=categoria_viejo,
+                sigla_nueva=sigla_nueva,
+                curso_nuevo=curso_nuevo,
+                creditos_nuevo=creditos_nuevo,
+                estado_nuevo=estado_nuevo,
+                categoria_nuevo=categoria_nuevo
+            ))
+        
+        # Agregar cursos completamente nuevos del plan nuevo (que no están en el plan vigente)
+        siglas_procesadas = set(curso.sigla_nueva for curso in cursos_procesados if curso.sigla_nueva)
+        
+        for equivalencia in self.tabla.solo_plan_nuevo:
+            if equivalencia.sigla_nueva not in siglas_procesadas:
+                cursos_procesados.append(FilaEquiparacion(
+                    sigla_vieja='',
+                    curso_viejo='',
+                    creditos_viejo=0,
+                    estado_viejo='',
+                    categoria_viejo=None,
+                    sigla_nueva=equivalencia.sigla_nueva,
+                    curso_nuevo=equivalencia.curso_nuevo,
+                    creditos_nuevo=equivalencia.creditos_nuevo,
+                    estado_nuevo='Pendiente',
+                    categoria_nuevo=PENDIENTE
+                ))
+        
+        return cursos_procesados
+
+    def _crear_hoja_equiparacion(self, workbook: openpyxl.Workbook,
+                                filas: List[FilaEquiparacion],
                                 carne_estudiante: str,
                                 nombre_estudiante: str) -> None:
         """
-        Crea la hoja de equiparación en el archivo Excel con información completa.
+        Crea la hoja de equiparación en un archivo Excel abierto con openpyxl.
         
         Args:
             workbook: Libro de Excel
-            analisis: Resultado del análisis de equiparación
-            todos_los_cursos: Diccionario de todos los cursos
+            filas: Filas calculadas con calcular_filas
             carne_estudiante: Carné del estudiante
             nombre_estudiante: Nombre del estudiante
         """
         # Crear nueva hoja
-        sheet = workbook.create_sheet('Equiparación')
+        sheet = workbook.create_sheet(HOJA_EQUIPARACION)
         
         # Estilos
-        title_font = Font(name='Arial', size=14, bold=True, color='FFFFFF')
         header_font = Font(name='Arial', size=12, bold=True, color='FFFFFF')
         subheader_font = Font(name='Arial', size=10, bold=True)
         normal_font = Font(name='Arial', size=10)
         
-        title_fill = PatternFill(start_color='1F4E79', end_color='1F4E79', fill_type='solid')
         header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        approved_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-        pending_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-        no_equiv_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-        equiv_fill = PatternFill(start_color='CCE5FF', end_color='CCE5FF', fill_type='solid')  # Azul claro para cursos equiparados
+        fills = {
+            categoria: PatternFill(start_color=color, end_color=color, fill_type='solid')
+            for categoria, color in COLORES_CATEGORIA.items()
+        }
         
         center_alignment = Alignment(horizontal='center', vertical='center')
         
@@ -322,7 +634,6 @@ class EquiparacionAnalyzer:
         row += 1
         
         # Fecha del estudio
-        from datetime import datetime
         fecha_hoy = datetime.now().strftime("%d/%m/%Y")
         sheet[f'B{row}'] = f'Estudio realizado: {fecha_hoy}'
         sheet[f'B{row}'].font = Font(name='Arial', size=11, italic=True)
@@ -352,188 +663,37 @@ class EquiparacionAnalyzer:
             cell.alignment = center_alignment
         row += 1
         
-        # Procesar cursos del expediente detallado como base
-        cursos_procesados = []
-        
-        # Para cada curso del expediente detallado
-        for sigla_vieja, curso_info in todos_los_cursos.items():
-            # Buscar equivalencia en la tabla
-            equivalencia_encontrada = None
-            for equivalencia in self.tabla_equivalencias:
-                if equivalencia[0] == sigla_vieja:  # sigla_vieja coincide
-                    equivalencia_encontrada = equivalencia
-                    break
-            
-            if equivalencia_encontrada:
-                sigla_vieja, curso_viejo, creditos_viejo, sigla_nueva, curso_nuevo, creditos_nuevo = equivalencia_encontrada
-            else:
-                # Curso no tiene equivalencia conocida
-                sigla_vieja = curso_info['sigla']
-                curso_viejo = curso_info['nombre']
-                creditos_viejo = curso_info['creditos']
-                sigla_nueva = ''
-                curso_nuevo = ''
-                creditos_nuevo = 0
-            
-            # Estado en plan vigente (exactamente como está en el expediente)
-            estado_viejo = curso_info['estado']
-            fill_viejo = None
-            
-            if estado_viejo.upper() in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
-                fill_viejo = approved_fill
-            elif estado_viejo.upper() == 'REPROBADO':
-                fill_viejo = pending_fill
-            elif estado_viejo.upper() == 'MATRICULADO':
-                fill_viejo = no_equiv_fill
-            
-            # Estado en plan nuevo (aplicar lógica de equiparación)
-            estado_nuevo = ''
-            fill_nuevo = None
-            
-            if not sigla_nueva:  # No tiene equivalencia
-                estado_nuevo = 'Sin equivalencia'
-                fill_nuevo = no_equiv_fill
-            elif sigla_vieja == sigla_nueva:  # Mismo curso en ambos planes
-                estado_nuevo = estado_viejo  # Copiar exactamente el mismo estado
-                fill_nuevo = fill_viejo
-            elif estado_viejo.upper() in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
-                # Curso diferente pero aprobado en plan vigente
-                
-                # Casos especiales de química
-                if sigla_vieja in ['QU0100'] and sigla_nueva in ['QU0114', 'QU-0114']:
-                    if self._verificar_quimica_completa(['QU0100', 'QU0102'], todos_los_cursos):
-                        estado_nuevo = 'EQUIPARADO'
-                        fill_nuevo = equiv_fill
-                    else:
-                        estado_nuevo = 'Requiere QU0102'
-                        fill_nuevo = pending_fill
-                elif sigla_vieja in ['QU0102'] and sigla_nueva in ['QU0114', 'QU-0114']:
-                    if self._verificar_quimica_completa(['QU0100', 'QU0102'], todos_los_cursos):
-                        estado_nuevo = 'EQUIPARADO'
-                        fill_nuevo = equiv_fill
-                    else:
-                        estado_nuevo = 'Requiere QU0100'
-                        fill_nuevo = pending_fill
-                elif sigla_vieja in ['QU0101'] and sigla_nueva in ['QU0115', 'QU-0115']:
-                    if self._verificar_quimica_completa(['QU0101', 'QU0103'], todos_los_cursos):
-                        estado_nuevo = 'EQUIPARADO'
-                        fill_nuevo = equiv_fill
-                    else:
-                        estado_nuevo = 'Requiere QU0103'
-                        fill_nuevo = pending_fill
-                elif sigla_vieja in ['QU0103'] and sigla_nueva in ['QU0115', 'QU-0115']:
-                    if self._verificar_quimica_completa(['QU0101', 'QU0103'], todos_los_cursos):
-                        estado_nuevo = 'EQUIPARADO'
-                        fill_nuevo = equiv_fill
-                    else:
-                        estado_nuevo = 'Requiere QU0101'
-                        fill_nuevo = pending_fill
-                else:
-                    estado_nuevo = 'EQUIPARADO'
-                    fill_nuevo = equiv_fill
-            else:  # No aprobado en plan vigente
-                estado_nuevo = 'Pendiente'
-                fill_nuevo = pending_fill
-            
-            cursos_procesados.append({
-                'sigla_vieja': sigla_vieja,
-                'curso_viejo': curso_viejo,
-                'creditos_viejo': creditos_viejo,
-                'estado_viejo': estado_viejo,
-                'fill_viejo': fill_viejo,
-                'sigla_nueva': sigla_nueva,
-                'curso_nuevo': curso_nuevo,
-                'creditos_nuevo': creditos_nuevo,
-                'estado_nuevo': estado_nuevo,
-                'fill_nuevo': fill_nuevo
-            })
-        
-        # Agregar cursos completamente nuevos del plan nuevo (que no están en el plan vigente)
-        siglas_procesadas = set(curso['sigla_nueva'] for curso in cursos_procesados if curso['sigla_nueva'])
-        
-        for equivalencia in self.tabla_equivalencias:
-            sigla_vieja, curso_viejo, creditos_viejo, sigla_nueva, curso_nuevo, creditos_nuevo = equivalencia
-            
-            # Si es un curso nuevo que no tiene equivalencia en el plan vigente
-            if sigla_nueva and sigla_nueva not in siglas_procesadas and not sigla_vieja:
-                cursos_procesados.append({
-                    'sigla_vieja': '',
-                    'curso_viejo': '',
-                    'creditos_viejo': 0,
-                    'estado_viejo': '',
-                    'fill_viejo': None,
-                    'sigla_nueva': sigla_nueva,
-                    'curso_nuevo': curso_nuevo,
-                    'creditos_nuevo': creditos_nuevo,
-                    'estado_nuevo': 'Pendiente',
-                    'fill_nuevo': pending_fill
-                })
-        
         # Escribir todos los cursos
-        for curso in cursos_procesados:
-            # Escribir datos del plan vigente
-            sheet.cell(row=row, column=1).value = curso['sigla_vieja']
-            sheet.cell(row=row, column=2).value = curso['curso_viejo']
-            sheet.cell(row=row, column=3).value = curso['creditos_viejo']
-            sheet.cell(row=row, column=4).value = curso['estado_viejo']
-            
-            # Aplicar formato al plan vigente
-            if curso['fill_viejo']:
-                for col in range(1, 5):
-                    sheet.cell(row=row, column=col).fill = curso['fill_viejo']
-            
-            # Escribir datos del plan nuevo
-            sheet.cell(row=row, column=5).value = curso['sigla_nueva']
-            sheet.cell(row=row, column=6).value = curso['curso_nuevo']
-            sheet.cell(row=row, column=7).value = curso['creditos_nuevo']
-            sheet.cell(row=row, column=8).value = curso['estado_nuevo']
-            
-            # Aplicar formato al plan nuevo
-            if curso['fill_nuevo']:
-                for col in range(5, 9):
-                    sheet.cell(row=row, column=col).fill = curso['fill_nuevo']
-            
-            # Aplicar fuente normal a todas las celdas
-            for col in range(1, 9):
-                sheet.cell(row=row, column=col).font = normal_font
+        for fila in filas:
+            valores = [
+                fila.sigla_vieja, fila.curso_viejo, fila.creditos_viejo, fila.estado_viejo,
+                fila.sigla_nueva, fila.curso_nuevo, fila.creditos_nuevo, fila.estado_nuevo
+            ]
+            for col, valor in enumerate(valores, 1):
+                cell = sheet.cell(row=row, column=col)
+                cell.value = valor
+                categoria = fila.categoria_viejo if col <= 4 else fila.categoria_nuevo
+                if categoria:
+                    cell.fill = fills[categoria]
+                cell.font = normal_font
             
             row += 1
         
         # Ajustar ancho de columnas
-        sheet.column_dimensions['A'].width = 12  # Sigla vieja
-        sheet.column_dimensions['B'].width = 45  # Curso viejo
-        sheet.column_dimensions['C'].width = 10  # Créditos viejo
-        sheet.column_dimensions['D'].width = 15  # Estado viejo
-        sheet.column_dimensions['E'].width = 12  # Sigla nueva
-        sheet.column_dimensions['F'].width = 45  # Curso nuevo
-        sheet.column_dimensions['G'].width = 10  # Créditos nuevo
-        sheet.column_dimensions['H'].width = 15  # Estado nuevo
+        for col, ancho in enumerate(ANCHOS_COLUMNAS):
+            sheet.column_dimensions['ABCDEFGH'[col]].width = ancho
         
         # Agregar leyenda explicativa
         row += 2
         sheet.cell(row=row, column=1).value = 'LEYENDA:'
         sheet.cell(row=row, column=1).font = Font(name='Arial', size=10, bold=True)
-        row += 1
-        
-        sheet.cell(row=row, column=1).value = '• Verde claro: Curso aprobado'
-        sheet.cell(row=row, column=1).font = Font(name='Arial', size=9)
-        sheet.cell(row=row, column=1).fill = approved_fill
-        row += 1
         
-        sheet.cell(row=row, column=1).value = '• Verde oscuro: Curso equiparado'
-        sheet.cell(row=row, column=1).font = Font(name='Arial', size=9)
-        sheet.cell(row=row, column=1).fill = equiv_fill
-        row += 1
-        
-        sheet.cell(row=row, column=1).value = '• Rojo: Curso pendiente o con nota insuficiente'
-        sheet.cell(row=row, column=1).font = Font(name='Arial', size=9)
-        sheet.cell(row=row, column=1).fill = pending_fill
-        row += 1
-        
-        sheet.cell(row=row, column=1).value = '• Amarillo: Sin equivalencia en el nuevo plan'
-        sheet.cell(row=row, column=1).font = Font(name='Arial', size=9)
-        sheet.cell(row=row, column=1).fill = no_equiv_fill
+        for texto, categoria in LEYENDA:
+            row += 1
+            sheet.cell(row=row, column=1).value = texto
+            sheet.cell(row=row, column=1).font = Font(name='Arial', size=9)
+            sheet.cell(row=row, column=1).fill = fills[categoria]
     
-    def _verificar_quimica_completa(self, cursos_requeridos: List[str], cursos_aprobados: Dict[str, Dict[str, Any]]) -> bool:
-        """Verifica si se tienen todos los cursos requeridos para una equivalencia de química."""
-        return all(curso in cursos_aprobados and cursos_aprobados[curso]['aprobado'] for curso in cursos_requeridos)
+    def _siglas_aprobadas(self, cursos: Dict[str, Dict[str, Any]]) -> Set[str]:
+        """Conjunto de siglas aprobadas del expediente."""
+        return {sigla for sigla, curso in cursos.items() if curso['aprobado']}
@@ -2,12 +2,159 @@
 Adaptador para generar archivos Excel
 """
 import xlsxwriter
-from typing import Dict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from xlsxwriter.format import Format
+from xlsxwriter.utility import xl_cell_to_rowcol
 from xlsxwriter.workbook import Workbook
 from xlsxwriter.worksheet import Worksheet
 
+from ...domain.entities.analisis_expediente import AnalisisExpediente
+from ...domain.entities.enums import EstadoCurso
 from ...domain.entities.expediente import Expediente
+from ...shared.config.indice_curricular import obtener_indice_curricular
+from ...shared.instrumentacion import metricas
+
+
+# Plan de estilos: propiedades de cada formato por rol, en el orden en que se
+# registran en cada libro. Se calcula una sola vez por proceso.
+PLAN_FORMATOS = (
+    # Encabezados
+    ('encabezado', {'bold': True, 'font_size': 12, 'bg_color': '#D7E4BC', 'border': 1,
+                    'align': 'center', 'valign': 'vcenter'}),
+    # Información del estudiante
+    ('info_estudiante', {'bold': True, 'font_size': 11, 'bg_color': '#F2F2F2', 'border': 1}),
+    # Cursos según su estado
+    ('curso_aprobado', {'bg_color': '#C6EFCE', 'border': 1, 'font_size': 10}),
+    ('curso_matriculado', {'bg_color': '#FFEB9C', 'border': 1, 'font_size': 10}),
+    ('curso_reprobado', {'bg_color': '#FFC7CE', 'border': 1, 'font_size': 10}),
+    ('curso_sin_datos', {'bg_color': '#F2F2F2', 'border': 1, 'font_size': 10}),
+    # Números y texto centrado
+    ('numero', {'border': 1, 'align': 'center', 'font_size': 10}),
+    ('texto_centrado', {'border': 1, 'align': 'center', 'font_size': 10}),
+    # Formatos adicionales para las hojas de análisis
+    ('requisito_cumplido', {'bg_color': '#C6EFCE', 'border': 1, 'align': 'center', 'font_size': 9}),
+    ('requisito_pendiente', {'bg_color': '#FFEB9C', 'border': 1, 'align': 'center', 'font_size': 9}),
+    ('curso_pendiente', {'bg_color': '#E6E6FA', 'border': 1, 'font_size': 10}),
+    ('numero_grande', {'border': 1, 'align': 'center', 'font_size': 12, 'bold': True}),
+    ('porcentaje', {'border': 1, 'align': 'center', 'font_size': 10, 'num_format': '0.0%'}),
+)
+
+# Nombre del formato de curso para cada código de EstadoCurso
+FORMATO_POR_ESTADO = tuple(
+    'curso_aprobado' if estado in EstadoCurso.estados_aprobados()
+    else 'curso_reprobado' if estado is EstadoCurso.REPROBADO
+    else 'curso_matriculado' if estado is EstadoCurso.MATRICULADO
+    else 'curso_sin_datos'
+    for estado in sorted(EstadoCurso, key=lambda e: e.value)
+)
+
+
+# Firma de los generadores de hojas: (writer, workbook, expediente, formatos, analisis)
+GeneradorHoja = Callable[..., None]
+
+
+@dataclass(frozen=True)
+class DefinicionHoja:
+    """Hoja registrada en ExcelWriter con los datos derivados de los que depende."""
+    nombre: str
+    generador: GeneradorHoja
+    dependencias: Tuple[str, ...] = ()
+
+
+class FormatosLibro(dict):
+    """
+    Formatos registrados en un libro, por nombre de rol.
+    
+    El atributo por_estado permite obtener el formato de un curso directamente
+    a partir del código entero de su estado.
+    """
+    por_estado: List[Format]
+
+
+def registrar_formatos(workbook: Workbook) -> FormatosLibro:
+    """
+    Registra en el libro los formatos del plan de estilos en una sola pasada.
+    
+    Args:
+        workbook: Libro de Excel
+    
+    Returns:
+        Formatos por nombre de rol y su tabla por código de estado
+    """
+    formatos = FormatosLibro(
+        (nombre, workbook.add_format(propiedades)) for nombre, propiedades in PLAN_FORMATOS
+    )
+    formatos.por_estado = [formatos[nombre] for nombre in FORMATO_POR_ESTADO]
+    return formatos
+
+
+class EscrituraFueraDeOrdenError(ValueError):
+    """Se intentó escribir en una fila ya volcada a disco en modo streaming."""
+
+
+class HojaSecuencial(Worksheet):
+    """
+    Hoja de trabajo para el modo streaming (constant_memory de xlsxwriter).
+
+    En ese modo xlsxwriter descarta en silencio cualquier escritura a una fila
+    anterior a la fila actual. Esta hoja lleva la última fila escrita por sus métodos
+    de escritura (write, write_row, write_column y merge_range, los que usan las hojas
+    de ExcelWriter) y convierte ese caso en un error para que ninguna hoja pierda
+    datos sin que se note.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fila_actual = 0  # Filas anteriores ya volcadas a disco
+
+    def write(self, *args):
+        fila, columna, *resto = _celda(args)
+        self._avanzar(fila, fila)
+        return super().write(fila, columna, *resto)
+
+    def write_row(self, *args, **kwargs):
+        fila, columna, *resto = _celda(args)
+        self._avanzar(fila, fila)
+        return super().write_row(fila, columna, *resto, **kwargs)
+
+    def write_column(self, *args, **kwargs):
+        fila, columna, datos, *resto = _celda(args)
+        self._avanzar(fila, fila + max(len(datos) - 1, 0))
+        return super().write_column(fila, columna, datos, *resto, **kwargs)
+
+    def merge_range(self, *args, **kwargs):
+        if isinstance(args[0], str):
+            inicio, _, fin = args[0].partition(':')
+            args = xl_cell_to_rowcol(inicio) + xl_cell_to_rowcol(fin or inicio) + tuple(args[1:])
+        primera_fila, primera_columna, ultima_fila, ultima_columna, *resto = args
+        self._avanzar(primera_fila, ultima_fila)
+        return super().merge_range(primera_fila, primera_columna, ultima_fila, ultima_columna, *resto, **kwargs)
+
+    def _avanzar(self, primera: int, ultima: int) -> None:
+        """Registra una escritura en las filas primera..ultima, que no pueden ser anteriores a la fila actual."""
+        if primera < self.fila_actual:
+            raise EscrituraFueraDeOrdenError(
+                f"La hoja '{self.name}' escribió en la fila {primera} después de la fila {self.fila_actual}"
+            )
+        self.fila_actual = ultima
+
+
+def _celda(args: tuple) -> tuple:
+    """Argumentos de escritura con la celda como (fila, columna), aunque vengan en notación A1."""
+    if args and isinstance(args[0], str):
+        return xl_cell_to_rowcol(args[0]) + tuple(args[1:])
+    return args
+
+
+class LibroStreaming(Workbook):
+    """Libro de Excel que escribe cada hoja fila por fila con memoria constante."""
+    worksheet_class = HojaSecuencial
+
+    def __init__(self, filename: str, options: Optional[dict] = None):
+        opciones = dict(options or {})
+        opciones['constant_memory'] = True
+        super().__init__(filename, opciones)
 
 
 class ExcelWriter:
@@ -15,37 +162,128 @@ class ExcelWriter:
     Adaptador para generar archivos Excel con información de expedientes.
     """
 
-    def __init__(self):
-        """Inicializa el escritor de Excel."""
-        pass
+    # Versión del formato generado. Debe incrementarse cuando cambie el contenido
+    # o el diseño de las hojas para invalidar la caché de construcción.
+    VERSION = '2.2.1'
+
+    HOJAS = (
+        'Malla Curricular',
+        'Expediente Detallado',
+        'Historial Completo',
+        'Análisis por Semestres',
+        'Progreso del Plan',
+        'Cursos Pendientes',
+        'Cursos Reprobados',
+    )
+
+    # Hojas que genera cada perfil, en orden
+    PERFILES: Dict[str, Tuple[str, ...]] = {
+        'completo': HOJAS,
+        'revision_rapida': ('Malla Curricular', 'Cursos Pendientes'),
+        'con_equiparacion': HOJAS + ('Equiparación',),
+    }
+
+    # Registro de hojas disponibles por nombre (se completa con registrar_hoja)
+    _registro_hojas: Dict[str, DefinicionHoja] = {}
+
+    def __init__(self, modo_streaming: bool = False, perfil: str = 'completo'):
+        """
+        Inicializa el escritor de Excel.
+        
+        Args:
+            modo_streaming: Si es True, cada hoja se escribe fila por fila y se vuelca
+                            a disco, de modo que la memoria no crece con el tamaño del archivo.
+                            Todas las hojas deben escribirse en orden estricto de filas.
+            perfil: Nombre del perfil con las hojas a generar (ver PERFILES)
+        
+        Raises:
+            ValueError: Si el perfil no existe o incluye una hoja no registrada
+        """
+        if perfil not in self.PERFILES:
+            raise ValueError(
+                f"Perfil de hojas desconocido: '{perfil}'. Disponibles: {', '.join(self.PERFILES)}"
+            )
+        faltantes = [hoja for hoja in self.PERFILES[perfil] if hoja not in self._registro_hojas]
+        if faltantes:
+            raise ValueError(f"El perfil '{perfil}' incluye hojas no registradas: {', '.join(faltantes)}")
+
+        self.modo_streaming = modo_streaming
+        self.perfil = perfil
+
+    @classmethod
+    def registrar_hoja(
+        cls,
+        nombre: str,
+        generador: GeneradorHoja,
+        dependencias: Tuple[str, ...] = ()
+    ) -> None:
+        """
+        Registra una hoja que puede incluirse en los perfiles.
+        
+        Args:
+            nombre: Nombre de la hoja en el libro
+            generador: Función (writer, workbook, expediente, formatos, analisis) que escribe la hoja
+            dependencias: Datos de AnalisisExpediente que usa la hoja
+        """
+        cls._registro_hojas[nombre] = DefinicionHoja(nombre, generador, tuple(dependencias))
+
+    @property
+    def hojas_seleccionadas(self) -> tuple:
+        """Nombres de las hojas que genera este escritor, en orden."""
+        return self.PERFILES[self.perfil]
+
+    @property
+    def datos_requeridos(self) -> Set[str]:
+        """Datos de AnalisisExpediente que necesitan las hojas seleccionadas."""
+        return {
+            dependencia
+            for hoja in self.hojas_seleccionadas
+            for dependencia in self._registro_hojas[hoja].dependencias
+        }
 
-    def generar_expediente(self, expediente: Expediente, ruta_archivo: str) -> None:
+    def generar_expediente(self, expediente: Expediente, ruta_archivo: str) -> AnalisisExpediente:
         """
-        Genera un archivo Excel con la información completa del expediente.
+        Genera un archivo Excel con las hojas del perfil seleccionado.
         
         Args:
             expediente: Expediente del estudiante
             ruta_archivo: Ruta donde guardar el archivo Excel
+        
+        Returns:
+            Análisis del expediente con los datos derivados que se calcularon
         """
-        workbook = xlsxwriter.Workbook(ruta_archivo)
+        workbook = self._crear_libro(ruta_archivo)
         
         # Generar formatos una vez para todas las hojas
-        formatos = self._generar_formatos(workbook)
-        
-        # Hojas originales
-        self._generar_hoja_malla(workbook, expediente, formatos)
-        self._generar_hoja_expediente(workbook, expediente, formatos)
-        self._generar_hoja_historial(workbook, expediente, formatos)
+        with metricas.medir('excel.formatos'):
+            formatos = self._generar_formatos(workbook)
+        
+        # Los datos derivados se calculan solo cuando una hoja seleccionada los usa
+        analisis = AnalisisExpediente(expediente)
+        for nombre in self.hojas_seleccionadas:
+            with metricas.medir(f'excel.hoja.{nombre}'):
+                self._registro_hojas[nombre].generador(self, workbook, expediente, formatos, analisis)
+        
+        with metricas.medir('excel.guardar'):
+            workbook.close()
+        metricas.contar('excel.archivos')
+        return analisis
+
+    def _crear_libro(self, ruta_archivo: str) -> Workbook:
+        """
+        Crea el libro de Excel según el modo de escritura configurado.
         
-        # Nuevas hojas de análisis
-        self._generar_hoja_analisis_semestres(workbook, expediente, formatos)
-        self._generar_hoja_progreso_plan(workbook, expediente, formatos)
-        self._generar_hoja_cursos_pendientes(workbook, expediente, formatos)
-        self._generar_hoja_cursos_reprobados(workbook, expediente, formatos)
+        Args:
+            ruta_archivo: Ruta donde guardar el archivo Excel
         
-        workbook.close()
+        Returns:
+            Libro de Excel listo para agregar hojas
+        """
+        if self.modo_streaming:
+            return LibroStreaming(ruta_archivo)
+        return xlsxwriter.Workbook(ruta_archivo)
 
-    def _generar_formatos(self, workbook: Workbook) -> Dict[str, Format]:
+    def _generar_formatos(self, workbook: Workbook) -> FormatosLibro:
         """
         Genera los formatos de celda para el archivo Excel.
         
@@ -55,104 +293,7 @@ class ExcelWriter:
         Returns:
             Diccionario con los formatos disponibles
         """
-        formatos = {}
-        
-        # Formato para encabezados
-        formatos['encabezado'] = workbook.add_format({
-            'bold': True,
-            'font_size': 12,
-            'bg_color': '#D7E4BC',
-            'border': 1,
-            'align': 'center',
-            'valign': 'vcenter'
-        })
-        
-        # Formato para información del estudiante
-        formatos['info_estudiante'] = workbook.add_format({
-            'bold': True,
-            'font_size': 11,
-            'bg_color': '#F2F2F2',
-            'border': 1
-        })
-        
-        # Formato para cursos aprobados
-        formatos['curso_aprobado'] = workbook.add_format({
-            'bg_color': '#C6EFCE',
-            'border': 1,
-            'font_size': 10
-        })
-        
-        # Formato para cursos matriculados
-        formatos['curso_matriculado'] = workbook.add_format({
-            'bg_color': '#FFEB9C',
-            'border': 1,
-            'font_size': 10
-        })
-        
-        # Formato para cursos reprobados
-        formatos['curso_reprobado'] = workbook.add_format({
-            'bg_color': '#FFC7CE',
-            'border': 1,
-            'font_size': 10
-        })
-        
-        # Formato para cursos sin datos
-        formatos['curso_sin_datos'] = workbook.add_format({
-            'bg_color': '#F2F2F2',
-            'border': 1,
-            'font_size': 10
-        })
-        
-        # Formato para números
-        formatos['numero'] = workbook.add_format({
-            'border': 1,
-            'align': 'center',
-            'font_size': 10
-        })
-        
-        # Formato para texto centrado
-        formatos['texto_centrado'] = workbook.add_format({
-            'border': 1,
-            'align': 'center',
-            'font_size': 10
-        })
-        
-        # Formatos adicionales para nuevas hojas
-        formatos['requisito_cumplido'] = workbook.add_format({
-            'bg_color': '#C6EFCE',
-            'border': 1,
-            'align': 'center',
-            'font_size': 9
-        })
-        
-        formatos['requisito_pendiente'] = workbook.add_format({
-            'bg_color': '#FFEB9C',
-            'border': 1,
-            'align': 'center',
-            'font_size': 9
-        })
-        
-        formatos['curso_pendiente'] = workbook.add_format({
-            'bg_color': '#E6E6FA',
-            'border': 1,
-            'font_size': 10
-        })
-        
-        formatos['numero_grande'] = workbook.add_format({
-            'border': 1,
-            'align': 'center',
-            'font_size': 12,
-            'bold': True
-        })
-        
-        formatos['porcentaje'] = workbook.add_format({
-            'border': 1,
-            'align': 'center',
-            'font_size': 10,
-            'num_format': '0.0%'
-        })
-        
-        return formatos
+        return registrar_formatos(workbook)
 
     def _escribir_encabezado_expediente(
         self, 
@@ -225,7 +366,7 @@ class ExcelWriter:
             
             for curso in semestre.cursos:
                 # Determinar formato según estado
-                formato_curso = self._obtener_formato_curso(curso.get_estado_actual(), formatos)
+                formato_curso = self._obtener_formato_curso(EstadoCurso.codigo(curso.get_estado_actual()), formatos)
                 
                 # Escribir datos del curso
                 worksheet.write(fila, 0, numero_semestre, formato_curso)
@@ -249,27 +390,26 @@ class ExcelWriter:
         worksheet.set_column(6, 6, 8)   # Año
         worksheet.set_column(7, 7, 10)  # Período
 
-    def _obtener_formato_curso(self, estado: str, formatos: Dict[str, Format]) -> Format:
+    def _obtener_formato_curso(self, codigo_estado: int, formatos: FormatosLibro) -> Format:
         """
         Obtiene el formato apropiado según el estado del curso.
         
         Args:
-            estado: Estado del curso
-            formatos: Diccionario de formatos
+            codigo_estado: Código entero del estado del curso (ver EstadoCurso.codigo)
+            formatos: Formatos registrados en el libro
             
         Returns:
             Formato a aplicar
         """
-        if estado in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
-            return formatos['curso_aprobado']
-        elif estado == 'REPROBADO':
-            return formatos['curso_reprobado']
-        elif estado == 'MATRICULADO':
-            return formatos['curso_matriculado']
-        else:
-            return formatos['curso_sin_datos']
+        return formatos.por_estado[codigo_estado]
     
-    def _generar_hoja_malla(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_malla(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja con el formato de malla curricular (formato de mapa).
         
@@ -277,6 +417,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Malla Curricular')
         worksheet.hide_gridlines(2)
@@ -292,15 +433,9 @@ class ExcelWriter:
         worksheet.merge_range(fila, 5, fila, 11, expediente.nombre, formatos['info_estudiante'])
         fila += 2
         
-        # Calcular estadísticas
-        total_creditos_carrera = sum(
-            curso.creditos for semestre in expediente.semestres.values() 
-            for curso in semestre.cursos
-        )
-        creditos_aprobados = sum(
-            curso.creditos for semestre in expediente.semestres.values() 
-            for curso in semestre.cursos if curso.esta_aprobado()
-        )
+        # Estadísticas de créditos
+        total_creditos_carrera = analisis.creditos_plan
+        creditos_aprobados = analisis.creditos_aprobados
         
         # Información de progreso
         worksheet.write(fila, 0, 'Total Créditos Carrera:', formatos['info_estudiante'])
@@ -346,7 +481,7 @@ class ExcelWriter:
                         
                         if k < len(semestre.cursos):
                             curso = semestre.cursos[k]
-                            formato_curso = self._obtener_formato_curso(curso.get_estado_actual(), formatos)
+                            formato_curso = self._obtener_formato_curso(EstadoCurso.codigo(curso.get_estado_actual()), formatos)
                             
                             # Sigla
                             worksheet.write(fila_actual, col_inicio, curso.sigla, formato_curso)
@@ -373,7 +508,13 @@ class ExcelWriter:
             else:  # Columnas de créditos
                 worksheet.set_column(i, i, 6)
 
-    def _generar_hoja_expediente(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_expediente(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja con el expediente detallado (formato nuevo).
         
@@ -381,6 +522,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Expediente Detallado')
         worksheet.hide_gridlines(2)
@@ -393,7 +535,13 @@ class ExcelWriter:
         # Escribir contenido del expediente
         self._escribir_expediente(expediente, workbook, worksheet, fila, columna, formatos)
 
-    def _generar_hoja_historial(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_historial(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja con el historial completo de todos los cursos.
         
@@ -401,6 +549,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Historial Completo')
         worksheet.hide_gridlines(2)
@@ -424,46 +573,12 @@ class ExcelWriter:
             worksheet.write(fila, i, encabezado, formatos['encabezado'])
         fila += 1
         
-        # Recopilar todo el historial
-        todo_historial = []
-        
-        for numero_semestre in sorted(expediente.semestres.keys()):
-            semestre = expediente.semestres[numero_semestre]
-            for curso in semestre.cursos:
-                if curso.historial:
-                    # Si el curso tiene historial, agregar cada registro
-                    for registro in curso.historial:
-                        todo_historial.append({
-                            'sigla': registro.sigla,
-                            'nombre': registro.nombre,
-                            'creditos': curso.creditos,
-                            'grupo': registro.grupo,
-                            'periodo': registro.periodo,
-                            'anno': registro.anno,
-                            'estado': registro.estado,
-                            'nota': registro.nota or '',
-                            'semestre_plan': numero_semestre
-                        })
-                else:
-                    # Si no tiene historial, agregar con datos del curso
-                    todo_historial.append({
-                        'sigla': curso.sigla,
-                        'nombre': curso.nombre,
-                        'creditos': curso.creditos,
-                        'grupo': '',
-                        'periodo': '',
-                        'anno': '',
-                        'estado': curso.get_estado_actual(),
-                        'nota': curso.get_nota_actual(),
-                        'semestre_plan': numero_semestre
-                    })
-        
-        # Ordenar por año, período, sigla
-        todo_historial.sort(key=lambda x: (x['anno'] or 0, x['periodo'] or 0, x['sigla']))
+        # Historial completo en orden cronológico
+        todo_historial = analisis.historial_completo
         
         # Escribir historial
         for registro in todo_historial:
-            formato_fila = self._obtener_formato_curso(registro['estado'], formatos)
+            formato_fila = self._obtener_formato_curso(EstadoCurso.codigo(registro['estado']), formatos)
             
             worksheet.write(fila, 0, registro['sigla'], formato_fila)
             worksheet.write(fila, 1, registro['nombre'], formato_fila)
@@ -502,7 +617,13 @@ class ExcelWriter:
         worksheet.set_column(7, 7, 8)   # Nota
         worksheet.set_column(8, 8, 12)  # Semestre Plan
 
-    def _generar_hoja_analisis_semestres(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_analisis_semestres(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja de análisis por semestres cronológicos.
         
@@ -510,6 +631,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Análisis por Semestres')
         worksheet.hide_gridlines(2)
@@ -527,52 +649,8 @@ class ExcelWriter:
         worksheet.merge_range(fila, 4, fila, 11, expediente.nombre, formatos['info_estudiante'])
         fila += 2
         
-        # Recopilar datos por período cronológico
-        periodos_cronologicos = {}
-        
-        for semestre in expediente.semestres.values():
-            for curso in semestre.cursos:
-                if curso.historial:
-                    for registro in curso.historial:
-                        if registro.anno and registro.periodo:
-                            periodo_key = f"{registro.anno}-{registro.periodo}"
-                            
-                            if periodo_key not in periodos_cronologicos:
-                                periodos_cronologicos[periodo_key] = {
-                                    'año': registro.anno,
-                                    'periodo': registro.periodo,
-                                    'cursos_matriculados': 0,
-                                    'cursos_aprobados': 0,
-                                    'cursos_reprobados': 0,
-                                    'cursos_en_matricula': 0,
-                                    'cursos_retiro': 0,
-                                    'creditos_matriculados': 0,
-                                    'creditos_aprobados': 0,
-                                    'creditos_reprobados': 0,
-                                    'creditos_en_matricula': 0,
-                                    'creditos_retiro': 0
-                                }
-                            
-                            periodo = periodos_cronologicos[periodo_key]
-                            periodo['cursos_matriculados'] += 1
-                            periodo['creditos_matriculados'] += curso.creditos
-                            
-                            if registro.estado in ['APROBADO', 'EQUIVALENTE', 'CONVALIDADO']:
-                                periodo['cursos_aprobados'] += 1
-                                periodo['creditos_aprobados'] += curso.creditos
-                            elif registro.estado == 'REPROBADO':
-                                periodo['cursos_reprobados'] += 1
-                                periodo['creditos_reprobados'] += curso.creditos
-                            elif registro.estado == 'MATRICULADO':
-                                periodo['cursos_en_matricula'] += 1
-                                periodo['creditos_en_matricula'] += curso.creditos
-                            elif 'RETIRO' in registro.estado:
-                                periodo['cursos_retiro'] += 1
-                                periodo['creditos_retiro'] += curso.creditos
-        
-        # Ordenar períodos cronológicamente
-        periodos_ordenados = sorted(periodos_cronologicos.items(), 
-                                  key=lambda x: (x[1]['año'], x[1]['periodo']))
+        # Datos por período en orden cronológico
+        periodos_ordenados = analisis.periodos
         
         # Encabezados
         encabezados = [
@@ -668,7 +746,13 @@ class ExcelWriter:
         
         worksheet.insert_chart(fila_inicio, 0, chart_rendimiento)
 
-    def _generar_hoja_progreso_plan(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_progreso_plan(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja de progreso por semestre del plan de estudios.
         
@@ -676,6 +760,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Progreso del Plan')
         worksheet.hide_gridlines(2)
@@ -753,7 +838,13 @@ class ExcelWriter:
         worksheet.set_column(0, 0, 15)  # Semestre
         worksheet.set_column(1, 7, 12)  # Resto de columnas
 
-    def _generar_hoja_cursos_pendientes(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_cursos_pendientes(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja de cursos pendientes con análisis detallado de requisitos.
         
@@ -761,6 +852,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Cursos Pendientes')
         worksheet.hide_gridlines(2)
@@ -785,34 +877,20 @@ class ExcelWriter:
         worksheet.write(fila, 4, '⚠️ En Matrícula', formatos['curso_matriculado'])
         fila += 2
         
-        # Obtener cursos aprobados y matriculados para verificar requisitos
-        cursos_aprobados = set()
-        cursos_matriculados = set()
-        for semestre in expediente.semestres.values():
-            for curso in semestre.cursos:
-                if curso.esta_aprobado():
-                    cursos_aprobados.add(curso.sigla)
-                elif any(h.estado == 'MATRICULADO' for h in curso.historial):
-                    cursos_matriculados.add(curso.sigla)
+        # Cursos aprobados y matriculados para verificar requisitos
+        cursos_aprobados = analisis.siglas_aprobadas
+        cursos_matriculados = analisis.siglas_matriculadas
         
         # Procesar cursos pendientes
-        cursos_pendientes_data = []
-        
-        for numero_semestre in sorted(expediente.semestres.keys()):
-            semestre = expediente.semestres[numero_semestre]
-            
-            for curso in semestre.cursos:
-                if not curso.esta_aprobado() and not any(h.estado == 'MATRICULADO' for h in curso.historial):
-                    # Este es un curso pendiente
-                    requisitos = self._obtener_requisitos_curso(curso.sigla)
-                    correquisitos = self._obtener_correquisitos_curso(curso.sigla)
-                    
-                    cursos_pendientes_data.append({
-                        'curso': curso,
-                        'semestre': numero_semestre,
-                        'requisitos': requisitos,
-                        'correquisitos': correquisitos
-                    })
+        cursos_pendientes_data = [
+            {
+                'curso': curso,
+                'semestre': numero_semestre,
+                'requisitos': self._obtener_requisitos_curso(curso.sigla),
+                'correquisitos': self._obtener_correquisitos_curso(curso.sigla)
+            }
+            for numero_semestre, curso in analisis.cursos_pendientes
+        ]
         
         if not cursos_pendientes_data:
             worksheet.write(fila, 0, 'No hay cursos pendientes. ¡Felicidades!', formatos['curso_aprobado'])
@@ -851,13 +929,8 @@ class ExcelWriter:
                     correquisitos_status.append(f"✗ {correq}")
             
             # Determinar si puede matricular
-            requisitos_cumplidos = all(req in cursos_aprobados for req in requisitos) if requisitos else True
-            correquisitos_disponibles = all(
-                correq in cursos_aprobados or correq in cursos_matriculados or self._curso_disponible(correq, expediente) 
-                for correq in correquisitos
-            ) if correquisitos else True
-            
-            puede_matricular = requisitos_cumplidos and correquisitos_disponibles
+            puede_matricular = self._puede_matricular_curso(data, analisis)
+            data['puede_matricular'] = puede_matricular
             
             # Escribir datos principales del curso
             formato_curso = formatos['curso_aprobado'] if puede_matricular else formatos['curso_pendiente']
@@ -932,8 +1005,7 @@ class ExcelWriter:
         
         # Resumen final
         fila += 2
-        puede_matricular_count = sum(1 for data in cursos_pendientes_data 
-                                   if self._puede_matricular_curso(data, cursos_aprobados, cursos_matriculados, expediente))
+        puede_matricular_count = sum(1 for data in cursos_pendientes_data if data['puede_matricular'])
         total_pendientes = len(cursos_pendientes_data)
         
         worksheet.write(fila, 0, 'RESUMEN:', formatos['encabezado'])
@@ -955,7 +1027,13 @@ class ExcelWriter:
         worksheet.set_column(7, 7, 15)  # Estado Correq
         worksheet.set_column(8, 8, 15)  # Puede Matricular
 
-    def _generar_hoja_cursos_reprobados(self, workbook: Workbook, expediente: Expediente, formatos: Dict[str, Format]) -> None:
+    def _generar_hoja_cursos_reprobados(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
         """
         Genera la hoja de cursos reprobados con su historial.
         
@@ -963,6 +1041,7 @@ class ExcelWriter:
             workbook: Libro de Excel
             expediente: Expediente del estudiante
             formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
         """
         worksheet = workbook.add_worksheet('Cursos Reprobados')
         worksheet.hide_gridlines(2)
@@ -980,23 +1059,8 @@ class ExcelWriter:
         worksheet.merge_range(fila, 4, fila, 6, expediente.nombre, formatos['info_estudiante'])
         fila += 2
         
-        # Recopilar cursos con estado reprobado o retiro
-        cursos_problema = {}
-        
-        for semestre in expediente.semestres.values():
-            for curso in semestre.cursos:
-                if curso.historial:
-                    registros_problema = [h for h in curso.historial 
-                                        if h.estado in ['REPROBADO', 'RETIRO', 'RETIRO DE MATRÍCULA']]
-                    
-                    if registros_problema:
-                        if curso.sigla not in cursos_problema:
-                            cursos_problema[curso.sigla] = {
-                                'nombre': curso.nombre,
-                                'creditos': curso.creditos,
-                                'registros': []
-                            }
-                        cursos_problema[curso.sigla]['registros'].extend(registros_problema)
+        # Cursos con estado reprobado o retiro
+        cursos_problema = analisis.cursos_problema
         
         if not cursos_problema:
             worksheet.write(fila, 0, 'No hay cursos reprobados o con retiros.', formatos['info_estudiante'])
@@ -1050,61 +1114,60 @@ class ExcelWriter:
         worksheet.set_column(5, 5, 8)   # Nota
         worksheet.set_column(6, 6, 25)  # Observaciones
 
+    def _generar_hoja_equiparacion(
+        self,
+        workbook: Workbook,
+        expediente: Expediente,
+        formatos: Dict[str, Format],
+        analisis: AnalisisExpediente
+    ) -> None:
+        """
+        Genera la hoja de equiparación al nuevo plan de estudios.
+        
+        Args:
+            workbook: Libro de Excel
+            expediente: Expediente del estudiante
+            formatos: Diccionario de formatos
+            analisis: Datos derivados del expediente
+        """
+        from .equiparacion_analyzer import EquiparacionAnalyzer
+        
+        EquiparacionAnalyzer().escribir_hoja(workbook, expediente)
+
     def _obtener_requisitos_curso(self, sigla: str) -> list:
         """
-        Obtiene los requisitos de un curso desde la configuración.
+        Obtiene los requisitos de un curso desde el índice del plan de estudios.
         """
-        try:
-            import config
-            for curso_dict in config.detalle_cursos:
-                if curso_dict.get('sigla') == sigla:
-                    return curso_dict.get('requisitos', [])
-        except Exception:
-            pass
-        
-        return []
+        return list(obtener_indice_curricular().requisitos(sigla))
 
     def _obtener_correquisitos_curso(self, sigla: str) -> list:
         """
-        Obtiene los correquisitos de un curso desde la configuración.
+        Obtiene los correquisitos de un curso desde el índice del plan de estudios.
         """
-        try:
-            import config
-            for curso_dict in config.detalle_cursos:
-                if curso_dict.get('sigla') == sigla:
-                    return curso_dict.get('correquisitos', [])
-        except Exception:
-            pass
-            
-        return []
+        return list(obtener_indice_curricular().correquisitos(sigla))
 
-    def _puede_matricular_curso(self, curso_data: dict, cursos_aprobados: set, cursos_matriculados: set, expediente: Expediente) -> bool:
+    def _puede_matricular_curso(self, curso_data: dict, analisis: AnalisisExpediente) -> bool:
         """
         Determina si un curso puede ser matriculado basado en sus requisitos.
         """
-        requisitos = curso_data['requisitos']
-        correquisitos = curso_data['correquisitos']
+        cursos_aprobados = analisis.siglas_aprobadas
         
         # Verificar requisitos
-        requisitos_cumplidos = all(req in cursos_aprobados for req in requisitos) if requisitos else True
+        requisitos_cumplidos = all(req in cursos_aprobados for req in curso_data['requisitos'])
         
         # Verificar correquisitos
         correquisitos_disponibles = all(
-            correq in cursos_aprobados or correq in cursos_matriculados or self._curso_disponible(correq, expediente) 
-            for correq in correquisitos
-        ) if correquisitos else True
+            correq in cursos_aprobados or self._curso_disponible(correq, analisis)
+            for correq in curso_data['correquisitos']
+        )
         
         return requisitos_cumplidos and correquisitos_disponibles
 
-    def _curso_disponible(self, sigla: str, expediente: Expediente) -> bool:
+    def _curso_disponible(self, sigla: str, analisis: AnalisisExpediente) -> bool:
         """
         Verifica si un curso está disponible para matrícula.
         """
-        for semestre in expediente.semestres.values():
-            for curso in semestre.cursos:
-                if curso.sigla == sigla:
-                    return any(h.estado == 'MATRICULADO' for h in curso.historial)
-        return False
+        return sigla in analisis.siglas_en_matricula
 
     def _generar_observacion_reprobado(self, registro, intento: int) -> str:
         """
@@ -1118,3 +1181,19 @@ class ExcelWriter:
             return "⚠️ Tercer intento - Revisar estrategia"
         else:
             return f"⚠️ Intento #{intento} - Requiere intervención"
+
+
+# Hojas disponibles; los perfiles definen cuáles se generan y en qué orden
+ExcelWriter.registrar_hoja(
+    'Malla Curricular', ExcelWriter._generar_hoja_malla, ('creditos_plan', 'creditos_aprobados')
+)
+ExcelWriter.registrar_hoja('Expediente Detallado', ExcelWriter._generar_hoja_expediente)
+ExcelWriter.registrar_hoja('Historial Completo', ExcelWriter._generar_hoja_historial, ('historial_completo',))
+ExcelWriter.registrar_hoja('Análisis por Semestres', ExcelWriter._generar_hoja_analisis_semestres, ('periodos',))
+ExcelWriter.registrar_hoja('Progreso del Plan', ExcelWriter._generar_hoja_progreso_plan)
+ExcelWriter.registrar_hoja(
+    'Cursos Pendientes', ExcelWriter._generar_hoja_cursos_pendientes,
+    ('cursos_pendientes', 'siglas_aprobadas', 'siglas_matriculadas', 'siglas_en_matricula')
+)
+ExcelWriter.registrar_hoja('Cursos Reprobados', ExcelWriter._generar_hoja_cursos_reprobados, ('cursos_problema',))
+ExcelWriter.registrar_hoja('Equiparación', ExcelWriter._generar_hoja_equiparacion)
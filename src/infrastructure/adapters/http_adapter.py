@@ -5,6 +5,7 @@ import ssl
 import urllib3
 import requests
 from typing import Dict, Optional
+from ...shared.instrumentacion import medido, metricas
 
 
 class CustomHttpAdapter(requests.adapters.HTTPAdapter):
@@ -65,6 +66,7 @@ class HttpAdapter:
         
         return session
 
+    @medido('http.autenticar')
     def autenticar(self, url_login: str, datos_login: Dict[str, str]) -> bool:
         """
         Autentica al usuario en el sistema.
@@ -83,6 +85,7 @@ class HttpAdapter:
         except Exception:
             return False
 
+    @medido('http.obtener')
     def obtener_contenido(self, url: str) -> str:
         """
         Obtiene el contenido de una URL usando la sesión autenticada.
@@ -102,6 +105,7 @@ class HttpAdapter:
         try:
             response = self.session.get(url)
             response.raise_for_status()
+            metricas.contar('http.bytes', len(response.content))
             return response.text
         except requests.RequestException as e:
             raise ValueError(f"Error al obtener contenido: {str(e)}")
@@ -0,0 +1,210 @@
+"""
+Lectura del texto de expedientes y prematrículas copiado desde el sistema de matrícula
+"""
+import heapq
+import re
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional
+
+
+MARCA_EXPEDIENTE = 'Expediente académico'
+MARCA_PREMATRICULA = 'Cursos solicitados en prematrícula'
+
+ENCABEZADO_COMENTARIO_ESTUDIANTE = 'comentario del estudiante'
+ENCABEZADO_COMENTARIO_PROFESOR = 'comentario hacia el estudiante'
+
+# Comentarios vacíos: en su lugar el texto muestra la línea siguiente del formulario
+SIN_COMENTARIO_ESTUDIANTE = 'Cantidad de créditos solicitados'
+SIN_COMENTARIO_PROFESOR = '* Cursos con Declaración Jurada'
+
+# Patrones de una línea, compilados una sola vez
+_CARNE = re.compile(r'Carné:\s+([A-Z]?\d{5})\s*$')
+_CARNE_NOMBRE = re.compile(r'Carné:\s+([A-Z]?\d{5})\s+([\w\s]+)$')
+_NOMBRE = re.compile(r'Nombre:\s+([\w\s]+)$')
+_CURSO_SOLICITADO = re.compile(
+    r'(\*?)[ ]?([A-Z]{2}\d{4}|[A-Z]{2}-[A-Z]|[A-Z]{2}-[I]{1,3})\s*'
+    r'([\.:\dA-Z\(\) ÁÉÍÓÚÑ]+)\s+(\d{1,2})'
+)
+_CURSO_HISTORIAL = re.compile(
+    r'([A-Z]{2}\d{4})\s+([\.:\dA-Z\(\) ÁÉÍÓÚÑ]+)\s+(\d{1,2})\s+'
+    r'(\d{1,3})\s+([I]{1,3})\s+(\d{4})\s+([A-ZÁÉÍÓÚÑ ]+)\s+(.+)$'
+)
+
+
+@dataclass
+class TextoMemoria:
+    """Datos leídos de un texto copiado."""
+    tipo: str  # 'exp' para expediente, 'pre' para prematrícula
+    carne: str = ''
+    nombre: str = ''
+    comentario_estudiante: str = ''
+    comentario_profesor: str = ''
+    # Historial (SIGLA, CURSO, CREDITOS, GRUPO, SEM, AÑO, ESTADO, NOTA) del expediente, o
+    # cursos solicitados (SIGLA, CURSO, CREDITOS, AUTORIZACION, DEC) de la prematrícula
+    cursos: List[Dict[str, str]] = field(default_factory=list)
+
+
+def identificar_tipo(texto: str) -> Optional[str]:
+    """
+    Identifica el tipo de un texto copiado.
+
+    Returns:
+        'pre' para prematrícula, 'exp' para expediente, None si no se identifica
+    """
+    if MARCA_PREMATRICULA in texto:
+        return 'pre'
+    if MARCA_EXPEDIENTE in texto:
+        return 'exp'
+    return None
+
+
+def dividir_registros(texto: str) -> List[str]:
+    """
+    Divide un texto con varios expedientes y prematrículas, por ejemplo una página
+    completa copiada o exportada, en un texto por estudiante.
+
+    Un registro empieza en la línea con la marca de expediente o de prematrícula. Una
+    marca que aparece antes del carné del registro en curso no inicia otro registro,
+    de modo que una página que menciona ambas marcas no se divide. Se descartan el
+    texto anterior a la primera marca y el último registro si no tiene carné. Si el
+    texto no tiene CRLF, como un volcado guardado en Linux, sus saltos de línea se
+    convierten a CRLF.
+
+    Las marcas y los carnés se ubican con str.find, que recorre el texto mucho más
+    rápido que un patrón con alternativas, y se procesan en orden de posición.
+
+    Args:
+        texto: Texto con cero o más registros
+
+    Returns:
+        Textos de cada registro, en el orden en que aparecen
+    """
+    if '\r\n' not in texto:
+        texto = texto.replace('\n', '\r\n')
+
+    eventos = heapq.merge(
+        ((posicion, True) for posicion in _posiciones(texto, MARCA_EXPEDIENTE)),
+        ((posicion, True) for posicion in _posiciones(texto, MARCA_PREMATRICULA)),
+        ((posicion, False) for posicion in _posiciones(texto, 'Carné:')),
+    )
+    inicios: List[int] = []
+    con_carne = False
+    for posicion, es_marca in eventos:
+        if not es_marca:
+            con_carne = bool(inicios)
+        elif not inicios or con_carne:
+            inicios.append(texto.rfind('\n', 0, posicion) + 1)
+            con_carne = False
+
+    registros = [texto[inicio:fin] for inicio, fin in zip(inicios, inicios[1:] + [len(texto)])]
+    if registros and not con_carne:
+        registros.pop()
+    return registros
+
+
+def _posiciones(texto: str, literal: str) -> Iterator[int]:
+    """Posiciones de todas las apariciones de un texto literal."""
+    posicion = texto.find(literal)
+    while posicion != -1:
+        yield posicion
+        posicion = texto.find(literal, posicion + len(literal))
+
+
+def analizar_texto_memoria(texto: str) -> Optional[TextoMemoria]:
+    """
+    Lee un expediente o una prematrícula recorriendo el texto una sola vez, línea por
+    línea, y obtiene juntos el encabezado, los comentarios y los cursos.
+
+    Cada línea se revisa primero con comparaciones de texto y solo se aplica el patrón
+    de su tipo. Las líneas deben terminar en CRLF, como las copia el navegador; la
+    última se ignora si no termina así. En una prematrícula, la línea que sigue a cada
+    curso es su autorización.
+
+    Args:
+        texto: Texto copiado
+
+    Returns:
+        Datos leídos, o None si el texto no es un expediente ni una prematrícula
+    """
+    tipo = identificar_tipo(texto)
+    if tipo is None:
+        return None
+
+    datos = TextoMemoria(tipo)
+    lineas = texto.split('\r\n')
+    lineas.pop()
+
+    if tipo == 'pre':
+        _leer_prematricula(lineas, datos)
+        datos.cursos.sort(key=itemgetter('SIGLA'))
+    else:
+        _leer_expediente(lineas, datos)
+        datos.cursos.sort(key=itemgetter('AÑO', 'SEM', 'SIGLA'))
+    return datos
+
+
+def _leer_expediente(lineas: List[str], datos: TextoMemoria) -> None:
+    """Lee el carné, el nombre y el historial de las líneas de un expediente."""
+    buscar_curso = _CURSO_HISTORIAL.search
+    cursos = datos.cursos
+    for linea in lineas:
+        if not datos.carne and 'Carné:' in linea:
+            coincidencia = _CARNE_NOMBRE.search(linea)
+            if coincidencia:
+                datos.carne, datos.nombre = coincidencia.group(1), coincidencia.group(2).strip()
+                continue
+
+        coincidencia = buscar_curso(linea)
+        if coincidencia:
+            sigla, curso, creditos, grupo, semestre, anno, estado, nota = coincidencia.groups()
+            cursos.append({
+                'SIGLA': sigla, 'CURSO': curso, 'CREDITOS': creditos, 'GRUPO': grupo,
+                'SEM': semestre, 'AÑO': anno, 'ESTADO': estado, 'NOTA': nota
+            })
+
+
+def _leer_prematricula(lineas: List[str], datos: TextoMemoria) -> None:
+    """Lee el carné, el nombre, los comentarios y los cursos de una prematrícula."""
+    buscar_curso = _CURSO_SOLICITADO.search
+    cursos = datos.cursos
+    comentario_estudiante = comentario_profesor = None  # Índice de la línea del comentario
+    autorizacion: Optional[Dict[str, str]] = None  # Curso que espera la línea de autorización
+
+    for indice, linea in enumerate(lineas):
+        if autorizacion is not None:
+            autorizacion['AUTORIZACION'] = linea.strip()
+            autorizacion = None
+            continue
+
+        if indice == comentario_estudiante:
+            datos.comentario_estudiante = '' if linea.startswith(SIN_COMENTARIO_ESTUDIANTE) else linea
+        if indice == comentario_profesor:
+            if not linea.strip():
+                comentario_profesor += 1  # Se omiten las líneas en blanco antes del comentario
+            elif not linea.startswith(SIN_COMENTARIO_PROFESOR):
+                datos.comentario_profesor = linea
+
+        if 'Carné:' in linea:
+            coincidencia = not datos.carne and _CARNE.search(linea)
+            if coincidencia:
+                datos.carne = coincidencia.group(1)
+            continue
+        if 'Nombre:' in linea:
+            coincidencia = not datos.nombre and _NOMBRE.search(linea)
+            if coincidencia:
+                datos.nombre = coincidencia.group(1).strip()
+            continue
+        if comentario_estudiante is None and linea.lower().endswith(ENCABEZADO_COMENTARIO_ESTUDIANTE):
+            comentario_estudiante = indice + 1
+        elif comentario_profesor is None and linea.rstrip().lower().endswith(ENCABEZADO_COMENTARIO_PROFESOR):
+            comentario_profesor = indice + 1
+
+        coincidencia = buscar_curso(linea)
+        if coincidencia and indice + 1 < len(lineas):
+            declaracion, sigla, curso, creditos = coincidencia.groups()
+            autorizacion = {
+                'SIGLA': sigla, 'CURSO': curso, 'CREDITOS': creditos, 'AUTORIZACION': '',
+                'DEC': 'SI' if declaracion == '*' else 'NO'
+            }
+            cursos.append(autorizacion)
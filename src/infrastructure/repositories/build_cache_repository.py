@@ -0,0 +1,173 @@
+"""
+Repositorio de la caché de construcción de archivos Excel
+"""
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ...shared.config.settings import DETALLE_CURSOS
+from ...shared.config.tabla_equivalencias import TablaEquivalencias, obtener_tabla_equivalencias
+
+
+# Hoja cuyo contenido depende también de la tabla de equivalencias
+HOJA_EQUIPARACION = 'Equiparación'
+
+
+@lru_cache(maxsize=1)
+def huella_curriculo() -> str:
+    """
+    Calcula la huella del plan de estudios configurado.
+    Se calcula una sola vez por proceso.
+
+    Returns:
+        Huella hexadecimal de DETALLE_CURSOS
+    """
+    contenido = json.dumps(DETALLE_CURSOS, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def huella_plan(hojas: Sequence[str], tabla: Optional[TablaEquivalencias] = None) -> str:
+    """
+    Calcula la huella del plan que usan las hojas seleccionadas.
+
+    Si se genera la hoja de equiparación, la huella incluye la tabla de equivalencias,
+    de modo que editar la tabla invalida los archivos generados con ella.
+
+    Args:
+        hojas: Nombres de las hojas seleccionadas
+        tabla: Tabla de equivalencias (por defecto la del plan nuevo)
+
+    Returns:
+        Huella hexadecimal para el argumento huella_plan de calcular_huella
+    """
+    if HOJA_EQUIPARACION not in hojas:
+        return huella_curriculo()
+    tabla = tabla or obtener_tabla_equivalencias()
+    return hashlib.sha256(f'{huella_curriculo()}:{tabla.huella}'.encode('utf-8')).hexdigest()
+
+
+class BuildCacheRepository:
+    """
+    Repositorio que recuerda con qué entradas se generó cada archivo de salida.
+
+    Un archivo se considera actualizado cuando existe en disco y la huella de sus
+    entradas (historial, plan de estudios y tabla de equivalencias, versión del
+    generador y hojas seleccionadas) coincide con la registrada en la última generación.
+    """
+
+    ARCHIVO_CACHE = '.cache_excel.json'
+
+    def __init__(self, directorio_salida: Path):
+        """
+        Inicializa la caché de construcción.
+
+        Args:
+            directorio_salida: Directorio donde se generan los archivos Excel
+        """
+        self.directorio_salida = Path(directorio_salida)
+        self.ruta_cache = self.directorio_salida / self.ARCHIVO_CACHE
+        self._entradas: Dict[str, str] = self._leer()
+        self._modificada = False
+
+    @staticmethod
+    def calcular_huella(
+        carne: str,
+        nombre: str,
+        historial: Iterable[Dict[str, str]],
+        version_generador: str,
+        hojas: Sequence[str],
+        huella_plan: Optional[str] = None
+    ) -> str:
+        """
+        Calcula la huella de las entradas que determinan un archivo de salida.
+
+        Args:
+            carne: Carné del estudiante
+            nombre: Nombre del estudiante
+            historial: Filas del historial académico
+            version_generador: Versión del generador de Excel
+            hojas: Nombres de las hojas seleccionadas
+            huella_plan: Huella del plan de estudios (por defecto la configurada)
+
+        Returns:
+            Huella hexadecimal de las entradas
+        """
+        filas: List[List[str]] = sorted(
+            sorted((str(k), str(v)) for k, v in fila.items()) for fila in historial
+        )
+        contenido = json.dumps(
+            {
+                'carne': carne,
+                'nombre': nombre,
+                'historial': filas,
+                'plan': huella_plan or huella_curriculo(),
+                'version': version_generador,
+                'hojas': list(hojas),
+            },
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def esta_actualizado(self, nombre_archivo: str, huella: str) -> bool:
+        """
+        Verifica si un archivo de salida ya fue generado con las mismas entradas.
+
+        Args:
+            nombre_archivo: Nombre del archivo dentro del directorio de salida
+            huella: Huella de las entradas actuales
+
+        Returns:
+            True si el archivo existe y su huella coincide
+        """
+        return (
+            self._entradas.get(nombre_archivo) == huella
+            and (self.directorio_salida / nombre_archivo).exists()
+        )
+
+    def registrar(self, nombre_archivo: str, huella: str) -> None:
+        """
+        Registra la huella con la que se generó un archivo.
+
+        Args:
+            nombre_archivo: Nombre del archivo dentro del directorio de salida
+            huella: Huella de las entradas usadas
+        """
+        if self._entradas.get(nombre_archivo) != huella:
+            self._entradas[nombre_archivo] = huella
+            self._modificada = True
+
+    def invalidar(self, nombre_archivo: str) -> None:
+        """
+        Elimina la huella registrada para un archivo.
+
+        Args:
+            nombre_archivo: Nombre del archivo dentro del directorio de salida
+        """
+        if self._entradas.pop(nombre_archivo, None) is not None:
+            self._modificada = True
+
+    def guardar(self) -> None:
+        """Persiste la caché en disco si hubo cambios."""
+        if not self._modificada:
+            return
+
+        self.directorio_salida.mkdir(parents=True, exist_ok=True)
+        temporal = self.ruta_cache.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self._entradas, archivo, ensure_ascii=False, indent=1, sort_keys=True)
+        temporal.replace(self.ruta_cache)
+        self._modificada = False
+
+    def _leer(self) -> Dict[str, str]:
+        """Lee la caché desde disco; una caché dañada se descarta."""
+        if not self.ruta_cache.exists():
+            return {}
+        try:
+            with open(self.ruta_cache, 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+            return datos if isinstance(datos, dict) else {}
+        except (OSError, ValueError):
+            return {}
@@ -3,8 +3,9 @@ Repositorio para manejo de archivos del sistema
 """
 import os
 import csv
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
+from ...shared.instrumentacion import medido
 
 
 class FileRepository:
@@ -23,6 +24,7 @@ class FileRepository:
         self.directorio_expedientes = self.base_path / 'expediente'
         self.directorio_solicitudes = self.base_path / 'solicitudes'
         self.directorio_salida = self.base_path / 'salida'
+        self.directorio_reportes = self.directorio_salida / 'reportes'
 
     def _asegurar_directorio(self, directorio: Path) -> None:
         """
@@ -33,6 +35,7 @@ class FileRepository:
         """
         directorio.mkdir(parents=True, exist_ok=True)
 
+    @medido('repositorio.escribir_historial')
     def escribir_historial(
         self, 
         archivo: str, 
@@ -48,15 +51,17 @@ class FileRepository:
             historial: Lista de diccionarios con los datos del historial
         """
         self._asegurar_directorio(self.directorio_expedientes)
-        
-        archivo_path = self.directorio_expedientes / f'{archivo}.sdf'
-        
+        self._escribir_tabla(self.directorio_expedientes / f'{archivo}.sdf', encabezado, historial)
+
+    @staticmethod
+    def _escribir_tabla(archivo_path: Path, encabezado: List[str], filas: Iterable[Dict[str, str]]) -> None:
+        """Escribe filas separadas por tabuladores con su encabezado."""
         with open(archivo_path, 'w', newline='', encoding='latin-1') as file:
             writer = csv.DictWriter(file, fieldnames=encabezado, delimiter='\t', dialect='excel')
             writer.writeheader()
-            for registro in historial:
-                writer.writerow(registro)
+            writer.writerows(filas)
 
+    @medido('repositorio.leer_historial')
     def leer_historial(self, archivo: str) -> List[Dict[str, str]]:
         """
         Lee el historial académico de un estudiante desde un archivo.
@@ -98,6 +103,7 @@ class FileRepository:
         
         return historial
 
+    @medido('repositorio.escribir_informacion')
     def escribir_informacion_estudiante(self, archivo: str, carne: str, nombre: str) -> None:
         """
         Escribe la información básica de un estudiante a un archivo.
@@ -108,13 +114,16 @@ class FileRepository:
             nombre: Nombre del estudiante
         """
         self._asegurar_directorio(self.directorio_expedientes)
-        
-        archivo_path = self.directorio_expedientes / f'{archivo}.edf'
-        
+        self._escribir_informacion(self.directorio_expedientes / f'{archivo}.edf', carne, nombre)
+
+    @staticmethod
+    def _escribir_informacion(archivo_path: Path, carne: str, nombre: str) -> None:
+        """Escribe el carné y el nombre de un estudiante."""
         with open(archivo_path, 'w', encoding='latin-1') as file:
             file.write(f'{carne}\n')
             file.write(nombre)
 
+    @medido('repositorio.leer_informacion')
     def leer_informacion_estudiante(self, archivo: str) -> tuple[str, str]:
         """
         Lee la información básica de un estudiante desde un archivo.
@@ -168,14 +177,7 @@ class FileRepository:
             cursos_solicitados: Lista de diccionarios con los cursos solicitados
         """
         self._asegurar_directorio(self.directorio_solicitudes)
-        
-        archivo_path = self.directorio_solicitudes / f'{archivo}.sdf'
-        
-        with open(archivo_path, 'w', newline='', encoding='latin-1') as file:
-            writer = csv.DictWriter(file, fieldnames=encabezado, delimiter='\t', dialect='excel')
-            writer.writeheader()
-            for curso in cursos_solicitados:
-                writer.writerow(curso)
+        self._escribir_tabla(self.directorio_solicitudes / f'{archivo}.sdf', encabezado, cursos_solicitados)
 
     def escribir_comentarios(self, archivo: str, estudiante: str, revision: str) -> None:
         """
@@ -187,13 +189,65 @@ class FileRepository:
             revision: Comentarios de revisión
         """
         self._asegurar_directorio(self.directorio_solicitudes)
-        
-        archivo_path = self.directorio_solicitudes / f'{archivo}.edf'
-        
+        self._escribir_comentarios(self.directorio_solicitudes / f'{archivo}.edf', estudiante, revision)
+
+    @staticmethod
+    def _escribir_comentarios(archivo_path: Path, estudiante: str, revision: str) -> None:
+        """Escribe el comentario del estudiante y el de revisión."""
         with open(archivo_path, 'w', encoding='latin-1') as file:
             file.write(f'estudiante:{estudiante}\n')
             file.write(f'rev:{revision}')
 
+    @medido('repositorio.escribir_lote_expedientes')
+    def escribir_expedientes(
+        self,
+        encabezado: List[str],
+        expedientes: Iterable[Tuple[str, str, List[Dict[str, str]]]]
+    ) -> int:
+        """
+        Escribe la información y el historial de varios estudiantes, como
+        escribir_informacion_estudiante y escribir_historial con el carné como nombre.
+        
+        Args:
+            encabezado: Lista con los nombres de las columnas del historial
+            expedientes: Tuplas (carné, nombre, historial)
+        
+        Returns:
+            Cantidad de expedientes escritos
+        """
+        self._asegurar_directorio(self.directorio_expedientes)
+        cantidad = 0
+        for carne, nombre, historial in expedientes:
+            self._escribir_informacion(self.directorio_expedientes / f'{carne}.edf', carne, nombre)
+            self._escribir_tabla(self.directorio_expedientes / f'{carne}.sdf', encabezado, historial)
+            cantidad += 1
+        return cantidad
+
+    @medido('repositorio.escribir_lote_solicitudes')
+    def escribir_solicitudes(
+        self,
+        encabezado: List[str],
+        solicitudes: Iterable[Tuple[str, List[Dict[str, str]], str, str]]
+    ) -> int:
+        """
+        Escribe los cursos solicitados y los comentarios de varios estudiantes, como
+        escribir_cursos_solicitados y escribir_comentarios con el carné como nombre.
+        
+        Args:
+            encabezado: Lista con los nombres de las columnas de los cursos
+            solicitudes: Tuplas (carné, cursos, comentario del estudiante, comentario de revisión)
+        
+        Returns:
+            Cantidad de solicitudes escritas
+        """
+        self._asegurar_directorio(self.directorio_solicitudes)
+        cantidad = 0
+        for carne, cursos, estudiante, revision in solicitudes:
+            self._escribir_tabla(self.directorio_solicitudes / f'{carne}.sdf', encabezado, cursos)
+            self._escribir_comentarios(self.directorio_solicitudes / f'{carne}.edf', estudiante, revision)
+            cantidad += 1
+        return cantidad
+
     def listar_archivos_expedientes(self) -> List[str]:
         """
         Lista todos los archivos de expedientes disponibles.
@@ -208,6 +262,66 @@ class FileRepository:
             archivo.name for archivo in self.directorio_expedientes.glob('*.edf')
         ]
 
+    def iterar_expedientes(
+        self, errores: Optional[List[Tuple[str, str]]] = None
+    ) -> Iterator[Tuple[str, str, List[Dict[str, str]]]]:
+        """
+        Recorre los expedientes disponibles leyendo un estudiante a la vez.
+        
+        Los estudiantes sin archivo de historial se entregan con historial vacío.
+        
+        Args:
+            errores: Lista donde anotar (carné, error) de los expedientes que no se
+                pueden leer; si se indica, esos estudiantes se omiten y el recorrido
+                continúa. Sin ella el error se propaga.
+        
+        Yields:
+            Tuplas (carné, nombre, historial) en orden de nombre de archivo
+        """
+        for archivo in sorted(self.listar_archivos_expedientes()):
+            carne = archivo.replace('.edf', '')
+            try:
+                _, nombre = self.leer_informacion_estudiante(carne)
+                try:
+                    historial = self.leer_historial(carne)
+                except FileNotFoundError:
+                    historial = []
+            except Exception as e:
+                if errores is None:
+                    raise
+                errores.append((carne, str(e)))
+                continue
+            yield carne, nombre, historial
+
+    def escribir_reporte(
+        self,
+        nombre_archivo: str,
+        encabezado: List[str],
+        filas: List[Dict[str, object]]
+    ) -> Path:
+        """
+        Escribe un reporte tabular separado por tabuladores en el directorio de reportes.
+        
+        Args:
+            nombre_archivo: Nombre del archivo del reporte
+            encabezado: Lista con los nombres de las columnas
+            filas: Lista de diccionarios con los datos del reporte
+        
+        Returns:
+            Ruta completa del reporte escrito
+        """
+        self._asegurar_directorio(self.directorio_reportes)
+        
+        archivo_path = self.directorio_reportes / nombre_archivo
+        
+        with open(archivo_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=encabezado, delimiter='\t', dialect='excel')
+            writer.writeheader()
+            for fila in filas:
+                writer.writerow(fila)
+        
+        return archivo_path
+
     def obtener_ruta_salida(self, nombre_archivo: str) -> Path:
         """
         Obtiene la ruta completa para un archivo de salida.
@@ -0,0 +1,425 @@
+"""
+Repositorio histórico de corridas de descarga con codificación por deltas
+"""
+import gzip
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_repository import FileRepository
+
+
+# Estado de una corrida: carné -> {'nombre': str, 'filas': {llave: fila}}
+EstadoCorrida = Dict[str, Dict[str, object]]
+
+
+@dataclass
+class CambiosEstudiante:
+    """
+    Cambios en el historial de un estudiante entre dos corridas.
+    """
+    carne: str
+    nombre: str
+    agregados: List[Dict[str, str]] = field(default_factory=list)
+    modificados: List[Tuple[Dict[str, str], Dict[str, str]]] = field(default_factory=list)
+    eliminados: List[Dict[str, str]] = field(default_factory=list)
+    estudiante_nuevo: bool = False
+    estudiante_eliminado: bool = False
+
+    def tiene_cambios(self) -> bool:
+        """Verifica si hubo algún cambio para el estudiante."""
+        return bool(
+            self.agregados or self.modificados or self.eliminados
+            or self.estudiante_nuevo or self.estudiante_eliminado
+        )
+
+
+class SnapshotRepository:
+    """
+    Repositorio que conserva cada corrida de descarga como un delta respecto a la anterior.
+
+    Cada corrida guarda únicamente las filas de historial agregadas o modificadas
+    y las llaves eliminadas por estudiante. Cada ``intervalo_completo`` corridas se
+    guarda una copia completa, de modo que reconstruir cualquier corrida nunca
+    requiere aplicar más de ``intervalo_completo - 1`` deltas.
+    """
+
+    ARCHIVO_INDICE = 'indice.json'
+
+    def __init__(self, base_path: str = '.', intervalo_completo: int = 10):
+        """
+        Inicializa el repositorio histórico.
+
+        Args:
+            base_path: Ruta base donde se creará el directorio 'historico'
+            intervalo_completo: Cada cuántas corridas se guarda una copia completa
+        """
+        if intervalo_completo < 1:
+            raise ValueError("El intervalo de copias completas debe ser al menos 1")
+
+        self.directorio_historico = Path(base_path) / 'historico'
+        self.directorio_corridas = self.directorio_historico / 'corridas'
+        self.intervalo_completo = intervalo_completo
+        self._cache_estado: Optional[Tuple[str, EstadoCorrida]] = None
+
+    # ------------------------------------------------------------------
+    # Registro de corridas
+    # ------------------------------------------------------------------
+
+    def registrar_corrida(
+        self,
+        estudiantes: Dict[str, Tuple[str, List[Dict[str, str]]]],
+        fecha: Optional[datetime] = None
+    ) -> str:
+        """
+        Registra una nueva corrida a partir del estado actual de los estudiantes.
+
+        Args:
+            estudiantes: Diccionario carné -> (nombre, historial)
+            fecha: Fecha de la corrida (por defecto la fecha actual)
+
+        Returns:
+            Identificador de la corrida registrada
+        """
+        fecha = fecha or datetime.now()
+        indice = self._leer_indice()
+        numero = len(indice) + 1
+        id_corrida = f'{numero:05d}-{fecha:%Y%m%d%H%M%S}'
+
+        estado_nuevo: EstadoCorrida = {
+            carne: {'nombre': nombre, 'filas': self._indexar_filas(historial)}
+            for carne, (nombre, historial) in estudiantes.items()
+        }
+
+        completa = not indice or (numero - 1) % self.intervalo_completo == 0
+        if completa:
+            contenido = {
+                'completa': True,
+                'estudiantes': {
+                    carne: {'nombre': datos['nombre'], 'agregados': datos['filas']}
+                    for carne, datos in estado_nuevo.items()
+                }
+            }
+        else:
+            estado_anterior = self.reconstruir_corrida(indice[-1]['id'])
+            contenido = {
+                'completa': False,
+                'estudiantes': self._calcular_delta(estado_anterior, estado_nuevo)
+            }
+
+        self._asegurar_directorio()
+        self._escribir_corrida(id_corrida, contenido)
+
+        indice.append({
+            'id': id_corrida,
+            'fecha': fecha.isoformat(timespec='seconds'),
+            'completa': completa,
+            'estudiantes': len(estado_nuevo),
+            'estudiantes_cambiados': len(contenido['estudiantes'])
+        })
+        self._escribir_indice(indice)
+        self._cache_estado = (id_corrida, estado_nuevo)
+
+        return id_corrida
+
+    def registrar_corrida_desde_repositorio(
+        self,
+        file_repo: FileRepository,
+        fecha: Optional[datetime] = None
+    ) -> str:
+        """
+        Registra una corrida con los expedientes presentes en el repositorio de archivos.
+
+        Args:
+            file_repo: Repositorio con los archivos .edf/.sdf de la descarga
+            fecha: Fecha de la corrida (por defecto la fecha actual)
+
+        Returns:
+            Identificador de la corrida registrada
+        """
+        estudiantes = {
+            carne: (nombre, historial)
+            for carne, nombre, historial in file_repo.iterar_expedientes()
+        }
+        return self.registrar_corrida(estudiantes, fecha)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def listar_corridas(self) -> List[Dict[str, object]]:
+        """
+        Lista las corridas registradas en orden cronológico.
+
+        Returns:
+            Lista de diccionarios con id, fecha y estadísticas de cada corrida
+        """
+        return self._leer_indice()
+
+    def obtener_ultima_corrida(self) -> Optional[str]:
+        """
+        Obtiene el identificador de la corrida más reciente.
+
+        Returns:
+            Identificador de la corrida o None si no hay corridas
+        """
+        indice = self._leer_indice()
+        return indice[-1]['id'] if indice else None
+
+    def reconstruir_corrida(self, id_corrida: str) -> EstadoCorrida:
+        """
+        Reconstruye el estado completo de una corrida.
+
+        Args:
+            id_corrida: Identificador de la corrida
+
+        Returns:
+            Diccionario carné -> {'nombre', 'filas'} con el estado de la corrida
+
+        Raises:
+            KeyError: Si la corrida no existe
+        """
+        if self._cache_estado and self._cache_estado[0] == id_corrida:
+            return self._copiar_estado(self._cache_estado[1])
+
+        indice = self._leer_indice()
+        ids = [corrida['id'] for corrida in indice]
+        if id_corrida not in ids:
+            raise KeyError(f"No existe la corrida: {id_corrida}")
+
+        posicion = ids.index(id_corrida)
+        inicio = posicion
+        while not indice[inicio]['completa']:
+            inicio -= 1
+
+        estado: EstadoCorrida = {}
+        for corrida in indice[inicio:posicion + 1]:
+            self._aplicar_delta(estado, self._leer_corrida(corrida['id']))
+
+        self._cache_estado = (id_corrida, estado)
+        return self._copiar_estado(estado)
+
+    def obtener_historial(self, id_corrida: str, carne: str) -> List[Dict[str, str]]:
+        """
+        Obtiene el historial de un estudiante tal como estaba en una corrida.
+
+        Args:
+            id_corrida: Identificador de la corrida
+            carne: Carné del estudiante
+
+        Returns:
+            Lista de filas del historial (vacía si el estudiante no existía)
+        """
+        estado = self.reconstruir_corrida(id_corrida)
+        if carne not in estado:
+            return []
+        return list(estado[carne]['filas'].values())
+
+    def cambios_desde(
+        self,
+        id_base: str,
+        id_destino: Optional[str] = None
+    ) -> Dict[str, CambiosEstudiante]:
+        """
+        Calcula los cambios por estudiante entre dos corridas.
+
+        Solo se comparan los estudiantes que aparecen en algún delta intermedio,
+        por lo que el costo es proporcional a lo que cambió y no al tamaño de la cohorte.
+        Una copia completa intermedia no registra a los estudiantes que dejaron de
+        aparecer, así que en ese caso también se comparan todos los de la corrida base.
+
+        Args:
+            id_base: Corrida de referencia (por ejemplo, la última revisión)
+            id_destino: Corrida a comparar (por defecto la más reciente)
+
+        Returns:
+            Diccionario carné -> cambios, solo con estudiantes que cambiaron
+        """
+        indice = self._leer_indice()
+        ids = [corrida['id'] for corrida in indice]
+        id_destino = id_destino or (ids[-1] if ids else None)
+        if id_base not in ids or id_destino not in ids:
+            raise KeyError(f"Corrida inexistente: {id_base if id_base not in ids else id_destino}")
+
+        inicio, fin = ids.index(id_base), ids.index(id_destino)
+        if inicio > fin:
+            raise ValueError("La corrida base debe ser anterior a la corrida destino")
+
+        tocados = set()
+        con_copia_completa = False
+        for corrida in indice[inicio + 1:fin + 1]:
+            tocados.update(self._leer_corrida(corrida['id'])['estudiantes'].keys())
+            con_copia_completa = con_copia_completa or corrida['completa']
+
+        if not tocados and not con_copia_completa:
+            return {}
+
+        estado_base = self.reconstruir_corrida(id_base)
+        estado_destino = self.reconstruir_corrida(id_destino)
+        if con_copia_completa:
+            tocados.update(estado_base)
+
+        cambios = {}
+        for carne in sorted(tocados):
+            anterior = estado_base.get(carne)
+            actual = estado_destino.get(carne)
+            resultado = self._comparar_estudiante(carne, anterior, actual)
+            if resultado.tiene_cambios():
+                cambios[carne] = resultado
+
+        return cambios
+
+    # ------------------------------------------------------------------
+    # Codificación de deltas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _llave_fila(fila: Dict[str, str]) -> str:
+        """Genera la llave de identidad de una fila de historial."""
+        return '|'.join(
+            str(fila.get(campo, '')).strip() for campo in ('SIGLA', 'AÑO', 'SEM', 'GRUPO')
+        )
+
+    def _indexar_filas(self, historial: List[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+        """
+        Indexa las filas del historial por su llave de identidad.
+
+        Si dos filas comparten llave se agrega un sufijo incremental para no perder ninguna.
+        """
+        filas: Dict[str, Dict[str, str]] = {}
+        for fila in historial:
+            llave = self._llave_fila(fila)
+            llave_unica, repeticion = llave, 1
+            while llave_unica in filas:
+                repeticion += 1
+                llave_unica = f'{llave}#{repeticion}'
+            filas[llave_unica] = dict(fila)
+        return filas
+
+    @staticmethod
+    def _calcular_delta(anterior: EstadoCorrida, nuevo: EstadoCorrida) -> Dict[str, Dict[str, object]]:
+        """
+        Calcula el delta de una corrida respecto a la anterior.
+
+        Returns:
+            Diccionario carné -> {'nombre', 'agregados', 'eliminados', 'eliminado'}
+            solo para los estudiantes con cambios
+        """
+        delta: Dict[str, Dict[str, object]] = {}
+
+        for carne, datos in nuevo.items():
+            previo = anterior.get(carne)
+            filas_previas = previo['filas'] if previo else {}
+            filas_nuevas = datos['filas']
+
+            agregados = {
+                llave: fila for llave, fila in filas_nuevas.items()
+                if filas_previas.get(llave) != fila
+            }
+            eliminados = [llave for llave in filas_previas if llave not in filas_nuevas]
+            cambio_nombre = previo is None or previo['nombre'] != datos['nombre']
+
+            if agregados or eliminados or cambio_nombre:
+                entrada: Dict[str, object] = {'nombre': datos['nombre'], 'agregados': agregados}
+                if eliminados:
+                    entrada['eliminados'] = eliminados
+                delta[carne] = entrada
+
+        for carne in anterior:
+            if carne not in nuevo:
+                delta[carne] = {'eliminado': True}
+
+        return delta
+
+    @staticmethod
+    def _aplicar_delta(estado: EstadoCorrida, contenido: Dict[str, object]) -> None:
+        """Aplica el contenido de una corrida (completa o delta) sobre un estado."""
+        if contenido['completa']:
+            estado.clear()
+
+        for carne, entrada in contenido['estudiantes'].items():
+            if entrada.get('eliminado'):
+                estado.pop(carne, None)
+                continue
+
+            actual = estado.setdefault(carne, {'nombre': entrada['nombre'], 'filas': {}})
+            actual['nombre'] = entrada['nombre']
+            for llave in entrada.get('eliminados', []):
+                actual['filas'].pop(llave, None)
+            actual['filas'].update(entrada.get('agregados', {}))
+
+    @staticmethod
+    def _comparar_estudiante(
+        carne: str,
+        anterior: Optional[Dict[str, object]],
+        actual: Optional[Dict[str, object]]
+    ) -> CambiosEstudiante:
+        """Compara el estado de un estudiante entre dos corridas."""
+        nombre = (actual or anterior or {}).get('nombre', '')
+        cambios = CambiosEstudiante(
+            carne=carne,
+            nombre=nombre,
+            estudiante_nuevo=anterior is None,
+            estudiante_eliminado=actual is None
+        )
+
+        filas_previas = anterior['filas'] if anterior else {}
+        filas_actuales = actual['filas'] if actual else {}
+
+        for llave, fila in filas_actuales.items():
+            previa = filas_previas.get(llave)
+            if previa is None:
+                cambios.agregados.append(fila)
+            elif previa != fila:
+                cambios.modificados.append((previa, fila))
+
+        cambios.eliminados = [
+            fila for llave, fila in filas_previas.items() if llave not in filas_actuales
+        ]
+        return cambios
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+
+    def _asegurar_directorio(self) -> None:
+        """Asegura que existan los directorios del histórico."""
+        self.directorio_corridas.mkdir(parents=True, exist_ok=True)
+
+    def _leer_indice(self) -> List[Dict[str, object]]:
+        """Lee el índice de corridas."""
+        ruta = self.directorio_historico / self.ARCHIVO_INDICE
+        if not ruta.exists():
+            return []
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    def _escribir_indice(self, indice: List[Dict[str, object]]) -> None:
+        """Escribe el índice de corridas de forma atómica."""
+        ruta = self.directorio_historico / self.ARCHIVO_INDICE
+        temporal = ruta.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(indice, archivo, ensure_ascii=False, indent=1)
+        temporal.replace(ruta)
+
+    def _leer_corrida(self, id_corrida: str) -> Dict[str, object]:
+        """Lee el contenido comprimido de una corrida."""
+        ruta = self.directorio_corridas / f'{id_corrida}.json.gz'
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    def _escribir_corrida(self, id_corrida: str, contenido: Dict[str, object]) -> None:
+        """Escribe el contenido comprimido de una corrida."""
+        ruta = self.directorio_corridas / f'{id_corrida}.json.gz'
+        with gzip.open(ruta, 'wt', encoding='utf-8') as archivo:
+            json.dump(contenido, archivo, ensure_ascii=False, separators=(',', ':'))
+
+    @staticmethod
+    def _copiar_estado(estado: EstadoCorrida) -> EstadoCorrida:
+        """Copia un estado para que el llamador no altere la caché interna."""
+        return {
+            carne: {'nombre': datos['nombre'], 'filas': dict(datos['filas'])}
+            for carne, datos in estado.items()
+        }
@@ -0,0 +1,480 @@
+"""
+Línea de comandos para ejecutar las tareas de la aplicación sin interacción
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ...shared.config.settings import FECHA_EXPIRACION, UrlsConfig, app_config
+from ...shared.instrumentacion import metricas, perfilar
+
+
+VARIABLE_USUARIO = 'PREEII_USUARIO'
+VARIABLE_CLAVE = 'PREEII_CLAVE'
+
+# Códigos de salida
+EXITO = 0
+CON_ERRORES = 1
+ERROR_USO = 2
+VERSION_EXPIRADA = 3
+
+
+class UsoInvalidoError(ValueError):
+    """Los argumentos, las credenciales o la entrada del comando no son válidos."""
+
+
+class CliController:
+    """
+    Controlador de la línea de comandos.
+
+    Los mensajes de avance se escriben en la salida de error y, al terminar, se
+    escribe en la salida estándar una sola línea JSON con los tiempos y totales
+    de la corrida, de modo que se pueda programar y medir.
+    """
+
+    def crear_parser(self) -> argparse.ArgumentParser:
+        """Crea el analizador de argumentos con los subcomandos disponibles."""
+        from ...infrastructure.adapters.excel_writer import ExcelWriter
+
+        generacion = argparse.ArgumentParser(add_help=False)
+        generacion.add_argument('--procesos', type=int, default=app_config.procesos,
+                                help='Procesos para generar los Excel (0 = todos los núcleos)')
+        generacion.add_argument('--tiempo-limite', type=float,
+                                help=f'Segundos máximos por archivo Excel (0 = sin límite, por omisión '
+                                     f'{app_config.tiempo_limite_excel:g}); requiere más de un proceso')
+        generacion.add_argument('--streaming', action='store_true', default=app_config.excel_streaming,
+                                help='Escribir los Excel con memoria constante')
+        generacion.add_argument('--forzar', action='store_true',
+                                help='Regenerar también los archivos que ya están actualizados')
+        generacion.add_argument('--metricas', metavar='ARCHIVO',
+                                help='Guardar los tiempos de cada etapa en un archivo .json o .csv')
+
+        perfil = argparse.ArgumentParser(add_help=False)
+        perfil.add_argument('--perfil', choices=sorted(ExcelWriter.PERFILES), default=app_config.perfil_excel,
+                            help='Hojas a generar en cada Excel')
+
+        parser = argparse.ArgumentParser(
+            prog='preeii', description='Revisión de prematrícula de Ingeniería Industrial'
+        )
+        parser.add_argument('--perfilar', action='store_true', default=app_config.perfilar,
+                            help='Perfila el subcomando y escribe los perfiles en --directorio-perfiles')
+        parser.add_argument('--memoria', action='store_true', default=app_config.medir_memoria,
+                            help='Agrega a las métricas la memoria de cada etapa y estudiante (tracemalloc)')
+        parser.add_argument('--directorio-perfiles', default=app_config.directorio_perfiles,
+                            help='Directorio de los perfiles (por defecto: %(default)s)')
+        subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+        descargar = subcomandos.add_parser(
+            'descargar', parents=[generacion, perfil],
+            help='Descarga los expedientes y genera los Excel'
+        )
+        descargar.add_argument('--credenciales', metavar='ARCHIVO',
+                               help=f'Archivo con líneas {VARIABLE_USUARIO}=... y {VARIABLE_CLAVE}=...')
+        descargar.add_argument('--descargas', type=int, default=app_config.descargas,
+                               help='Expedientes que se descargan a la vez')
+        descargar.add_argument('--url-base', metavar='URL',
+                               help='Servidor con las rutas del sistema de matrícula, por ejemplo el simulado')
+        casete = descargar.add_mutually_exclusive_group()
+        casete.add_argument('--grabar', metavar='CASETE',
+                            help='Grabar las solicitudes y respuestas en un casete, sin las credenciales')
+        casete.add_argument('--reproducir', metavar='CASETE',
+                            help='Usar las respuestas de un casete grabado en lugar de la red')
+        descargar.add_argument('--sin-esperas', action='store_true',
+                               help='Al reproducir, responder sin la duración original de cada solicitud')
+
+        procesar = subcomandos.add_parser(
+            'procesar', parents=[generacion, perfil],
+            help='Procesa un expediente o solicitud copiado de la página de matrícula'
+        )
+        procesar.add_argument('archivos', nargs='+', metavar='archivo',
+                              help="Archivo o directorio de archivos .txt con el texto copiado o exportado, "
+                                   "con uno o varios estudiantes ('-' para la entrada estándar)")
+
+        subcomandos.add_parser(
+            'regenerar', parents=[generacion, perfil],
+            help='Genera los Excel de los expedientes ya descargados'
+        )
+        subcomandos.add_parser(
+            'equiparacion', parents=[generacion],
+            help='Genera los Excel incluyendo la hoja de equiparación'
+        )
+
+        sintetico = subcomandos.add_parser(
+            'sintetico', help='Genera una cohorte de estudiantes sintéticos para pruebas y mediciones'
+        )
+        sintetico.add_argument('cantidad', type=int, help='Cantidad de estudiantes')
+        sintetico.add_argument('--semilla', type=int, default=0, help='Semilla de la cohorte')
+        sintetico.add_argument('--formato', choices=('repositorio', 'html', 'texto'), default='repositorio',
+                               help='Expedientes descargados (.edf/.sdf), páginas HTML o texto copiado')
+        sintetico.add_argument('--destino', default='.',
+                               help='Directorio base del repositorio o directorio de los archivos')
+
+        simulado = subcomandos.add_parser(
+            'servidor-simulado', help='Atiende una cohorte sintética con las rutas del sistema de matrícula'
+        )
+        simulado.add_argument('cantidad', type=int, help='Cantidad de estudiantes asignados')
+        simulado.add_argument('--semilla', type=int, default=0, help='Semilla de la cohorte')
+        simulado.add_argument('--puerto', type=int, default=8080, help='Puerto local')
+        simulado.add_argument('--latencia', type=float, default=0.0, help='Segundos de espera por respuesta')
+        simulado.add_argument('--tasa-error', type=float, default=0.0,
+                              help='Probabilidad de responder con error 500')
+        simulado.add_argument('--limite-por-segundo', type=float,
+                              help='Solicitudes permitidas por segundo (429 al exceder)')
+        simulado.add_argument('--duracion-sesion', type=float,
+                              help='Segundos de validez de cada sesión (401 al vencer)')
+        return parser
+
+    def ejecutar(self, argumentos: List[str]) -> int:
+        """
+        Ejecuta un subcomando.
+
+        Args:
+            argumentos: Argumentos de la línea de comandos, sin el nombre del programa
+
+        Returns:
+            Código de salida: 0 si todo salió bien, 1 si hubo errores al procesar,
+            2 si los argumentos o las credenciales no son válidos y 3 si la versión expiró
+        """
+        parser = self.crear_parser()
+        args = parser.parse_args(argumentos)
+        if getattr(args, 'tiempo_limite', None) and args.procesos == 1 and args.comando != 'descargar':
+            # Con un proceso los Excel se generan en el proceso actual, que no se puede interrumpir
+            parser.error('--tiempo-limite no se puede aplicar con --procesos 1')
+
+        if datetime.now() > FECHA_EXPIRACION:
+            print('SE HA VENCIDO LA VERSION DE PRUEBAS', file=sys.stderr)
+            return VERSION_EXPIRADA
+
+        app_config.procesos = getattr(args, 'procesos', app_config.procesos)
+        if getattr(args, 'tiempo_limite', None) is not None:
+            app_config.tiempo_limite_excel = args.tiempo_limite
+        app_config.excel_streaming = getattr(args, 'streaming', app_config.excel_streaming)
+        app_config.perfilar = args.perfilar
+        app_config.directorio_perfiles = args.directorio_perfiles
+
+        comandos = {
+            'descargar': self._comando_descargar,
+            'procesar': self._comando_procesar,
+            'regenerar': self._comando_regenerar,
+            'equiparacion': self._comando_equiparacion,
+            'sintetico': self._comando_sintetico,
+            'servidor-simulado': self._comando_servidor_simulado,
+        }
+        resultado: Dict[str, object] = {
+            'comando': args.comando,
+            'inicio': datetime.now().isoformat(timespec='seconds'),
+            'etapas': {},
+        }
+
+        if args.memoria:
+            metricas.activar_memoria()
+        metricas.reiniciar()
+        perfilador = None
+        inicio = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(sys.stderr), perfilar(args.comando) as perfilador:
+                codigo = comandos[args.comando](args, resultado)
+        except UsoInvalidoError as e:
+            resultado['error'] = str(e)
+            codigo = ERROR_USO
+        except Exception as e:
+            resultado['error'] = str(e)
+            codigo = CON_ERRORES
+
+        resultado['duracion_s'] = round(time.perf_counter() - inicio, 3)
+        resultado['codigo'] = codigo
+        resultado['metricas'] = metricas.como_dict()
+        if perfilador and perfilador.resultado:
+            resultado['perfilado'] = {
+                'resumen': str(perfilador.resultado.resumen),
+                'cprofile': str(perfilador.resultado.perfil),
+                'pilas': str(perfilador.resultado.pilas),
+            }
+        if getattr(args, 'metricas', None):
+            resultado['archivo_metricas'] = str(metricas.exportar(args.metricas))
+        metricas.desactivar_memoria()
+        print(json.dumps(resultado, ensure_ascii=False))
+        return codigo
+
+    def _comando_descargar(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """
+        Descarga los expedientes generando cada Excel conforme llega su expediente,
+        y registra la corrida en el histórico. La sesión se puede grabar en un casete
+        o reproducir desde uno.
+        """
+        from ...application.services.web_scraping_service import WebScrapingService
+        from ...infrastructure.adapters.casete_http import Casete, HttpAdapterGrabador, HttpAdapterReproductor
+
+        if args.reproducir:
+            # El casete no tiene credenciales; el login grabado se reproduce tal cual
+            usuario, clave = '', ''
+            http_adapter = HttpAdapterReproductor(Casete.cargar(args.reproducir), not args.sin_esperas)
+        else:
+            usuario, clave = self.leer_credenciales(args.credenciales)
+            http_adapter = HttpAdapterGrabador() if args.grabar else None
+        if args.url_base:
+            app_config.urls = UrlsConfig.desde_base(args.url_base)
+        app_config.auth.user = usuario
+        app_config.auth.password = clave
+
+        web_scraping_service = WebScrapingService(http_adapter)
+        try:
+            return self._descargar_y_generar(args, resultado, web_scraping_service, usuario, clave)
+        finally:
+            if args.grabar:
+                casete = http_adapter.casete
+                resultado['casete'] = {
+                    'ruta': str(casete.guardar(args.grabar)),
+                    'interacciones': len(casete.interacciones),
+                    'tiempo_red_s': round(casete.tiempo_red, 3),
+                }
+
+    def _descargar_y_generar(self, args: argparse.Namespace, resultado: Dict[str, object],
+                             web_scraping_service, usuario: str, clave: str) -> int:
+        """Obtiene el listado, descarga y genera los Excel, y registra la corrida en el histórico."""
+        from ...application.services.generacion_excel_service import GeneracionExcelService
+        from ...application.services.pipeline_service import PipelineDescargaService
+        from ...infrastructure.repositories.file_repository import FileRepository
+        from ...infrastructure.repositories.snapshot_repository import SnapshotRepository
+
+        with self._etapa(resultado, 'listado'):
+            estudiantes = web_scraping_service.obtener_estudiantes_asignados(usuario, clave)
+        if estudiantes is None:
+            resultado['error'] = 'No se pudo obtener el listado de estudiantes'
+            return CON_ERRORES
+
+        file_repo = FileRepository()
+        servicio = PipelineDescargaService(
+            web_scraping_service, file_repo, app_config.procesos, args.descargas,
+            app_config.tiempo_limite_excel, modo_streaming=app_config.excel_streaming, perfil=args.perfil
+        )
+
+        def al_completar(completados, total, estudiante):
+            exitoso = estudiante.omitido or estudiante.resultado.exitoso
+            detalle = '(sin cambios)' if estudiante.omitido else (
+                estudiante.nombre[:30] if exitoso else estudiante.resultado.error
+            )
+            print(f'[{completados:3d}/{total}] {"✓" if exitoso else "✗"} {estudiante.carne} - {detalle}')
+            self._vigilar_memoria(estudiante.carne, estudiante.resultado)
+
+        with self._etapa(resultado, 'descarga_y_generacion'):
+            resumen = servicio.ejecutar(estudiantes, args.forzar, al_completar)
+        resultado['tiempo_ocupado_por_etapa'] = {
+            nombre: round(segundos, 3) for nombre, segundos in resumen.tiempos.items()
+        }
+
+        with self._etapa(resultado, 'historico'):
+            snapshot_repo = SnapshotRepository()
+            id_anterior = snapshot_repo.obtener_ultima_corrida()
+            id_corrida = snapshot_repo.registrar_corrida_desde_repositorio(file_repo)
+            resultado['corrida'] = id_corrida
+            if id_anterior is not None:
+                resultado['estudiantes_con_cambios'] = len(snapshot_repo.cambios_desde(id_anterior, id_corrida))
+
+        ruta_fallos = GeneracionExcelService(file_repo).escribir_reporte_fallos(resumen.lote)
+        self._registrar_totales(
+            resultado, args.perfil, len(estudiantes), len(resumen.omitidos), 0, resumen.lote, ruta_fallos
+        )
+        return CON_ERRORES if resumen.lote.fallidos else EXITO
+
+    def _comando_procesar(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """Guarda los estudiantes del texto copiado o exportado de la página de matrícula y genera los Excel."""
+        from ...application.services.ingesta_texto_service import IngestaTextoService
+        from ...infrastructure.repositories.file_repository import FileRepository
+
+        servicio = IngestaTextoService(FileRepository(), app_config.procesos)
+        rutas = [ruta for ruta in args.archivos if ruta != '-']
+        textos = [sys.stdin.read()] if '-' in args.archivos else []
+
+        def al_guardar(analizados, resumen):
+            print(f'{analizados} registros leídos: {len(resumen.expedientes)} expedientes, '
+                  f'{len(resumen.prematriculas)} prematrículas')
+
+        with self._etapa(resultado, 'lectura_texto'):
+            resumen = servicio.ingerir(textos + list(servicio.leer_textos(rutas)), al_guardar)
+        resultado['registros'] = {
+            'expedientes': len(resumen.expedientes),
+            'prematriculas': len(resumen.prematriculas),
+            'sin_datos': resumen.sin_datos,
+        }
+        if not resumen.total:
+            raise UsoInvalidoError(f'El contenido de {", ".join(args.archivos)} no tiene expedientes ni solicitudes')
+
+        return self._generar(args.perfil, args.forzar, resultado)
+
+    def _comando_regenerar(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """Genera los Excel de los expedientes descargados."""
+        return self._generar(args.perfil, args.forzar, resultado)
+
+    def _comando_equiparacion(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """Genera los Excel de los expedientes descargados con la hoja de equiparación."""
+        return self._generar('con_equiparacion', args.forzar, resultado)
+
+    def _comando_sintetico(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """Escribe una cohorte sintética en el formato indicado."""
+        from pathlib import Path
+        from ...infrastructure.repositories.file_repository import FileRepository
+        from ...shared.sinteticos import (
+            GeneradorCohorte, escribir_en_repositorio, html_listado, html_nivel_avance, texto_expediente
+        )
+
+        if args.cantidad < 1:
+            raise UsoInvalidoError('La cantidad de estudiantes debe ser mayor que cero')
+
+        generador = GeneradorCohorte(args.semilla)
+        destino = Path(args.destino)
+        with self._etapa(resultado, 'generacion'):
+            if args.formato == 'repositorio':
+                escribir_en_repositorio(FileRepository(str(destino)), generador.estudiantes(args.cantidad))
+            else:
+                destino.mkdir(parents=True, exist_ok=True)
+                if args.formato == 'html':
+                    (destino / 'listado.html').write_text(
+                        html_listado(generador.estudiantes(args.cantidad)), encoding='utf-8'
+                    )
+                for estudiante in generador.estudiantes(args.cantidad):
+                    if args.formato == 'html':
+                        (destino / f'{estudiante.carne}.html').write_text(
+                            html_nivel_avance(estudiante), encoding='utf-8'
+                        )
+                    else:
+                        with open(destino / f'{estudiante.carne}.txt', 'w', encoding='utf-8', newline='') as archivo:
+                            archivo.write(texto_expediente(estudiante))
+
+        resultado['estudiantes'] = args.cantidad
+        resultado['semilla'] = args.semilla
+        resultado['destino'] = str(destino)
+        return EXITO
+
+    def _comando_servidor_simulado(self, args: argparse.Namespace, resultado: Dict[str, object]) -> int:
+        """Atiende el servidor simulado hasta que se interrumpa con Ctrl+C."""
+        from dataclasses import asdict
+        from ...shared.sinteticos import GeneradorCohorte, ServidorEmatricula
+
+        usuario, clave = self.leer_credenciales()
+        servidor = ServidorEmatricula(
+            GeneradorCohorte(args.semilla), args.cantidad, usuario, clave,
+            latencia=args.latencia, tasa_error=args.tasa_error,
+            limite_por_segundo=args.limite_por_segundo, duracion_sesion=args.duracion_sesion,
+            semilla=args.semilla, puerto=args.puerto
+        )
+        with servidor:
+            print(f'Servidor simulado en {servidor.url_base} (use --url-base con el subcomando descargar)')
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+
+        resultado['solicitudes'] = asdict(servidor.estadisticas)
+        return EXITO
+
+    def _generar(self, perfil: str, forzar: bool, resultado: Dict[str, object]) -> int:
+        """
+        Genera los Excel de todos los expedientes descargados y agrega los totales al resultado.
+
+        Returns:
+            EXITO si todos los archivos se generaron u omitieron, CON_ERRORES en otro caso
+        """
+        from ...application.services.generacion_excel_service import GeneracionExcelService
+        from ...infrastructure.repositories.file_repository import FileRepository
+
+        file_repo = FileRepository()
+        servicio = GeneracionExcelService(
+            file_repo, app_config.procesos, app_config.tiempo_limite_excel, app_config.excel_streaming
+        )
+
+        with self._etapa(resultado, 'lectura'):
+            plan = servicio.preparar(file_repo.listar_archivos_expedientes(), perfil, forzar)
+        for _, archivo, error in plan.errores:
+            print(f'✗ Error en {archivo}: {error}')
+
+        def al_completar(completados, total, resultado_excel):
+            marca = '✓' if resultado_excel.exitoso else '✗'
+            detalle = resultado_excel.nombre[:30] if resultado_excel.exitoso else resultado_excel.error
+            print(f'[{completados:3d}/{total}] {marca} {resultado_excel.carne} - {detalle}')
+            self._vigilar_memoria(resultado_excel.carne, resultado_excel)
+
+        with self._etapa(resultado, 'generacion'):
+            resumen = servicio.generar(plan, al_completar)
+        ruta_fallos = servicio.escribir_reporte_fallos(resumen)
+
+        self._registrar_totales(
+            resultado, plan.perfil, plan.total, len(plan.omitidos), len(plan.errores), resumen, ruta_fallos
+        )
+        return CON_ERRORES if plan.errores or resumen.fallidos else EXITO
+
+    @staticmethod
+    def _registrar_totales(resultado: Dict[str, object], perfil: str, total: int, omitidos: int,
+                           errores_lectura: int, resumen, ruta_fallos) -> None:
+        """Agrega al resultado los totales de archivos generados de una corrida."""
+        resultado['perfil'] = perfil
+        resultado['archivos'] = {
+            'total': total,
+            'generados': len(resumen.exitosos),
+            'omitidos': omitidos,
+            'errores': errores_lectura + len(resumen.fallidos),
+            'tiempos_agotados': resumen.tiempos_agotados,
+        }
+        resultado['archivos_por_segundo'] = round(resumen.por_segundo, 2)
+        resultado['reporte_fallos'] = str(ruta_fallos) if ruta_fallos else None
+
+    @staticmethod
+    def leer_credenciales(archivo: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Obtiene las credenciales de la UCR del ambiente o de un archivo.
+
+        Los valores del archivo tienen prioridad sobre las variables de ambiente.
+
+        Args:
+            archivo: Archivo con líneas VARIABLE=valor; se ignoran las líneas vacías
+                     y las que empiezan con '#'
+
+        Returns:
+            Tupla (usuario, contraseña)
+
+        Raises:
+            UsoInvalidoError: Si falta el usuario o la contraseña
+        """
+        valores = {
+            variable: os.environ.get(variable, '') for variable in (VARIABLE_USUARIO, VARIABLE_CLAVE)
+        }
+        if archivo:
+            with open(archivo, 'r', encoding='utf-8') as credenciales:
+                for linea in credenciales:
+                    linea = linea.strip()
+                    if not linea or linea.startswith('#') or '=' not in linea:
+                        continue
+                    variable, valor = linea.split('=', 1)
+                    if variable.strip() in valores:
+                        valores[variable.strip()] = valor.strip()
+
+        usuario, clave = valores[VARIABLE_USUARIO], valores[VARIABLE_CLAVE]
+        if not usuario or not clave:
+            raise UsoInvalidoError(
+                f'Faltan las credenciales: defina {VARIABLE_USUARIO} y {VARIABLE_CLAVE} '
+                'en el ambiente o en el archivo de credenciales'
+            )
+        return usuario, clave
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _etapa(resultado: Dict[str, object], nombre: str):
+        """Mide la duración de una etapa y la agrega al resultado."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            resultado['etapas'][nombre] = round(time.perf_counter() - inicio, 3)
+
+    @staticmethod
+    def _vigilar_memoria(carne: str, resultado_excel) -> None:
+        """Advierte si la memoria no se libera entre estudiantes, cuando se mide la memoria."""
+        advertencia = metricas.registrar_estudiante(carne, resultado_excel.metricas if resultado_excel else None)
+        if advertencia:
+            print(f'ADVERTENCIA: {advertencia}')
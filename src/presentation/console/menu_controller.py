@@ -3,12 +3,12 @@ Controlador del menú principal de la aplicación
 """
 import getpass
 from datetime import datetime
+from functools import cached_property
 from termcolor import cprint
 
 from .console_utils import ConsoleUtils
-from ...application.services.expediente_service import ExpedienteService
-from ...application.services.web_scraping_service import WebScrapingService
-from ...shared.config.settings import app_config
+from ...shared.config.settings import FECHA_EXPIRACION, app_config
+from ...shared.instrumentacion import metricas, perfilado, perfilar
 
 
 class MenuController:
@@ -17,18 +17,33 @@ class MenuController:
     """
 
     def __init__(self):
-        """Inicializa el controlador del menú."""
-        self.expediente_service = ExpedienteService()
-        self.web_scraping_service = WebScrapingService()
+        """
+        Inicializa el controlador del menú.
+        
+        Los servicios se crean al usarlos por primera vez, de modo que el menú aparece
+        sin cargar el dominio, requests, xlsxwriter ni openpyxl.
+        """
         self.ancho_menu = 60
+        if app_config.medir_memoria:
+            metricas.activar_memoria()
+
+    @cached_property
+    def expediente_service(self):
+        """Servicio de expedientes, creado al usarlo por primera vez."""
+        from ...application.services.expediente_service import ExpedienteService
+        return ExpedienteService()
+
+    @cached_property
+    def web_scraping_service(self):
+        """Servicio del sistema de matrícula, creado al usarlo por primera vez."""
+        from ...application.services.web_scraping_service import WebScrapingService
+        return WebScrapingService()
 
     def mostrar_menu_principal(self) -> None:
         """Muestra el menú principal y maneja la navegación."""
-        fecha_expiracion = datetime(year=2026, month=2, day=28)
-        
         while True:
             ahora = datetime.now()
-            dias_restantes = (fecha_expiracion - ahora).days
+            dias_restantes = (FECHA_EXPIRACION - ahora).days
             
             if dias_restantes < 0:
                 self._mostrar_version_expirada()
@@ -40,7 +55,7 @@ class MenuController:
             self._mostrar_informacion_expiracion(dias_restantes)
             
             opcion = ConsoleUtils.leer_rango_numeros_enteros(
-                'Digite la opción del menú:', 0, 5
+                'Digite la opción del menú:', 0, 7
             )
             
             if opcion == 0:
@@ -56,6 +71,10 @@ class MenuController:
                 self._opcion_regenerar_excel()
             elif opcion == 5:
                 self._opcion_analisis_equiparacion()
+            elif opcion == 6:
+                self._opcion_reporte_cohorte()
+            elif opcion == 7:
+                self._opcion_vigilar_portapapeles()
 
     def _mostrar_encabezado_menu(self) -> None:
         """Muestra el encabezado del menú principal."""
@@ -70,6 +89,8 @@ class MenuController:
             (3, 'PROCESAR EXPEDIENTE EN MEMORIA RAM'),
             (4, 'REGENERAR ARCHIVOS EXCEL'),
             (5, 'ANÁLISIS DE EQUIPARACIÓN'),
+            (6, 'REPORTE DE COHORTE'),
+            (7, 'VIGILAR PORTAPAPELES'),
             (0, 'SALIR')
         ]
         
@@ -120,12 +141,93 @@ class MenuController:
         app_config.auth.user = usuario
         app_config.auth.password = clave
 
-        # Iniciar proceso de descarga
-        if self.web_scraping_service.iniciar_proceso_descarga_completo(usuario, clave):
-            self._procesar_archivos_expedientes()
+        # Iniciar proceso de descarga, generando cada Excel conforme llega su expediente
+        if self._descargar_y_generar(usuario, clave):
+            self._registrar_corrida_historica()
         
         ConsoleUtils.pausar()
 
+    @perfilado('descarga')
+    def _descargar_y_generar(self, usuario: str, clave: str) -> bool:
+        """
+        Descarga los expedientes y genera sus archivos Excel mientras continúa la descarga.
+        
+        Args:
+            usuario: Usuario de la UCR
+            clave: Contraseña del usuario
+        
+        Returns:
+            True si se pudo obtener el listado de estudiantes
+        """
+        from ...infrastructure.repositories.file_repository import FileRepository
+        from ...application.services.pipeline_service import PipelineDescargaService
+        from datetime import timedelta
+        
+        try:
+            estudiantes = self.web_scraping_service.obtener_estudiantes_asignados(usuario, clave)
+        except Exception as e:
+            cprint(f'Error durante el proceso de descarga: {str(e)}', 'white', 'on_red', attrs=['bold'])
+            return False
+        
+        if estudiantes is None:
+            return False
+        
+        metricas.reiniciar()
+        tiempo_total = timedelta(seconds=0)
+        self.expediente_service.imprimir_encabezado_procesamiento()
+        
+        def al_completar(completados, total, estudiante):
+            nonlocal tiempo_total
+            tiempo = self.expediente_service.calcular_tiempo_estimado_revision(len(estudiante.historial))
+            tiempo_total += tiempo
+            self.expediente_service.imprimir_resumen_procesamiento(
+                estudiante.carne, estudiante.nombre, len(estudiante.historial), tiempo, completados % 2 == 1
+            )
+            if estudiante.resultado and not estudiante.resultado.exitoso:
+                print(f"Error procesando {estudiante.carne}: {estudiante.resultado.error}")
+            self._vigilar_memoria(estudiante.carne, estudiante.resultado)
+        
+        file_repo = FileRepository()
+        servicio = PipelineDescargaService(
+            self.web_scraping_service, file_repo, app_config.procesos, app_config.descargas,
+            app_config.tiempo_limite_excel, modo_streaming=app_config.excel_streaming, perfil=app_config.perfil_excel
+        )
+        resumen = servicio.ejecutar(estudiantes, forzar=True, al_completar=al_completar)
+        
+        self._mostrar_resumen_lote(self._crear_servicio_generacion(file_repo), resumen.lote)
+        self.expediente_service.imprimir_tiempo_total_ahorrado(tiempo_total)
+        return True
+
+    def _registrar_corrida_historica(self) -> None:
+        """
+        Registra la descarga en el histórico de corridas y muestra los cambios
+        respecto a la corrida anterior.
+        """
+        from ...infrastructure.repositories.file_repository import FileRepository
+        from ...infrastructure.repositories.snapshot_repository import SnapshotRepository
+
+        try:
+            snapshot_repo = SnapshotRepository()
+            id_anterior = snapshot_repo.obtener_ultima_corrida()
+            id_corrida = snapshot_repo.registrar_corrida_desde_repositorio(FileRepository())
+        except Exception as e:
+            print(f'No se pudo registrar la corrida en el histórico: {str(e)}')
+            return
+
+        print(f'Corrida registrada en el histórico: {id_corrida}')
+        if id_anterior is None:
+            return
+
+        cambios = snapshot_repo.cambios_desde(id_anterior, id_corrida)
+        if not cambios:
+            print('Sin cambios respecto a la corrida anterior.')
+            return
+
+        cprint(f'{len(cambios)} estudiantes con cambios desde {id_anterior}:', 'yellow')
+        for carne, cambio in cambios.items():
+            print(f'  {carne:9} {cambio.nombre[:40]:40} '
+                  f'+{len(cambio.agregados)} ~{len(cambio.modificados)} -{len(cambio.eliminados)}')
+
     def _opcion_mostrar_informacion(self) -> None:
         """Muestra información sobre la aplicación."""
         mensajes = [
@@ -151,8 +253,8 @@ class MenuController:
     def _opcion_procesar_memoria(self) -> None:
         """Maneja la opción de procesar expediente desde memoria."""
         import pyperclip
-        from ...infrastructure.adapters.html_parser import StudentParser
         from ...application.services.memory_reader_service import MemoryReaderService
+        from ...infrastructure.adapters.texto_memoria_parser import dividir_registros
         
         self._mostrar_titulo_procesador()
         
@@ -160,7 +262,13 @@ class MenuController:
             texto = pyperclip.paste()
             memory_service = MemoryReaderService()
             
-            if memory_service.procesar_contenido_memoria(texto):
+            # Una página copiada con varios estudiantes se guarda completa en lotes
+            registros = dividir_registros(texto)
+            if len(registros) > 1:
+                procesado = self._ingerir_registros(memory_service.file_repo, registros)
+            else:
+                procesado = memory_service.procesar_contenido_memoria(texto)
+            if procesado:
                 self._procesar_archivos_expedientes()
             
         except Exception as e:
@@ -168,6 +276,90 @@ class MenuController:
         
         ConsoleUtils.pausar()
 
+    @staticmethod
+    def _ingerir_registros(file_repo, registros) -> bool:
+        """
+        Guarda todos los expedientes y prematrículas de un texto con varios estudiantes.
+        
+        Args:
+            file_repo: Repositorio donde se guardan los estudiantes
+            registros: Registros del texto copiado, divididos con dividir_registros
+        
+        Returns:
+            True si se guardó al menos un estudiante
+        """
+        from ...application.services.ingesta_texto_service import IngestaTextoService
+        
+        resumen = IngestaTextoService(file_repo, app_config.procesos).ingerir_registros(registros)
+        print(f"EXPEDIENTES PROCESADOS: {len(resumen.expedientes)}")
+        print(f"SOLICITUDES PROCESADAS: {len(resumen.prematriculas)}")
+        if resumen.sin_datos:
+            print(f"REGISTROS SIN CARNÉ: {resumen.sin_datos}")
+        return resumen.total > 0
+
+    @perfilado('vigilar')
+    def _opcion_vigilar_portapapeles(self) -> None:
+        """
+        Vigila el portapapeles y genera el Excel de cada expediente copiado, sin volver
+        al menú entre estudiantes. Termina con Ctrl+C.
+        """
+        import pyperclip
+        from ...application.services.memory_reader_service import MemoryReaderService
+        from ...application.services.portapapeles_service import (
+            GeneradorEnCaliente, PortapapelesService, VigilantePortapapeles
+        )
+        
+        self._mostrar_titulo_procesador()
+        memory_service = MemoryReaderService()
+        metricas.reiniciar()
+        
+        with GeneradorEnCaliente(
+            memory_service.file_repo, app_config.perfil_excel, app_config.excel_streaming
+        ) as generador:
+            servicio = PortapapelesService(memory_service, generador)
+            
+            def mostrar_terminados() -> None:
+                # Mientras el trabajador genera, se sigue leyendo el portapapeles
+                for listo in servicio.terminados():
+                    self._mostrar_pegado(listo)
+            
+            print('Copie un expediente o una prematrícula; presione Ctrl+C para terminar.')
+            try:
+                for texto in VigilantePortapapeles(pyperclip.paste).textos(al_esperar=mostrar_terminados):
+                    try:
+                        pegado = servicio.procesar(texto)
+                    except Exception as e:
+                        print(f'Error al procesar memoria: {str(e)}')
+                        continue
+                    if pegado is not None and not pegado.enviado:
+                        self._mostrar_pegado(pegado)
+                    mostrar_terminados()
+            except KeyboardInterrupt:
+                pass
+            for pegado in servicio.terminados(esperar=True):
+                self._mostrar_pegado(pegado)
+        
+        print(metricas.tabla())
+        ConsoleUtils.pausar()
+
+    def _mostrar_pegado(self, pegado) -> None:
+        """
+        Muestra el resultado de un estudiante copiado en la vigilancia del portapapeles.
+        
+        Args:
+            pegado: Pegado con el Excel generado, omitido o fallido
+        """
+        estudiante = f'{pegado.carne} {pegado.nombre}'
+        if pegado.error:
+            cprint(f'{estudiante}: ERROR {pegado.error}', 'red')
+        elif pegado.resultado is not None:
+            cprint(f'{estudiante}: {pegado.resultado.ruta_salida} ({pegado.duracion * 1000:.0f} ms)', 'green')
+            self._vigilar_memoria(pegado.carne, pegado.resultado)
+        elif pegado.actualizado:
+            print(f'{estudiante}: el Excel ya está actualizado')
+        else:
+            print(f'{estudiante}: prematrícula guardada; copie el expediente para generar el Excel')
+
     def _opcion_salir(self) -> None:
         """Maneja la opción de salir de la aplicación."""
         self._mostrar_mensaje_despedida()
@@ -187,10 +379,10 @@ class MenuController:
         print("SI TIENE DUDAS, NO LLAME, NO WHATSAPP SOLO RESPONDO TELEGRAM")
         print("SIGA EL CANAL DE YT https://www.youtube.com/mauricioz7")
 
+    @perfilado('procesar')
     def _procesar_archivos_expedientes(self) -> None:
         """Procesa todos los archivos de expedientes disponibles."""
         from ...infrastructure.repositories.file_repository import FileRepository
-        import xlsxwriter
         from datetime import timedelta
         
         file_repo = FileRepository()
@@ -200,56 +392,87 @@ class MenuController:
             print("No se encontraron expedientes para procesar.")
             return
 
+        metricas.reiniciar()
         tiempo_total = timedelta(seconds=0)
         self.expediente_service.imprimir_encabezado_procesamiento()
         
-        for i, archivo in enumerate(archivos_expedientes):
-            try:
-                # Leer información del estudiante
-                carne, nombre = file_repo.leer_informacion_estudiante(archivo.replace('.edf', ''))
-                
-                # Leer historial
-                historial = file_repo.leer_historial(carne)
-                
-                # Procesar expediente
-                expediente = self.expediente_service.procesar_expediente_estudiante(
-                    carne, nombre, historial
-                )
-                
-                # Calcular tiempo estimado
-                tiempo = self.expediente_service.calcular_tiempo_estimado_revision(len(historial))
-                tiempo_total += tiempo
-                
-                # Mostrar progreso
-                self.expediente_service.imprimir_resumen_procesamiento(
-                    carne, nombre, len(historial), tiempo, i % 2 == 0
-                )
-                
-                # Generar archivo Excel
-                self._generar_archivo_excel(expediente, file_repo)
-                
-            except Exception as e:
-                print(f"Error procesando {archivo}: {str(e)}")
+        servicio = self._crear_servicio_generacion(file_repo)
+        plan = servicio.preparar(archivos_expedientes, app_config.perfil_excel, forzar=True)
+        
+        for i, tarea in enumerate(plan.tareas):
+            # Calcular tiempo estimado y mostrar progreso
+            tiempo = self.expediente_service.calcular_tiempo_estimado_revision(len(tarea.filas))
+            tiempo_total += tiempo
+            self.expediente_service.imprimir_resumen_procesamiento(
+                tarea.carne, tarea.nombre, len(tarea.filas), tiempo, i % 2 == 0
+            )
+        
+        for _, archivo, error in plan.errores:
+            print(f"Error procesando {archivo}: {error}")
+        
+        # Generar archivos Excel en paralelo
+        def al_completar(completados, total, resultado):
+            if not resultado.exitoso:
+                print(f"Error procesando {resultado.carne}: {resultado.error}")
+            self._vigilar_memoria(resultado.carne, resultado)
+        
+        resumen = servicio.generar(plan, al_completar)
+        self._mostrar_resumen_lote(servicio, resumen)
         
         # Mostrar tiempo total ahorrado
         self.expediente_service.imprimir_tiempo_total_ahorrado(tiempo_total)
 
-    def _generar_archivo_excel(self, expediente, file_repo):
+    @staticmethod
+    def _crear_servicio_generacion(file_repo):
         """
-        Genera un archivo Excel para el expediente.
+        Crea el servicio de generación de archivos Excel con la configuración de la aplicación.
         
         Args:
-            expediente: Expediente del estudiante
-            file_repo: Repositorio de archivos
+            file_repo: Repositorio con los expedientes descargados
+        
+        Returns:
+            Servicio de generación de archivos Excel
         """
-        import xlsxwriter
-        from ...infrastructure.adapters.excel_writer import ExcelWriter
+        from ...application.services.generacion_excel_service import GeneracionExcelService
         
-        nombre_archivo = f'{expediente.carne}-{expediente.nombre.upper()}.xlsx'
-        ruta_salida = file_repo.obtener_ruta_salida(nombre_archivo)
+        return GeneracionExcelService(
+            file_repo, app_config.procesos, app_config.tiempo_limite_excel, app_config.excel_streaming
+        )
+
+    @staticmethod
+    def _vigilar_memoria(carne, resultado) -> None:
+        """
+        Advierte si la memoria no se libera entre estudiantes, cuando se mide la memoria.
         
-        excel_writer = ExcelWriter()
-        excel_writer.generar_expediente(expediente, str(ruta_salida))
+        Args:
+            carne: Carné del estudiante que terminó
+            resultado: ResultadoExcel del estudiante, o None si no se generó
+        """
+        advertencia = metricas.registrar_estudiante(carne, resultado.metricas if resultado else None)
+        if advertencia:
+            cprint(advertencia, 'yellow', attrs=['bold'])
+
+    def _mostrar_resumen_lote(self, servicio, resumen) -> None:
+        """
+        Muestra el rendimiento de un lote, con el tiempo de cada etapa, y guarda el
+        detalle de los archivos que fallaron.
+        
+        Args:
+            servicio: Servicio de generación que produjo el lote
+            resumen: ResumenLote con los resultados
+        """
+        if resumen.total:
+            print(f"{resumen.total} archivos en {resumen.duracion:.1f} s "
+                  f"({resumen.por_segundo:.1f} archivos/s)")
+            print()
+            print(metricas.tabla())
+            print(f"Métricas de la corrida: {servicio.escribir_reporte_metricas()}")
+        
+        ruta = servicio.escribir_reporte_fallos(resumen)
+        if ruta:
+            cprint(f"{len(resumen.fallidos)} archivos con error "
+                   f"({resumen.tiempos_agotados} por tiempo límite)", 'white', 'on_red', attrs=['bold'])
+            print(f"Detalle de los errores: {ruta}")
 
     def _opcion_regenerar_excel(self) -> None:
         """Regenera archivos Excel desde expedientes existentes."""
@@ -276,41 +499,28 @@ class MenuController:
         if respuesta not in ['s', 'si', 'sí', 'y', 'yes']:
             return
         
+        respuesta = ConsoleUtils.leer_texto(
+            "¿Forzar la regeneración de archivos que ya están actualizados? (s/n): "
+        ).lower()
+        forzar = respuesta in ['s', 'si', 'sí', 'y', 'yes']
+        
+        respuesta = ConsoleUtils.leer_texto(
+            "¿Generar solo Malla Curricular y Cursos Pendientes (revisión rápida)? (s/n): "
+        ).lower()
+        perfil = 'revision_rapida' if respuesta in ['s', 'si', 'sí', 'y', 'yes'] else app_config.perfil_excel
+        
         print()
         print("Procesando expedientes...")
         print("=" * self.ancho_menu)
         
-        exitosos = 0
-        errores = 0
-        
-        for i, archivo in enumerate(archivos_expedientes, 1):
-            try:
-                # Leer información del estudiante
-                carne = archivo.replace('.edf', '')
-                carne_info, nombre = file_repo.leer_informacion_estudiante(carne)
-                
-                # Leer historial
-                historial = file_repo.leer_historial(carne)
-                
-                # Procesar expediente
-                expediente = self.expediente_service.procesar_expediente_estudiante(
-                    carne, nombre, historial
-                )
-                
-                # Generar archivo Excel
-                self._generar_archivo_excel(expediente, file_repo)
-                
-                # Mostrar progreso
-                print(f"[{i:3d}/{len(archivos_expedientes)}] ✓ {carne} - {nombre[:30]}")
-                exitosos += 1
-                
-            except Exception as e:
-                print(f"[{i:3d}/{len(archivos_expedientes)}] ✗ Error en {archivo}: {str(e)}")
-                errores += 1
+        exitosos, omitidos, errores = self._regenerar_archivos_excel(
+            file_repo, archivos_expedientes, perfil, forzar
+        )
         
         print()
         print("=" * self.ancho_menu)
-        cprint(f"Proceso completado: {exitosos} exitosos, {errores} errores", 'green', attrs=['bold'])
+        cprint(f"Proceso completado: {exitosos} exitosos, {omitidos} sin cambios, {errores} errores",
+               'green', attrs=['bold'])
         
         if exitosos > 0:
             print("Los archivos Excel se han generado en la carpeta 'salida/'")
@@ -325,38 +535,66 @@ class MenuController:
         
         ConsoleUtils.pausar()
 
+    @perfilado('regenerar')
+    def _regenerar_archivos_excel(self, file_repo, archivos_expedientes, perfil, forzar):
+        """
+        Regenera en paralelo los archivos Excel de los expedientes indicados, omitiendo
+        los que ya están actualizados según la caché de construcción.
+        
+        Args:
+            file_repo: Repositorio con los expedientes descargados
+            archivos_expedientes: Nombres de los archivos .edf a procesar
+            perfil: Perfil de hojas de ExcelWriter a generar
+            forzar: Si es True, regenera también los archivos actualizados
+        
+        Returns:
+            Tupla (exitosos, omitidos, errores)
+        """
+        metricas.reiniciar()
+        servicio = self._crear_servicio_generacion(file_repo)
+        plan = servicio.preparar(archivos_expedientes, perfil, forzar)
+        
+        for i, carne, nombre in plan.omitidos:
+            print(f"[{i:3d}/{plan.total}] = {carne} - {nombre[:30]} (sin cambios)")
+        for i, archivo, error in plan.errores:
+            print(f"[{i:3d}/{plan.total}] ✗ Error en {archivo}: {error}")
+        
+        if plan.tareas:
+            print(f"Generando {len(plan.tareas)} archivos Excel...")
+        
+        # Generar archivos Excel en paralelo, mostrando el progreso conforme terminan
+        def al_completar(completados, total_tareas, resultado):
+            if resultado.exitoso:
+                print(f"[{completados:3d}/{total_tareas}] ✓ {resultado.carne} - {resultado.nombre[:30]}")
+            else:
+                print(f"[{completados:3d}/{total_tareas}] ✗ Error en {resultado.carne}: {resultado.error}")
+            self._vigilar_memoria(resultado.carne, resultado)
+        
+        resumen = servicio.generar(plan, al_completar)
+        self._mostrar_resumen_lote(servicio, resumen)
+        
+        return len(resumen.exitosos), len(plan.omitidos), len(plan.errores) + len(resumen.fallidos)
+
     def _opcion_analisis_equiparacion(self) -> None:
         """Realiza análisis de equiparación para nuevo plan de estudios."""
-        from ...infrastructure.adapters.equiparacion_analyzer import EquiparacionAnalyzer
+        from ...infrastructure.repositories.file_repository import FileRepository
         
         print("ANÁLISIS DE EQUIPARACIÓN AL NUEVO PLAN DE ESTUDIOS")
         print("=" * self.ancho_menu)
-        print("Esta opción analiza los expedientes existentes para determinar")
-        print("la equiparación de cursos al nuevo plan de estudios.")
+        print("Esta opción genera los archivos Excel de los expedientes existentes")
+        print("incluyendo la hoja de equiparación al nuevo plan de estudios.")
         print()
         
-        # Verificar archivos Excel existentes
-        import os
-        from pathlib import Path
-        
-        directorio_salida = Path('./salida')
-        if not directorio_salida.exists():
-            cprint("No se encontraron archivos Excel para analizar.", 'white', 'on_red', attrs=['bold'])
-            print("Primero debe generar los expedientes usando la opción 1 o 4.")
-            ConsoleUtils.pausar()
-            return
-        
-        archivos_excel = list(directorio_salida.glob('*.xlsx'))
-        # Filtrar archivos de prueba
-        archivos_excel = [f for f in archivos_excel if not f.name.startswith('TEST-')]
+        file_repo = FileRepository()
+        archivos_expedientes = file_repo.listar_archivos_expedientes()
         
-        if not archivos_excel:
-            cprint("No se encontraron archivos Excel válidos para analizar.", 'white', 'on_red', attrs=['bold'])
-            print("Primero debe generar los expedientes usando la opción 1 o 4.")
+        if not archivos_expedientes:
+            cprint("No se encontraron expedientes para analizar.", 'white', 'on_red', attrs=['bold'])
+            print("Primero debe descargar expedientes usando la opción 1.")
             ConsoleUtils.pausar()
             return
         
-        print(f"Se encontraron {len(archivos_excel)} expedientes para analizar.")
+        print(f"Se encontraron {len(archivos_expedientes)} expedientes para analizar.")
         
         respuesta = ConsoleUtils.leer_texto("¿Desea continuar con el análisis? (s/n): ").lower()
         if respuesta not in ['s', 'si', 'sí', 'y', 'yes']:
@@ -366,34 +604,15 @@ class MenuController:
         print("Analizando expedientes para equiparación...")
         print("=" * self.ancho_menu)
         
-        analyzer = EquiparacionAnalyzer()
-        exitosos = 0
-        errores = 0
-        
-        for i, archivo_excel in enumerate(archivos_excel, 1):
-            try:
-                # Procesar archivo para equiparación
-                resultado = analyzer.analizar_expediente(str(archivo_excel))
-                
-                if resultado:
-                    # Extraer nombre del estudiante del archivo
-                    nombre_archivo = archivo_excel.stem
-                    partes = nombre_archivo.split('-', 1)
-                    carne = partes[0] if len(partes) > 0 else "N/A"
-                    nombre = partes[1] if len(partes) > 1 else "N/A"
-                    
-                    print(f"[{i:3d}/{len(archivos_excel)}] ✓ {carne} - {nombre[:30]}")
-                    exitosos += 1
-                else:
-                    print(f"[{i:3d}/{len(archivos_excel)}] ⚠️ {archivo_excel.name} - Sin análisis")
-                    
-            except Exception as e:
-                print(f"[{i:3d}/{len(archivos_excel)}] ✗ Error en {archivo_excel.name}: {str(e)}")
-                errores += 1
+        with perfilar('equiparacion'):
+            exitosos, omitidos, errores = self._regenerar_archivos_excel(
+                file_repo, archivos_expedientes, 'con_equiparacion', forzar=False
+            )
         
         print()
         print("=" * self.ancho_menu)
-        cprint(f"Análisis completado: {exitosos} exitosos, {errores} errores", 'green', attrs=['bold'])
+        cprint(f"Análisis completado: {exitosos} exitosos, {omitidos} sin cambios, {errores} errores",
+               'green', attrs=['bold'])
         
         if exitosos > 0:
             print("Se ha agregado la hoja 'Equiparación' a los archivos Excel.")
@@ -404,3 +623,48 @@ class MenuController:
             print("  • Recomendaciones de equiparación")
         
         ConsoleUtils.pausar()
+
+    def _opcion_reporte_cohorte(self) -> None:
+        """Genera un solo archivo Excel con el resumen de todos los estudiantes."""
+        from ...infrastructure.repositories.file_repository import FileRepository
+        from ...application.services.reporte_cohorte_service import ReporteCohorteService
+        
+        print("REPORTE DE COHORTE")
+        print("=" * self.ancho_menu)
+        print("Esta opción genera un solo archivo Excel con una fila por estudiante")
+        print("y estadísticas de aprobación y reprobación por curso.")
+        print()
+        
+        file_repo = FileRepository()
+        archivos_expedientes = file_repo.listar_archivos_expedientes()
+        
+        if not archivos_expedientes:
+            cprint("No se encontraron expedientes para procesar.", 'white', 'on_red', attrs=['bold'])
+            print("Primero debe descargar expedientes usando la opción 1.")
+            ConsoleUtils.pausar()
+            return
+        
+        total = len(archivos_expedientes)
+        file_repo.directorio_reportes.mkdir(parents=True, exist_ok=True)
+        ruta_salida = file_repo.directorio_reportes / f'cohorte-{datetime.now():%Y%m%d-%H%M%S}.xlsx'
+        
+        def al_procesar(procesados, fila):
+            print(f"[{procesados:3d}/{total}] ✓ {fila.carne} - {fila.nombre[:30]}")
+        
+        errores_lectura = []
+        resumen = ReporteCohorteService().generar(
+            file_repo.iterar_expedientes(errores_lectura), str(ruta_salida), al_procesar
+        )
+        
+        for carne, error in errores_lectura + resumen.errores:
+            print(f"✗ Error en {carne}: {error}")
+        
+        print()
+        print("=" * self.ancho_menu)
+        cprint(
+            f"Reporte generado con {resumen.estudiantes} estudiantes en {resumen.duracion:.1f} s",
+            'green', attrs=['bold']
+        )
+        print(f"Archivo: {ruta_salida}")
+        
+        ConsoleUtils.pausar()
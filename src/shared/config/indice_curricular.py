@@ -0,0 +1,73 @@
+"""
+Índice del plan de estudios por sigla
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .settings import DETALLE_CURSOS
+
+
+@dataclass(frozen=True)
+class CursoPlan:
+    """Curso del plan de estudios con sus requisitos y correquisitos."""
+    sigla: str
+    nombre: str
+    creditos: int
+    semestre: int
+    requisitos: Tuple[str, ...] = ()
+    correquisitos: Tuple[str, ...] = ()
+
+
+class IndiceCurricular:
+    """
+    Consulta de los cursos del plan de estudios en tiempo constante por sigla.
+    """
+
+    def __init__(self, detalle_cursos: List[Dict[str, Any]]):
+        """
+        Construye el índice a partir del detalle de cursos del plan.
+
+        Args:
+            detalle_cursos: Lista de diccionarios con el formato de DETALLE_CURSOS.
+                            Si una sigla se repite, se conserva la primera aparición.
+        """
+        self._cursos: Dict[str, CursoPlan] = {}
+        for curso in detalle_cursos:
+            self._cursos.setdefault(curso['sigla'], CursoPlan(
+                sigla=curso['sigla'],
+                nombre=curso.get('curso', ''),
+                creditos=curso.get('creditos', 0),
+                semestre=curso.get('semestre', 0),
+                requisitos=tuple(curso.get('requisitos', ())),
+                correquisitos=tuple(curso.get('correquisitos', ()))
+            ))
+
+    def __contains__(self, sigla: str) -> bool:
+        return sigla in self._cursos
+
+    def __len__(self) -> int:
+        return len(self._cursos)
+
+    def obtener(self, sigla: str) -> Optional[CursoPlan]:
+        """Obtiene el curso del plan con la sigla indicada, o None si no existe."""
+        return self._cursos.get(sigla)
+
+    def requisitos(self, sigla: str) -> Tuple[str, ...]:
+        """Requisitos del curso; vacío si el curso no existe o no tiene."""
+        curso = self._cursos.get(sigla)
+        return curso.requisitos if curso else ()
+
+    def correquisitos(self, sigla: str) -> Tuple[str, ...]:
+        """Correquisitos del curso; vacío si el curso no existe o no tiene."""
+        curso = self._cursos.get(sigla)
+        return curso.correquisitos if curso else ()
+
+
+@lru_cache(maxsize=None)
+def obtener_indice_curricular() -> IndiceCurricular:
+    """
+    Obtiene el índice del plan de estudios vigente (DETALLE_CURSOS).
+    Se construye una sola vez por proceso y se comparte entre todos los libros.
+    """
+    return IndiceCurricular(DETALLE_CURSOS)
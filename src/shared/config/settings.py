@@ -1,18 +1,40 @@
 """
 Configuración general de la aplicación
 """
+from datetime import datetime
 from typing import Dict, List, Any
 from dataclasses import dataclass, field
 
 
+URL_BASE_EMATRICULA = 'https://ematricula.ucr.ac.cr/ematricula/admin'
+
+
 @dataclass
 class UrlsConfig:
     """URLs utilizadas para el web scraping del sistema de matrícula."""
-    home: str = 'https://ematricula.ucr.ac.cr/ematricula/admin/showAdminLogin.do'
-    login: str = 'https://ematricula.ucr.ac.cr/ematricula/admin/loginAdmin.do'
-    listado: str = 'https://ematricula.ucr.ac.cr/ematricula/admin/profesorExpedienteEstud.do'
-    comentarios: str = 'https://ematricula.ucr.ac.cr/ematricula/admin/showComentariosProfEstud.do?c={}'
-    notas: str = 'https://ematricula.ucr.ac.cr/ematricula/admin/nivelAvance.do?c={}'
+    home: str = f'{URL_BASE_EMATRICULA}/showAdminLogin.do'
+    login: str = f'{URL_BASE_EMATRICULA}/loginAdmin.do'
+    listado: str = f'{URL_BASE_EMATRICULA}/profesorExpedienteEstud.do'
+    comentarios: str = f'{URL_BASE_EMATRICULA}/showComentariosProfEstud.do?c={{}}'
+    notas: str = f'{URL_BASE_EMATRICULA}/nivelAvance.do?c={{}}'
+
+    @classmethod
+    def desde_base(cls, url_base: str) -> 'UrlsConfig':
+        """
+        Crea las URLs de un servidor con las mismas rutas que el sistema de matrícula,
+        por ejemplo el servidor simulado de las pruebas de carga.
+
+        Args:
+            url_base: URL del directorio admin, por ejemplo http://127.0.0.1:8080/ematricula/admin
+        """
+        url_base = url_base.rstrip('/')
+        return cls(
+            home=f'{url_base}/showAdminLogin.do',
+            login=f'{url_base}/loginAdmin.do',
+            listado=f'{url_base}/profesorExpedienteEstud.do',
+            comentarios=f'{url_base}/showComentariosProfEstud.do?c={{}}',
+            notas=f'{url_base}/nivelAvance.do?c={{}}',
+        )
 
 
 @dataclass
@@ -26,6 +48,14 @@ class AuthConfig:
 class ApplicationConfig:
     """Configuración general de la aplicación."""
     debug: bool = True
+    procesos: int = 0  # Procesos para generar Excel en lote (0 = todos los núcleos)
+    excel_streaming: bool = False  # Escribir los Excel con memoria constante
+    perfil_excel: str = 'completo'  # Hojas a generar (ver ExcelWriter.PERFILES)
+    tiempo_limite_excel: float = 120  # Segundos máximos por Excel en lote (0 = sin límite)
+    descargas: int = 1  # Expedientes que se descargan a la vez
+    perfilar: bool = False  # Perfilar las operaciones (ver shared.instrumentacion.perfilador)
+    directorio_perfiles: str = 'perfiles'  # Directorio de los perfiles escritos
+    medir_memoria: bool = False  # Registrar la memoria de cada etapa con tracemalloc
     urls: UrlsConfig = field(default_factory=UrlsConfig)
     auth: AuthConfig = field(default_factory=AuthConfig)
 
@@ -33,6 +63,9 @@ class ApplicationConfig:
 # Instancia global de configuración
 app_config = ApplicationConfig()
 
+# Fecha en que deja de funcionar esta versión de prueba
+FECHA_EXPIRACION = datetime(year=2026, month=2, day=28)
+
 # Datos de la configuración de cursos (detalle_cursos de config.py original)
 DETALLE_CURSOS: List[Dict[str, Any]] = [
     {'sigla': 'EF-D', 'curso': 'ACTIVIDAD DEPORTIVA', 'creditos': 0, 'semestre': 1},
@@ -0,0 +1,151 @@
+"""
+Tabla de equivalencias entre el plan de estudios vigente y el plan nuevo
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+
+RUTA_EQUIVALENCIAS = Path(__file__).with_name('equivalencias_plan.json')
+
+
+@dataclass(frozen=True)
+class Equivalencia:
+    """Par de cursos equivalentes entre el plan vigente y el plan nuevo."""
+    sigla_vieja: str
+    curso_viejo: str
+    creditos_viejo: str
+    sigla_nueva: str
+    curso_nuevo: str
+    creditos_nuevo: str
+
+
+@dataclass(frozen=True)
+class ReglaCombinada:
+    """
+    Equivalencia que requiere aprobar varios cursos del plan vigente para
+    equiparar un curso del plan nuevo.
+    """
+    nombre: str
+    cursos_requeridos: Tuple[str, ...]
+    equivale_a: FrozenSet[str]  # Siglas con las que aparece el curso nuevo en la tabla
+    nombre_nuevo: str = ''
+
+    def faltantes(self, siglas_aprobadas: AbstractSet[str]) -> Tuple[str, ...]:
+        """Cursos requeridos que no están aprobados, en el orden de la regla."""
+        pendientes = set(self.cursos_requeridos) - siglas_aprobadas
+        return tuple(sigla for sigla in self.cursos_requeridos if sigla in pendientes)
+
+    def cumplida(self, siglas_aprobadas: AbstractSet[str]) -> bool:
+        """Indica si todos los cursos requeridos están aprobados."""
+        return set(self.cursos_requeridos) <= siglas_aprobadas
+
+
+class TablaEquivalencias:
+    """
+    Equivalencias entre planes indexadas por sigla en ambos sentidos.
+    """
+
+    def __init__(self, equivalencias: List[Dict[str, Any]],
+                 reglas_combinadas: Optional[List[Dict[str, Any]]] = None):
+        """
+        Compila la tabla a partir de sus filas.
+
+        Args:
+            equivalencias: Filas con sigla, curso y créditos en ambos planes. Una sigla
+                           vacía indica que el curso no existe en ese plan.
+            reglas_combinadas: Reglas con los cursos requeridos y las siglas del curso nuevo
+        """
+        # Huella del contenido, para saber si los archivos generados con la tabla están al día
+        contenido = json.dumps(
+            {'equivalencias': equivalencias, 'reglas_combinadas': reglas_combinadas or []},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        self.huella: str = hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+        self._filas: Tuple[Equivalencia, ...] = tuple(
+            Equivalencia(**{campo: str(fila.get(campo, '')) for campo in Equivalencia.__dataclass_fields__})
+            for fila in equivalencias
+        )
+
+        self._por_sigla_vieja: Dict[str, Equivalencia] = {}
+        self._por_sigla_nueva: Dict[str, List[Equivalencia]] = {}
+        for equivalencia in self._filas:
+            if equivalencia.sigla_vieja:
+                # Si una sigla vieja se repite, se conserva la primera aparición
+                self._por_sigla_vieja.setdefault(equivalencia.sigla_vieja, equivalencia)
+            if equivalencia.sigla_nueva:
+                self._por_sigla_nueva.setdefault(equivalencia.sigla_nueva, []).append(equivalencia)
+
+        self.solo_plan_nuevo: Tuple[Equivalencia, ...] = tuple(
+            equivalencia for equivalencia in self._filas
+            if equivalencia.sigla_nueva and not equivalencia.sigla_vieja
+        )
+
+        self.reglas: Dict[str, ReglaCombinada] = {}
+        self._regla_por_sigla_vieja: Dict[str, ReglaCombinada] = {}
+        for regla in reglas_combinadas or []:
+            compilada = ReglaCombinada(
+                nombre=regla['nombre'],
+                cursos_requeridos=tuple(regla['cursos_requeridos']),
+                equivale_a=frozenset(regla['equivale_a']),
+                nombre_nuevo=regla.get('nombre_nuevo', '')
+            )
+            self.reglas[compilada.nombre] = compilada
+            for sigla in compilada.cursos_requeridos:
+                self._regla_por_sigla_vieja[sigla] = compilada
+
+    @classmethod
+    def cargar(cls, ruta: Union[str, Path]) -> 'TablaEquivalencias':
+        """
+        Carga la tabla desde un archivo JSON.
+
+        Args:
+            ruta: Archivo con las listas 'equivalencias' y 'reglas_combinadas'
+
+        Returns:
+            Tabla compilada
+        """
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        return cls(datos.get('equivalencias', []), datos.get('reglas_combinadas', []))
+
+    def __iter__(self) -> Iterator[Equivalencia]:
+        return iter(self._filas)
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+    def por_sigla_vieja(self, sigla: str) -> Optional[Equivalencia]:
+        """Equivalencia de un curso del plan vigente, o None si no está en la tabla."""
+        return self._por_sigla_vieja.get(sigla)
+
+    def por_sigla_nueva(self, sigla: str) -> Tuple[Equivalencia, ...]:
+        """Equivalencias que llevan al curso del plan nuevo indicado."""
+        return tuple(self._por_sigla_nueva.get(sigla, ()))
+
+    def regla_combinada(self, sigla_vieja: str, sigla_nueva: str) -> Optional[ReglaCombinada]:
+        """
+        Regla combinada que aplica a un par de cursos.
+
+        Args:
+            sigla_vieja: Sigla del curso en el plan vigente
+            sigla_nueva: Sigla del curso en el plan nuevo
+
+        Returns:
+            La regla si el curso vigente es requerido por ella y el curso nuevo es su destino
+        """
+        regla = self._regla_por_sigla_vieja.get(sigla_vieja)
+        return regla if regla and sigla_nueva in regla.equivale_a else None
+
+
+@lru_cache(maxsize=None)
+def obtener_tabla_equivalencias(ruta: Union[str, Path] = RUTA_EQUIVALENCIAS) -> TablaEquivalencias:
+    """
+    Obtiene la tabla de equivalencias compilada.
+    Se carga una sola vez por archivo y proceso.
+    """
+    return TablaEquivalencias.cargar(ruta)
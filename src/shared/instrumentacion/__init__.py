@@ -0,0 +1,13 @@
+"""
+Instrumentación de tiempos, contadores, memoria y perfiles
+
+El monitor de memoria (memoria.MonitorMemoria) no se importa aquí: carga tracemalloc
+y solo se usa al activarlo con metricas.activar_memoria.
+"""
+from .metricas import EstadisticaMetrica, Metricas, medido, metricas
+from .perfilador import Perfilador, ResultadoPerfil, perfilado, perfilar
+
+__all__ = [
+    'EstadisticaMetrica', 'Metricas', 'medido', 'metricas',
+    'Perfilador', 'ResultadoPerfil', 'perfilado', 'perfilar',
+]
@@ -0,0 +1,333 @@
+"""
+Memoria asignada por las etapas de procesamiento, con tracemalloc
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+KIB = 1024
+MIB = 1024 * 1024
+
+# Las asignaciones de estos archivos son del propio monitor
+_ARCHIVOS_PROPIOS = {__file__, tracemalloc.__file__}
+
+
+@dataclass
+class EstadisticaMemoria:
+    """Memoria asignada por una etapa medida."""
+    nombre: str
+    llamadas: int = 0
+    pico: int = 0  # Bytes por encima del inicio de la etapa; máximo entre las llamadas
+    retenido: int = 0  # Bytes que siguen asignados al terminar; suma de las llamadas
+    sitios: Counter = field(default_factory=Counter)  # 'directorio/archivo:línea' -> bytes que siguen asignados
+
+
+@dataclass
+class _EtapaAbierta:
+    """Etapa en curso; su pico se actualiza antes de cada reinicio del pico de tracemalloc."""
+    nombre: str
+    inicio: int
+    pico: int
+
+
+def pico_rss() -> Optional[int]:
+    """Pico del tamaño residente del proceso en bytes, o None si el sistema no lo informa."""
+    try:
+        import resource
+    except ImportError:
+        return _pico_rss_windows()
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * KIB
+
+
+def _pico_rss_windows() -> Optional[int]:
+    """PeakWorkingSetSize del proceso, con la API de Windows."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Contadores(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        contadores = Contadores()
+        contadores.cb = ctypes.sizeof(contadores)
+        proceso = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(proceso, ctypes.byref(contadores), contadores.cb):
+            return contadores.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def _sitio(archivo: str, linea: int) -> str:
+    """Archivo con su directorio y línea; el directorio distingue xlsxwriter de openpyxl."""
+    directorio, archivo = os.path.split(archivo)
+    if directorio:
+        archivo = f'{os.path.basename(directorio)}/{archivo}'
+    return f'{archivo}:{linea}'
+
+
+def _asignaciones() -> tracemalloc.Snapshot:
+    """
+    Instantánea de las asignaciones vivas, agrupables por la línea que las hizo.
+
+    Tomar y comparar una instantánea recorre toda la memoria asignada, por lo que
+    solo se hace en las llamadas muestreadas (ver MonitorMemoria).
+    """
+    return tracemalloc.take_snapshot()
+
+
+def _sitios_nuevos(antes: tracemalloc.Snapshot, despues: tracemalloc.Snapshot) -> Counter:
+    """Bytes que crecieron entre dos instantáneas, por sitio."""
+    sitios: Counter = Counter()
+    for diferencia in despues.compare_to(antes, 'lineno'):
+        marco = diferencia.traceback[0]
+        if diferencia.size_diff > 0 and marco.filename not in _ARCHIVOS_PROPIOS:
+            sitios[_sitio(marco.filename, marco.lineno)] += diferencia.size_diff
+    return sitios
+
+
+class MonitorMemoria:
+    """
+    Mide con tracemalloc el pico y la memoria retenida de cada etapa, y vigila que la
+    memoria de cada estudiante se libere entre las iteraciones de un lote.
+
+    tracemalloc mide todo el proceso: si varias etapas corren a la vez en distintos
+    hilos, el pico de cada una incluye lo asignado por las demás. Los sitios de
+    asignación se obtienen comparando instantáneas de tracemalloc tomadas antes y
+    después de la etapa, solo en sus primeras llamadas durante la vida del monitor
+    (en los trabajadores, las de sus primeros estudiantes), porque cada instantánea
+    recorre toda la memoria asignada y eleva el pico de las etapas que la contienen.
+    """
+
+    def __init__(self, sitios: int = 5, muestras: int = 1, ventana: int = 20, umbral: int = 64 * KIB):
+        """
+        Inicializa el monitor sin iniciar tracemalloc.
+
+        Args:
+            sitios: Cantidad de sitios de asignación que se reportan por etapa
+            muestras: Llamadas de cada etapa en las que se buscan los sitios de asignación
+            ventana: Estudiantes entre dos revisiones de la memoria no liberada
+            umbral: Bytes retenidos por estudiante a partir de los cuales se advierte
+        """
+        self.sitios = sitios
+        self.muestras = muestras
+        self.ventana = ventana
+        self.umbral = umbral
+        self._candado = threading.Lock()
+        self._propio = False
+        self._muestreadas: Counter = Counter()  # Llamadas con instantáneas por etapa; no se reinicia
+        self.reiniciar()
+
+    def iniciar(self) -> None:
+        """Inicia tracemalloc si no estaba activo."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._propio = True
+        self.reiniciar()
+
+    def detener(self) -> None:
+        """Detiene tracemalloc si lo inició este monitor."""
+        if self._propio:
+            tracemalloc.stop()
+            self._propio = False
+
+    def reiniciar(self) -> None:
+        """Descarta lo registrado y empieza una corrida nueva."""
+        with self._candado:
+            self._etapas: Dict[str, EstadisticaMemoria] = {}
+            self._estudiantes: Dict[str, int] = {}  # clave -> pico de su generación
+            self._series: Dict[str, Deque[int]] = {}  # origen -> memoria tras cada estudiante
+            self._iteraciones: Counter = Counter()
+            self._asignaciones_lote: Optional[tracemalloc.Snapshot] = None
+            self._rss_trabajadores: Dict[int, int] = {}
+            self.advertencias: List[str] = []
+            actual = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+            self._corrida = _EtapaAbierta('corrida', actual, actual)
+            self._abiertas: List[_EtapaAbierta] = [self._corrida]
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+
+    def _actualizar_picos(self) -> int:
+        """Lleva el pico actual a las etapas abiertas y retorna la memoria actual."""
+        actual, pico = tracemalloc.get_traced_memory()
+        for abierta in self._abiertas:
+            abierta.pico = max(abierta.pico, pico)
+        return actual
+
+    @contextmanager
+    def etapa(self, nombre: str) -> Iterator[None]:
+        """Mide el pico, lo retenido y, en las primeras llamadas, los sitios de asignación del bloque."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        with self._candado:
+            muestrear = self._muestreadas[nombre] < self.muestras
+            if muestrear:
+                self._muestreadas[nombre] += 1
+        antes = _asignaciones() if muestrear else None
+
+        with self._candado:
+            actual = self._actualizar_picos()
+            tracemalloc.reset_peak()
+            abierta = _EtapaAbierta(nombre, actual, actual)
+            self._abiertas.append(abierta)
+        try:
+            yield
+        finally:
+            with self._candado:
+                actual = self._actualizar_picos()
+                self._abiertas.remove(abierta)
+                estadistica = self._etapas.setdefault(nombre, EstadisticaMemoria(nombre))
+                estadistica.llamadas += 1
+                estadistica.pico = max(estadistica.pico, abierta.pico - abierta.inicio)
+                estadistica.retenido += actual - abierta.inicio
+
+            if antes is not None:
+                sitios = _sitios_nuevos(antes, _asignaciones())
+                del antes
+                with self._candado:
+                    estadistica.sitios.update(sitios)
+                    self._actualizar_picos()
+                    tracemalloc.reset_peak()
+
+    def registrar_estudiante(self, clave: str, datos_trabajador: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Registra el fin de un estudiante en un lote y revisa si la memoria crece
+        de un estudiante a otro, en este proceso y en el trabajador que lo generó.
+
+        Args:
+            clave: Identificación del estudiante (carné)
+            datos_trabajador: Memoria reportada por el proceso trabajador (como_dict)
+
+        Returns:
+            Advertencia si la memoria retenida por estudiante superó el umbral, o None
+        """
+        if not tracemalloc.is_tracing():
+            return None
+
+        advertencia = self._revisar_serie('el proceso principal', tracemalloc.get_traced_memory()[0], True)
+        if datos_trabajador:
+            with self._candado:
+                self._estudiantes[clave] = datos_trabajador.get('pico', 0)
+            advertencia = self._revisar_serie(
+                f'el trabajador {datos_trabajador.get("proceso")}', datos_trabajador.get('actual', 0), False
+            ) or advertencia
+        return advertencia
+
+    def _revisar_serie(self, origen: str, actual: int, con_sitios: bool) -> Optional[str]:
+        """Agrega la memoria de una iteración y la compara con la de hace una ventana."""
+        with self._candado:
+            serie = self._series.setdefault(origen, deque(maxlen=self.ventana))
+            serie.append(actual)
+            self._iteraciones[origen] += 1
+            if self._iteraciones[origen] % self.ventana:
+                return None
+            por_estudiante = (serie[-1] - serie[0]) / max(1, len(serie) - 1)
+
+        sitios = ''
+        if con_sitios:
+            asignaciones = _asignaciones()
+            if self._asignaciones_lote is not None and por_estudiante > self.umbral:
+                sitios = ' Crecen: ' + ', '.join(
+                    f'{sitio} (+{bytes_ / KIB:.0f} KiB)'
+                    for sitio, bytes_ in _sitios_nuevos(self._asignaciones_lote, asignaciones).most_common(3)
+                )
+            self._asignaciones_lote = asignaciones
+
+        if por_estudiante <= self.umbral:
+            return None
+        advertencia = (
+            f'La memoria de {origen} no se libera entre estudiantes: +{por_estudiante / KIB:.0f} KiB '
+            f'por estudiante en los últimos {self.ventana}.{sitios}'
+        )
+        with self._candado:
+            self.advertencias.append(advertencia)
+        return advertencia
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Valores registrados en un diccionario serializable."""
+        with self._candado:
+            actual = self._actualizar_picos() if tracemalloc.is_tracing() else 0
+            return {
+                'proceso': os.getpid(),
+                'actual': actual,
+                'pico': self._corrida.pico - self._corrida.inicio,
+                'rss_pico': pico_rss(),
+                'rss_trabajadores': dict(self._rss_trabajadores),
+                'etapas': {
+                    e.nombre: {
+                        'llamadas': e.llamadas, 'pico': e.pico, 'retenido': e.retenido,
+                        'sitios': dict(e.sitios.most_common(self.sitios)),
+                    }
+                    for e in self.etapas()
+                },
+                'estudiantes': dict(Counter(self._estudiantes).most_common(self.sitios)),
+                'advertencias': list(self.advertencias),
+            }
+
+    def combinar(self, datos: Dict[str, Any]) -> None:
+        """
+        Suma la memoria de otro registro, por ejemplo el de un proceso trabajador.
+
+        Args:
+            datos: Diccionario obtenido con como_dict
+        """
+        with self._candado:
+            for nombre, valores in datos.get('etapas', {}).items():
+                estadistica = self._etapas.setdefault(nombre, EstadisticaMemoria(nombre))
+                estadistica.llamadas += valores['llamadas']
+                estadistica.pico = max(estadistica.pico, valores['pico'])
+                estadistica.retenido += valores['retenido']
+                estadistica.sitios.update(valores['sitios'])
+            if datos.get('rss_pico') and datos.get('proceso') != os.getpid():
+                proceso = datos['proceso']
+                self._rss_trabajadores[proceso] = max(self._rss_trabajadores.get(proceso, 0), datos['rss_pico'])
+
+    def etapas(self) -> List[EstadisticaMemoria]:
+        """Etapas ordenadas de mayor a menor pico."""
+        return sorted(self._etapas.values(), key=lambda e: (-e.pico, e.nombre))
+
+    def tabla(self) -> str:
+        """Tabla con el pico y lo retenido por etapa, los sitios que más asignan y las advertencias."""
+        datos = self.como_dict()
+        lineas = [f'{"MEMORIA (tracemalloc)":32} {"LLAMADAS":>9} {"PICO KiB":>11} {"RETENIDO KiB":>13}']
+        for nombre, valores in datos['etapas'].items():
+            lineas.append(
+                f'{nombre[:32]:32} {valores["llamadas"]:9d} {valores["pico"] / KIB:11.1f} '
+                f'{valores["retenido"] / KIB:13.1f}'
+            )
+
+        sitios: Counter = Counter()
+        for etapa in self._etapas.values():
+            sitios.update(etapa.sitios)
+        if sitios:
+            lineas.append('Sitios que más memoria asignan:')
+            lineas.extend(f'  {sitio:48} {bytes_ / KIB:11.1f} KiB' for sitio, bytes_ in sitios.most_common(self.sitios))
+
+        if datos['estudiantes']:
+            lineas.append('Estudiantes con más memoria: ' + ', '.join(
+                f'{clave} {bytes_ / KIB:.0f} KiB' for clave, bytes_ in datos['estudiantes'].items()
+            ))
+
+        rss = [f'pico de asignaciones {datos["pico"] / MIB:.1f} MiB']
+        if datos['rss_pico']:
+            rss.append(f'RSS pico {datos["rss_pico"] / MIB:.1f} MiB')
+        if datos['rss_trabajadores']:
+            rss.append(f'RSS pico de los trabajadores {max(datos["rss_trabajadores"].values()) / MIB:.1f} MiB')
+        lineas.append('Proceso principal: ' + ', '.join(rss))
+        lineas.extend(f'ADVERTENCIA: {advertencia}' for advertencia in datos['advertencias'])
+        return '\n'.join(lineas)
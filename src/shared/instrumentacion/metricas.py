@@ -0,0 +1,249 @@
+"""
+Tiempos y contadores de las etapas de procesamiento
+"""
+import contextlib
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    from .memoria import MonitorMemoria
+
+
+@dataclass
+class EstadisticaMetrica:
+    """Tiempo acumulado de una operación medida."""
+    nombre: str
+    llamadas: int = 0
+    total: float = 0.0  # Segundos
+    maximo: float = 0.0  # Segundos
+
+    @property
+    def promedio(self) -> float:
+        """Segundos promedio por llamada."""
+        return self.total / self.llamadas if self.llamadas else 0.0
+
+
+class Metricas:
+    """
+    Registro de tiempos y contadores de una corrida.
+
+    Es seguro usarlo desde varios hilos. Los procesos trabajadores tienen su propio
+    registro; sus valores se envían al proceso principal con como_dict y se suman
+    con combinar. Con activar_memoria, cada medición registra también la memoria
+    asignada (ver MonitorMemoria).
+    """
+
+    def __init__(self):
+        """Inicializa un registro vacío."""
+        self._candado = threading.Lock()
+        self.memoria: Optional['MonitorMemoria'] = None
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Descarta los valores registrados y empieza una corrida nueva."""
+        with self._candado:
+            self._tiempos: Dict[str, EstadisticaMetrica] = {}
+            self._contadores: Dict[str, float] = {}
+            self.inicio = time.perf_counter()
+        if self.memoria:
+            self.memoria.reiniciar()
+
+    def activar_memoria(self, **opciones) -> 'MonitorMemoria':
+        """
+        Inicia tracemalloc y registra la memoria de cada medición.
+
+        Args:
+            **opciones: Opciones para MonitorMemoria
+
+        Returns:
+            El monitor de memoria del registro
+        """
+        from .memoria import MonitorMemoria
+
+        if self.memoria is None:
+            self.memoria = MonitorMemoria(**opciones)
+            self.memoria.iniciar()
+        return self.memoria
+
+    def desactivar_memoria(self) -> None:
+        """Deja de registrar la memoria y detiene tracemalloc."""
+        if self.memoria:
+            self.memoria.detener()
+            self.memoria = None
+
+    @contextmanager
+    def medir(self, nombre: str) -> Iterator[None]:
+        """Mide la duración del bloque y la acumula en la métrica indicada."""
+        memoria = self.memoria.etapa(nombre) if self.memoria else contextlib.nullcontext()
+        with memoria:
+            inicio = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.registrar_tiempo(nombre, time.perf_counter() - inicio)
+
+    def registrar_estudiante(self, clave: str, datos_trabajador: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Marca el fin de un estudiante en un lote para vigilar la memoria no liberada.
+
+        Args:
+            clave: Identificación del estudiante (carné)
+            datos_trabajador: Métricas del proceso trabajador que lo generó (como_dict)
+
+        Returns:
+            Advertencia si la memoria crece de un estudiante a otro, o None
+        """
+        if not self.memoria:
+            return None
+        return self.memoria.registrar_estudiante(clave, (datos_trabajador or {}).get('memoria'))
+
+    def registrar_tiempo(self, nombre: str, segundos: float) -> None:
+        """Acumula la duración de una llamada en la métrica indicada."""
+        with self._candado:
+            estadistica = self._tiempos.get(nombre)
+            if estadistica is None:
+                estadistica = self._tiempos[nombre] = EstadisticaMetrica(nombre)
+            estadistica.llamadas += 1
+            estadistica.total += segundos
+            estadistica.maximo = max(estadistica.maximo, segundos)
+
+    def contar(self, nombre: str, cantidad: float = 1) -> None:
+        """Suma una cantidad al contador indicado."""
+        with self._candado:
+            self._contadores[nombre] = self._contadores.get(nombre, 0) + cantidad
+
+    @property
+    def duracion(self) -> float:
+        """Segundos transcurridos desde el inicio de la corrida."""
+        return time.perf_counter() - self.inicio
+
+    def tiempos(self) -> List[EstadisticaMetrica]:
+        """Métricas de tiempo ordenadas de mayor a menor tiempo total."""
+        with self._candado:
+            return sorted(
+                (EstadisticaMetrica(e.nombre, e.llamadas, e.total, e.maximo) for e in self._tiempos.values()),
+                key=lambda e: (-e.total, e.nombre)
+            )
+
+    def contadores(self) -> Dict[str, float]:
+        """Contadores ordenados por nombre."""
+        with self._candado:
+            return dict(sorted(self._contadores.items()))
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Valores registrados en un diccionario serializable."""
+        datos = {
+            'duracion': round(self.duracion, 6),
+            'tiempos': {
+                e.nombre: {'llamadas': e.llamadas, 'total': round(e.total, 6), 'maximo': round(e.maximo, 6)}
+                for e in self.tiempos()
+            },
+            'contadores': self.contadores(),
+        }
+        if self.memoria:
+            datos['memoria'] = self.memoria.como_dict()
+        return datos
+
+    def combinar(self, datos: Dict[str, Any]) -> None:
+        """
+        Suma los valores de otro registro, por ejemplo el de un proceso trabajador.
+
+        Args:
+            datos: Diccionario obtenido con como_dict
+        """
+        with self._candado:
+            for nombre, valores in datos.get('tiempos', {}).items():
+                estadistica = self._tiempos.get(nombre)
+                if estadistica is None:
+                    estadistica = self._tiempos[nombre] = EstadisticaMetrica(nombre)
+                estadistica.llamadas += valores['llamadas']
+                estadistica.total += valores['total']
+                estadistica.maximo = max(estadistica.maximo, valores['maximo'])
+            for nombre, cantidad in datos.get('contadores', {}).items():
+                self._contadores[nombre] = self._contadores.get(nombre, 0) + cantidad
+        if self.memoria and datos.get('memoria'):
+            self.memoria.combinar(datos['memoria'])
+
+    def tabla(self) -> str:
+        """
+        Tabla de resumen con el tiempo de cada métrica y el ritmo de cada contador.
+
+        Los tiempos de los procesos trabajadores se suman, por lo que el total de una
+        métrica puede ser mayor que la duración de la corrida.
+        """
+        duracion = self.duracion
+        tiempos = self.tiempos()
+        total_medido = sum(e.total for e in tiempos) or 1.0
+
+        lineas = [f'{"MÉTRICA":32} {"LLAMADAS":>9} {"TOTAL s":>9} {"PROM ms":>9} {"MÁX ms":>9} {"%":>6}']
+        for e in tiempos:
+            lineas.append(
+                f'{e.nombre[:32]:32} {e.llamadas:9d} {e.total:9.3f} {e.promedio * 1000:9.2f} '
+                f'{e.maximo * 1000:9.2f} {e.total / total_medido * 100:6.1f}'
+            )
+        for nombre, cantidad in self.contadores().items():
+            ritmo = cantidad / duracion if duracion > 0 else 0.0
+            lineas.append(f'{nombre[:32]:32} {cantidad:9g} {"":9} {ritmo:>14.1f}/s')
+        lineas.append(f'{"DURACIÓN DE LA CORRIDA":32} {"":9} {duracion:9.3f}')
+        if self.memoria:
+            lineas.extend(['', self.memoria.tabla()])
+        return '\n'.join(lineas)
+
+    def exportar(self, ruta: Union[str, Path]) -> Path:
+        """
+        Guarda los valores registrados en JSON o CSV según la extensión del archivo.
+
+        Args:
+            ruta: Archivo de destino (.json o .csv)
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        import csv
+        import json
+
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+
+        if ruta.suffix.lower() == '.csv':
+            with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+                writer = csv.writer(archivo)
+                writer.writerow(['tipo', 'nombre', 'llamadas', 'total_s', 'promedio_s', 'maximo_s', 'valor'])
+                for e in self.tiempos():
+                    writer.writerow(['tiempo', e.nombre, e.llamadas, f'{e.total:.6f}',
+                                     f'{e.promedio:.6f}', f'{e.maximo:.6f}', ''])
+                for nombre, cantidad in self.contadores().items():
+                    writer.writerow(['contador', nombre, '', '', '', '', cantidad])
+                for e in (self.memoria.etapas() if self.memoria else []):
+                    writer.writerow(['memoria_pico', e.nombre, e.llamadas, '', '', '', e.pico])
+                    writer.writerow(['memoria_retenida', e.nombre, e.llamadas, '', '', '', e.retenido])
+        else:
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                json.dump(self.como_dict(), archivo, ensure_ascii=False, indent=2)
+
+        return ruta
+
+
+# Registro de la corrida del proceso actual
+metricas = Metricas()
+
+
+def medido(nombre: str) -> Callable:
+    """
+    Decorador que mide cada llamada de una función en el registro global.
+
+    Args:
+        nombre: Nombre de la métrica
+    """
+    def decorador(funcion: Callable) -> Callable:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with metricas.medir(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
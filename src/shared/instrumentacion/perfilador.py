@@ -0,0 +1,185 @@
+"""
+Perfilado de las operaciones de la aplicación con cProfile y por muestreo
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Union
+
+
+INTERVALO_MUESTREO = 0.005  # Segundos entre muestras de las pilas
+FUNCIONES_EN_RESUMEN = 30
+
+
+@dataclass
+class ResultadoPerfil:
+    """Archivos escritos por un perfilado."""
+    perfil: Path  # Volcado de cProfile, para pstats, snakeviz o similares
+    resumen: Path  # Funciones con más tiempo, en texto
+    pilas: Path  # Pilas colapsadas por muestreo, para flamegraph.pl o speedscope
+    muestras: int = 0
+
+
+class Perfilador:
+    """
+    Perfila una operación con cProfile en el hilo que la inicia y, al mismo tiempo,
+    toma muestras de las pilas de todos los hilos.
+
+    cProfile da el tiempo exacto por función del hilo principal; el muestreo incluye
+    los hilos de la descarga y del pipeline, y produce las pilas colapsadas para los
+    gráficos de llama. Los procesos trabajadores no se perfilan.
+    """
+
+    def __init__(self, nombre: str, directorio: Union[str, Path] = 'perfiles',
+                 intervalo: float = INTERVALO_MUESTREO, funciones: int = FUNCIONES_EN_RESUMEN):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            nombre: Nombre de la operación, usado en los nombres de archivo
+            directorio: Directorio donde se escriben los perfiles
+            intervalo: Segundos entre muestras de las pilas
+            funciones: Cantidad de funciones del resumen
+        """
+        self.nombre = nombre
+        self.directorio = Path(directorio)
+        self.intervalo = intervalo
+        self.funciones = funciones
+        self.pilas: Counter = Counter()
+        self.resultado: Optional[ResultadoPerfil] = None
+        self._perfil = None
+        self._detener = threading.Event()
+        self._muestreador: Optional[threading.Thread] = None
+        self._inicio = 0.0
+
+    def iniciar(self) -> None:
+        """Empieza a perfilar el hilo actual y a tomar muestras."""
+        import cProfile
+
+        self._perfil = cProfile.Profile()
+        self._inicio = time.perf_counter()
+        self._muestreador = threading.Thread(target=self._muestrear, name='perfilador', daemon=True)
+        self._muestreador.start()
+        self._perfil.enable()
+
+    def detener(self) -> ResultadoPerfil:
+        """Detiene el perfilado y escribe los archivos."""
+        self._perfil.disable()
+        self._detener.set()
+        self._muestreador.join()
+        self.resultado = self._escribir(time.perf_counter() - self._inicio)
+        return self.resultado
+
+    def _muestrear(self) -> None:
+        """Registra periódicamente la pila de cada hilo, excepto la del muestreador."""
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            nombres = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+            for ident, marco in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila: List[str] = []
+                while marco is not None:
+                    codigo = marco.f_code
+                    pila.append(f'{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})')
+                    marco = marco.f_back
+                pila.append(nombres.get(ident, str(ident)))
+                self.pilas[';'.join(reversed(pila))] += 1
+
+    def _escribir(self, duracion: float) -> ResultadoPerfil:
+        """Escribe el volcado de cProfile, el resumen y las pilas colapsadas."""
+        import io
+        import pstats
+
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        base = self.directorio / f'{self.nombre}-{datetime.now():%Y%m%d-%H%M%S}'
+        resultado = ResultadoPerfil(
+            base.with_suffix('.prof'), base.with_suffix('.txt'), base.with_suffix('.folded'),
+            sum(self.pilas.values())
+        )
+
+        self._perfil.dump_stats(resultado.perfil)
+
+        with open(resultado.pilas, 'w', encoding='utf-8') as archivo:
+            for pila, cantidad in self.pilas.most_common():
+                archivo.write(f'{pila} {cantidad}\n')
+
+        with open(resultado.resumen, 'w', encoding='utf-8') as archivo:
+            archivo.write(f'Operación: {self.nombre}\nDuración: {duracion:.3f} s\n')
+            archivo.write(f'Muestras: {resultado.muestras} (cada {self.intervalo * 1000:.1f} ms)\n\n')
+            archivo.write(self._resumen_muestras())
+            for orden in ('tottime', 'cumulative'):
+                texto = io.StringIO()
+                pstats.Stats(self._perfil, stream=texto).strip_dirs().sort_stats(orden).print_stats(self.funciones)
+                archivo.write(f'\n== cProfile del hilo principal, por {orden} ==\n{texto.getvalue()}')
+
+        return resultado
+
+    def _resumen_muestras(self) -> str:
+        """Funciones con más muestras propias y totales en todos los hilos."""
+        propias: Counter = Counter()
+        totales: Counter = Counter()
+        for pila, cantidad in self.pilas.items():
+            marcos = pila.split(';')[1:]
+            if not marcos:
+                continue
+            propias[marcos[-1]] += cantidad
+            for marco in set(marcos):
+                totales[marco] += cantidad
+
+        total = sum(self.pilas.values()) or 1
+        lineas = ['== Muestras de todos los hilos ==', f'{"PROPIAS %":>9} {"TOTALES %":>9}  FUNCIÓN']
+        for marco, cantidad in propias.most_common(self.funciones):
+            lineas.append(f'{cantidad / total * 100:9.1f} {totales[marco] / total * 100:9.1f}  {marco}')
+        return '\n'.join(lineas) + '\n'
+
+
+# Perfilador de la operación en curso; las operaciones anidadas no se perfilan aparte
+_activo: Optional[Perfilador] = None
+
+
+@contextmanager
+def perfilar(nombre: str) -> Iterator[Optional[Perfilador]]:
+    """
+    Perfila el bloque si el perfilado está activado en la configuración.
+
+    Args:
+        nombre: Nombre de la operación
+
+    Yields:
+        El perfilador, o None si el perfilado está desactivado o ya hay uno en curso
+    """
+    global _activo
+    from ..config.settings import app_config
+
+    if not app_config.perfilar or _activo is not None:
+        yield None
+        return
+
+    _activo = Perfilador(nombre, app_config.directorio_perfiles)
+    _activo.iniciar()
+    try:
+        yield _activo
+    finally:
+        perfilador, _activo = _activo, None
+        resultado = perfilador.detener()
+        print(f'Perfil de {nombre}: {resultado.resumen} ({resultado.muestras} muestras)')
+
+
+def perfilado(nombre: str) -> Callable:
+    """Decorador que perfila cada llamada de una función con perfilar."""
+    def decorador(funcion: Callable) -> Callable:
+        import functools
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with perfilar(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,20 @@
+"""
+Datos sintéticos para pruebas, mediciones y pruebas de carga
+"""
+from .generador_cohorte import (
+    EstudianteSintetico, GeneradorCohorte, escribir_en_repositorio, html_listado,
+    html_nivel_avance, texto_expediente, texto_prematricula
+)
+from .servidor_ematricula import EstadisticasServidor, ServidorEmatricula
+
+__all__ = [
+    'EstadisticasServidor',
+    'EstudianteSintetico',
+    'GeneradorCohorte',
+    'ServidorEmatricula',
+    'escribir_en_repositorio',
+    'html_listado',
+    'html_nivel_avance',
+    'texto_expediente',
+    'texto_prematricula',
+]
@@ -0,0 +1,279 @@
+"""
+Generador de cohortes sintéticas con los formatos de entrada de la aplicación
+"""
+import base64
+import random
+from dataclasses import dataclass, field
+from html import escape
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..config.settings import DETALLE_CURSOS
+
+
+COLUMNAS_HISTORIAL = ('SIGLA', 'CURSO', 'CREDITOS', 'GRUPO', 'SEM', 'AÑO', 'ESTADO', 'NOTA')
+
+# Siglas con las que aparecen en el expediente los cursos que el plan agrupa
+SIGLAS_REALES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'EF-D': (('EF0220', 'NATACIÓN'), ('EF0245', 'BALONCESTO'), ('EF0312', 'ACONDICIONAMIENTO FÍSICO')),
+    'RP-1': (('RP0001', 'REPERTORIO DE LITERATURA'), ('RP0023', 'REPERTORIO DE HISTORIA DEL ARTE')),
+    'EG-CA': (('EG0301', 'CURSO DE ARTE TEATRO'), ('EG0312', 'CURSO DE ARTE MÚSICA')),
+    'EG-I': (('EG0124', 'CURSO INTEGRADO DE HUMANIDADES I'),),
+    'EG-II': (('EG0125', 'CURSO INTEGRADO DE HUMANIDADES II'),),
+    'SR-I': (('SR0001', 'SEMINARIO DE REALIDAD NACIONAL I'), ('SR0005', 'SEMINARIO DE REALIDAD NACIONAL I')),
+    'SR-II': (('SR0011', 'SEMINARIO DE REALIDAD NACIONAL II'), ('SR0055', 'SEMINARIO DE REALIDAD NACIONAL II')),
+}
+
+# Cursos optativos: no están en el plan, por lo que el expediente los lista aparte
+OPTATIVOS: Tuple[Tuple[str, str], ...] = (
+    ('II0408', 'TÓPICOS DE INGENIERÍA INDUSTRIAL'),
+    ('II0409', 'GESTIÓN DE LA INNOVACIÓN'),
+    ('II0410', 'ANALÍTICA DE DATOS INDUSTRIALES'),
+    ('II0411', 'SIMULACIÓN DE SISTEMAS'),
+    ('II0412', 'ERGONOMÍA AVANZADA'),
+)
+
+NOMBRES = ('ANA', 'LUIS', 'SOFÍA', 'JOSÉ', 'MARÍA', 'DANIEL', 'VALERIA', 'ANDRÉS', 'CAMILA', 'DIEGO',
+           'GABRIELA', 'PABLO', 'NATALIA', 'FERNANDO', 'LAURA', 'ESTEBAN', 'PAULA', 'RICARDO')
+APELLIDOS = ('SOTO', 'MORA', 'VARGAS', 'JIMÉNEZ', 'ROJAS', 'CHAVES', 'SOLANO', 'CASTRO', 'QUESADA',
+             'ARAYA', 'MUÑOZ', 'CAMPOS', 'VILLALOBOS', 'BRENES', 'CORDERO', 'UREÑA', 'ALFARO')
+
+ESTADO_RETIRO = 'RETIRO DE MATRÍCULA'
+CREDITOS_POR_CICLO = 18
+CICLOS_DEL_PLAN = max(curso['semestre'] for curso in DETALLE_CURSOS)
+
+
+@dataclass
+class EstudianteSintetico:
+    """Estudiante generado con su historial en orden cronológico."""
+    indice: int
+    carne: str
+    nombre: str
+    correo: str
+    historial: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def valor_radio(self) -> str:
+        """Valor del botón de selección del estudiante en el listado del profesor."""
+        return f'{self.carne},{self.indice}'
+
+    @property
+    def clave(self) -> str:
+        """Clave del estudiante tal como la obtiene MainListingParser del listado."""
+        return base64.b64encode('!!'.join(self.valor_radio.split(',')).encode('utf-8')).decode('utf-8')
+
+
+class GeneradorCohorte:
+    """
+    Genera estudiantes sintéticos con historiales plausibles según DETALLE_CURSOS.
+
+    Cada estudiante matricula por ciclo los cursos pendientes cuyos requisitos ya
+    aprobó, junto con sus correquisitos, hasta un límite de créditos. Los resultados
+    incluyen reprobados que se repiten, retiros, convalidaciones y optativos, y el
+    último ciclo queda matriculado. Cada estudiante depende solo de la semilla y de su
+    índice, de modo que una cohorte grande se genera sin guardarla en memoria.
+    """
+
+    def __init__(self, semilla: int = 0, anno_actual: int = 2025):
+        """
+        Inicializa el generador.
+
+        Args:
+            semilla: Semilla de la cohorte; la misma semilla produce los mismos estudiantes
+            anno_actual: Año del ciclo que queda matriculado
+        """
+        self.semilla = semilla
+        self.anno_actual = anno_actual
+        self._cursos = sorted(DETALLE_CURSOS, key=lambda curso: curso['semestre'])
+        self._por_sigla = {curso['sigla']: curso for curso in DETALLE_CURSOS}
+
+    def estudiante(self, indice: int, ciclos: Optional[int] = None) -> EstudianteSintetico:
+        """
+        Genera un estudiante.
+
+        Args:
+            indice: Número del estudiante dentro de la cohorte
+            ciclos: Ciclos ya cursados; si es None se elige al azar
+
+        Returns:
+            Estudiante con su historial
+        """
+        rng = random.Random(f'{self.semilla}:{indice}')
+        nombre = f'{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}'
+        carne = f'{chr(ord("A") + indice // 100000 % 26)}{indice % 100000:05d}'
+        correo = f'{nombre.split()[0].lower()}.{carne.lower()}@ucr.ac.cr'
+
+        if ciclos is None:
+            ciclos = rng.randint(0, CICLOS_DEL_PLAN + 2)
+        historial = self._simular_historial(rng, ciclos)
+        return EstudianteSintetico(indice, carne, nombre, correo, historial)
+
+    def estudiantes(self, cantidad: int, inicio: int = 0) -> Iterator[EstudianteSintetico]:
+        """Genera los estudiantes con índices de inicio a inicio + cantidad - 1."""
+        for indice in range(inicio, inicio + cantidad):
+            yield self.estudiante(indice)
+
+    def _simular_historial(self, rng: random.Random, ciclos: int) -> List[Dict[str, str]]:
+        """Simula los ciclos cursados y el ciclo matriculado de un estudiante."""
+        habilidad = rng.uniform(0.6, 0.97)
+        anno_ingreso = self.anno_actual - ciclos // 2
+        aprobados: Set[str] = set()
+        historial: List[Dict[str, str]] = []
+
+        # Algunos estudiantes llegan con cursos de primer ciclo convalidados de otra carrera
+        if ciclos and rng.random() < 0.1:
+            for curso in self._cursos:
+                if curso['semestre'] == 1 and not curso.get('correquisitos') and rng.random() < 0.5:
+                    historial.append(self._fila(rng, curso, anno_ingreso - 1, 'II', 'CONVALIDADO', '', grupo='0'))
+                    aprobados.add(curso['sigla'])
+
+        for ciclo in range(ciclos + 1):
+            anno, periodo = self._periodo(anno_ingreso, ciclo)
+            matricula = self._elegir_matricula(aprobados, ciclo)
+            actual = ciclo == ciclos
+
+            for curso in matricula:
+                if actual:
+                    historial.append(self._fila(rng, curso, anno, periodo, 'MATRICULADO', ''))
+                    continue
+                sorteo = rng.random()
+                if sorteo < 0.04:
+                    historial.append(self._fila(rng, curso, anno, periodo, ESTADO_RETIRO, ''))
+                elif sorteo < 0.04 + (1 - habilidad):
+                    nota = f'{rng.choice(range(8, 14)) / 2:.1f}'
+                    historial.append(self._fila(rng, curso, anno, periodo, 'REPROBADO', nota))
+                else:
+                    nota = f'{rng.choice(range(14, 21)) / 2:.1f}'
+                    historial.append(self._fila(rng, curso, anno, periodo, 'APROBADO', nota))
+                    aprobados.add(curso['sigla'])
+
+        return historial
+
+    @staticmethod
+    def _periodo(anno_ingreso: int, ciclo: int) -> Tuple[int, str]:
+        """Año y periodo de un ciclo contado desde el ingreso."""
+        return anno_ingreso + ciclo // 2, 'I' if ciclo % 2 == 0 else 'II'
+
+    def _elegir_matricula(self, aprobados: Set[str], ciclo: int) -> List[Dict[str, object]]:
+        """
+        Cursos pendientes que el estudiante puede matricular en un ciclo, en orden del plan.
+        Un curso con correquisitos solo se matricula junto con ellos o si ya están aprobados.
+        """
+        elegidos: List[Dict[str, object]] = []
+        siglas: Set[str] = set()
+        creditos = 0
+
+        for curso in self._cursos:
+            if curso['semestre'] > ciclo + 2 or creditos >= CREDITOS_POR_CICLO:
+                break
+            if curso['sigla'] in aprobados or curso['sigla'] in siglas:
+                continue
+
+            grupo = [curso] + [
+                self._por_sigla[sigla] for sigla in curso.get('correquisitos', [])
+                if sigla in self._por_sigla and sigla not in aprobados and sigla not in siglas
+            ]
+            if all(set(miembro.get('requisitos', [])) <= aprobados for miembro in grupo):
+                elegidos.extend(grupo)
+                siglas.update(miembro['sigla'] for miembro in grupo)
+                creditos += sum(int(miembro['creditos']) for miembro in grupo)
+
+        return elegidos
+
+    @staticmethod
+    def _fila(rng: random.Random, curso: Dict[str, object], anno: int, periodo: str,
+              estado: str, nota: str, grupo: Optional[str] = None) -> Dict[str, str]:
+        """Fila del historial con la sigla con que el curso aparece en el expediente."""
+        sigla, nombre = str(curso['sigla']), str(curso['curso'])
+        if sigla in SIGLAS_REALES:
+            sigla, nombre = rng.choice(SIGLAS_REALES[sigla])
+        elif sigla.startswith('OPT'):
+            sigla, nombre = rng.choice(OPTATIVOS)
+
+        return {
+            'SIGLA': sigla, 'CURSO': nombre, 'CREDITOS': str(curso['creditos']),
+            'GRUPO': grupo if grupo is not None else f'{rng.randint(1, 6):02d}',
+            'SEM': periodo, 'AÑO': str(anno), 'ESTADO': estado, 'NOTA': nota,
+        }
+
+
+def html_listado(estudiantes: Iterable[EstudianteSintetico]) -> str:
+    """Página del listado de estudiantes asignados al profesor, para MainListingParser."""
+    filas = ''.join(
+        '<tr>'
+        f'<td><input type="radio" name="radio" value="{escape(estudiante.valor_radio)}"></td>'
+        f'<td>{estudiante.carne}</td><td>{escape(estudiante.nombre)}</td>'
+        f'<td>{escape(estudiante.correo)}</td><td>INGENIERÍA INDUSTRIAL</td>'
+        '<td>ACTIVO</td></tr>\n'
+        for estudiante in estudiantes
+    )
+    return (
+        '<html><body><h2>Listado de estudiantes asignados al profesor</h2><table>\n'
+        '<tr><th></th><th>Carné</th><th>Nombre</th><th>Correo</th><th>Carrera</th><th>Estado</th></tr>\n'
+        f'{filas}</table></body></html>'
+    )
+
+
+def html_nivel_avance(estudiante: EstudianteSintetico) -> str:
+    """Página de nivel de avance del estudiante, para StudentParser."""
+    filas = ''.join(
+        '<tr>'
+        f'<td>{escape(fila["SIGLA"])}</td><td>{escape(fila["CURSO"])}</td><td>{fila["CREDITOS"]}</td>'
+        f'<td>{fila["GRUPO"]}</td><td>\n  {fila["SEM"]}\n  {fila["AÑO"]}\n</td>'
+        f'<td>{escape(fila["ESTADO"])}</td><td>{fila["NOTA"] or "&nbsp;"}</td>'
+        '</tr>\n'
+        for fila in estudiante.historial
+    )
+    return (
+        '<html><body><table>\n'
+        '<tr><th>Sigla</th><th>Curso</th><th>Créditos</th><th>Grupo</th>'
+        '<th>Periodo</th><th>Estado</th><th>Nota</th></tr>\n'
+        f'{filas}</table></body></html>'
+    )
+
+
+def texto_expediente(estudiante: EstudianteSintetico) -> str:
+    """Texto del expediente académico copiado desde el navegador, para MemoryReaderService."""
+    lineas = ['Expediente académico', f'Carné: {estudiante.carne} {estudiante.nombre}']
+    lineas.extend(
+        '\t'.join(fila[columna] or '-' for columna in COLUMNAS_HISTORIAL)
+        for fila in estudiante.historial
+    )
+    return '\r\n'.join(lineas) + '\r\n'
+
+
+def texto_prematricula(estudiante: EstudianteSintetico, cursos: int = 6) -> str:
+    """
+    Texto de los cursos solicitados en prematrícula copiado desde el navegador, para
+    MemoryReaderService. Se solicitan los primeros cursos del plan que el estudiante
+    no ha aprobado; el primero con declaración jurada.
+    """
+    aprobados = {fila['SIGLA'] for fila in estudiante.historial if fila['ESTADO'] == 'APROBADO'}
+    solicitados = [curso for curso in DETALLE_CURSOS if curso['sigla'] not in aprobados][:cursos]
+    lineas = [
+        'Cursos solicitados en prematrícula', f'Carné: {estudiante.carne}', f'Nombre: {estudiante.nombre}',
+        'Comentario del estudiante', 'Solicito los cursos pendientes del plan',
+        'Comentario hacia el Estudiante', '* Cursos con Declaración Jurada',
+    ]
+    for numero, curso in enumerate(solicitados):
+        lineas.append(f'{"*" if numero == 0 else ""}{curso["sigla"]}\t{curso["curso"]}\t{curso["creditos"]}\t01')
+        lineas.append('AUTORIZADO')
+    return '\r\n'.join(lineas) + '\r\n'
+
+
+def escribir_en_repositorio(file_repository, estudiantes: Iterable[EstudianteSintetico]) -> int:
+    """
+    Guarda los estudiantes como expedientes descargados (.edf y .sdf).
+
+    Args:
+        file_repository: Repositorio de destino
+        estudiantes: Estudiantes a guardar
+
+    Returns:
+        Cantidad de estudiantes guardados
+    """
+    cantidad = 0
+    for estudiante in estudiantes:
+        file_repository.escribir_informacion_estudiante(estudiante.carne, estudiante.carne, estudiante.nombre)
+        file_repository.escribir_historial(estudiante.carne, list(COLUMNAS_HISTORIAL), estudiante.historial)
+        cantidad += 1
+    return cantidad
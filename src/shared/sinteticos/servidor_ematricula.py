@@ -0,0 +1,289 @@
+"""
+Servidor local que reemplaza al sistema de matrícula en las pruebas de carga
+"""
+import base64
+import binascii
+import random
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ..config.settings import UrlsConfig
+from .generador_cohorte import GeneradorCohorte, html_listado, html_nivel_avance
+
+
+RUTA_BASE = '/ematricula/admin'
+
+PAGINA_LOGIN = (
+    '<html><body><form method="post" action="loginAdmin.do">'
+    '<input name="user"><input name="password" type="password"></form></body></html>'
+)
+
+
+@dataclass
+class EstadisticasServidor:
+    """Solicitudes atendidas por el servidor simulado."""
+    por_ruta: Dict[str, int] = field(default_factory=dict)
+    errores_inyectados: int = 0
+    limitadas: int = 0  # Respuestas 429 por exceder el límite de solicitudes
+    sesiones_vencidas: int = 0
+    maximo_simultaneas: int = 0  # Solicitudes atendidas al mismo tiempo
+
+
+class ServidorEmatricula:
+    """
+    Servidor HTTP con las rutas de login, listado y nivel de avance del sistema de
+    matrícula, que sirve una cohorte del GeneradorCohorte.
+
+    Permite simular latencia, errores del servidor (500), límite de solicitudes por
+    segundo (429) y vencimiento de la sesión (401), de modo que la descarga se pueda
+    medir y probar sin conexión. Se usa como administrador de contexto:
+
+        with ServidorEmatricula(GeneradorCohorte(1), 100) as servidor:
+            app_config.urls = servidor.urls
+    """
+
+    def __init__(
+        self,
+        generador: GeneradorCohorte,
+        cantidad: int,
+        usuario: str = 'profesor',
+        clave: str = 'clave',
+        latencia: float = 0.0,
+        variacion_latencia: float = 0.0,
+        tasa_error: float = 0.0,
+        limite_por_segundo: Optional[float] = None,
+        duracion_sesion: Optional[float] = None,
+        semilla: int = 0,
+        puerto: int = 0
+    ):
+        """
+        Inicializa el servidor sin iniciarlo.
+
+        Args:
+            generador: Generador de la cohorte que se sirve
+            cantidad: Cantidad de estudiantes asignados al profesor
+            usuario: Usuario aceptado por el login
+            clave: Contraseña aceptada por el login
+            latencia: Segundos de espera antes de cada respuesta
+            variacion_latencia: Segundos adicionales al azar entre 0 y este valor
+            tasa_error: Probabilidad de responder 500 a una solicitud de datos
+            limite_por_segundo: Solicitudes de datos permitidas por segundo (None para no limitar)
+            duracion_sesion: Segundos de validez de una sesión (None para no vencer)
+            semilla: Semilla de la latencia y los errores
+            puerto: Puerto local (0 para elegir uno libre)
+        """
+        self.generador = generador
+        self.cantidad = cantidad
+        self.usuario = usuario
+        self.clave = clave
+        self.latencia = latencia
+        self.variacion_latencia = variacion_latencia
+        self.tasa_error = tasa_error
+        self.limite_por_segundo = limite_por_segundo
+        self.duracion_sesion = duracion_sesion
+        self.puerto = puerto
+        self.estadisticas = EstadisticasServidor()
+
+        self._azar = random.Random(semilla)
+        self._candado = threading.Lock()
+        self._sesiones: Dict[str, float] = {}  # token -> momento de inicio
+        self._listado: Optional[str] = None
+        self._simultaneas = 0
+        self._fichas = limite_por_segundo or 0.0
+        self._ultima_recarga = time.monotonic()
+        self._servidor: Optional[ThreadingHTTPServer] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    @property
+    def url_base(self) -> str:
+        """URL del directorio admin del servidor."""
+        host, puerto = self._servidor.server_address[:2]
+        return f'http://{host}:{puerto}{RUTA_BASE}'
+
+    @property
+    def urls(self) -> UrlsConfig:
+        """URLs de la aplicación apuntando a este servidor."""
+        return UrlsConfig.desde_base(self.url_base)
+
+    def iniciar(self) -> 'ServidorEmatricula':
+        """Inicia el servidor en un hilo y retorna el mismo servidor."""
+        servidor = self
+
+        class Manejador(_ManejadorEmatricula):
+            simulador = servidor
+
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', self.puerto), Manejador)
+        self._servidor.daemon_threads = True
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name='servidor-ematricula', daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self) -> None:
+        """Detiene el servidor y espera a que termine su hilo."""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._hilo.join()
+            self._servidor = None
+
+    def __enter__(self) -> 'ServidorEmatricula':
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.detener()
+
+    def vencer_sesiones(self) -> None:
+        """Invalida todas las sesiones abiertas, como si el servidor se reiniciara."""
+        with self._candado:
+            self._sesiones.clear()
+
+    def _atender(self, ruta: str, consulta: Dict[str, list], cuerpo: Dict[str, list],
+                 cookie: str) -> tuple:
+        """
+        Calcula la respuesta de una solicitud.
+
+        Returns:
+            Tupla (código, contenido, encabezados)
+        """
+        with self._candado:
+            self.estadisticas.por_ruta[ruta] = self.estadisticas.por_ruta.get(ruta, 0) + 1
+            self._simultaneas += 1
+            self.estadisticas.maximo_simultaneas = max(self.estadisticas.maximo_simultaneas, self._simultaneas)
+            espera = self.latencia + self._azar.uniform(0, self.variacion_latencia)
+        try:
+            if espera > 0:
+                time.sleep(espera)
+            return self._responder(ruta, consulta, cuerpo, cookie)
+        finally:
+            with self._candado:
+                self._simultaneas -= 1
+
+    def _responder(self, ruta: str, consulta: Dict[str, list], cuerpo: Dict[str, list],
+                   cookie: str) -> tuple:
+        """Respuesta de una ruta, ya aplicada la latencia."""
+        if ruta == 'showAdminLogin.do':
+            return 200, PAGINA_LOGIN, {}
+
+        if ruta == 'loginAdmin.do':
+            if cuerpo.get('user') != [self.usuario] or cuerpo.get('password') != [self.clave]:
+                return 401, PAGINA_LOGIN, {}
+            token = secrets.token_hex(16)
+            with self._candado:
+                self._sesiones[token] = time.monotonic()
+            return 200, '<html><body>Bienvenido</body></html>', {'Set-Cookie': f'JSESSIONID={token}; Path=/'}
+
+        if ruta not in ('profesorExpedienteEstud.do', 'nivelAvance.do', 'showComentariosProfEstud.do'):
+            return 404, 'No encontrado', {}
+
+        if not self._sesion_valida(cookie):
+            return 401, PAGINA_LOGIN, {}
+        if not self._tomar_ficha():
+            return 429, 'Demasiadas solicitudes', {'Retry-After': '1'}
+        with self._candado:
+            if self.tasa_error and self._azar.random() < self.tasa_error:
+                self.estadisticas.errores_inyectados += 1
+                return 500, 'Error interno', {}
+
+        if ruta == 'profesorExpedienteEstud.do':
+            return 200, self._pagina_listado(), {}
+
+        indice = self._indice_de_clave(consulta.get('c', [''])[0])
+        if indice is None:
+            return 404, 'Estudiante no encontrado', {}
+        if ruta == 'showComentariosProfEstud.do':
+            return 200, '<html><body><textarea></textarea></body></html>', {}
+        return 200, html_nivel_avance(self.generador.estudiante(indice)), {}
+
+    def _sesion_valida(self, cookie: str) -> bool:
+        """Indica si la cookie corresponde a una sesión abierta y vigente."""
+        token = ''
+        for parte in cookie.split(';'):
+            nombre, _, valor = parte.strip().partition('=')
+            if nombre == 'JSESSIONID':
+                token = valor
+
+        with self._candado:
+            inicio = self._sesiones.get(token)
+            if inicio is None:
+                return False
+            if self.duracion_sesion is not None and time.monotonic() - inicio > self.duracion_sesion:
+                del self._sesiones[token]
+                self.estadisticas.sesiones_vencidas += 1
+                return False
+            return True
+
+    def _tomar_ficha(self) -> bool:
+        """Aplica el límite de solicitudes por segundo con un balde de fichas."""
+        if not self.limite_por_segundo:
+            return True
+        with self._candado:
+            ahora = time.monotonic()
+            self._fichas = min(
+                self.limite_por_segundo,
+                self._fichas + (ahora - self._ultima_recarga) * self.limite_por_segundo
+            )
+            self._ultima_recarga = ahora
+            if self._fichas >= 1:
+                self._fichas -= 1
+                return True
+            self.estadisticas.limitadas += 1
+            return False
+
+    def _pagina_listado(self) -> str:
+        """Listado de estudiantes asignados; se genera una sola vez."""
+        if self._listado is None:
+            listado = html_listado(self.generador.estudiantes(self.cantidad))
+            with self._candado:
+                self._listado = listado
+        return self._listado
+
+    def _indice_de_clave(self, clave: str) -> Optional[int]:
+        """Índice del estudiante a partir de la clave del listado, o None si no es válida."""
+        try:
+            _, indice = base64.b64decode(clave.encode('utf-8')).decode('utf-8').split('!!')
+            indice = int(indice)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        return indice if 0 <= indice < self.cantidad else None
+
+
+class _ManejadorEmatricula(BaseHTTPRequestHandler):
+    """Traduce las solicitudes HTTP a ServidorEmatricula._atender."""
+
+    simulador: ServidorEmatricula
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self._procesar({})
+
+    def do_POST(self) -> None:
+        longitud = int(self.headers.get('Content-Length', 0))
+        cuerpo = self.rfile.read(longitud).decode('utf-8') if longitud else ''
+        self._procesar(parse_qs(cuerpo))
+
+    def _procesar(self, cuerpo: Dict[str, list]) -> None:
+        partes = urlsplit(self.path)
+        if not partes.path.startswith(RUTA_BASE + '/'):
+            codigo, contenido, encabezados = 404, 'No encontrado', {}
+        else:
+            codigo, contenido, encabezados = self.simulador._atender(
+                partes.path[len(RUTA_BASE) + 1:], parse_qs(partes.query), cuerpo,
+                self.headers.get('Cookie', '')
+            )
+
+        datos = contenido.encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(datos)))
+        for nombre, valor in encabezados.items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, formato: str, *args) -> None:
+        """Las solicitudes no se registran en la consola."""
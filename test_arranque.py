@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las importaciones diferidas del arranque
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+
+RAIZ = Path(__file__).resolve().parent
+PESADOS = ('requests', 'urllib3', 'ssl', 'xlsxwriter', 'openpyxl', 'pyperclip', 'tracemalloc', 'cProfile')
+
+
+def _modulos_cargados(codigo: str, modulos: tuple = PESADOS) -> list:
+    """Módulos indicados que quedan cargados tras ejecutar el código en un intérprete nuevo."""
+    salida = subprocess.run(
+        [sys.executable, '-c', f'{codigo}\nimport sys\nprint(*[m for m in {modulos!r} if m in sys.modules])'],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    return salida.stdout.split()
+
+
+def test_menu_arranca_sin_modulos_pesados():
+    """Crear el menú no carga requests, las bibliotecas de Excel, el portapapeles ni el dominio."""
+    codigo = 'import main\nfrom src.presentation.console.menu_controller import MenuController\nMenuController()'
+    assert _modulos_cargados(codigo, PESADOS + ('src.domain.entities',)) == []
+
+
+def test_servicio_de_descarga_carga_requests_al_crearlo():
+    """El módulo del servicio de descarga se importa sin requests; el adaptador HTTP lo carga al crearlo."""
+    modulo = 'from src.application.services.web_scraping_service import WebScrapingService'
+    assert _modulos_cargados(modulo) == []
+    assert 'requests' in _modulos_cargados(modulo + '\nWebScrapingService()')
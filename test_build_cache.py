@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché de construcción de archivos Excel
+"""
+import json
+
+from src.application.services.generacion_excel_service import GeneracionExcelService
+from src.infrastructure.repositories import build_cache_repository
+from src.infrastructure.repositories.build_cache_repository import BuildCacheRepository
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.shared.config.tabla_equivalencias import RUTA_EQUIVALENCIAS, TablaEquivalencias
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+    {'SIGLA': 'QU0100', 'CURSO': 'QUÍMICA GENERAL I', 'CREDITOS': '3', 'GRUPO': '02',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'REPROBADO', 'NOTA': '5.0'},
+]
+HOJAS = ('Malla Curricular', 'Cursos Pendientes')
+
+
+def test_huella_depende_de_las_entradas():
+    """La huella ignora el orden de las filas pero cambia con cualquier entrada relevante."""
+    base = BuildCacheRepository.calcular_huella('C12345', 'JUAN', HISTORIAL, '1.0', HOJAS)
+
+    assert base == BuildCacheRepository.calcular_huella(
+        'C12345', 'JUAN', list(reversed(HISTORIAL)), '1.0', HOJAS)
+
+    modificado = [dict(HISTORIAL[0]), dict(HISTORIAL[1], ESTADO='APROBADO', NOTA='7.0')]
+    variantes = [
+        BuildCacheRepository.calcular_huella('C12345', 'JUAN', modificado, '1.0', HOJAS),
+        BuildCacheRepository.calcular_huella('C12345', 'JUAN', HISTORIAL, '1.1', HOJAS),
+        BuildCacheRepository.calcular_huella('C12345', 'JUAN', HISTORIAL, '1.0', HOJAS[:1]),
+        BuildCacheRepository.calcular_huella('C12345', 'JUAN', HISTORIAL, '1.0', HOJAS, 'otro-plan'),
+    ]
+    assert all(variante != base for variante in variantes)
+
+
+def test_archivo_actualizado_y_persistencia(tmp_path):
+    """Un archivo solo está actualizado si existe y su huella quedó registrada en disco."""
+    cache = BuildCacheRepository(tmp_path)
+    huella = cache.calcular_huella('C12345', 'JUAN', HISTORIAL, '1.0', HOJAS)
+    nombre = 'C12345-JUAN.xlsx'
+
+    cache.registrar(nombre, huella)
+    assert not cache.esta_actualizado(nombre, huella)  # el archivo aún no existe
+
+    (tmp_path / nombre).write_bytes(b'xlsx')
+    assert cache.esta_actualizado(nombre, huella)
+    cache.guardar()
+
+    recargada = BuildCacheRepository(tmp_path)
+    assert recargada.esta_actualizado(nombre, huella)
+    assert not recargada.esta_actualizado(nombre, 'otra-huella')
+
+    recargada.invalidar(nombre)
+    assert not recargada.esta_actualizado(nombre, huella)
+
+
+def test_editar_tabla_de_equivalencias_invalida_la_hoja_de_equiparacion(tmp_path, monkeypatch):
+    """Cambiar la tabla regenera los libros con equiparación, pero no los que no la tienen."""
+    file_repo = FileRepository(str(tmp_path))
+    file_repo.escribir_informacion_estudiante('C12345', 'C12345', 'JUAN')
+    file_repo.escribir_historial('C12345', list(HISTORIAL[0]), HISTORIAL)
+    file_repo.directorio_salida.mkdir(parents=True, exist_ok=True)
+    servicio = GeneracionExcelService(file_repo, procesos=1)
+
+    for perfil in ('con_equiparacion', 'completo'):
+        plan = servicio.preparar(['C12345.edf'], perfil)
+        cache = BuildCacheRepository(file_repo.directorio_salida)
+        for ruta_salida, (nombre_archivo, huella) in plan.huellas.items():
+            (file_repo.directorio_salida / nombre_archivo).write_bytes(b'xlsx')
+            cache.registrar(nombre_archivo, huella)
+        cache.guardar()
+        assert not servicio.preparar(['C12345.edf'], perfil).tareas
+
+    datos = json.loads(RUTA_EQUIVALENCIAS.read_text(encoding='utf-8'))
+    datos['equivalencias'][0]['curso_nuevo'] = 'CURSO RENOMBRADO'
+    editada = tmp_path / 'equivalencias.json'
+    editada.write_text(json.dumps(datos, ensure_ascii=False), encoding='utf-8')
+    monkeypatch.setattr(build_cache_repository, 'obtener_tabla_equivalencias',
+                        lambda: TablaEquivalencias.cargar(editada))
+
+    assert len(servicio.preparar(['C12345.edf'], 'con_equiparacion').tareas) == 1
+    assert not servicio.preparar(['C12345.edf'], 'completo').tareas
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la grabación y reproducción de sesiones HTTP
+"""
+import gzip
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from src.application.services.web_scraping_service import WebScrapingService
+from src.infrastructure.adapters.casete_http import Casete, HttpAdapterGrabador, HttpAdapterReproductor
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+from src.shared.config.settings import UrlsConfig, app_config
+from src.shared.sinteticos import GeneradorCohorte, ServidorEmatricula
+
+
+def test_descarga_grabada_se_reproduce_sin_red_ni_credenciales(tmp_path, monkeypatch, capsys):
+    """Una descarga grabada produce los mismos expedientes al reproducirla, y el casete no tiene la clave."""
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    monkeypatch.setattr(app_config, 'urls', app_config.urls)
+    monkeypatch.setenv('PREEII_USUARIO', 'profesor')
+    monkeypatch.setenv('PREEII_CLAVE', 'clave-secreta')
+    casete = tmp_path / 'sesion.json.gz'
+
+    grabacion = tmp_path / 'grabacion'
+    grabacion.mkdir()
+    monkeypatch.chdir(grabacion)
+    with ServidorEmatricula(GeneradorCohorte(2), 4, clave='clave-secreta', latencia=0.01) as servidor:
+        assert CliController().ejecutar([
+            'descargar', '--url-base', servidor.url_base, '--grabar', str(casete), '--procesos', '1',
+            '--perfil', 'revision_rapida'
+        ]) == 0
+    resultado = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert resultado['casete']['interacciones'] == 6
+    with gzip.open(casete, 'rt', encoding='utf-8') as archivo:
+        assert 'clave-secreta' not in archivo.read()
+
+    monkeypatch.delenv('PREEII_CLAVE')
+    monkeypatch.setattr(app_config, 'urls', UrlsConfig())
+    reproduccion = tmp_path / 'reproduccion'
+    reproduccion.mkdir()
+    monkeypatch.chdir(reproduccion)
+    assert CliController().ejecutar([
+        'descargar', '--reproducir', str(casete), '--sin-esperas', '--procesos', '1', '--perfil', 'revision_rapida'
+    ]) == 0
+
+    original = FileRepository(str(grabacion))
+    reproducido = FileRepository(str(reproduccion))
+    assert sorted(reproducido.listar_archivos_expedientes()) == sorted(original.listar_archivos_expedientes())
+    for archivo in original.listar_archivos_expedientes():
+        carne = archivo.replace('.edf', '')
+        assert reproducido.leer_historial(carne) == original.leer_historial(carne)
+
+
+def test_reproduccion_respeta_tiempos_y_errores(tmp_path):
+    """Las respuestas esperan su duración original, los errores se repiten y lo no grabado falla."""
+    with ServidorEmatricula(GeneradorCohorte(), 2, latencia=0.05) as servidor:
+        grabador = HttpAdapterGrabador()
+        servicio = WebScrapingService(grabador)
+        servicio.urls = servidor.urls
+        clave = servicio.obtener_estudiantes_asignados('profesor', 'clave')[0][0]
+        html = servicio.descargar_expediente_estudiante(clave)
+        servidor.tasa_error = 1.0
+        with pytest.raises(ValueError, match='500'):
+            servicio.descargar_expediente_estudiante(clave)
+    grabador.casete.guardar(tmp_path / 'casete.json.gz')
+    casete = Casete.cargar(tmp_path / 'casete.json.gz')
+    assert casete.tiempo_red >= 4 * 0.05
+
+    reproductor = HttpAdapterReproductor(casete)
+    servicio = WebScrapingService(reproductor)
+    inicio = time.perf_counter()
+    assert servicio.autenticar_usuario('', '')
+    servicio.obtener_listado_estudiantes()
+    assert servicio.descargar_expediente_estudiante(clave) == html
+    assert time.perf_counter() - inicio >= 3 * 0.05
+    with pytest.raises(ValueError, match='500'):
+        servicio.descargar_expediente_estudiante(clave)
+    with pytest.raises(ValueError, match='no está en el casete'):
+        servicio.descargar_expediente_estudiante(clave)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la línea de comandos sin interacción
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+]
+
+
+def test_credenciales_del_ambiente_y_de_archivo(tmp_path, monkeypatch):
+    """Las credenciales se toman del ambiente y el archivo tiene prioridad."""
+    monkeypatch.setenv('PREEII_USUARIO', 'ambiente')
+    monkeypatch.setenv('PREEII_CLAVE', 'secreta')
+    assert CliController.leer_credenciales() == ('ambiente', 'secreta')
+
+    archivo = tmp_path / 'credenciales'
+    archivo.write_text('# cuenta de la escuela\nPREEII_USUARIO = archivo\n', encoding='utf-8')
+    assert CliController.leer_credenciales(str(archivo)) == ('archivo', 'secreta')
+
+    monkeypatch.delenv('PREEII_CLAVE')
+    with pytest.raises(ValueError, match='PREEII_CLAVE'):
+        CliController.leer_credenciales(str(archivo))
+
+
+def test_equiparacion_imprime_tiempos_en_json(tmp_path, monkeypatch, capsys):
+    """El subcomando genera los Excel, omite los actualizados y reporta una línea JSON."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    repositorio = FileRepository()
+    for carne in ('C00001', 'C00002'):
+        repositorio.escribir_informacion_estudiante(carne, carne, f'ESTUDIANTE {carne}')
+        repositorio.escribir_historial(carne, list(HISTORIAL[0]), HISTORIAL)
+
+    assert CliController().ejecutar(['equiparacion', '--procesos', '1']) == 0
+    primera = json.loads(capsys.readouterr().out)
+    assert CliController().ejecutar(['equiparacion', '--procesos', '1']) == 0
+    segunda = json.loads(capsys.readouterr().out)
+
+    assert primera['perfil'] == 'con_equiparacion'
+    assert primera['archivos']['generados'] == 2 and set(primera['etapas']) == {'lectura', 'generacion'}
+    assert segunda['archivos']['omitidos'] == 2 and segunda['archivos']['generados'] == 0
+
+    with pytest.raises(SystemExit) as salida:
+        CliController().ejecutar(['equiparacion', '--procesos', '1', '--tiempo-limite', '5'])
+    assert salida.value.code == 2
+
+
+def test_solo_los_errores_de_uso_devuelven_codigo_2(tmp_path, monkeypatch, capsys):
+    """Un error de uso devuelve 2; un ValueError durante la corrida cuenta como error al procesar."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+
+    assert CliController().ejecutar(['sintetico', '0']) == cli_controller.ERROR_USO
+    assert 'cantidad' in json.loads(capsys.readouterr().out)['error']
+
+    def fallar(self, args, resultado):
+        raise ValueError('nota con formato inválido')
+
+    monkeypatch.setattr(CliController, '_comando_regenerar', fallar)
+    assert CliController().ejecutar(['regenerar', '--procesos', '1']) == cli_controller.CON_ERRORES
+    assert json.loads(capsys.readouterr().out)['error'] == 'nota con formato inválido'
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la hoja de equiparación generada desde el modelo de dominio
+"""
+import openpyxl
+
+from src.application.services.expediente_service import ExpedienteService
+from src.infrastructure.adapters.equiparacion_analyzer import EquiparacionAnalyzer, HOJA_EQUIPARACION
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+
+
+pytest_plugins = ['tests.conftest']  # expediente_variado
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2022', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+    {'SIGLA': 'QU0100', 'CURSO': 'QUÍMICA GENERAL I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2022', 'ESTADO': 'APROBADO', 'NOTA': '7.5'},
+    {'SIGLA': 'CI0202', 'CURSO': 'PRINCIPIOS DE INFORMÁTICA', 'CREDITOS': '4', 'GRUPO': '01',
+     'SEM': 'II', 'AÑO': '2022', 'ESTADO': 'APROBADO', 'NOTA': '9.0'},
+    {'SIGLA': 'MA1002', 'CURSO': 'CÁLCULO II', 'CREDITOS': '4', 'GRUPO': '02',
+     'SEM': 'II', 'AÑO': '2022', 'ESTADO': 'REPROBADO', 'NOTA': '5.5'},
+]
+
+
+def _valores(ruta):
+    libro = openpyxl.load_workbook(ruta, read_only=True)
+    filas = {fila[0]: fila[:8] for fila in libro[HOJA_EQUIPARACION].iter_rows(min_row=7, values_only=True)
+             if fila and fila[0]}
+    libro.close()
+    return filas
+
+
+def test_hoja_generada_con_el_libro_coincide_con_la_legada(tmp_path):
+    """La hoja generada desde el expediente equivale a la que se agrega releyendo el xlsx."""
+    expediente = ExpedienteService.procesar_expediente_estudiante('C12345', 'JUAN', HISTORIAL)
+
+    ruta_dominio = tmp_path / 'dominio.xlsx'
+    ExcelWriter(perfil='con_equiparacion').generar_expediente(expediente, str(ruta_dominio))
+    ruta_legada = tmp_path / 'C12345-JUAN.xlsx'
+    ExcelWriter().generar_expediente(expediente, str(ruta_legada))
+    assert EquiparacionAnalyzer().analizar_expediente(str(ruta_legada))
+
+    dominio, legada = _valores(ruta_dominio), _valores(ruta_legada)
+    assert dominio['MA1001'][7] == 'APROBADO'
+    assert dominio['QU0100'][7] == 'Requiere QU0102'
+    assert dominio['CI0202'][4:] == ('II-1119', 'FUNDAMENTOS PARA TECNOLOGÍAS DIGITALES', '4', 'EQUIPARADO')
+    assert dominio['MA1002'][7] == 'REPROBADO'
+    assert dominio == legada
+
+
+def _filas(ruta):
+    libro = openpyxl.load_workbook(ruta, read_only=True)
+    filas = []
+    for fila in libro[HOJA_EQUIPARACION].iter_rows(min_row=7, values_only=True):
+        if not any(fila[:8]):
+            break
+        filas.append(fila[:8])
+    libro.close()
+    return filas
+
+
+def test_ambas_rutas_escriben_las_mismas_filas(tmp_path, expediente_variado):
+    """Releer el xlsx produce las mismas filas, en el mismo orden, que el modelo de dominio."""
+    expediente = expediente_variado
+
+    ruta_dominio = tmp_path / 'dominio.xlsx'
+    ExcelWriter(perfil='con_equiparacion').generar_expediente(expediente, str(ruta_dominio))
+    ruta_legada = tmp_path / f'{expediente.carne}-{expediente.nombre}.xlsx'
+    ExcelWriter().generar_expediente(expediente, str(ruta_legada))
+    assert EquiparacionAnalyzer().analizar_expediente(str(ruta_legada))
+
+    dominio = _filas(ruta_dominio)
+    assert {'EF-D', 'EG-CA', 'EG-I'} <= {fila[0] for fila in dominio}
+    assert _filas(ruta_legada) == dominio
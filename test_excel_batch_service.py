@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la generación de archivos Excel en lote con varios procesos
+"""
+import os
+import threading
+import time
+
+import openpyxl
+import pytest
+
+from src.application.services.excel_batch_service import ExcelBatchService, TareaExcel
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+    {'SIGLA': 'MA1002', 'CURSO': 'CÁLCULO II', 'CREDITOS': '4', 'GRUPO': '03',
+     'SEM': 'II', 'AÑO': '2023', 'ESTADO': 'MATRICULADO', 'NOTA': ''},
+]
+
+
+def test_tarea_compacta_conserva_historial():
+    """La tarea viaja como tuplas y se reconstruye sin pérdida."""
+    tarea = TareaExcel.desde_historial('C12345', 'JUAN', HISTORIAL, 'salida.xlsx')
+    assert all(isinstance(fila, tuple) for fila in tarea.filas)
+    assert tarea.historial() == HISTORIAL
+
+
+def test_lote_paralelo_recoge_fallos(tmp_path):
+    """Los errores de un estudiante no detienen el lote y el progreso se reporta por tarea."""
+    tareas = [
+        TareaExcel.desde_historial(f'C0000{i}', f'ESTUDIANTE {i}', HISTORIAL,
+                                   str(tmp_path / f'C0000{i}.xlsx'))
+        for i in range(3)
+    ]
+    tareas.append(TareaExcel.desde_historial(
+        'C99999', 'SIN DIRECTORIO', HISTORIAL, str(tmp_path / 'no-existe' / 'C99999.xlsx')))
+
+    progreso = []
+    resumen = ExcelBatchService(procesos=2).generar_lote(
+        tareas, lambda completados, total, resultado: progreso.append((completados, total)))
+
+    assert len(resumen.exitosos) == 3
+    assert [r.carne for r in resumen.fallidos] == ['C99999']
+    assert progreso == [(i, 4) for i in range(1, 5)]
+
+    libro = openpyxl.load_workbook(tmp_path / 'C00000.xlsx', read_only=True)
+    assert tuple(libro.sheetnames) == ExcelWriter.HOJAS
+    libro.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='Requiere tuberías con nombre')
+def test_tiempo_limite_cancela_solo_la_tarea_bloqueada(tmp_path):
+    """Una tarea que no termina se registra como fallida y el resto del lote continúa."""
+    bloqueado = tmp_path / 'bloqueado.xlsx'
+    os.mkfifo(bloqueado)  # Escribir en una tubería sin lector bloquea al trabajador
+    tareas = [
+        TareaExcel.desde_historial(f'C0000{i}', f'ESTUDIANTE {i}', HISTORIAL,
+                                   str(tmp_path / f'C0000{i}.xlsx'))
+        for i in range(4)
+    ]
+    tareas.insert(1, TareaExcel.desde_historial('C99999', 'BLOQUEADO', HISTORIAL, str(bloqueado)))
+
+    resumen = ExcelBatchService(procesos=2, tiempo_limite=1).generar_lote(tareas)
+
+    assert sorted(r.carne for r in resumen.exitosos) == [f'C0000{i}' for i in range(4)]
+    assert [(r.carne, r.tiempo_agotado) for r in resumen.fallidos] == [('C99999', True)]
+    assert resumen.tiempos_agotados == 1 and resumen.por_segundo > 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='Requiere tuberías con nombre')
+def test_tiempo_limite_no_cuenta_la_espera_en_cola(tmp_path):
+    """Una tarea que espera a que se desocupe un trabajador no consume su tiempo límite."""
+    rutas = [tmp_path / f'C0000{i}.xlsx' for i in range(3)]
+    for ruta in rutas:
+        os.mkfifo(ruta)
+    inicio = time.perf_counter()
+
+    def leer(ruta, segundos):  # Cada tubería se lee en un momento fijo del lote
+        time.sleep(max(0.0, inicio + segundos - time.perf_counter()))
+        with open(ruta, 'rb') as tuberia:
+            tuberia.read()
+
+    lectores = [threading.Thread(target=leer, args=(ruta, segundos), daemon=True)
+                for ruta, segundos in zip(rutas, (1.0, 1.0, 2.2))]
+    for lector in lectores:
+        lector.start()
+    tareas = [TareaExcel.desde_historial(ruta.stem, 'EN COLA', HISTORIAL, str(ruta)) for ruta in rutas]
+
+    resumen = ExcelBatchService(procesos=2, tiempo_limite=1.5).generar_lote(tareas)
+    for lector in lectores:
+        lector.join(timeout=5)
+
+    assert len(resumen.exitosos) == 3 and not resumen.fallidos
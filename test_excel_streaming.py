@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Pruebas del modo streaming (memoria constante) de ExcelWriter
+"""
+import openpyxl
+import pytest
+
+from src.infrastructure.adapters.excel_writer import (
+    EscrituraFueraDeOrdenError, ExcelWriter, LibroStreaming
+)
+
+
+pytest_plugins = ['tests.conftest']  # expediente_variado
+
+
+def _contenido(ruta):
+    libro = openpyxl.load_workbook(ruta)
+    contenido = {
+        hoja.title: [
+            [(celda.value, celda.fill.fgColor.rgb) for celda in fila] for fila in hoja.iter_rows()
+        ]
+        for hoja in libro.worksheets
+    }
+    libro.close()
+    return contenido
+
+
+def test_streaming_produce_el_mismo_contenido(tmp_path, expediente_variado):
+    """Todas las hojas escriben en orden de filas, por lo que ambos modos coinciden celda por celda."""
+    expediente = expediente_variado
+    ExcelWriter().generar_expediente(expediente, str(tmp_path / 'normal.xlsx'))
+    ExcelWriter(modo_streaming=True).generar_expediente(expediente, str(tmp_path / 'streaming.xlsx'))
+
+    assert _contenido(tmp_path / 'normal.xlsx') == _contenido(tmp_path / 'streaming.xlsx')
+
+
+def test_escritura_fuera_de_orden_falla(tmp_path):
+    """En modo streaming escribir en una fila ya volcada es un error y no una pérdida silenciosa."""
+    libro = LibroStreaming(str(tmp_path / 'orden.xlsx'))
+    hoja = libro.add_worksheet('Prueba')
+    hoja.write(0, 0, 'uno')
+    hoja.write(1, 0, 'dos')
+    with pytest.raises(EscrituraFueraDeOrdenError):
+        hoja.write(0, 1, 'tarde')
+    hoja.merge_range('A3:B4', 'combinada')
+    with pytest.raises(EscrituraFueraDeOrdenError):
+        hoja.write_row('A3', ['tarde'])
+    hoja.write('A5', 'cinco')
+    libro.close()
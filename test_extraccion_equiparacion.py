@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la lectura de cursos de expedientes ya generados
+"""
+import json
+
+import openpyxl
+
+from src.infrastructure.adapters import equiparacion_analyzer
+from src.infrastructure.adapters.equiparacion_analyzer import EquiparacionAnalyzer, HOJA_EQUIPARACION
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+from src.shared.config.tabla_equivalencias import RUTA_EQUIVALENCIAS
+
+
+pytest_plugins = ['tests.conftest']  # expediente_variado
+
+
+def test_lectura_de_solo_lectura_coincide_con_libro_completo(tmp_path, expediente_variado):
+    """La lectura rápida obtiene los mismos cursos que el libro completo, desde el encabezado."""
+    expediente = expediente_variado
+    ruta = tmp_path / 'expediente.xlsx'
+    ExcelWriter().generar_expediente(expediente, str(ruta))
+
+    analyzer = EquiparacionAnalyzer()
+    rapido = analyzer.extraer_cursos(str(ruta))
+    libro = openpyxl.load_workbook(ruta)
+    assert rapido == analyzer._extraer_cursos_aprobados(libro)
+    libro.close()
+
+    siglas_plan = {curso.sigla for semestre in expediente.semestres.values() for curso in semestre.cursos}
+    assert set(rapido) == siglas_plan
+
+
+def test_cursos_en_cache_por_huella_del_archivo(tmp_path, monkeypatch, expediente_variado):
+    """Un archivo ya leído no se vuelve a recorrer, y uno ya analizado tampoco se vuelve a abrir."""
+    ruta = tmp_path / 'C12345-ANA SOTO.xlsx'
+    ExcelWriter().generar_expediente(expediente_variado, str(ruta))
+
+    lecturas, cargas = [], []
+    extraer = EquiparacionAnalyzer._extraer_cursos_aprobados
+    cargar = openpyxl.load_workbook
+    monkeypatch.setattr(EquiparacionAnalyzer, '_extraer_cursos_aprobados',
+                        lambda self, libro: lecturas.append(1) or extraer(self, libro))
+    monkeypatch.setattr(equiparacion_analyzer.openpyxl, 'load_workbook',
+                        lambda *args, **kwargs: cargas.append(kwargs.get('read_only', False)) or cargar(*args, **kwargs))
+    monkeypatch.setattr(equiparacion_analyzer, '_CURSOS_POR_HUELLA', equiparacion_analyzer.OrderedDict())
+    monkeypatch.setattr(equiparacion_analyzer, '_HUELLAS_ANALIZADAS', equiparacion_analyzer.OrderedDict())
+
+    analyzer = EquiparacionAnalyzer()
+    cursos = analyzer.extraer_cursos(str(ruta))
+    cursos['MA1001']['estado'] = 'MODIFICADO'
+    assert analyzer.extraer_cursos(str(ruta))['MA1001']['estado'] != 'MODIFICADO'
+    assert analyzer.analizar_expediente(str(ruta))
+    guardado = ruta.read_bytes()
+    assert analyzer.analizar_expediente(str(ruta))
+
+    assert len(lecturas) == 1
+    assert cargas == [True, True, False]  # Dos lecturas rápidas y el único análisis que guardó el archivo
+    assert ruta.read_bytes() == guardado
+
+
+def test_hoja_al_dia_no_vuelve_a_guardar_el_libro(tmp_path, monkeypatch, expediente_variado):
+    """En otro proceso, un libro con la hoja al día solo se lee; otra tabla obliga a regenerarla."""
+    ruta = tmp_path / f'{expediente_variado.carne}-{expediente_variado.nombre}.xlsx'
+    ExcelWriter(perfil='con_equiparacion').generar_expediente(expediente_variado, str(ruta))
+    generado = ruta.read_bytes()
+
+    cargas = []
+    cargar = openpyxl.load_workbook
+    monkeypatch.setattr(equiparacion_analyzer.openpyxl, 'load_workbook',
+                        lambda *args, **kwargs: cargas.append(kwargs.get('read_only', False)) or cargar(*args, **kwargs))
+    monkeypatch.setattr(equiparacion_analyzer, '_CURSOS_POR_HUELLA', equiparacion_analyzer.OrderedDict())
+    monkeypatch.setattr(equiparacion_analyzer, '_HUELLAS_ANALIZADAS', equiparacion_analyzer.OrderedDict())
+
+    assert EquiparacionAnalyzer().analizar_expediente(str(ruta))
+    assert cargas == [True] and ruta.read_bytes() == generado
+
+    datos = json.loads(RUTA_EQUIVALENCIAS.read_text(encoding='utf-8'))
+    datos['equivalencias'][0]['curso_nuevo'] = 'CURSO RENOMBRADO'
+    editada = tmp_path / 'equivalencias.json'
+    editada.write_text(json.dumps(datos, ensure_ascii=False), encoding='utf-8')
+
+    assert EquiparacionAnalyzer(str(editada)).analizar_expediente(str(ruta))
+    assert cargas == [True, True, False]
+    libro = openpyxl.load_workbook(ruta, read_only=True)
+    assert 'CURSO RENOMBRADO' in {fila[5] for fila in libro[HOJA_EQUIPARACION].iter_rows(min_row=7, values_only=True)}
+    libro.close()
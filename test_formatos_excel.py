@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Pruebas del plan de estilos compartido de ExcelWriter
+"""
+import xlsxwriter
+
+from src.domain.entities.enums import EstadoCurso, _CODIGOS_ESTADO
+from src.infrastructure.adapters.excel_writer import ExcelWriter, PLAN_FORMATOS
+
+
+def test_codigo_de_estado():
+    """Los estados en texto se convierten a su código entero."""
+    assert EstadoCurso.codigo('APROBADO') == EstadoCurso.APROBADO.value
+    assert EstadoCurso.codigo('EQUIVALENTE') == EstadoCurso.EQUIVALENTE.value
+    assert EstadoCurso.codigo('RETIRO DE MATRÍCULA') == EstadoCurso.RETIRADO.value
+    assert EstadoCurso.codigo('') == EstadoCurso.SIN_DATOS.value
+    assert EstadoCurso.codigo('DESCONOCIDO') == EstadoCurso.SIN_DATOS.value
+    assert EstadoCurso.codigo('RETIRO JUSTIFICADO') == EstadoCurso.RETIRADO.value
+    assert EstadoCurso.codigo(None) == EstadoCurso.SIN_DATOS.value
+    assert 'DESCONOCIDO' not in _CODIGOS_ESTADO and 'RETIRO JUSTIFICADO' not in _CODIGOS_ESTADO
+
+
+def test_formatos_por_codigo_de_estado(tmp_path):
+    """Cada libro registra todo el plan y elige el formato del curso por código."""
+    libro = xlsxwriter.Workbook(str(tmp_path / 'formatos.xlsx'))
+    writer = ExcelWriter()
+    formatos = writer._generar_formatos(libro)
+
+    assert list(formatos) == [nombre for nombre, _ in PLAN_FORMATOS]
+    esperado = {
+        'APROBADO': 'curso_aprobado', 'CONVALIDADO': 'curso_aprobado',
+        'REPROBADO': 'curso_reprobado', 'MATRICULADO': 'curso_matriculado',
+        'RETIRO DE MATRÍCULA': 'curso_sin_datos', '': 'curso_sin_datos',
+    }
+    for estado, nombre in esperado.items():
+        assert writer._obtener_formato_curso(EstadoCurso.codigo(estado), formatos) is formatos[nombre]
+    libro.close()
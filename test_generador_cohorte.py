@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pruebas del generador de cohortes sintéticas
+"""
+from src.infrastructure.adapters.html_parser import MainListingParser, StudentParser
+from src.infrastructure.adapters.texto_memoria_parser import analizar_texto_memoria
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.shared.config.settings import DETALLE_CURSOS
+from src.shared.sinteticos import (
+    GeneradorCohorte, escribir_en_repositorio, html_listado, html_nivel_avance, texto_expediente
+)
+
+
+def _orden(fila):
+    return fila['AÑO'], fila['SEM'], fila['SIGLA'], fila['ESTADO']
+
+
+def test_historiales_respetan_requisitos_y_son_reproducibles():
+    """Un curso solo se matricula con sus requisitos aprobados y la semilla fija los estudiantes."""
+    generador = GeneradorCohorte(semilla=3)
+    requisitos = {curso['sigla']: curso.get('requisitos', []) for curso in DETALLE_CURSOS}
+    estados = set()
+
+    for estudiante in generador.estudiantes(200):
+        aprobados_por_periodo = {}
+        for fila in estudiante.historial:
+            estados.add(fila['ESTADO'])
+            if fila['ESTADO'] in ('APROBADO', 'CONVALIDADO'):
+                aprobados_por_periodo.setdefault(fila['SIGLA'], (fila['AÑO'], fila['SEM']))
+        for fila in estudiante.historial:
+            for requisito in requisitos.get(fila['SIGLA'], []):
+                assert aprobados_por_periodo[requisito] < (fila['AÑO'], fila['SEM'])
+
+    assert {'APROBADO', 'REPROBADO', 'MATRICULADO', 'CONVALIDADO', 'RETIRO DE MATRÍCULA'} <= estados
+    assert GeneradorCohorte(semilla=3).estudiante(42) == generador.estudiante(42)
+    assert GeneradorCohorte(semilla=4).estudiante(42) != generador.estudiante(42)
+
+
+def test_formatos_se_leen_con_los_lectores_de_la_aplicacion(tmp_path):
+    """El listado, la página de avance, el texto copiado y el repositorio conservan los datos."""
+    generador = GeneradorCohorte(semilla=1)
+    estudiantes = list(generador.estudiantes(3))
+    estudiante = generador.estudiante(7, ciclos=6)
+
+    listado = MainListingParser()
+    listado.feed(html_listado(estudiantes))
+    assert [fila[:3] for fila in listado.get_lista()] == [
+        [e.clave, e.carne, e.nombre] for e in estudiantes
+    ]
+
+    parser = StudentParser()
+    parser.feed(html_nivel_avance(estudiante))
+    assert sorted(parser.get_lista(), key=_orden) == sorted(estudiante.historial, key=_orden)
+
+    texto = texto_expediente(estudiante)
+    datos = analizar_texto_memoria(texto)
+    assert (datos.carne, datos.nombre) == (estudiante.carne, estudiante.nombre)
+    assert datos.cursos
+
+    repositorio = FileRepository(str(tmp_path))
+    assert escribir_en_repositorio(repositorio, [estudiante]) == 1
+    assert repositorio.leer_informacion_estudiante(estudiante.carne) == (estudiante.carne, estudiante.nombre)
+    assert sorted(repositorio.leer_historial(estudiante.carne), key=_orden) == sorted(
+        estudiante.historial, key=_orden
+    )
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice del plan de estudios por sigla
+"""
+import config
+from src.shared.config.indice_curricular import IndiceCurricular, obtener_indice_curricular
+
+
+def test_indice_coincide_con_configuracion_legada():
+    """El índice responde lo mismo que el recorrido lineal de config.detalle_cursos."""
+    indice = obtener_indice_curricular()
+    assert indice is obtener_indice_curricular()
+
+    for curso in config.detalle_cursos:
+        assert list(indice.requisitos(curso['sigla'])) == curso.get('requisitos', [])
+        assert list(indice.correquisitos(curso['sigla'])) == curso.get('correquisitos', [])
+
+
+def test_sigla_desconocida_y_repetida():
+    """Las siglas desconocidas no tienen requisitos y ante repetidas gana la primera."""
+    indice = IndiceCurricular([
+        {'sigla': 'AA0001', 'curso': 'A', 'creditos': 3, 'semestre': 1, 'requisitos': ['BB0001']},
+        {'sigla': 'AA0001', 'curso': 'A (duplicado)', 'creditos': 3, 'semestre': 2},
+    ])
+    assert len(indice) == 1 and 'AA0001' in indice
+    assert indice.requisitos('AA0001') == ('BB0001',)
+    assert indice.obtener('AA0001').semestre == 1
+    assert indice.requisitos('ZZ9999') == () and indice.obtener('ZZ9999') is None
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la ingesta de textos con muchos expedientes y prematrículas
+"""
+import json
+from datetime import datetime
+
+from src.application.services.ingesta_texto_service import IngestaTextoService
+from src.infrastructure.adapters.texto_memoria_parser import analizar_texto_memoria, dividir_registros
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+from src.shared.sinteticos import GeneradorCohorte, texto_expediente, texto_prematricula
+
+
+def test_dividir_pagina_con_varios_estudiantes(tmp_path):
+    """Cada registro conserva su texto; el encabezado de la página y el registro sin carné se descartan."""
+    primero, segundo = GeneradorCohorte(6).estudiantes(2)
+    # Una página que menciona ambas marcas antes del carné sigue siendo un solo registro
+    mixto = 'Expediente académico\r\n' + texto_prematricula(segundo)
+    texto = ('Menú principal\r\n' + texto_expediente(primero) + texto_prematricula(primero)
+             + mixto + 'Expediente académico\r\nsin datos\r\n')
+
+    registros = dividir_registros(texto)
+
+    assert registros == [texto_expediente(primero), texto_prematricula(primero), mixto]
+    assert [(datos.tipo, datos.carne) for datos in map(analizar_texto_memoria, registros)] == [
+        ('exp', primero.carne), ('pre', primero.carne), ('pre', segundo.carne)
+    ]
+    assert dividir_registros(texto.replace('\r\n', '\n')) == registros
+    assert dividir_registros('texto cualquiera\r\n') == []
+
+    resumen = IngestaTextoService(FileRepository(str(tmp_path)), procesos=1).ingerir_registros(registros)
+    assert resumen.expedientes == [(primero.carne, primero.nombre)]
+    assert [carne for carne, _ in resumen.prematriculas] == [primero.carne, segundo.carne]
+
+
+def test_procesar_directorio_de_volcados(tmp_path, monkeypatch, capsys):
+    """El subcomando guarda todos los estudiantes de los volcados y genera sus Excel."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    estudiantes = list(GeneradorCohorte(6).estudiantes(3))
+    volcados = tmp_path / 'volcados'
+    volcados.mkdir()
+    (volcados / 'expedientes.txt').write_text(
+        ''.join(texto_expediente(e) for e in estudiantes).replace('\r\n', '\n'), encoding='utf-8'
+    )
+    (volcados / 'prematriculas.txt').write_bytes(
+        (texto_prematricula(estudiantes[0]) + 'Cursos solicitados en prematrícula\r\n').encode('latin-1')
+    )
+
+    codigo = CliController().ejecutar(['procesar', str(volcados), '--procesos', '1', '--perfil', 'revision_rapida'])
+    resultado = json.loads(capsys.readouterr().out)
+
+    assert codigo == 0
+    assert resultado['registros'] == {'expedientes': 3, 'prematriculas': 1, 'sin_datos': 0}
+    assert resultado['archivos']['generados'] == 3
+    repositorio = FileRepository()
+    assert all((repositorio.directorio_expedientes / f'{e.carne}.edf').exists() for e in estudiantes)
+    assert (repositorio.directorio_solicitudes / f'{estudiantes[0].carne}.sdf').exists()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la medición de memoria por etapa y por estudiante
+"""
+import json
+import tracemalloc
+from datetime import datetime
+
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+from src.shared.instrumentacion import Metricas
+from src.shared.sinteticos import GeneradorCohorte, escribir_en_repositorio
+
+
+def test_etapas_con_pico_sitios_y_advertencia_de_memoria_no_liberada():
+    """Cada etapa reporta su pico y sus sitios, y lo retenido entre estudiantes se advierte."""
+    registro = Metricas()
+    monitor = registro.activar_memoria(ventana=5, umbral=16 * 1024)
+    retenidos = []
+    try:
+        with registro.medir('temporal'):
+            bloque = bytearray(512 * 1024)
+            del bloque
+        advertencias = []
+        for indice in range(10):
+            with registro.medir('estudiante'):
+                retenidos.append([f'{indice}-{numero}' * 20 for numero in range(400)])
+            advertencias.append(registro.registrar_estudiante(f'B{indice:05d}'))
+        datos = registro.como_dict()['memoria']
+    finally:
+        registro.desactivar_memoria()
+
+    assert datos['etapas']['temporal']['pico'] >= 512 * 1024
+    assert datos['etapas']['temporal']['retenido'] < 64 * 1024
+    assert datos['etapas']['estudiante']['llamadas'] == 10
+    assert any('test_memoria.py' in sitio for sitio in datos['etapas']['estudiante']['sitios'])
+    assert advertencias[4] and 'no se libera' in advertencias[4] and monitor.advertencias
+    assert not tracemalloc.is_tracing()
+
+
+def test_cli_agrega_la_memoria_de_los_trabajadores(tmp_path, monkeypatch, capsys):
+    """Con --memoria, las métricas incluyen las etapas medidas en los procesos trabajadores."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    estudiantes = list(GeneradorCohorte(3).estudiantes(2))
+    escribir_en_repositorio(FileRepository(), estudiantes)
+
+    assert CliController().ejecutar(['--memoria', 'regenerar', '--procesos', '2',
+                                     '--perfil', 'revision_rapida']) == 0
+    memoria = json.loads(capsys.readouterr().out)['metricas']['memoria']
+
+    assert memoria['etapas']['expediente.construir']['llamadas'] == 2
+    assert memoria['rss_trabajadores'] and set(memoria['estudiantes']) == {e.carne for e in estudiantes}
+    assert not tracemalloc.is_tracing()
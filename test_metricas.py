@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los tiempos y contadores por etapa
+"""
+import csv
+import json
+
+from src.application.services.excel_batch_service import ExcelBatchService, TareaExcel
+from src.shared.instrumentacion import Metricas, metricas
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+    {'SIGLA': 'MA1002', 'CURSO': 'CÁLCULO II', 'CREDITOS': '4', 'GRUPO': '03',
+     'SEM': 'II', 'AÑO': '2023', 'ESTADO': 'MATRICULADO', 'NOTA': ''},
+]
+
+
+def test_combinar_y_exportar(tmp_path):
+    """Los valores de otro registro se suman y se exportan en JSON y CSV."""
+    registro = Metricas()
+    with registro.medir('http.obtener'):
+        pass
+    registro.registrar_tiempo('http.obtener', 0.5)
+    registro.contar('http.bytes', 100)
+
+    trabajador = Metricas()
+    trabajador.registrar_tiempo('http.obtener', 2.0)
+    trabajador.registrar_tiempo('excel.guardar', 0.25)
+    trabajador.contar('http.bytes', 50)
+    registro.combinar(trabajador.como_dict())
+
+    tiempos = {e.nombre: e for e in registro.tiempos()}
+    assert tiempos['http.obtener'].llamadas == 3
+    assert tiempos['http.obtener'].maximo == 2.0
+    assert [e.nombre for e in registro.tiempos()] == ['http.obtener', 'excel.guardar']
+    assert registro.contadores() == {'http.bytes': 150}
+    assert 'excel.guardar' in registro.tabla()
+
+    datos = json.loads(registro.exportar(tmp_path / 'metricas.json').read_text(encoding='utf-8'))
+    assert datos['tiempos']['excel.guardar'] == {'llamadas': 1, 'total': 0.25, 'maximo': 0.25}
+    with open(registro.exportar(tmp_path / 'metricas.csv'), newline='', encoding='utf-8') as archivo:
+        filas = list(csv.DictReader(archivo))
+    assert {fila['nombre'] for fila in filas} == {'http.obtener', 'excel.guardar', 'http.bytes'}
+
+
+def test_lote_paralelo_suma_metricas_de_trabajadores(tmp_path):
+    """Los tiempos de cada hoja medidos en los procesos trabajadores llegan al proceso principal."""
+    tareas = [
+        TareaExcel.desde_historial(f'C0000{i}', f'ESTUDIANTE {i}', HISTORIAL,
+                                   str(tmp_path / f'C0000{i}.xlsx'))
+        for i in range(3)
+    ]
+
+    metricas.reiniciar()
+    resumen = ExcelBatchService(procesos=2, perfil='revision_rapida').generar_lote(tareas)
+
+    assert len(resumen.exitosos) == 3
+    tiempos = {e.nombre: e for e in metricas.tiempos()}
+    assert tiempos['expediente.construir'].llamadas == 3
+    assert tiempos['excel.guardar'].llamadas == 3
+    assert tiempos['excel.hoja.Malla Curricular'].llamadas == 3
+    assert metricas.contadores()['excel.archivos'] == 3
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas del perfilado de las operaciones
+"""
+import json
+import time
+from datetime import datetime
+
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+from src.shared.config.settings import app_config
+from src.shared.instrumentacion import Perfilador, perfilar
+from src.shared.sinteticos import GeneradorCohorte, escribir_en_repositorio
+
+
+def _ocupar(segundos: float) -> int:
+    """Trabajo de CPU para que el muestreo registre la función."""
+    fin, total = time.perf_counter() + segundos, 0
+    while time.perf_counter() < fin:
+        total += sum(range(100))
+    return total
+
+
+def test_perfilador_escribe_resumen_cprofile_y_pilas_colapsadas(tmp_path):
+    """El resumen lista las funciones con más tiempo y las pilas tienen el formato de flamegraph."""
+    perfilador = Perfilador('prueba', tmp_path, intervalo=0.001)
+    perfilador.iniciar()
+    _ocupar(0.2)
+    resultado = perfilador.detener()
+
+    assert resultado.perfil.stat().st_size > 0
+    assert '_ocupar' in resultado.resumen.read_text(encoding='utf-8')
+    lineas = resultado.pilas.read_text(encoding='utf-8').splitlines()
+    assert resultado.muestras > 0 and lineas
+    pila, cantidad = lineas[0].rsplit(' ', 1)
+    assert int(cantidad) > 0 and pila.startswith('MainThread;')
+    assert any('_ocupar (test_perfilador.py' in linea for linea in lineas)
+
+
+def test_perfilar_solo_con_el_interruptor_y_desde_la_cli(tmp_path, monkeypatch, capsys):
+    """Sin el interruptor no se escribe nada; con --perfilar el subcomando reporta sus perfiles."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    monkeypatch.setattr(app_config, 'perfilar', False)
+    monkeypatch.setattr(app_config, 'directorio_perfiles', app_config.directorio_perfiles)
+    with perfilar('apagado') as perfilador:
+        _ocupar(0.01)
+    assert perfilador is None and not (tmp_path / 'perfiles').exists()
+
+    escribir_en_repositorio(FileRepository(), GeneradorCohorte(1).estudiantes(2))
+    assert CliController().ejecutar([
+        '--perfilar', '--directorio-perfiles', 'perfiles', 'regenerar', '--procesos', '1'
+    ]) == 0
+    resultado = json.loads(capsys.readouterr().out)
+    assert resultado['perfilado']['resumen'].startswith('perfiles')
+    assert sorted(ruta.suffix for ruta in (tmp_path / 'perfiles').iterdir()) == ['.folded', '.prof', '.txt']
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los perfiles de hojas de ExcelWriter
+"""
+import openpyxl
+import pytest
+
+from src.application.services.expediente_service import ExpedienteService
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+    {'SIGLA': 'MA1002', 'CURSO': 'CÁLCULO II', 'CREDITOS': '4', 'GRUPO': '03',
+     'SEM': 'II', 'AÑO': '2023', 'ESTADO': 'REPROBADO', 'NOTA': '6.0'},
+]
+
+
+def test_revision_rapida_solo_calcula_lo_necesario(tmp_path):
+    """El perfil rápido genera sus dos hojas y no calcula datos de las hojas omitidas."""
+    expediente = ExpedienteService.procesar_expediente_estudiante('C12345', 'JUAN', HISTORIAL)
+    writer = ExcelWriter(perfil='revision_rapida')
+    ruta = tmp_path / 'rapido.xlsx'
+
+    analisis = writer.generar_expediente(expediente, str(ruta))
+
+    libro = openpyxl.load_workbook(ruta, read_only=True)
+    assert libro.sheetnames == ['Malla Curricular', 'Cursos Pendientes']
+    libro.close()
+    assert writer.datos_requeridos == {
+        'creditos_plan', 'creditos_aprobados', 'cursos_pendientes',
+        'siglas_aprobadas', 'siglas_matriculadas', 'siglas_en_matricula'
+    }
+    assert set(vars(analisis)) - {'expediente'} == writer.datos_requeridos
+
+
+def test_perfil_desconocido():
+    """Un perfil que no existe se rechaza al crear el escritor."""
+    with pytest.raises(ValueError):
+        ExcelWriter(perfil='inexistente')
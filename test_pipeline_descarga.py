@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la descarga con generación simultánea de los archivos Excel
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from src.application.services.pipeline_service import Pipeline, PipelineDescargaService
+from src.infrastructure.repositories.file_repository import FileRepository
+
+
+HISTORIAL = [
+    {'SIGLA': 'MA1001', 'CURSO': 'CÁLCULO I', 'CREDITOS': '3', 'GRUPO': '01',
+     'SEM': 'I', 'AÑO': '2023', 'ESTADO': 'APROBADO', 'NOTA': '8.5'},
+]
+
+
+class ServicioMatriculaFalso:
+    """Simula el sistema de matrícula con una demora de red por expediente."""
+
+    def __init__(self):
+        self.inicios_descarga = []
+
+    def descargar_expediente_estudiante(self, clave):
+        if clave == 'CAIDO':
+            raise ConnectionError('Tiempo de espera agotado')
+        self.inicios_descarga.append(time.perf_counter())
+        time.sleep(0.1)
+        return f'<html>{clave}</html>'
+
+    def procesar_expediente_estudiante(self, contenido_html):
+        return [dict(fila) for fila in HISTORIAL]
+
+    def guardar_expediente_estudiante(self, carne, nombre, datos_cursos, file_repo):
+        file_repo.escribir_historial(carne, list(HISTORIAL[0]), datos_cursos)
+        file_repo.escribir_informacion_estudiante(carne, carne, nombre)
+
+
+def test_pipeline_acota_los_elementos_en_espera():
+    """Con una etapa lenta, las etapas anteriores esperan en lugar de acumular elementos."""
+    en_proceso = []
+    maximo = [0]
+    candado = threading.Lock()
+
+    def entrar(numero):
+        with candado:
+            en_proceso.append(numero)
+            maximo[0] = max(maximo[0], len(en_proceso))
+        return numero
+
+    def salir_lento(numero):
+        time.sleep(0.005)
+        with candado:
+            en_proceso.remove(numero)
+        if numero == 13:
+            raise ValueError('dato defectuoso')
+        return numero * 2
+
+    pipeline = Pipeline(capacidad=2).etapa('entrar', entrar, 2).etapa('salir', salir_lento)
+    resultados = sorted(pipeline.ejecutar(range(40)))
+
+    assert resultados == [n * 2 for n in range(40) if n != 13]
+    assert [(f.etapa, f.elemento) for f in pipeline.fallos] == [('salir', 13)]
+    assert maximo[0] <= 2 + 2 + 2  # capacidad de la cola, hilos de entrada y la etapa lenta
+    assert set(pipeline.tiempos) == {'entrar', 'salir'}
+
+
+def test_excel_listo_antes_de_terminar_la_descarga(tmp_path):
+    """El primer libro se completa mientras aún se descargan otros expedientes."""
+    repositorio = FileRepository(str(tmp_path))
+    servicio_matricula = ServicioMatriculaFalso()
+    estudiantes = [(f'K{i}', f'C0000{i}', f'ESTUDIANTE {i}', '') for i in range(6)]
+    estudiantes.insert(3, ('CAIDO', 'C99999', 'SIN RED', ''))
+
+    completados = []
+    resumen = PipelineDescargaService(servicio_matricula, repositorio, procesos=2).ejecutar(
+        estudiantes, al_completar=lambda n, total, e: completados.append(time.perf_counter())
+    )
+
+    assert len(resumen.lote.exitosos) == 6
+    assert [(r.carne, r.error) for r in resumen.lote.fallidos] == [
+        ('C99999', 'Error en descarga: Tiempo de espera agotado')
+    ]
+    assert all((tmp_path / 'salida' / f'C0000{i}-ESTUDIANTE {i}.xlsx').exists() for i in range(6))
+    assert all((tmp_path / 'expediente' / f'C0000{i}.edf').exists() for i in range(6))
+    assert completados[0] < servicio_matricula.inicios_descarga[-1]
+
+    omitidos = PipelineDescargaService(servicio_matricula, repositorio, procesos=2).ejecutar(
+        estudiantes, forzar=False
+    ).omitidos
+    assert len(omitidos) == 6
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='Requiere tuberías con nombre')
+def test_libro_bloqueado_no_detiene_la_descarga(tmp_path):
+    """Un libro que excede el tiempo límite se registra como fallido y los demás se generan."""
+    repositorio = FileRepository(str(tmp_path))
+    estudiantes = [(f'K{i}', f'C0000{i}', f'ESTUDIANTE {i}', '') for i in range(4)]
+    repositorio.directorio_salida.mkdir(parents=True, exist_ok=True)
+    os.mkfifo(repositorio.directorio_salida / 'C00001-ESTUDIANTE 1.xlsx')  # Escribir aquí bloquea al trabajador
+
+    resumen = PipelineDescargaService(
+        ServicioMatriculaFalso(), repositorio, procesos=2, tiempo_limite=1
+    ).ejecutar(estudiantes)
+
+    assert sorted(r.carne for r in resumen.lote.exitosos) == ['C00000', 'C00002', 'C00003']
+    assert [(r.carne, r.tiempo_agotado) for r in resumen.lote.fallidos] == [('C00001', True)]
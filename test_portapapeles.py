@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la vigilancia del portapapeles con el generador en caliente
+"""
+import os
+import threading
+
+from src.application.services.memory_reader_service import MemoryReaderService
+from src.application.services.portapapeles_service import (
+    GeneradorEnCaliente, PortapapelesService, VigilantePortapapeles
+)
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.shared.sinteticos import GeneradorCohorte, texto_expediente
+
+
+def test_vigilante_entrega_cada_texto_una_sola_vez():
+    """Los textos repetidos o ya vistos no se entregan otra vez."""
+    copiados = iter(['', 'A', 'A', 'B', 'A', ' ', 'C'])
+    detener = threading.Event()
+
+    def leer():
+        try:
+            return next(copiados)
+        except StopIteration:
+            detener.set()
+            return 'C'
+
+    vigilante = VigilantePortapapeles(leer, intervalo=0.001, intervalo_maximo=0.002)
+    esperas = []
+
+    assert list(vigilante.textos(detener, lambda: esperas.append(1))) == ['A', 'B', 'C']
+    assert len(esperas) >= 3  # Las lecturas vacías o repetidas
+
+
+def test_generador_en_caliente_produce_el_excel_de_cada_pegado(tmp_path, monkeypatch):
+    """Cada expediente copiado produce su Excel; uno ya generado y una prematrícula sin expediente no."""
+    monkeypatch.chdir(tmp_path)
+    primero, segundo = GeneradorCohorte(5).estudiantes(2)
+    memory_service = MemoryReaderService(FileRepository())
+
+    with GeneradorEnCaliente(memory_service.file_repo, 'revision_rapida') as generador:
+        assert generador.esperar_calentamiento() > 0
+        servicio = PortapapelesService(memory_service, generador)
+        pegados, terminados = [], []
+        for texto in (texto_expediente(primero), texto_expediente(segundo),
+                      texto_expediente(primero) + '\r\n',
+                      'Cursos solicitados en prematrícula\r\nCarné: B99999\r\n', 'texto cualquiera'):
+            pegados.append(servicio.procesar(texto))
+            terminados.extend(servicio.terminados(esperar=True))
+
+    assert [pegado.carne for pegado in terminados] == [primero.carne, segundo.carne]
+    assert all(pegado.resultado.exitoso and os.path.exists(pegado.resultado.ruta_salida)
+               for pegado in terminados)
+    assert pegados[2].actualizado and not pegados[2].enviado
+    assert pegados[3].tipo == 'pre' and not pegados[3].enviado
+    assert pegados[4] is None
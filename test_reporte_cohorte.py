@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Pruebas del reporte de cohorte generado en una sola pasada
+"""
+import openpyxl
+import pytest
+
+from src.application.services.reporte_cohorte_service import ReporteCohorteService
+from src.domain.entities.analisis_expediente import AnalisisExpediente
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.application.services.expediente_service import ExpedienteService
+from src.application.services.excel_batch_service import COLUMNAS_HISTORIAL
+
+
+def _fila(sigla, anno, sem, estado, nota=''):
+    return {
+        'SIGLA': sigla, 'CURSO': f'CURSO {sigla}', 'CREDITOS': '3', 'GRUPO': '01',
+        'SEM': sem, 'AÑO': anno, 'ESTADO': estado, 'NOTA': nota
+    }
+
+
+ESTUDIANTES = {
+    'B00001': ('ANA', [_fila('MA1001', '2022', 'I', 'APROBADO', '8.0'),
+                       _fila('MA1002', '2023', 'I', 'MATRICULADO')]),
+    'B00002': ('LUIS', [_fila('MA1001', '2021', 'I', 'REPROBADO', '5.0'),
+                        _fila('MA1001', '2021', 'II', 'REPROBADO', '5.5'),
+                        _fila('MA1001', '2022', 'I', 'REPROBADO', '6.0')]),
+    'B00003': ('SOFÍA', []),
+}
+
+
+def test_reporte_desde_repositorio(tmp_path):
+    """El reporte tiene una fila por estudiante y estadísticas por curso."""
+    file_repo = FileRepository(str(tmp_path))
+    for carne, (nombre, historial) in ESTUDIANTES.items():
+        file_repo.escribir_informacion_estudiante(carne, carne, nombre)
+        if historial:
+            file_repo.escribir_historial(carne, list(COLUMNAS_HISTORIAL), historial)
+
+    ruta = tmp_path / 'cohorte.xlsx'
+    procesados = []
+    resumen = ReporteCohorteService().generar(
+        file_repo.iterar_expedientes(), str(ruta), lambda n, fila: procesados.append(fila.carne)
+    )
+
+    assert resumen.estudiantes == 3 and not resumen.errores
+    assert procesados == ['B00001', 'B00002', 'B00003']
+
+    libro = openpyxl.load_workbook(ruta, read_only=True)
+    filas = {fila[0]: fila for fila in libro['Estudiantes'].iter_rows(min_row=2, values_only=True)}
+    assert filas['B00001'][2] == 3 and filas['B00001'][9] == 1  # créditos aprobados, matriculados
+    assert filas['B00002'][8] == 1  # MA1001 reprobado 3 veces
+    assert filas['B00003'][6] == 1  # sin cursos aprobados: primer semestre
+
+    aprobacion = {f[0]: f for f in libro['Aprobación por Curso'].iter_rows(min_row=2, values_only=True)}
+    assert aprobacion['MA1001'][3:6] == (1, 0, 2)
+    reprobacion = list(libro['Reprobación por Curso'].iter_rows(min_row=2, values_only=True))
+    assert reprobacion[0][0] == 'MA1001' and reprobacion[0][3:6] == (1, 3, 1)
+    libro.close()
+
+
+def test_expediente_ilegible_no_detiene_el_recorrido(tmp_path):
+    """Un expediente que no se puede leer se anota como error y el resto se sigue entregando."""
+    file_repo = FileRepository(str(tmp_path))
+    for carne, (nombre, historial) in ESTUDIANTES.items():
+        file_repo.escribir_informacion_estudiante(carne, carne, nombre)
+        if historial:
+            file_repo.escribir_historial(carne, list(COLUMNAS_HISTORIAL), historial)
+    (file_repo.directorio_expedientes / 'B00000.edf').mkdir()
+    (file_repo.directorio_expedientes / 'B00002.sdf').unlink()
+    (file_repo.directorio_expedientes / 'B00002.sdf').mkdir()
+
+    errores = []
+    resumen = ReporteCohorteService().generar(
+        file_repo.iterar_expedientes(errores), str(tmp_path / 'cohorte.xlsx')
+    )
+
+    assert resumen.estudiantes == 2 and not resumen.errores
+    assert [carne for carne, _ in errores] == ['B00000', 'B00002']
+    with pytest.raises(OSError):
+        list(file_repo.iterar_expedientes())
+
+
+def test_elegibles_coinciden_con_hoja_de_pendientes():
+    """Los cursos elegibles del análisis coinciden con 'Puede Matricular' de ExcelWriter."""
+    nombre, historial = ESTUDIANTES['B00001']
+    analisis = AnalisisExpediente(
+        ExpedienteService.procesar_expediente_estudiante('B00001', nombre, historial))
+    writer = ExcelWriter()
+
+    puede = {
+        curso.sigla for _, curso in analisis.cursos_pendientes
+        if writer._puede_matricular_curso({
+            'requisitos': writer._obtener_requisitos_curso(curso.sigla),
+            'correquisitos': writer._obtener_correquisitos_curso(curso.sigla)
+        }, analisis)
+    }
+    assert puede == analisis.siglas_elegibles
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la descarga contra el servidor simulado del sistema de matrícula
+"""
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from src.application.services.pipeline_service import PipelineDescargaService
+from src.application.services.web_scraping_service import WebScrapingService
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.presentation.console import cli_controller
+from src.presentation.console.cli_controller import CliController
+from src.shared.config.settings import app_config
+from src.shared.sinteticos import GeneradorCohorte, ServidorEmatricula
+
+
+def _orden(fila):
+    return fila['AÑO'], fila['SEM'], fila['SIGLA'], fila['ESTADO']
+
+
+def test_descarga_de_punta_a_punta_sin_conexion(tmp_path, monkeypatch, capsys):
+    """El subcomando descargar obtiene la cohorte del servidor simulado con descargas simultáneas."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli_controller, 'FECHA_EXPIRACION', datetime(2100, 1, 1))
+    monkeypatch.setattr(app_config, 'urls', app_config.urls)
+    monkeypatch.setenv('PREEII_USUARIO', 'profesor')
+    monkeypatch.setenv('PREEII_CLAVE', 'clave')
+    generador = GeneradorCohorte(semilla=5)
+
+    with ServidorEmatricula(generador, 6, latencia=0.02) as servidor:
+        codigo = CliController().ejecutar([
+            'descargar', '--url-base', servidor.url_base, '--descargas', '3', '--procesos', '2',
+            '--perfil', 'revision_rapida'
+        ])
+
+    resultado = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert codigo == 0, resultado
+    assert resultado['archivos']['generados'] == 6
+    assert servidor.estadisticas.por_ruta['nivelAvance.do'] == 6
+    assert servidor.estadisticas.maximo_simultaneas > 1
+
+    repositorio = FileRepository()
+    for estudiante in generador.estudiantes(6):
+        assert sorted(repositorio.leer_historial(estudiante.carne), key=_orden) == sorted(
+            estudiante.historial, key=_orden
+        )
+
+
+def test_fallas_simuladas(tmp_path):
+    """Credenciales inválidas, errores, límite de solicitudes y sesiones vencidas."""
+    with ServidorEmatricula(GeneradorCohorte(), 4, tasa_error=1.0) as servidor:
+        servicio = WebScrapingService()
+        servicio.urls = servidor.urls
+        assert servicio.obtener_estudiantes_asignados('profesor', 'otra') is None
+        assert servicio.autenticar_usuario('profesor', 'clave')
+        with pytest.raises(ValueError, match='500'):
+            servicio.obtener_listado_estudiantes()
+
+        servidor.tasa_error = 0.0
+        estudiantes = servicio.obtener_listado_estudiantes()
+        servidor.tasa_error = 1.0
+        resumen = PipelineDescargaService(servicio, FileRepository(str(tmp_path)), procesos=1).ejecutar(estudiantes)
+        assert len(resumen.lote.fallidos) == 4
+        assert all(r.error.startswith('Error en descarga') for r in resumen.lote.fallidos)
+
+    with ServidorEmatricula(GeneradorCohorte(), 4, limite_por_segundo=2, duracion_sesion=0.5) as servidor:
+        servicio = WebScrapingService()
+        servicio.urls = servidor.urls
+        assert servicio.autenticar_usuario('profesor', 'clave')
+        clave = servicio.obtener_listado_estudiantes()[0][0]
+        with pytest.raises(ValueError, match='429'):
+            for _ in range(5):
+                servicio.descargar_expediente_estudiante(clave)
+        assert servidor.estadisticas.limitadas == 1
+
+        time.sleep(0.6)
+        with pytest.raises(ValueError, match='401'):
+            servicio.descargar_expediente_estudiante(clave)
+        assert servidor.estadisticas.sesiones_vencidas == 1
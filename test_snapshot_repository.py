@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pruebas del repositorio histórico de corridas con codificación por deltas
+"""
+from datetime import datetime
+
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.infrastructure.repositories.snapshot_repository import SnapshotRepository
+
+
+def _fila(sigla, anno, sem, estado, nota=''):
+    return {
+        'SIGLA': sigla, 'CURSO': f'CURSO {sigla}', 'CREDITOS': '3', 'GRUPO': '01',
+        'SEM': sem, 'AÑO': anno, 'ESTADO': estado, 'NOTA': nota
+    }
+
+
+def test_reconstruccion_y_deltas(tmp_path):
+    """Cada corrida se reconstruye exactamente y los deltas solo guardan lo que cambió."""
+    repo = SnapshotRepository(str(tmp_path), intervalo_completo=3)
+
+    corrida_1 = {
+        'B00001': ('ANA', [_fila('MA1001', '2023', 'I', 'APROBADO', '8.0')]),
+        'B00002': ('LUIS', [_fila('MA1001', '2023', 'I', 'REPROBADO', '5.0')]),
+    }
+    corrida_2 = {
+        'B00001': ('ANA', [_fila('MA1001', '2023', 'I', 'APROBADO', '8.0'),
+                           _fila('MA1002', '2024', 'I', 'MATRICULADO')]),
+        'B00002': ('LUIS', [_fila('MA1001', '2023', 'I', 'REPROBADO', '5.0')]),
+    }
+    corrida_3 = {
+        'B00001': ('ANA', [_fila('MA1001', '2023', 'I', 'APROBADO', '8.0'),
+                           _fila('MA1002', '2024', 'I', 'APROBADO', '9.0')]),
+        'B00003': ('SOFIA', []),
+    }
+
+    ids = [
+        repo.registrar_corrida(corrida, datetime(2024, 1, dia))
+        for dia, corrida in enumerate([corrida_1, corrida_2, corrida_3], 1)
+    ]
+
+    corridas = repo.listar_corridas()
+    assert [c['completa'] for c in corridas] == [True, False, False]
+    # La segunda corrida solo contiene al estudiante que cambió
+    assert corridas[1]['estudiantes_cambiados'] == 1
+
+    # Un repositorio nuevo (sin caché) reconstruye cualquier corrida
+    repo_frio = SnapshotRepository(str(tmp_path), intervalo_completo=3)
+    for id_corrida, corrida in zip(ids, [corrida_1, corrida_2, corrida_3]):
+        estado = repo_frio.reconstruir_corrida(id_corrida)
+        assert set(estado) == set(corrida)
+        for carne, (nombre, historial) in corrida.items():
+            assert estado[carne]['nombre'] == nombre
+            assert sorted(estado[carne]['filas'].values(), key=str) == sorted(historial, key=str)
+
+    cambios = repo_frio.cambios_desde(ids[0])
+    assert set(cambios) == {'B00001', 'B00002', 'B00003'}
+    assert cambios['B00002'].estudiante_eliminado
+    assert cambios['B00003'].estudiante_nuevo
+    assert [f['SIGLA'] for f in cambios['B00001'].agregados] == ['MA1002']
+
+    cambios_recientes = repo_frio.cambios_desde(ids[1], ids[2])
+    previa, actual = cambios_recientes['B00001'].modificados[0]
+    assert (previa['ESTADO'], actual['ESTADO']) == ('MATRICULADO', 'APROBADO')
+
+
+def test_estudiante_eliminado_en_una_copia_completa(tmp_path):
+    """Un estudiante que desaparece justo en una copia completa se reporta como eliminado."""
+    repo = SnapshotRepository(str(tmp_path), intervalo_completo=2)
+    ana = ('ANA', [_fila('MA1001', '2023', 'I', 'APROBADO', '8.0')])
+    luis = ('LUIS', [_fila('MA1001', '2023', 'I', 'REPROBADO', '5.0')])
+    ids = [
+        repo.registrar_corrida(corrida, datetime(2024, 1, dia))
+        for dia, corrida in enumerate([{'B00001': ana, 'B00002': luis}, {'B00001': ana, 'B00002': luis},
+                                       {'B00001': ana}], 1)
+    ]
+
+    assert [c['completa'] for c in repo.listar_corridas()] == [True, False, True]
+    cambios = repo.cambios_desde(ids[1], ids[2])
+    assert set(cambios) == {'B00002'} and cambios['B00002'].estudiante_eliminado
+
+
+def test_registro_desde_repositorio(tmp_path):
+    """La corrida se puede registrar directamente desde los archivos descargados."""
+    file_repo = FileRepository(str(tmp_path))
+    encabezados = ['SIGLA', 'CURSO', 'CREDITOS', 'GRUPO', 'SEM', 'AÑO', 'ESTADO', 'NOTA']
+    file_repo.escribir_informacion_estudiante('C12345', 'C12345', 'JUAN PEREZ')
+    file_repo.escribir_historial('C12345', encabezados, [_fila('MA1001', '2023', 'I', 'APROBADO', '8.5')])
+
+    repo = SnapshotRepository(str(tmp_path))
+    id_corrida = repo.registrar_corrida_desde_repositorio(file_repo)
+
+    historial = repo.obtener_historial(id_corrida, 'C12345')
+    assert len(historial) == 1
+    assert historial[0]['ESTADO'] == 'APROBADO'
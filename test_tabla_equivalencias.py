@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la tabla de equivalencias compilada
+"""
+import json
+
+from src.infrastructure.adapters.equiparacion_analyzer import EquiparacionAnalyzer, PENDIENTE
+from src.shared.config.tabla_equivalencias import TablaEquivalencias, obtener_tabla_equivalencias
+
+
+def _curso(sigla, aprobado=True):
+    estado = 'APROBADO' if aprobado else 'REPROBADO'
+    return {'sigla': sigla, 'nombre': sigla, 'creditos': 3, 'estado': estado, 'aprobado': aprobado}
+
+
+def test_indices_en_ambos_sentidos_y_reglas_combinadas():
+    """La tabla se consulta por sigla vieja y nueva, y las reglas se resuelven con conjuntos."""
+    tabla = obtener_tabla_equivalencias()
+    assert tabla is obtener_tabla_equivalencias()
+
+    assert tabla.por_sigla_vieja('II0201').sigla_nueva == 'II-1118'
+    assert tabla.por_sigla_vieja('ZZ9999') is None
+    assert {e.sigla_vieja for e in tabla.por_sigla_nueva('II-1137')} == {'IE0303', 'II0606'}
+
+    regla = tabla.regla_combinada('QU0102', 'QU-0114')
+    assert regla is tabla.reglas['QU0100_QU0102']
+    assert tabla.regla_combinada('QU0102', 'II-1118') is None
+    assert regla.faltantes({'QU0102'}) == ('QU0100',)
+    assert regla.cumplida({'QU0100', 'QU0102', 'MA1001'})
+
+    filas = {f.sigla_vieja: f for f in EquiparacionAnalyzer().calcular_filas(
+        {'QU0100': _curso('QU0100'), 'QU0101': _curso('QU0101'), 'QU0103': _curso('QU0103')}
+    )}
+    assert (filas['QU0100'].estado_nuevo, filas['QU0100'].categoria_nuevo) == ('Requiere QU0102', PENDIENTE)
+    assert filas['QU0101'].estado_nuevo == filas['QU0103'].estado_nuevo == 'EQUIPARADO'
+
+
+def test_tabla_desde_archivo_con_curso_solo_en_plan_nuevo(tmp_path):
+    """Una transición nueva se agrega editando el archivo de datos, sin cambiar código."""
+    ruta = tmp_path / 'equivalencias.json'
+    ruta.write_text(json.dumps({
+        'equivalencias': [
+            {'sigla_vieja': 'AA0001', 'curso_viejo': 'A', 'creditos_viejo': '3',
+             'sigla_nueva': 'BB0001', 'curso_nuevo': 'B', 'creditos_nuevo': '4'},
+            {'sigla_vieja': '', 'curso_viejo': '', 'creditos_viejo': '',
+             'sigla_nueva': 'BB0002', 'curso_nuevo': 'NUEVO', 'creditos_nuevo': '2'},
+        ]
+    }), encoding='utf-8')
+
+    assert len(TablaEquivalencias.cargar(ruta)) == 2
+    filas = EquiparacionAnalyzer(str(ruta)).calcular_filas({'AA0001': _curso('AA0001')})
+    assert [(f.sigla_vieja, f.sigla_nueva, f.estado_nuevo) for f in filas] == [
+        ('AA0001', 'BB0001', 'EQUIPARADO'), ('', 'BB0002', 'Pendiente')
+    ]
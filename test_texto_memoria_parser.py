@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la lectura en una pasada del texto copiado al portapapeles
+"""
+from src.application.services.memory_reader_service import MemoryReaderService
+from src.infrastructure.adapters.texto_memoria_parser import analizar_texto_memoria
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.shared.sinteticos import GeneradorCohorte, texto_expediente, texto_prematricula
+
+
+def test_expediente_con_retiros_y_texto_sin_datos():
+    """El historial conserva cada fila, incluido el estado con tilde de los retiros."""
+    estudiante = next(
+        estudiante for estudiante in GeneradorCohorte(4).estudiantes(50)
+        if any(fila['ESTADO'] == 'RETIRO DE MATRÍCULA' for fila in estudiante.historial)
+    )
+
+    datos = analizar_texto_memoria(texto_expediente(estudiante))
+
+    assert (datos.tipo, datos.carne, datos.nombre) == ('exp', estudiante.carne, estudiante.nombre)
+    esperado = [dict(fila, NOTA=fila['NOTA'] or '-') for fila in estudiante.historial]
+    clave = lambda fila: (fila['AÑO'], fila['SEM'], fila['SIGLA'], fila['ESTADO'])
+    assert sorted(datos.cursos, key=clave) == sorted(esperado, key=clave)
+    assert [clave(fila)[:3] for fila in datos.cursos] == sorted(clave(fila)[:3] for fila in datos.cursos)
+    assert analizar_texto_memoria('Carné: B12345 ANA\r\n') is None
+
+
+def test_prematricula_guarda_cursos_comentarios_y_nombre(tmp_path):
+    """Cada curso toma la línea siguiente como autorización y el nombre no incluye otras líneas."""
+    estudiante = GeneradorCohorte(4).estudiante(1, ciclos=1)
+    repositorio = FileRepository(str(tmp_path))
+
+    assert MemoryReaderService(repositorio).procesar_contenido(texto_prematricula(estudiante, 10)) == (
+        'pre', estudiante.carne, estudiante.nombre
+    )
+    datos = analizar_texto_memoria(texto_prematricula(estudiante, 10))
+    assert datos.comentario_estudiante == 'Solicito los cursos pendientes del plan'
+    assert datos.comentario_profesor == ''
+    assert datos.cursos == sorted(datos.cursos, key=lambda curso: curso['SIGLA'])
+    assert all(curso['AUTORIZACION'] == 'AUTORIZADO' for curso in datos.cursos)
+    assert [curso['DEC'] for curso in datos.cursos].count('SI') == 1
+    assert (repositorio.directorio_solicitudes / f'{estudiante.carne}.sdf').exists()
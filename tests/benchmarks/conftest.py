@@ -0,0 +1,142 @@
+"""
+Configuración de las pruebas de rendimiento
+
+Las pruebas solo se recolectan con PREEII_BENCHMARKS=1. Variables opcionales:
+    PREEII_BENCHMARK_SALIDA: archivo JSON donde se guardan los resultados
+    PREEII_BENCHMARK_BASE: resultados anteriores; una prueba falla si su mediana
+                           empeora más que la tolerancia
+    PREEII_BENCHMARK_TOLERANCIA: fracción de empeoramiento permitida (0.25 por defecto)
+    PREEII_BENCHMARK_COHORTES: tamaños de cohorte separados por comas (10,100,1000)
+    PREEII_BENCHMARK_ARRANQUE_MS: milisegundos permitidos para el arranque del menú (250)
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+
+if os.environ.get('PREEII_BENCHMARKS') != '1':
+    collect_ignore_glob = ['test_*.py']
+
+
+TIEMPO_MINIMO = 0.2  # Segundos mínimos de medición por prueba
+REPETICIONES_MINIMAS = 5
+REPETICIONES_MAXIMAS = 1000
+
+_resultados: Dict[str, Dict[str, Any]] = {}
+
+
+class Cronometro:
+    """Mide repetidamente una función y compara con los resultados anteriores."""
+
+    def __init__(self, base: Dict[str, Dict[str, Any]], tolerancia: float):
+        self.base = base
+        self.tolerancia = tolerancia
+
+    def __call__(
+        self,
+        nombre: str,
+        funcion: Callable[[], Any],
+        repeticiones: Optional[int] = None,
+        unidades: int = 1,
+        preparar: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Mide una función y registra sus estadísticas.
+
+        Args:
+            nombre: Nombre del resultado
+            funcion: Función sin argumentos a medir
+            repeticiones: Repeticiones fijas; si es None se repite hasta TIEMPO_MINIMO
+            unidades: Elementos procesados por llamada, para calcular el ritmo
+            preparar: Función que se llama antes de cada repetición, fuera de la medición
+
+        Returns:
+            Estadísticas de la medición, en segundos
+        """
+        muestras: List[float] = []
+        acumulado = 0.0
+        while True:
+            if preparar:
+                preparar()
+            inicio = time.perf_counter()
+            funcion()
+            duracion = time.perf_counter() - inicio
+            muestras.append(duracion)
+            acumulado += duracion
+
+            if repeticiones is not None:
+                if len(muestras) >= repeticiones:
+                    break
+            elif (len(muestras) >= REPETICIONES_MINIMAS and acumulado >= TIEMPO_MINIMO) \
+                    or len(muestras) >= REPETICIONES_MAXIMAS:
+                break
+
+        mediana = statistics.median(muestras)
+        resultado = {
+            'repeticiones': len(muestras),
+            'minimo': min(muestras),
+            'mediana': mediana,
+            'media': statistics.fmean(muestras),
+            'desviacion': statistics.stdev(muestras) if len(muestras) > 1 else 0.0,
+            'unidades': unidades,
+            'por_segundo': unidades / mediana if mediana > 0 else 0.0,
+        }
+        _resultados[nombre] = resultado
+
+        anterior = self.base.get(nombre)
+        if anterior:
+            limite = anterior['mediana'] * (1 + self.tolerancia)
+            assert mediana <= limite, (
+                f'{nombre}: la mediana pasó de {anterior["mediana"] * 1000:.2f} ms '
+                f'a {mediana * 1000:.2f} ms'
+            )
+        return resultado
+
+
+@pytest.fixture(scope='session')
+def cronometro() -> Cronometro:
+    """Cronómetro con los resultados de referencia de PREEII_BENCHMARK_BASE."""
+    base: Dict[str, Dict[str, Any]] = {}
+    ruta_base = os.environ.get('PREEII_BENCHMARK_BASE')
+    if ruta_base:
+        with open(ruta_base, 'r', encoding='utf-8') as archivo:
+            base = json.load(archivo)['resultados']
+    return Cronometro(base, float(os.environ.get('PREEII_BENCHMARK_TOLERANCIA', '0.25')))
+
+
+def tamanos_cohorte() -> List[int]:
+    """Tamaños de cohorte para la prueba de punta a punta."""
+    return [int(tamano) for tamano in os.environ.get('PREEII_BENCHMARK_COHORTES', '10,100,1000').split(',')]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    """Muestra la tabla de resultados y los guarda si se indicó un archivo."""
+    if not _resultados:
+        return
+
+    terminalreporter.section('rendimiento')
+    terminalreporter.write_line(
+        f'{"PRUEBA":52} {"REP":>5} {"MÍN ms":>10} {"MEDIANA ms":>11} {"DESV ms":>9} {"POR s":>10}'
+    )
+    for nombre, r in sorted(_resultados.items()):
+        terminalreporter.write_line(
+            f'{nombre[:52]:52} {r["repeticiones"]:5d} {r["minimo"] * 1000:10.3f} '
+            f'{r["mediana"] * 1000:11.3f} {r["desviacion"] * 1000:9.3f} {r["por_segundo"]:10.1f}'
+        )
+
+    salida = os.environ.get('PREEII_BENCHMARK_SALIDA')
+    if salida:
+        ruta = Path(salida)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'procesadores': os.cpu_count(),
+                'resultados': _resultados,
+            }, archivo, ensure_ascii=False, indent=2)
+        terminalreporter.write_line(f'Resultados guardados en {ruta}')
@@ -0,0 +1,42 @@
+"""
+Rendimiento del arranque del menú en un intérprete nuevo
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+# Milisegundos permitidos para importar main y crear el menú
+PRESUPUESTO_MS = float(os.environ.get('PREEII_BENCHMARK_ARRANQUE_MS', '250'))
+
+ARRANQUE = (
+    'import time\n'
+    'inicio = time.perf_counter()\n'
+    'import main\n'
+    'from src.presentation.console.menu_controller import MenuController\n'
+    'MenuController()\n'
+    'print((time.perf_counter() - inicio) * 1000)\n'
+)
+
+
+def _arranque_ms() -> float:
+    """Milisegundos de importación y creación del menú, medidos dentro del proceso nuevo."""
+    salida = subprocess.run(
+        [sys.executable, '-c', ARRANQUE], cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    return float(salida.stdout.strip().splitlines()[-1])
+
+
+def test_arranque_del_menu(cronometro):
+    """El menú se muestra dentro del presupuesto de arranque, sin contar el inicio del intérprete."""
+    tiempos = []
+    cronometro('arranque.menu_con_interprete', lambda: tiempos.append(_arranque_ms()), repeticiones=7)
+
+    mediana = statistics.median(tiempos)
+    assert mediana <= PRESUPUESTO_MS, (
+        f'El arranque del menú tarda {mediana:.1f} ms; el presupuesto es {PRESUPUESTO_MS:.0f} ms'
+    )
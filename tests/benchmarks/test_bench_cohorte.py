@@ -0,0 +1,27 @@
+"""
+Rendimiento de punta a punta: generación de los Excel de una cohorte descargada
+"""
+import pytest
+
+from conftest import tamanos_cohorte
+from src.application.services.generacion_excel_service import GeneracionExcelService
+from src.infrastructure.repositories.file_repository import FileRepository
+from src.shared.config.settings import app_config
+from src.shared.sinteticos import GeneradorCohorte, escribir_en_repositorio
+
+
+@pytest.mark.parametrize('estudiantes', tamanos_cohorte())
+def test_cohorte(cronometro, tmp_path, estudiantes):
+    """Lectura de los expedientes guardados y generación en paralelo de todos los Excel."""
+    file_repo = FileRepository(str(tmp_path))
+    escribir_en_repositorio(file_repo, GeneradorCohorte().estudiantes(estudiantes))
+    archivos = file_repo.listar_archivos_expedientes()
+    servicio = GeneracionExcelService(file_repo, app_config.procesos, tiempo_limite=None)
+    resumenes = []
+
+    def generar():
+        plan = servicio.preparar(archivos, 'completo', forzar=True)
+        resumenes.append(servicio.generar(plan))
+
+    cronometro(f'cohorte[{estudiantes} estudiantes]', generar, repeticiones=1, unidades=estudiantes)
+    assert len(resumenes[-1].exitosos) == estudiantes
@@ -0,0 +1,28 @@
+"""
+Rendimiento de la construcción del expediente y la resolución de requisitos
+"""
+import pytest
+
+from src.application.services.expediente_service import ExpedienteService
+from src.shared.sinteticos import GeneradorCohorte
+
+
+@pytest.mark.parametrize('ciclos', [2, 6, 10])
+def test_construir_expediente(cronometro, ciclos):
+    """ExpedienteService.procesar_expediente_estudiante según el avance en el plan."""
+    estudiante = GeneradorCohorte().estudiante(0, ciclos=ciclos)
+    cronometro(
+        f'dominio.construir_expediente[{ciclos} ciclos]',
+        lambda: ExpedienteService.procesar_expediente_estudiante(
+            estudiante.carne, estudiante.nombre, estudiante.historial
+        )
+    )
+
+
+def test_requisitos_correquisitos(cronometro):
+    """Expediente.procesar_requisitos_correquisitos sobre un expediente ya cargado."""
+    estudiante = GeneradorCohorte().estudiante(0, ciclos=6)
+    expediente = ExpedienteService.procesar_expediente_estudiante(
+        estudiante.carne, estudiante.nombre, estudiante.historial
+    )
+    cronometro('dominio.requisitos_correquisitos', expediente.procesar_requisitos_correquisitos)
@@ -0,0 +1,80 @@
+"""
+Rendimiento de la escritura de cada hoja del Excel y del análisis de equiparación
+"""
+import openpyxl
+import pytest
+import xlsxwriter
+
+from src.application.services.expediente_service import ExpedienteService
+from src.domain.entities.analisis_expediente import AnalisisExpediente
+from src.infrastructure.adapters import equiparacion_analyzer
+from src.infrastructure.adapters.equiparacion_analyzer import EquiparacionAnalyzer
+from src.infrastructure.adapters.excel_writer import ExcelWriter
+from src.shared.sinteticos import GeneradorCohorte
+
+
+@pytest.fixture(scope='module')
+def expediente():
+    estudiante = GeneradorCohorte().estudiante(0, ciclos=6)
+    return ExpedienteService.procesar_expediente_estudiante(
+        estudiante.carne, estudiante.nombre, estudiante.historial
+    )
+
+
+@pytest.mark.parametrize('hoja', ExcelWriter.PERFILES['con_equiparacion'])
+def test_generar_hoja(cronometro, expediente, tmp_path, hoja):
+    """Escritura de una hoja en un libro nuevo, sin guardar el archivo."""
+    writer = ExcelWriter()
+    generador = ExcelWriter._registro_hojas[hoja].generador
+    libros = []
+
+    def preparar():
+        libro = xlsxwriter.Workbook(str(tmp_path / 'hoja.xlsx'))
+        libros[:] = [(libro, writer._generar_formatos(libro), AnalisisExpediente(expediente))]
+
+    def generar():
+        libro, formatos, analisis = libros[-1]
+        generador(writer, libro, expediente, formatos, analisis)
+
+    cronometro(f'excel.hoja[{hoja}]', generar, preparar=preparar)
+
+
+def test_generar_libro_completo(cronometro, expediente, tmp_path):
+    """Generación y guardado del libro con todas las hojas."""
+    writer = ExcelWriter()
+    ruta = str(tmp_path / 'expediente.xlsx')
+    cronometro('excel.libro_completo', lambda: writer.generar_expediente(expediente, ruta))
+
+
+def test_analizar_equiparacion(cronometro, expediente, tmp_path, monkeypatch):
+    """EquiparacionAnalyzer.analizar_expediente sobre un libro recién generado, sin caché."""
+    ruta = str(tmp_path / 'B12345-ANA SOTO.xlsx')
+    writer = ExcelWriter()
+    analyzer = EquiparacionAnalyzer()
+
+    def preparar():
+        monkeypatch.setattr(equiparacion_analyzer, '_CURSOS_POR_HUELLA', equiparacion_analyzer.OrderedDict())
+        monkeypatch.setattr(equiparacion_analyzer, '_HUELLAS_ANALIZADAS', equiparacion_analyzer.OrderedDict())
+        writer.generar_expediente(expediente, ruta)
+
+    cronometro('equiparacion.analizar_expediente', lambda: analyzer.analizar_expediente(ruta),
+               preparar=preparar)
+
+
+def test_extraer_cursos_equiparacion(cronometro, expediente, tmp_path, monkeypatch):
+    """EquiparacionAnalyzer.extraer_cursos (solo lectura) frente a la lectura del libro completo."""
+    ruta = str(tmp_path / 'B12345-ANA SOTO.xlsx')
+    ExcelWriter().generar_expediente(expediente, ruta)
+    analyzer = EquiparacionAnalyzer()
+
+    def vaciar_cache():
+        monkeypatch.setattr(equiparacion_analyzer, '_CURSOS_POR_HUELLA', equiparacion_analyzer.OrderedDict())
+
+    def libro_completo():
+        libro = openpyxl.load_workbook(ruta)
+        analyzer._extraer_cursos_aprobados(libro)
+        libro.close()
+
+    cronometro('equiparacion.extraer_cursos', lambda: analyzer.extraer_cursos(ruta), preparar=vaciar_cache)
+    cronometro('equiparacion.extraer_cursos_libro_completo', libro_completo)
+    cronometro('equiparacion.extraer_cursos_en_cache', lambda: analyzer.extraer_cursos(ruta))
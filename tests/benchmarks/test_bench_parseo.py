@@ -0,0 +1,51 @@
+"""
+Rendimiento de la lectura de expedientes: HTML descargado y texto copiado
+"""
+from src.infrastructure.adapters.html_parser import StudentParser
+from src.infrastructure.adapters.texto_memoria_parser import analizar_texto_memoria
+from src.shared.config.settings import DETALLE_CURSOS
+from src.shared.sinteticos import GeneradorCohorte, html_nivel_avance, texto_expediente, texto_prematricula
+
+
+def test_student_parser(cronometro):
+    """Análisis del HTML de nivel de avance con StudentParser.feed y get_lista."""
+    estudiante = GeneradorCohorte().estudiante(0, ciclos=10)
+    historial = estudiante.historial
+    html = html_nivel_avance(estudiante)
+
+    def analizar():
+        parser = StudentParser()
+        parser.feed(html)
+        return parser.get_lista()
+
+    assert len(analizar()) == len(historial)
+    cronometro('parseo.student_parser', analizar, unidades=len(historial))
+
+
+def test_historial_desde_texto(cronometro):
+    """Lectura del texto copiado de un expediente con analizar_texto_memoria."""
+    estudiante = GeneradorCohorte().estudiante(0, ciclos=10)
+    historial = estudiante.historial
+    texto = texto_expediente(estudiante)
+
+    assert len(analizar_texto_memoria(texto).cursos) == len(historial)
+    cronometro('parseo.texto_memoria', lambda: analizar_texto_memoria(texto), unidades=len(historial))
+
+
+def test_textos_copiados_grandes(cronometro):
+    """Lectura de un expediente con el historial de 50 estudiantes y de una prematrícula con todo el plan."""
+    estudiantes = list(GeneradorCohorte().estudiantes(50))
+    grande = estudiantes[0]
+    grande.historial = [fila for estudiante in estudiantes for fila in estudiante.historial]
+    expediente = texto_expediente(grande)
+    prematricula = texto_prematricula(grande, len(DETALLE_CURSOS))
+
+    assert len(analizar_texto_memoria(expediente).cursos) == len(grande.historial)
+    cronometro(
+        'parseo.texto_memoria.expediente_grande', lambda: analizar_texto_memoria(expediente),
+        unidades=len(grande.historial)
+    )
+    cronometro(
+        'parseo.texto_memoria.prematricula_grande', lambda: analizar_texto_memoria(prematricula),
+        unidades=prematricula.count('\r\n')
+    )
@@ -46,3 +46,23 @@ def sample_cursos_data():
             'semestre': 2
         }
     ]
+
+
+@pytest.fixture
+def expediente_variado():
+    """Expediente con aprobados, reprobaciones repetidas, retiros y matrícula actual."""
+    from src.application.services.expediente_service import ExpedienteService
+    from src.shared.config.settings import DETALLE_CURSOS
+
+    estados = ['APROBADO', 'REPROBADO', 'MATRICULADO', 'RETIRO DE MATRÍCULA']
+    historial = []
+    for i, curso in enumerate(DETALLE_CURSOS[:40]):
+        estado = estados[i % len(estados)]
+        historial.append({
+            'SIGLA': curso['sigla'], 'CURSO': curso['curso'], 'CREDITOS': str(curso['creditos']),
+            'GRUPO': '01', 'SEM': 'I', 'AÑO': str(2020 + i % 4), 'ESTADO': estado, 'NOTA': '7.0'
+        })
+        if estado == 'REPROBADO':
+            for intento in range(3):
+                historial.append(dict(historial[-1], SEM='II', AÑO=str(2016 + intento), NOTA='5.0'))
+    return ExpedienteService.procesar_expediente_estudiante('B12345', 'ANA SOTO', historial)